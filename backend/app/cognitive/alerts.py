@@ -9,6 +9,8 @@ from datetime import datetime, UTC
 from typing import Optional
 
 from .utils import get_pronouns
+from ..events import event_hub
+from ..storage.unit_of_work import current_unit_of_work
 
 logger = logging.getLogger(__name__)
 
@@ -104,9 +106,9 @@ class AlertEngine:
                 
                 alerts_created.append(alert)
 
-        # Dispatch notifications if service is available
+        # Dispatch notifications if service is available (once the alerts are committed)
         if alerts_created and self.notification_service:
-            await self._dispatch_notifications(patient_id, alerts_created)
+            await self._notify_after_commit(patient_id, alerts_created)
 
         return alerts_created
     
@@ -229,9 +231,18 @@ class AlertEngine:
         alert["id"] = alert_id
         
         logger.warning(f"Alert created: {alert_type} ({deviation['severity']}) for patient {patient_id}")
+        self._publish_created(patient_id, alert)
         
         return alert
 
+    def _publish_created(self, patient_id: str, alert: dict) -> None:
+        """Publish alert_created now, or once the active batch commits (never for a rolled-back one)."""
+        uow = current_unit_of_work(self.data_store)
+        if uow is not None:
+            uow.after_commit(lambda: event_hub.publish("alert_created", patient_id, alert))
+        else:
+            event_hub.publish("alert_created", patient_id, alert)
+
     
     def _generate_alert_description(self, deviation: dict) -> str:
         """Generate plain-English alert description for family members — no jargon or raw numbers."""
@@ -377,14 +388,34 @@ class AlertEngine:
         alert["id"] = alert_id
         
         logger.critical(f"REALTIME ALERT: {alert_type} ({severity}) - {message}")
+        self._publish_created(patient_id, alert)
         
         # Dispatch notification for high and medium severity real-time alerts
         if severity in ("high", "medium") and self.notification_service:
-            await self._dispatch_notifications(patient_id, [alert])
+            await self._notify_after_commit(patient_id, [alert])
         
         return alert
 
     
+    async def save_uncommitted_alerts(self, patient_id: str, alerts: list[dict]) -> None:
+        """
+        Save alerts built inside a batch that failed to commit, one by one,
+        then publish and notify as check_and_alert would have.
+        """
+        for alert in alerts:
+            await self.data_store.save_alert(alert)
+            self._publish_created(patient_id, alert)
+        if alerts and self.notification_service:
+            await self._notify_after_commit(patient_id, alerts)
+
+    async def _notify_after_commit(self, patient_id: str, alerts: list[dict]) -> None:
+        """Notify now, or once the active batch commits (never for a rolled-back one)."""
+        uow = current_unit_of_work(self.data_store)
+        if uow is not None:
+            uow.after_commit(lambda: self._dispatch_notifications(patient_id, alerts))
+        else:
+            await self._dispatch_notifications(patient_id, alerts)
+
     async def _dispatch_notifications(self, patient_id: str, alerts: list[dict]) -> None:
         """
         Send notifications to family members for alerts
@@ -72,7 +72,8 @@ class CognitiveAnalyzer:
         response_times: Optional[list[float]] = None,
         conversation_id: Optional[str] = None,
         patient_id: Optional[str] = None,
-        history_transcripts: Optional[list[str]] = None
+        history_transcripts: Optional[list[str]] = None,
+        pause_durations: Optional[list[float]] = None
     ) -> dict:
         """
         Main entry point: analyze a conversation transcript
@@ -84,6 +85,7 @@ class CognitiveAnalyzer:
             conversation_id: Optional conversation ID for tracking
             patient_id: Optional patient ID for tracking
             history_transcripts: Optional list of recent conversation transcripts for cross-conversation repetition
+            pause_durations: Optional list of silences (seconds) inside the patient's turns
             
         Returns:
             CognitiveMetrics as dict
@@ -113,6 +115,7 @@ class CognitiveAnalyzer:
         )
         word_finding_pauses = self.count_word_finding_pauses(patient_turns)
         response_latency = self.compute_response_latency(response_times)
+        pause_duration = self.compute_pause_duration(pause_durations)
         
         metrics = {
             "vocabulary_diversity": vocabulary_diversity,
@@ -121,6 +124,7 @@ class CognitiveAnalyzer:
             "repetition_rate": repetition_rate,
             "word_finding_pauses": word_finding_pauses,
             "response_latency": response_latency,
+            "pause_duration": pause_duration,
             "analyzed_at": datetime.now(UTC).isoformat(),
             "conversation_id": conversation_id,
             "patient_id": patient_id
@@ -129,7 +133,8 @@ class CognitiveAnalyzer:
         logger.info(f"Analysis complete. TTR={vocabulary_diversity:.3f}, "
                    f"Coherence={topic_coherence:.3f}, Repetitions={repetition_count} "
                    f"(cross-convo: {len(history_turns)} history turns), "
-                   f"Word-finding={word_finding_pauses}")
+                   f"Word-finding={word_finding_pauses}, Latency={response_latency}, "
+                   f"Pause={pause_duration}")
         
         return metrics
     
@@ -142,6 +147,7 @@ class CognitiveAnalyzer:
             "repetition_rate": 0.0,
             "word_finding_pauses": 0,
             "response_latency": None,
+            "pause_duration": None,
             "analyzed_at": datetime.now(UTC).isoformat(),
             "conversation_id": conversation_id,
             "patient_id": patient_id,
@@ -339,3 +345,18 @@ class CognitiveAnalyzer:
         
         avg_latency = sum(response_times) / len(response_times)
         return round(avg_latency, 2)
+    
+    def compute_pause_duration(self, pause_durations: Optional[list[float]]) -> Optional[float]:
+        """
+        Compute average silence inside the patient's own turns
+        
+        Args:
+            pause_durations: List of mid-turn pause lengths in seconds
+            
+        Returns:
+            Average pause or None if unavailable
+        """
+        if not pause_durations:
+            return None
+        
+        return round(sum(pause_durations) / len(pause_durations), 2)
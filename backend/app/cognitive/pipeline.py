@@ -4,6 +4,7 @@ Chains all cognitive processing steps: analyze -> baseline -> alert -> digest
 Uses Gemini LLM for enhanced wellness highlight generation.
 """
 
+import asyncio
 import logging
 import os
 import uuid
@@ -17,9 +18,13 @@ except ImportError:
     _GEMINI_AVAILABLE = False
 
 from .utils import calculate_cognitive_score, get_pronouns
+from app.resilience import deadline, guarded
+from app.storage.unit_of_work import RevisionConflictError
 
 logger = logging.getLogger(__name__)
 
+COMMIT_ATTEMPTS = 3
+
 
 class CognitivePipeline:
     """
@@ -33,7 +38,8 @@ class CognitivePipeline:
         baseline_tracker,
         alert_engine,
         data_store,
-        notification_service=None
+        notification_service=None,
+        budget_seconds: float = 60.0
     ):
         """
         Args:
@@ -42,12 +48,15 @@ class CognitivePipeline:
             alert_engine: AlertEngine instance
             data_store: DataStore implementation
             notification_service: Optional EmailNotifier for sending digests
+            budget_seconds: Overall latency budget for one process_conversation
+                run; external calls inside it are capped to the time left
         """
         self.analyzer = analyzer
         self.baseline_tracker = baseline_tracker
         self.alert_engine = alert_engine
         self.data_store = data_store
         self.notification_service = notification_service
+        self.budget_seconds = budget_seconds
     
     async def process_conversation(
         self,
@@ -58,11 +67,15 @@ class CognitivePipeline:
         detected_mood: str,
         response_times: Optional[list[float]] = None,
         conversation_id: Optional[str] = None,
-        analysis: Optional[dict] = None
+        analysis: Optional[dict] = None,
+        pause_durations: Optional[list[float]] = None
     ) -> dict:
         """
         Run full cognitive pipeline on a conversation
         
+        External calls made while processing share one budget of
+        budget_seconds (see app.resilience.deadline).
+        
         Args:
             patient_id: Patient identifier
             transcript: Full conversation transcript
@@ -71,10 +84,30 @@ class CognitivePipeline:
             detected_mood: Detected mood (happy, sad, etc.)
             response_times: Optional list of response latencies
             conversation_id: Optional conversation ID
+            pause_durations: Optional list of silences inside the patient's turns
             
         Returns:
             Pipeline result dict with conversation_id, metrics, alerts, digest
         """
+        with deadline(self.budget_seconds):
+            return await self._process_conversation(
+                patient_id, transcript, duration, summary, detected_mood,
+                response_times, conversation_id, analysis, pause_durations
+            )
+    
+    async def _process_conversation(
+        self,
+        patient_id: str,
+        transcript: str,
+        duration: int,
+        summary: str,
+        detected_mood: str,
+        response_times: Optional[list[float]],
+        conversation_id: Optional[str],
+        analysis: Optional[dict],
+        pause_durations: Optional[list[float]] = None
+    ) -> dict:
+        """Body of process_conversation (runs inside its deadline)."""
         logger.info(f"Processing conversation for patient: {patient_id}")
         
         # Generate conversation ID if not provided
@@ -93,7 +126,8 @@ class CognitivePipeline:
         
         # Get recent conversation history for cross-conversation repetition detection
         recent_convos = await self.data_store.get_conversations(patient_id=patient_id, limit=5)
-        history_transcripts = [c.get("transcript", "") for c in recent_convos if c.get("transcript")]
+        history = await self.data_store.get_transcripts([c["id"] for c in recent_convos])
+        history_transcripts = [history[c["id"]] for c in recent_convos if history.get(c["id"])]
         
         # Step 1: Analyze conversation with NLP metrics (including cross-conversation repetition)
         logger.info("Step 1: Analyzing conversation metrics...")
@@ -101,6 +135,7 @@ class CognitivePipeline:
             transcript=transcript,
             patient_name=patient_name,
             response_times=response_times,
+            pause_durations=pause_durations,
             conversation_id=conversation_id,
             patient_id=patient_id,
             history_transcripts=history_transcripts  # For cross-conversation repetition
@@ -123,91 +158,123 @@ class CognitivePipeline:
             })
         }
         
-        # Clean summary at save time (avoid per-GET regex processing)
-        try:
-            from app.routes.conversations import _clean_summary
-            conversation["summary"] = _clean_summary(summary)
-        except ImportError:
-            pass  # graceful fallback if conversations module not yet loaded
-        
-        await self.data_store.save_conversation(conversation)
-        logger.info(f"Conversation saved: {conversation_id}")
-        
-        # Steps 3-7 are wrapped in try/except for partial-failure safety.
-        # If any step fails, the conversation (already saved) is not lost.
-        saved_artifacts = ["conversation"]
-        deviations = []
-        alerts = []
-        digest = None
-        baseline = None
-        
-        try:
-            # Step 3: Check if baseline exists, establish if ready
-            baseline = await self.data_store.get_cognitive_baseline(patient_id)
+        # Steps 2-6 write through one unit of work: the conversation, deviation
+        # counters, baseline, alerts and digest are committed as a single batch.
+        # Steps 3-6 are wrapped in try/except for partial-failure safety —
+        # if any step fails, the conversation (already queued) is still committed.
+        # A revision conflict on commit (a concurrent write to the baseline or
+        # deviation tracker) reruns steps 2-6 against fresh reads.
+        for attempt in range(1, COMMIT_ATTEMPTS + 1):
+            saved_artifacts = []
+            deviations = []
+            alerts = []
+            digest = None
+            baseline = None
+            step_error: Optional[Exception] = None
             
-            if not baseline or not baseline.get("established"):
-                # Check if we have enough conversations to establish baseline
-                if await self.baseline_tracker.check_baseline_ready(patient_id):
-                    logger.info("Sufficient conversations for baseline. Establishing...")
-                    baseline = await self.baseline_tracker.establish_baseline(patient_id)
-                else:
-                    logger.info("Baseline not ready yet (need 7 conversations)")
-                    baseline = None
-            
-            # Step 4: Compare to baseline and detect deviations
-            if baseline and baseline.get("established"):
-                logger.info("Step 2: Comparing to baseline...")
-                deviations = await self.baseline_tracker.compare_to_baseline(
-                    patient_id,
-                    metrics,
-                    baseline
-                )
+            try:
+                async with self.data_store.batch():
+                    await self.data_store.save_conversation(conversation)
+                    saved_artifacts.append("conversation")
                 
-                # Step 5: Generate alerts if deviations are significant
-                if deviations:
-                    logger.info(f"Step 3: Checking for alerts ({len(deviations)} deviations)...")
-                    alerts = await self.alert_engine.check_and_alert(
-                        patient_id,
-                        metrics,
-                        deviations,
-                        analysis=analysis
+                    try:
+                        # Step 3: Check if baseline exists, establish if ready
+                        baseline = await self.data_store.get_cognitive_baseline(patient_id)
+                    
+                        if not baseline or not baseline.get("established"):
+                            # Check if we have enough conversations to establish baseline
+                            if await self.baseline_tracker.check_baseline_ready(patient_id):
+                                logger.info("Sufficient conversations for baseline. Establishing...")
+                                baseline = await self.baseline_tracker.establish_baseline(patient_id)
+                            else:
+                                logger.info("Baseline not ready yet (need 7 conversations)")
+                                baseline = None
+                    
+                        # Step 4: Compare to baseline and detect deviations
+                        if baseline and baseline.get("established"):
+                            logger.info("Step 2: Comparing to baseline...")
+                            deviations = await self.baseline_tracker.compare_to_baseline(
+                                patient_id,
+                                metrics,
+                                baseline
+                            )
+                        
+                            # Step 5: Generate alerts if deviations are significant
+                            if deviations:
+                                logger.info(f"Step 3: Checking for alerts ({len(deviations)} deviations)...")
+                                alerts = await self.alert_engine.check_and_alert(
+                                    patient_id,
+                                    metrics,
+                                    deviations,
+                                    analysis=analysis
+                                )
+                    
+                        # Step 6: Generate wellness digest
+                        logger.info("Step 4: Generating wellness digest...")
+                        digest = await self._generate_wellness_digest(
+                            patient_id,
+                            conversation_id,
+                            metrics,
+                            summary,
+                            detected_mood,
+                            baseline,
+                            analysis
+                        )
+                        saved_artifacts.append("digest")
+                    except Exception as e:
+                        step_error = e
+                break
+            except RevisionConflictError as e:
+                if attempt < COMMIT_ATTEMPTS:
+                    logger.warning(
+                        f"[PIPELINE_COMMIT_CONFLICT] patient={patient_id} "
+                        f"conversation={conversation_id} attempt={attempt} — retrying with fresh reads"
                     )
+                    continue
+                commit_error = e
+            except Exception as e:
+                commit_error = e
             
-            # Step 6: Generate wellness digest
-            logger.info("Step 4: Generating wellness digest...")
-            digest = await self._generate_wellness_digest(
-                patient_id,
-                conversation_id,
-                metrics,
-                summary,
-                detected_mood,
-                baseline,
-                analysis
+            # The batch could not be committed. Save the conversation and any
+            # alerts on their own so neither is lost; the baseline, deviation
+            # counters and digest are rebuilt on the next call.
+            logger.error(
+                f"[PIPELINE_COMMIT_FAILED] patient={patient_id} "
+                f"conversation={conversation_id} error={commit_error}"
             )
-            saved_artifacts.append("digest")
-            
-            # Step 7: Send daily digest email (if enabled)
-            if digest and self.notification_service:
-                await self._send_digest_notification(patient_id, digest)
+            await self.data_store.save_conversation(conversation)
+            saved_artifacts = ["conversation"]
+            if alerts:
+                await self.alert_engine.save_uncommitted_alerts(patient_id, alerts)
+                saved_artifacts.append("alerts")
+            digest = None
+            step_error = commit_error
+            break
         
-        except Exception as e:
+        logger.info(f"Conversation saved: {conversation_id}")
+        
+        if step_error is not None:
             logger.error(
                 f"[PIPELINE_PARTIAL_FAILURE] patient={patient_id} "
-                f"conversation={conversation_id} saved={saved_artifacts} error={e}",
-                exc_info=True,
+                f"conversation={conversation_id} saved={saved_artifacts} error={step_error}",
+                exc_info=step_error,
             )
             # The conversation is already saved — don't lose it.
             return {
                 "success": True,
                 "partial": True,
                 "conversation_id": conversation_id,
-                "error": f"Pipeline partially completed ({', '.join(saved_artifacts)} saved). Error: {str(e)}",
+                "error": f"Pipeline partially completed ({', '.join(saved_artifacts)} saved). Error: {str(step_error)}",
                 "cognitive_score": None,
                 "cognitive_trend": None,
                 "baseline_established": bool(baseline and baseline.get("established")),
                 "alerts_generated": len(alerts),
             }
         
+        # Step 7: Send daily digest email (if enabled) — only after the batch committed
+        if digest and self.notification_service:
+            await self._send_digest_notification(patient_id, digest)
+        
         logger.info(f"Pipeline complete for {patient_id}. "
                    f"Metrics: ✓, Baseline: {'✓' if baseline else '⏳'}, "
                    f"Alerts: {len(alerts)}, Digest: ✓")
@@ -251,7 +318,7 @@ class CognitivePipeline:
         recommendations = self._generate_recommendations(metrics, baseline)
         
         # Extract highlights from summary + analysis data
-        highlights = self._extract_highlights(summary, analysis, metrics)
+        highlights = await self._extract_highlights(summary, analysis, metrics)
         
         # Create digest
         digest = {
@@ -307,21 +374,22 @@ class CognitivePipeline:
         
         return "stable"
     
-    def _extract_highlights(self, summary: str, analysis: Optional[dict] = None, metrics: Optional[dict] = None) -> list[str]:
+    async def _extract_highlights(self, summary: str, analysis: Optional[dict] = None, metrics: Optional[dict] = None) -> list[str]:
         """
         Extract key highlights from conversation summary and analysis data.
         Uses Gemini LLM for rich, detailed highlights when available.
-        Falls back to rule-based extraction otherwise.
+        Falls back to rule-based extraction otherwise (also when the Gemini
+        breaker is open or the pipeline budget is spent).
         """
         # Try Gemini-powered highlights first
-        gemini_highlights = self._gemini_highlights(summary, analysis, metrics)
+        gemini_highlights = await self._gemini_highlights(summary, analysis, metrics)
         if gemini_highlights:
             return gemini_highlights
         
         # Fallback: rule-based extraction
         return self._rule_based_highlights(summary, analysis, metrics)
     
-    def _gemini_highlights(self, summary: str, analysis: Optional[dict] = None, metrics: Optional[dict] = None) -> list[str]:
+    async def _gemini_highlights(self, summary: str, analysis: Optional[dict] = None, metrics: Optional[dict] = None) -> list[str]:
         """
         Generate detailed, warm wellness highlights using Gemini LLM.
         """
@@ -377,7 +445,9 @@ Generate 3-5 bullet points for the "KEY HIGHLIGHTS" section. Rules:
         try:
             genai.configure(api_key=api_key)
             model = genai.GenerativeModel("gemini-3-flash-preview")
-            response = model.generate_content(prompt)
+            response = await guarded(
+                "gemini", lambda: asyncio.to_thread(model.generate_content, prompt), timeout=20.0
+            )
             raw = response.text.strip()
             
             # Parse response into individual highlights
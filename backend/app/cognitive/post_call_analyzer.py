@@ -17,6 +17,7 @@ Then layers elder-care-specific keyword analysis for:
   - Mood refinement
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -25,7 +26,8 @@ from typing import Optional
 
 from .utils import get_pronouns
 
-import httpx
+from app.http_clients import get_http_client
+from app.resilience import deadline, guarded
 
 try:
     import google.generativeai as genai
@@ -35,6 +37,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Overall latency budget for one post-call analysis (Deepgram + Gemini)
+POST_CALL_BUDGET_SEC = 45.0
+
 # ─── Safety keywords (highest priority) ────────────────────────────────────────
 # Tier 1: ALWAYS flag — unambiguous crisis language
 SAFETY_KEYWORDS_CRITICAL = [
@@ -129,6 +134,15 @@ async def analyze_transcript(
         patient_context:  Optional dict with patient info for richer analysis:
                           {name, preferred_name, location, family_names, interests}
     """
+    with deadline(POST_CALL_BUDGET_SEC):
+        return await _analyze_transcript(transcript, medications, patient_context)
+
+
+async def _analyze_transcript(
+    transcript: str,
+    medications: list[str] | None,
+    patient_context: dict | None,
+) -> dict:
     patient_meds = [m.lower() for m in (medications or [])]
     ctx = patient_context or {}
 
@@ -180,8 +194,8 @@ async def _deepgram_analyze(transcript: str, patient_name: str = "") -> dict:
         return {}
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
+        async def attempt() -> dict:
+            response = await get_http_client("deepgram").post(
                 "https://api.deepgram.com/v1/read",
                 params={
                     "sentiment": "true",
@@ -196,51 +210,53 @@ async def _deepgram_analyze(transcript: str, patient_name: str = "") -> dict:
                 json={"text": transcript},
             )
             response.raise_for_status()
-            data = response.json()
-            
-            results = data.get("results", {})
-            
-            logger.debug(
-                "[DEEPGRAM_RAW] %s",
-                json.dumps(results, indent=2, default=str)[:4000]
-            )
-            
-            # ── Extract topics ──────────────────────────────────────────
-            topics_data = results.get("topics", {}).get("segments", [])
-            topics: list[str] = []
-            for seg in topics_data:
-                for topic in seg.get("topics", []):
-                    t = topic.get("topic", "")
-                    if t and t not in topics:
-                        topics.append(t)
-            
-            # ── Extract sentiment ───────────────────────────────────────
-            sentiments_data = results.get("sentiments", {}).get("average", {})
-            sentiment = sentiments_data.get("sentiment", "neutral")
-            sentiment_score = sentiments_data.get("sentiment_score", 0)
-            
-            # ── Extract intents ─────────────────────────────────────────
-            intents_data = results.get("intents", {}).get("segments", [])
-            intents: list[str] = []
-            for seg in intents_data:
-                for intent in seg.get("intents", []):
-                    i = intent.get("intent", "")
-                    if i and i not in intents:
-                        intents.append(i)
-            
-            logger.info(
-                f"[DEEPGRAM_INTEL] "
-                f"topics={topics}, sentiment={sentiment}({sentiment_score:.2f}), "
-                f"intents={intents}"
-            )
-            
-            return {
-                "topics": topics,
-                "sentiment": sentiment,
-                "sentiment_score": sentiment_score,
-                "intents": intents,
-            }
-            
+            return response.json()
+
+        data = await guarded("deepgram", attempt, timeout=30.0)
+        
+        results = data.get("results", {})
+        
+        logger.debug(
+            "[DEEPGRAM_RAW] %s",
+            json.dumps(results, indent=2, default=str)[:4000]
+        )
+        
+        # ── Extract topics ──────────────────────────────────────────
+        topics_data = results.get("topics", {}).get("segments", [])
+        topics: list[str] = []
+        for seg in topics_data:
+            for topic in seg.get("topics", []):
+                t = topic.get("topic", "")
+                if t and t not in topics:
+                    topics.append(t)
+        
+        # ── Extract sentiment ───────────────────────────────────────
+        sentiments_data = results.get("sentiments", {}).get("average", {})
+        sentiment = sentiments_data.get("sentiment", "neutral")
+        sentiment_score = sentiments_data.get("sentiment_score", 0)
+        
+        # ── Extract intents ─────────────────────────────────────────
+        intents_data = results.get("intents", {}).get("segments", [])
+        intents: list[str] = []
+        for seg in intents_data:
+            for intent in seg.get("intents", []):
+                i = intent.get("intent", "")
+                if i and i not in intents:
+                    intents.append(i)
+        
+        logger.info(
+            f"[DEEPGRAM_INTEL] "
+            f"topics={topics}, sentiment={sentiment}({sentiment_score:.2f}), "
+            f"intents={intents}"
+        )
+        
+        return {
+            "topics": topics,
+            "sentiment": sentiment,
+            "sentiment_score": sentiment_score,
+            "intents": intents,
+        }
+        
     except Exception as e:
         logger.error(f"Deepgram text intelligence failed: {e}")
         return {}
@@ -356,7 +372,10 @@ Pick 2-3 short, memorable things {pname} actually said during the call — funny
     try:
         genai.configure(api_key=api_key)
         model = genai.GenerativeModel("gemini-3-flash-preview")
-        response = model.generate_content(prompt)
+        # generate_content blocks, so run it off the event loop under the breaker
+        response = await guarded(
+            "gemini", lambda: asyncio.to_thread(model.generate_content, prompt), timeout=25.0
+        )
         raw = response.text.strip().strip('"').strip("'").strip()
         
         # Parse out quotes if present
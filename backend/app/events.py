@@ -0,0 +1,121 @@
+"""
+Event Hub
+In-process pub/sub for dashboard events, streamed at /api/events (SSE).
+
+The dashboard used to poll /api/live-status and /api/alerts to notice a
+call starting or an alert firing. Producers now publish here instead:
+
+    call_started        TwilioBridge, once the media stream is registered
+    call_ended          TwilioBridge, when the stream stops (before post-call analysis)
+    pipeline_complete   TwilioCallSession.end(), after post-call analysis
+    alert_created       AlertEngine, once the saved alert is committed
+
+publish() is synchronous and never blocks a call: each subscriber has a
+bounded queue (SUBSCRIBER_QUEUE_SIZE) that drops its oldest event when a
+client falls behind. The last REPLAY_SIZE events are kept so a client
+reconnecting with Last-Event-ID picks up what it missed.
+
+The hub is per process; with several workers a client only hears events
+from the worker it is connected to.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime, UTC
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ("call_started", "call_ended", "pipeline_complete", "alert_created")
+SUBSCRIBER_QUEUE_SIZE = 100
+REPLAY_SIZE = 200
+
+
+class Subscription:
+    """One connected client, filtered to a set of patients"""
+
+    def __init__(self, patient_ids: Set[str], maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.patient_ids = patient_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def wants(self, event: dict) -> bool:
+        return event["patient_id"] in self.patient_ids
+
+    def offer(self, event: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Next event, or None after `timeout` seconds with nothing to send"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventHub:
+    """Fan-out of dashboard events to subscribed clients"""
+
+    def __init__(self, replay_size: int = REPLAY_SIZE):
+        self._subscribers: List[Subscription] = []
+        self._recent: deque = deque(maxlen=replay_size)
+        self._seq = 0
+        self.stats = {"published": 0, "delivered": 0}
+
+    def publish(self, event_type: str, patient_id: Optional[str], data: Optional[Dict[str, Any]] = None) -> Optional[dict]:
+        """Record an event and hand it to every matching subscriber"""
+        if not patient_id:
+            return None
+        self._seq += 1
+        event = {
+            "id": self._seq,
+            "type": event_type,
+            "patient_id": patient_id,
+            "timestamp": datetime.now(UTC).isoformat(),
+            "data": data or {},
+        }
+        self._recent.append(event)
+        self.stats["published"] += 1
+        for subscription in self._subscribers:
+            if subscription.wants(event):
+                subscription.offer(event)
+                self.stats["delivered"] += 1
+        return event
+
+    def subscribe(self, patient_ids: Iterable[str], last_event_id: Optional[int] = None) -> Subscription:
+        """Start receiving events for these patients, replaying any after last_event_id"""
+        subscription = Subscription(set(patient_ids))
+        if last_event_id is not None:
+            for event in self._recent:
+                if event["id"] > last_event_id and subscription.wants(event):
+                    subscription.offer(event)
+        self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+            if subscription.dropped:
+                logger.warning(f"[EVENTS] Subscriber fell behind, dropped {subscription.dropped} event(s)")
+
+    def metrics(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "last_event_id": self._seq,
+            "buffered": len(self._recent),
+            **self.stats,
+        }
+
+
+def format_sse(event: dict) -> str:
+    """One Server-Sent Events frame"""
+    payload = {k: event[k] for k in ("patient_id", "timestamp", "data")}
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(payload)}\n\n"
+
+
+event_hub = EventHub()
@@ -0,0 +1,185 @@
+"""
+Shared HTTP Client Registry
+One pooled httpx.AsyncClient per upstream, shared across the process.
+
+Created in the FastAPI lifespan (init_http_clients) and closed on
+shutdown (close_http_clients). Call sites ask for a client by upstream
+name instead of opening a throwaway client per request, so keep-alive
+connections (and their TLS sessions) are reused across calls.
+
+Each upstream is configured with:
+    base_url, timeout, connect_timeout, max_connections,
+    max_keepalive, keepalive_expiry, http2, follow_redirects
+
+HTTP/2 is only enabled when the optional `h2` package is installed
+(httpx[http2]); otherwise the client falls back to HTTP/1.1.
+
+Connection reuse is measured with httpcore's trace extension: every
+request is counted, and a request that had to open a TCP connection
+(and possibly a TLS handshake) is counted as a new connection.
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+DEFAULT_UPSTREAM = {
+    "base_url": "",
+    "timeout": 10.0,
+    "connect_timeout": 5.0,
+    "max_connections": 20,
+    "max_keepalive": 10,
+    "keepalive_expiry": 30.0,
+    "http2": False,
+    "follow_redirects": False,
+}
+
+UPSTREAMS = {
+    # Nostalgia + real-time search
+    "youcom": {"base_url": "https://ydc-index.io", "timeout": 15.0, "http2": True},
+    # Text intelligence (mid-call sentiment, post-call analysis)
+    "deepgram": {"base_url": "https://api.deepgram.com", "timeout": 30.0, "http2": True},
+    # Outbound call creation
+    "twilio": {"base_url": "https://api.twilio.com", "timeout": 30.0, "max_connections": 50},
+    # Internal REST fallbacks (SANITY_API_URL)
+    "internal": {"timeout": 10.0},
+    # Sanity content lake (the host is per project, so callers pass full URLs)
+    "sanity": {"timeout": 10.0, "max_connections": 20},
+    # Foxit PDF Services + Document Generation (host set by FOXIT_BASE_URL)
+    "foxit": {"timeout": 60.0, "max_connections": 5},
+}
+
+
+def _new_metrics() -> dict:
+    return {"requests": 0, "connections_opened": 0, "tls_handshakes": 0, "errors": 0}
+
+
+class HTTPClientRegistry:
+    """Lazily creates and owns one pooled AsyncClient per upstream."""
+
+    def __init__(self, config: Optional[dict] = None):
+        """
+        Args:
+            config: per-upstream overrides merged over UPSTREAMS, e.g.
+                    {"deepgram": {"max_connections": 5}}. An override may
+                    also carry a `transport` (used by tests).
+        """
+        self.config = {name: dict(cfg) for name, cfg in UPSTREAMS.items()}
+        for name, overrides in (config or {}).items():
+            self.config.setdefault(name, {}).update(overrides)
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._metrics: dict[str, dict] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the shared client for an upstream, creating it on first use."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name)
+            self._clients[name] = client
+        return client
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        cfg = {**DEFAULT_UPSTREAM, **self.config.get(name, {})}
+        http2 = bool(cfg["http2"]) and HAS_HTTP2
+        if cfg["http2"] and not HAS_HTTP2:
+            logger.info(f"[HTTP] {name}: h2 not installed, using HTTP/1.1")
+
+        metrics = self._metrics.setdefault(name, _new_metrics())
+
+        async def trace(event: str, info: dict) -> None:
+            if event == "connection.connect_tcp.complete":
+                metrics["connections_opened"] += 1
+            elif event == "connection.start_tls.complete":
+                metrics["tls_handshakes"] += 1
+
+        async def on_request(request: httpx.Request) -> None:
+            metrics["requests"] += 1
+            request.extensions["trace"] = trace
+
+        async def on_response(response: httpx.Response) -> None:
+            if response.status_code >= 500:
+                metrics["errors"] += 1
+
+        kwargs = {
+            "timeout": httpx.Timeout(cfg["timeout"], connect=cfg["connect_timeout"]),
+            "limits": httpx.Limits(
+                max_connections=cfg["max_connections"],
+                max_keepalive_connections=cfg["max_keepalive"],
+                keepalive_expiry=cfg["keepalive_expiry"],
+            ),
+            "http2": http2,
+            "follow_redirects": cfg["follow_redirects"],
+            "event_hooks": {"request": [on_request], "response": [on_response]},
+        }
+        if cfg["base_url"]:
+            kwargs["base_url"] = cfg["base_url"]
+        if cfg.get("transport") is not None:
+            kwargs["transport"] = cfg["transport"]
+
+        logger.info(
+            f"[HTTP] {name}: pool max={cfg['max_connections']} keepalive={cfg['max_keepalive']} "
+            f"timeout={cfg['timeout']}s http2={http2}"
+        )
+        return httpx.AsyncClient(**kwargs)
+
+    def metrics(self) -> dict:
+        """Per-upstream request / connection counters and reuse ratio."""
+        result = {}
+        for name, m in self._metrics.items():
+            reused = max(0, m["requests"] - m["connections_opened"])
+            result[name] = {
+                **m,
+                "reused_requests": reused,
+                "reuse_ratio": round(reused / m["requests"], 3) if m["requests"] else 0.0,
+                "open": name in self._clients and not self._clients[name].is_closed,
+            }
+        return result
+
+    async def aclose(self) -> None:
+        """Close every pooled client."""
+        for name, client in self._clients.items():
+            if not client.is_closed:
+                await client.aclose()
+                logger.info(f"[HTTP] {name}: closed")
+        self._clients.clear()
+
+
+_registry: Optional[HTTPClientRegistry] = None
+
+
+def init_http_clients(config: Optional[dict] = None) -> HTTPClientRegistry:
+    """Create the process-wide registry (called from the app lifespan)."""
+    global _registry
+    _registry = HTTPClientRegistry(config)
+    return _registry
+
+
+def get_http_registry() -> HTTPClientRegistry:
+    """The process-wide registry, created on demand outside the app lifespan (scripts, tests)."""
+    global _registry
+    if _registry is None:
+        _registry = HTTPClientRegistry()
+    return _registry
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """Shorthand for get_http_registry().get(name)."""
+    return get_http_registry().get(name)
+
+
+async def close_http_clients() -> None:
+    """Close all pooled clients and drop the registry (called on shutdown)."""
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
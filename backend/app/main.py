@@ -6,6 +6,8 @@ Main entry point for the backend server
 import logging
 import os
 from pathlib import Path
+from xml.sax.saxutils import escape
+from typing import Optional
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
@@ -17,7 +19,14 @@ from fastapi.responses import JSONResponse, Response
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-from .voice import twilio_bridge, session_manager, outbound_manager
+from .voice import twilio_bridge, session_manager, outbound_manager, prewarm_pool, call_scheduler
+from .voice.admission import admission
+from .voice.call_registry import call_registry
+from .voice.prompt_cache import prompt_cache
+from .nostalgia import YouComClient, era_cache, era_cache_warmer, era_knowledge_base, realtime_cache
+from .http_clients import init_http_clients, close_http_clients, get_http_registry
+from .resilience import breaker_states
+from .events import event_hub
 
 # Cognitive analysis and storage components
 from .storage import InMemoryDataStore, SanityDataStore
@@ -31,7 +40,8 @@ from .routes import (
     conversations_router,
     wellness_router,
     alerts_router,
-    live_status_router
+    live_status_router,
+    events_router
 )
 from .routes import patients, conversations, wellness, alerts
 
@@ -63,6 +73,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting ClaraCare backend...")
     
+    # Shared pooled HTTP clients (You.com, Deepgram, Twilio, internal APIs)
+    app.state.http_clients = init_http_clients()
+    
     # Initialize cognitive analysis components
     logger.info("Initializing cognitive analysis system...")
     
@@ -122,6 +135,18 @@ async def lifespan(app: FastAPI):
     
     # Set cognitive pipeline in Twilio bridge for real-time analysis
     twilio_bridge.set_cognitive_pipeline(cognitive_pipeline)
+    prewarm_pool.set_cognitive_pipeline(cognitive_pipeline)
+    
+    # Precompute nostalgia era content for the roster (startup, then nightly)
+    era_cache_warmer.start(data_store, YouComClient())
+    
+    # Publish this node's calls to the (possibly shared) call registry
+    call_registry.start(lambda: list(twilio_bridge.active_calls), twilio_bridge.handle_registry_command)
+    
+    # Daily check-in calls at each patient's preferred local time (opt-in)
+    call_scheduler.load()
+    if os.getenv("CALL_SCHEDULER_ENABLED", "false").lower() == "true":
+        call_scheduler.start(data_store, outbound_manager.call_patient_when_idle)
     
     logger.info("Cognitive analysis system initialized ✓")
     
@@ -133,6 +158,13 @@ async def lifespan(app: FastAPI):
     # Cleanup Sanity client if using SanityDataStore
     if isinstance(data_store, SanityDataStore):
         await data_store.close()
+    
+    await era_cache_warmer.stop()
+    await call_scheduler.stop()
+    await outbound_manager.bulk_dialer.close()
+    await call_registry.close()
+    await prewarm_pool.close_all()
+    await close_http_clients()
 
 
 # Create FastAPI app
@@ -158,6 +190,7 @@ app.include_router(conversations_router)
 app.include_router(wellness_router)
 app.include_router(alerts_router)
 app.include_router(live_status_router)
+app.include_router(events_router)
 
 # Register data routes if available
 if HAS_DATA_ROUTES:
@@ -182,10 +215,21 @@ async def health_check():
     return {
         "status": "healthy",
         "active_calls": twilio_bridge.get_active_call_count(),
-        "active_sessions": len(session_manager.sessions)
+        "active_sessions": len(session_manager.sessions),
+        "capacity": admission.utilization()
     }
 
 
+@app.get("/capacity")
+async def capacity():
+    """
+    Call capacity and utilization of this worker (for autoscaling / routing)
+    Returns 503 while saturated so a load balancer can stop sending new calls.
+    """
+    utilization = admission.utilization()
+    return JSONResponse(status_code=503 if utilization["saturated"] else 200, content=utilization)
+
+
 @app.get("/dev/status")
 async def dev_status():
     """
@@ -209,20 +253,33 @@ async def dev_status():
     # Check cognitive pipeline
     pipeline_ready = twilio_bridge.cognitive_pipeline is not None
     
-    # Active call details
+    # Active call details: live calls on every node come from the call
+    # registry; session internals are only available for this worker's calls
+    from datetime import datetime, UTC
     active_calls = []
-    for call_sid, session in twilio_bridge.active_calls.items():
-        duration = 0
-        if session.call_start_time:
-            from datetime import datetime, UTC
-            duration = int((datetime.now(UTC) - session.call_start_time).total_seconds())
-        active_calls.append({
-            "call_sid": call_sid,
-            "patient_id": session.patient_id,
-            "is_active": session.is_active,
-            "duration_sec": duration,
-            "transcript_turns": len(session.conversation_transcript),
-        })
+    for record in await call_registry.list_calls():
+        session = twilio_bridge.active_calls.get(record["call_sid"])
+        call = {
+            "call_sid": record["call_sid"],
+            "patient_id": record["patient_id"],
+            "node_id": record["node_id"],
+            "started_at": record.get("started_at"),
+            "local": session is not None,
+        }
+        if session:
+            duration = 0
+            if session.call_start_time:
+                duration = int((datetime.now(UTC) - session.call_start_time).total_seconds())
+            call.update({
+                "is_active": session.is_active,
+                "duration_sec": duration,
+                "transcript_turns": len(session.conversation_transcript),
+                "audio_relay": session.relay_metrics(),
+                "time_to_greeting_ms": session.time_to_greeting_ms,
+                "functions": session.deepgram_agent.function_dispatcher.metrics() if session.deepgram_agent else {},
+                "prefetch": session.deepgram_agent.function_handler.prefetch_metrics() if session.deepgram_agent else {},
+            })
+        active_calls.append(call)
     
     return {
         "system": "claracare-backend",
@@ -240,23 +297,66 @@ async def dev_status():
                 "ready": pipeline_ready,
             },
         },
+        "http_clients": get_http_registry().metrics(),
+        "breakers": breaker_states(),
+        "prewarm": prewarm_pool.metrics(),
+        "prompt_cache": prompt_cache.metrics(),
+        "era_cache": {**era_cache.metrics(), "last_warm": era_cache_warmer.last_run},
+        "era_kb": era_knowledge_base.metrics(),
+        "realtime_cache": realtime_cache.metrics(),
+        "admission": admission.utilization(),
+        "call_registry": await call_registry.metrics(),
+        "events": event_hub.metrics(),
+        "scheduler": {**call_scheduler.metrics(), "dial_rate": outbound_manager.dial_limiter.metrics()},
         "calls": {
-            "active_count": twilio_bridge.get_active_call_count(),
+            "active_count": len(active_calls),
+            "local_count": twilio_bridge.get_active_call_count(),
             "agent_sessions": len(session_manager.sessions),
             "active_calls": active_calls,
         },
     }
 
 
+def overflow_twiml(patient_id: str) -> str:
+    """TwiML for a call this worker can't take: redirect to CALL_OVERFLOW_URL, or apologize and hang up"""
+    overflow_url = os.getenv("CALL_OVERFLOW_URL")
+    if overflow_url:
+        separator = "&" if "?" in overflow_url else "?"
+        return f'''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Redirect method="GET">{escape(f"{overflow_url}{separator}patient_id={patient_id}")}</Redirect>
+</Response>'''
+    return '''<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Say>Hello, this is Clara. I'm not able to chat just this minute, but I'll call you back very soon.</Say>
+    <Hangup/>
+</Response>'''
+
+
 @app.get("/voice/twiml")
-async def twiml_handler(patient_id: str = "demo-patient"):
+async def twiml_handler(patient_id: str = "demo-patient", CallSid: Optional[str] = None):
     """
     TwiML endpoint for outbound calls
     Returns TwiML that connects the call to our WebSocket
     
     Query params:
         patient_id: Patient identifier
+        CallSid: Added by Twilio when it fetches the TwiML
     """
+    # Turn the call away before any audio flows if this worker is full. Only
+    # a real CallSid reserves a slot: nothing would ever release one keyed on
+    # a made-up id, and the stream's own admission check still applies.
+    admitted = admission.try_admit(CallSid) if CallSid else not admission.saturated
+    if not admitted:
+        await prewarm_pool.cancel(patient_id)
+        if CallSid:
+            call_scheduler.on_call_status(CallSid, "busy")  # retry scheduled check-ins later
+        return Response(content=overflow_twiml(patient_id), media_type="application/xml")
+    
+    # The stream connects right after this response; warm the agent now
+    # (no-op if the dial already started one)
+    prewarm_pool.prewarm(patient_id, CallSid)
+    
     server_url = os.getenv("SERVER_PUBLIC_URL", "http://localhost:8000")
     
     # Strip protocol to get hostname for WSS URL
@@ -294,6 +394,10 @@ async def call_status_callback(request: Request):
         f"from={from_number} to={to_number}"
     )
     
+    # Unanswered scheduled check-ins are retried
+    if call_sid and call_status:
+        call_scheduler.on_call_status(call_sid, call_status)
+    
     return {"status": "received"}
 
 
@@ -323,13 +427,20 @@ async def end_call(call_sid: str):
     
     Args:
         call_sid: Twilio call SID
+    
+    Calls running on another node are ended by that node (202).
     """
     try:
-        await twilio_bridge.end_call(call_sid)
-        return {"message": f"Call {call_sid} ended"}
+        outcome = await twilio_bridge.end_call(call_sid)
     except Exception as e:
         logger.error(f"Error ending call: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if outcome == "not_found":
+        raise HTTPException(status_code=404, detail=f"No active call {call_sid}")
+    if outcome == "routed":
+        return JSONResponse(status_code=202, content={"message": f"End of call {call_sid} sent to its node"})
+    return {"message": f"Call {call_sid} ended"}
 
 
 @app.post("/voice/call/patient")
@@ -381,6 +492,9 @@ async def trigger_daily_checkins():
     1. Fetch patient list from Sanity
     2. Filter patients who need check-ins today
     3. Initiate calls to each patient
+    
+    Dialing runs in the background; returns a job handle to poll at
+    GET /voice/call/jobs/{job_id}.
     """
     # Example patient list (in production, fetch from Sanity)
     demo_patients = [
@@ -393,21 +507,41 @@ async def trigger_daily_checkins():
     
     logger.info("Triggering daily check-ins...")
     
-    result = await outbound_manager.call_multiple_patients(demo_patients)
+    job = outbound_manager.bulk_dialer.start(demo_patients)
     
-    return result
+    return JSONResponse(
+        status_code=202,
+        content={**job.progress(), "status_url": f"/voice/call/jobs/{job.id}"},
+    )
+
+
+@app.get("/voice/call/jobs/{job_id}")
+async def get_bulk_call_job(job_id: str, since: int = 0):
+    """
+    Progress of a batch call job
+    
+    Query params:
+        since: Only return per-patient results from this index on
+               (pass the previous response's "next")
+    """
+    job = outbound_manager.bulk_dialer.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown call job {job_id}")
+    return job.progress(since=max(since, 0))
 
 
 @app.get("/voice/calls")
 async def list_active_calls():
-    """List all active calls"""
+    """List all active calls (on every node sharing the call registry)"""
     calls = []
-    for call_sid, session in twilio_bridge.active_calls.items():
+    for record in await call_registry.list_calls():
+        session = twilio_bridge.active_calls.get(record["call_sid"])
         calls.append({
-            "call_sid": call_sid,
-            "patient_id": session.patient_id,
-            "is_active": session.is_active,
-            "stream_sid": session.twilio_stream.stream_sid
+            "call_sid": record["call_sid"],
+            "patient_id": record["patient_id"],
+            "node_id": record["node_id"],
+            "is_active": session.is_active if session else True,
+            "stream_sid": session.twilio_stream.stream_sid if session else None
         })
     
     return {
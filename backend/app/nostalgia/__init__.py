@@ -5,10 +5,21 @@ Provides era-specific content to engage elderly patients
 
 from .era import calculate_golden_years, get_era_label, get_decade_from_year
 from .youcom_client import YouComClient
+from .era_cache import EraContentCache, era_cache, warm_era_cache, era_cache_warmer
+from .era_kb import EraKnowledgeBase, era_knowledge_base
+from .realtime_cache import RealtimeQueryCache, realtime_cache
 
 __all__ = [
     "calculate_golden_years",
     "get_era_label",
     "get_decade_from_year",
-    "YouComClient"
+    "YouComClient",
+    "EraContentCache",
+    "era_cache",
+    "warm_era_cache",
+    "era_cache_warmer",
+    "EraKnowledgeBase",
+    "era_knowledge_base",
+    "RealtimeQueryCache",
+    "realtime_cache"
 ]
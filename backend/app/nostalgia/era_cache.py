@@ -0,0 +1,201 @@
+"""
+Nostalgia Mode - Era Content Cache
+Shares You.com era content across patients and restarts.
+
+Nostalgia content depends only on the golden-years window, so every
+patient born in the same year gets the same answer. Live results are
+cached by era ("1966-1976") with a TTL and written to a JSON file so a
+restart doesn't empty the cache. Concurrent misses for the same era
+share one fetch.
+
+A nightly warm job (EraCacheWarmer) refreshes the era of every birth
+year in the patient roster, so mid-call lookups are served from memory.
+
+Configuration:
+    ERA_CACHE_PATH      JSON file (default: backend/.cache/era_content.json)
+    ERA_CACHE_TTL_DAYS  entry lifetime (default: 7)
+    ERA_WARM_HOUR_UTC   hour the nightly warm runs (default: 3)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "era_content.json"
+DEFAULT_TTL_SEC = float(os.getenv("ERA_CACHE_TTL_DAYS", "7")) * 86400
+REFRESH_WITHIN_SEC = 86400  # the warm job refreshes entries expiring within a day
+
+
+def era_key(year_start: int, year_end: int) -> str:
+    return f"{year_start}-{year_end}"
+
+
+class EraContentCache:
+    """Era-keyed nostalgia content with TTL, single-flight fills and a JSON file behind it"""
+
+    def __init__(self, path: Optional[Path] = None, ttl: float = DEFAULT_TTL_SEC):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self._entries: Optional[Dict[str, dict]] = None
+        self._flight = SingleFlight()
+        self.stats = {"hits": 0, "misses": 0, "fills": 0, "shared_fills": 0}
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path and self.path.exists():
+                try:
+                    self._entries = json.loads(self.path.read_text())
+                    logger.info(f"[ERA_CACHE] Loaded {len(self._entries)} era(s) from {self.path}")
+                except (OSError, ValueError) as e:
+                    logger.warning(f"[ERA_CACHE] Ignoring unreadable cache file {self.path}: {e}")
+        return self._entries
+
+    def _persist(self) -> None:
+        if not self.path:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._entries))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"[ERA_CACHE] Could not write {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[dict]:
+        """Fresh cached content for an era, or None"""
+        entry = self._load().get(key)
+        if entry and time.time() - entry["fetched_at"] < self.ttl:
+            return entry["content"]
+        return None
+
+    def expires_in(self, key: str) -> float:
+        """Seconds until an era's entry expires (<= 0 when missing or stale)"""
+        entry = self._load().get(key)
+        return entry["fetched_at"] + self.ttl - time.time() if entry else 0.0
+
+    def put(self, key: str, content: dict) -> None:
+        self._load()[key] = {"content": content, "fetched_at": time.time()}
+        self._persist()
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[dict]],
+        cacheable: Callable[[dict], bool] = lambda content: True,
+        refresh: bool = False,
+    ) -> dict:
+        """
+        Cached content for `key`, fetching on a miss (or when `refresh`).
+        Concurrent callers for the same key share one fetch, which finishes
+        (and fills the cache) even if the callers are cancelled; results that
+        are not `cacheable` (e.g. fallback content) are returned but not stored.
+        """
+        if not refresh:
+            content = self.get(key)
+            if content is not None:
+                self.stats["hits"] += 1
+                return content
+            self.stats["misses"] += 1
+
+        if self._flight.in_flight(key):
+            self.stats["shared_fills"] += 1
+
+        async def fill() -> dict:
+            content = await fetch()
+            if cacheable(content):
+                self.put(key, content)
+                self.stats["fills"] += 1
+            return content
+
+        return await self._flight.run(key, fill)
+
+    def metrics(self) -> dict:
+        entries = self._load()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "eras": len(entries),
+            "fresh": sum(1 for key in entries if self.get(key) is not None),
+            **self.stats,
+            "hit_ratio": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+era_cache = EraContentCache(Path(os.getenv("ERA_CACHE_PATH", str(DEFAULT_CACHE_PATH))))
+
+
+async def warm_era_cache(data_store, client, cache: Optional[EraContentCache] = None) -> Dict[str, Any]:
+    """
+    Refresh era content for every birth year in the roster that is missing
+    or expires within a day. Returns a summary for logging.
+    """
+    from .era import calculate_golden_years
+
+    cache = cache or era_cache
+    years = await data_store.get_patient_birth_years()
+    eras = {era_key(*calculate_golden_years(year)): year for year in years}
+    refreshed, failed = 0, 0
+    for key, birth_year in sorted(eras.items()):
+        if cache.expires_in(key) > REFRESH_WITHIN_SEC:
+            continue
+        try:
+            await client.search_nostalgia(birth_year=birth_year, refresh=True)
+            refreshed += 1
+        except Exception as e:
+            failed += 1
+            logger.warning(f"[ERA_WARM] {key} failed: {e}")
+    summary = {"birth_years": len(years), "eras": len(eras), "refreshed": refreshed, "failed": failed}
+    logger.info(f"[ERA_WARM] {summary}")
+    return summary
+
+
+class EraCacheWarmer:
+    """Runs warm_era_cache once at startup and then nightly at ERA_WARM_HOUR_UTC"""
+
+    def __init__(self, hour_utc: Optional[int] = None):
+        self.hour_utc = int(os.getenv("ERA_WARM_HOUR_UTC", "3")) if hour_utc is None else hour_utc
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[dict] = None
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now(UTC)
+        run_at = now.replace(hour=self.hour_utc, minute=0, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return (run_at - now).total_seconds()
+
+    def start(self, data_store, client) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(data_store, client))
+
+    async def _run(self, data_store, client) -> None:
+        while True:
+            try:
+                self.last_run = {
+                    **await warm_era_cache(data_store, client),
+                    "at": datetime.now(UTC).isoformat(),
+                }
+            except Exception as e:
+                logger.error(f"[ERA_WARM] Warm run failed: {e}")
+            await asyncio.sleep(self.seconds_until_next_run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+era_cache_warmer = EraCacheWarmer()
@@ -0,0 +1,166 @@
+"""
+Nostalgia Mode - Era Knowledge Base
+Local, versioned music/events/culture per year, served without the network.
+
+The curated source is data/era_kb.json (edit this one, bump "version").
+It is compiled into data/era_kb.sqlite: one row per item, indexed on
+(kind, year), plus a meta table holding the version. The compiled file
+ships with the app and is opened read-only. When it is missing or out of
+date, the JSON is compiled into an in-memory database at startup instead.
+
+Rebuild after editing the JSON:
+    python -m app.nostalgia.era_kb
+"""
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+KB_SOURCE = DATA_DIR / "era_kb.json"
+KB_PATH = DATA_DIR / "era_kb.sqlite"
+
+MAX_ITEMS = 5
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE items (
+    kind TEXT NOT NULL,      -- 'music' | 'event' | 'culture' (culture rows are keyed by decade)
+    year INTEGER NOT NULL,
+    rank INTEGER NOT NULL,   -- 0 = most representative for that year
+    text TEXT NOT NULL
+);
+CREATE INDEX items_kind_year ON items (kind, year, rank);
+"""
+
+
+def _load_source(source: Path) -> dict:
+    return json.loads(Path(source).read_text(encoding="utf-8"))
+
+
+def _populate(conn: sqlite3.Connection, data: dict) -> None:
+    conn.executescript(_SCHEMA)
+    conn.execute("INSERT INTO meta VALUES ('version', ?)", (str(data["version"]),))
+    rows = []
+    for year, entry in data["years"].items():
+        for kind, key in (("music", "music"), ("event", "events")):
+            rows.extend((kind, int(year), rank, text) for rank, text in enumerate(entry.get(key, [])))
+    rows.extend(("culture", int(decade), 0, text) for decade, text in data["decades"].items())
+    conn.executemany("INSERT INTO items VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+
+
+def build_era_kb(source: Path = KB_SOURCE, dest: Path = KB_PATH) -> int:
+    """Compile the JSON source into the shipped SQLite file. Returns its version."""
+    data = _load_source(source)
+    dest = Path(dest)
+    tmp = dest.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp)
+    try:
+        _populate(conn, data)
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    tmp.replace(dest)
+    return int(data["version"])
+
+
+def _spread(items: List[str], limit: int) -> List[str]:
+    """Up to `limit` items evenly spaced across a year-ordered list"""
+    if len(items) <= limit:
+        return items
+    step = (len(items) - 1) / (limit - 1) if limit > 1 else 0
+    return [items[round(i * step)] for i in range(limit)]
+
+
+class EraKnowledgeBase:
+    """Read-only lookups of era content from the compiled knowledge base"""
+
+    def __init__(self, path: Path = KB_PATH, source: Path = KB_SOURCE):
+        self.path = Path(path)
+        self.source = Path(source)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._eras: Dict[Tuple[int, int], Optional[dict]] = {}
+        self.version: Optional[int] = None
+        self.stats = {"lookups": 0, "hits": 0}
+
+    def _open(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        expected = _load_source(self.source)["version"] if self.source.exists() else None
+        try:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+            version = int(conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0])
+            if expected is not None and version != expected:
+                conn.close()
+                raise sqlite3.DatabaseError(f"version {version}, source is {expected}")
+        except sqlite3.Error as e:
+            if expected is None:
+                raise
+            logger.warning(f"[ERA_KB] {self.path.name} unusable ({e}); compiling {self.source.name} in memory")
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            _populate(conn, _load_source(self.source))
+            version = expected
+        self._conn, self.version = conn, version
+        logger.info(f"[ERA_KB] Loaded era knowledge base v{version}")
+        return conn
+
+    def _texts(self, kind: str, year_start: int, year_end: int) -> List[str]:
+        rows = self._open().execute(
+            "SELECT text FROM items WHERE kind = ? AND year BETWEEN ? AND ? ORDER BY rank, year",
+            (kind, year_start, year_end),
+        ).fetchall()
+        return [text for (text,) in rows]
+
+    def lookup(self, year_start: int, year_end: int, limit: int = MAX_ITEMS) -> Optional[Dict[str, Any]]:
+        """
+        Era content for a golden-years window, or None when the knowledge
+        base has nothing for it. Results are memoized per era.
+        """
+        self.stats["lookups"] += 1
+        key = (year_start, year_end)
+        if key not in self._eras:
+            self._eras[key] = self._query(year_start, year_end, limit)
+        content = self._eras[key]
+        if content is None:
+            return None
+        self.stats["hits"] += 1
+        return {**content, "music": list(content["music"]), "events": list(content["events"])}
+
+    def _query(self, year_start: int, year_end: int, limit: int) -> Optional[Dict[str, Any]]:
+        try:
+            # Rank-0 items first so each year gets its signature song/event
+            # before any year gets a second one
+            music = self._texts("music", year_start, year_end)
+            events = self._texts("event", year_start, year_end)
+            culture = self._texts("culture", year_start - year_start % 10, year_end)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.error(f"[ERA_KB] Lookup failed for {year_start}-{year_end}: {e}")
+            return None
+        if not music and not events:
+            return None
+        years = year_end - year_start + 1
+        return {
+            "music": _spread(music[:years], limit),
+            "events": _spread(events[:years], limit),
+            "culture": "; ".join(culture) or f"Popular culture from {year_start}-{year_end}",
+            "era": f"{year_start}-{year_end}",
+            "sources": ["era_kb"],
+        }
+
+    def metrics(self) -> dict:
+        return {"version": self.version, "eras": len(self._eras), **self.stats}
+
+
+era_knowledge_base = EraKnowledgeBase()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    version = build_era_kb()
+    logger.info(f"[ERA_KB] Wrote {KB_PATH} (v{version})")
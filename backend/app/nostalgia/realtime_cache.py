@@ -0,0 +1,134 @@
+"""
+Real-time Q&A - Query Cache
+Collapses repeated search_realtime questions across all live calls.
+
+A morning burst of scheduled calls asks the same handful of things
+("what's the weather today?", "any news?", "did the Cubs win?"). Queries
+are normalized (case, punctuation, filler words) into a cache key and
+classified into a category whose TTL matches how quickly the answer goes
+stale. Concurrent identical queries share one upstream request. Fallback
+answers are never cached.
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from .single_flight import SingleFlight
+
+# (category, TTL seconds, keyword pattern), first match wins
+CATEGORIES: Tuple[Tuple[str, float, re.Pattern], ...] = (
+    ("sports", 5 * 60, re.compile(r"\b(score|scores|game|games|match|won|win|lose|lost|playoffs?|innings?|season|league)\b")),
+    ("markets", 5 * 60, re.compile(r"\b(stocks?|market|dow|nasdaq|price|prices)\b")),
+    ("weather", 20 * 60, re.compile(r"\b(weather|forecast|temperature|rain|raining|snow|snowing|sunny|storm|humid|cold|hot|wind)\b")),
+    ("news", 20 * 60, re.compile(r"\b(news|headlines?|latest|happening|today|tonight|yesterday|this week)\b")),
+)
+DEFAULT_CATEGORY = ("general", 12 * 3600)
+
+_FILLER = frozenset({
+    "a", "an", "the", "please", "hey", "clara", "um", "uh", "oh", "well",
+    "can", "could", "would", "you", "tell", "me", "find", "look", "up", "search", "for",
+    "i", "wonder", "know", "do", "let", "like", "what", "is", "are",
+})
+_CONTRACTIONS = (("what's", "what is"), ("how's", "how is"), ("who's", "who is"), ("it's", "it is"))
+
+MAX_ENTRIES = 500
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a question: lowercase, no punctuation or filler words"""
+    text = query.lower().replace("’", "'")
+    for short, full in _CONTRACTIONS:
+        text = text.replace(short, full)
+    words = re.findall(r"[a-z0-9]+", text)
+    kept = [w for w in words if w not in _FILLER]
+    return " ".join(kept or words)
+
+
+def classify_query(normalized: str) -> Tuple[str, float]:
+    """(category, ttl_seconds) for a normalized query"""
+    for category, ttl, pattern in CATEGORIES:
+        if pattern.search(normalized):
+            return category, ttl
+    return DEFAULT_CATEGORY
+
+
+class RealtimeQueryCache:
+    """Normalized-query cache with per-category TTLs, LRU bound and single-flight fills"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, category: str, field: str) -> None:
+        stats = self._stats.setdefault(category, {"hits": 0, "shared": 0, "upstream": 0})
+        stats[field] += 1
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: dict, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(
+        self,
+        query: str,
+        fetch: Callable[[], Awaitable[dict]],
+        cacheable: Callable[[dict], bool] = lambda result: True,
+    ) -> dict:
+        key = normalize_query(query)
+        category, ttl = classify_query(key)
+
+        result = self.get(key)
+        if result is not None:
+            self._count(category, "hits")
+            return result
+
+        self._count(category, "shared" if self._flight.in_flight(key) else "upstream")
+
+        async def fill() -> dict:
+            result = await fetch()
+            if cacheable(result):
+                self.put(key, result, ttl)
+            return result
+
+        return await self._flight.run(key, fill)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def metrics(self) -> dict:
+        def ratio(s: Dict[str, int]) -> float:
+            asked = s["hits"] + s["shared"] + s["upstream"]
+            return round((s["hits"] + s["shared"]) / asked, 3) if asked else 0.0
+
+        totals = {"hits": 0, "shared": 0, "upstream": 0}
+        for s in self._stats.values():
+            for field in totals:
+                totals[field] += s[field]
+        return {
+            "entries": len(self._entries),
+            **totals,
+            "hit_ratio": ratio(totals),
+            "by_category": {
+                category: {**s, "hit_ratio": ratio(s)} for category, s in sorted(self._stats.items())
+            },
+        }
+
+
+realtime_cache = RealtimeQueryCache()
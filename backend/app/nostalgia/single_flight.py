@@ -0,0 +1,41 @@
+"""
+Single-flight fetches shared by the nostalgia caches.
+
+Concurrent misses for one key share a single fetch. The fetch runs as a
+task owned by the cache and every caller (including the one that started
+it) waits through asyncio.shield, so a caller that is cancelled (a patient
+hanging up) only stops its own wait: the others still get the result, and
+if nobody is left waiting the task finishes and fills the cache anyway.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """At most one running fetch per key"""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._tasks
+
+    async def run(self, key: str, fill: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of the running fill for `key`, starting `fill()` if none is running"""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(fill())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Retrieved here so a fill nobody waited for doesn't warn at GC
+            logger.debug(f"[SINGLE_FLIGHT] {key} failed: {task.exception()}")
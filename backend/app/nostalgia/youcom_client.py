@@ -14,13 +14,53 @@ API Features:
 - Perfect for grounding models in real-time data
 """
 
+import asyncio
 import logging
 import os
 from typing import Optional, Dict, Any, List
 import httpx
 
+from app.http_clients import get_http_client
+from app.resilience import guarded
+from .era_cache import EraContentCache, era_cache, era_key
+from .era_kb import EraKnowledgeBase, era_knowledge_base, MAX_ITEMS
+from .realtime_cache import RealtimeQueryCache, realtime_cache
+
 logger = logging.getLogger(__name__)
 
+# How long search_nostalgia waits for live results to merge into the local
+# knowledge-base content; slower fetches finish in the background and fill
+# the era cache for the next caller.
+LIVE_DEADLINE_SEC = float(os.getenv("NOSTALGIA_LIVE_DEADLINE_MS", "300")) / 1000
+
+LIVE_PLACEHOLDERS = frozenset({"Classic hits from the era", "Historical events from the time"})
+
+# Live fetches that outlived the deadline
+_late_fetches: set[asyncio.Future] = set()
+
+
+def _merge_items(local: List[str], live: List[str], limit: int) -> List[str]:
+    """Local items first, then new live items, de-duplicated case-insensitively"""
+    merged, seen = [], set()
+    for item in local + [i for i in live if i not in LIVE_PLACEHOLDERS]:
+        key = item.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            merged.append(item)
+    return merged[:limit]
+
+
+def merge_era_content(local: Dict[str, Any], live: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Knowledge-base content enriched with live You.com results (fallback content is ignored)"""
+    if not live or "_note" in live:
+        return local
+    return {
+        **local,
+        "music": _merge_items(local["music"], live.get("music", []), MAX_ITEMS + 3),
+        "events": _merge_items(local["events"], live.get("events", []), MAX_ITEMS + 3),
+        "sources": local["sources"] + ["youcom"],
+    }
+
 
 class YouComClient:
     """
@@ -33,44 +73,62 @@ class YouComClient:
     Get your API key: https://you.com/platform (free $100 credits)
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[EraContentCache] = None,
+        knowledge_base: Optional[EraKnowledgeBase] = None,
+        live_deadline: float = LIVE_DEADLINE_SEC,
+        query_cache: Optional[RealtimeQueryCache] = None,
+    ):
         """
         Initialize You.com Search API client
         
         Args:
             api_key: You.com API key (or from YOUCOM_API_KEY env var)
                     Sign up at https://you.com/platform for $100 free credits
+            cache: Era content cache (defaults to the shared, disk-backed one)
+            knowledge_base: Local era knowledge base (defaults to the shipped one)
+            live_deadline: Seconds to wait for live results before answering locally
+            query_cache: search_realtime cache (defaults to the process-wide one)
         """
         self.api_key = api_key or os.getenv("YOUCOM_API_KEY")
+        self.cache = cache or era_cache
+        self.knowledge_base = knowledge_base or era_knowledge_base
+        self.live_deadline = live_deadline
+        self.query_cache = query_cache or realtime_cache
         # You.com Search API — official base URL per docs: https://ydc-index.io
         # If 403, likely expired API key or exhausted credits.
         self.base_url = "https://ydc-index.io"
         
+        # Requests go through the shared "youcom" pool (app.http_clients);
+        # the API key is sent per request rather than baked into the client.
+        self._headers = {"X-API-Key": self.api_key} if self.api_key else {}
+        
         if self.api_key:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                headers={"X-API-Key": self.api_key},
-                timeout=15.0,
-                follow_redirects=False,  # Prevent redirect stripping auth headers
-            )
             logger.info("✓ YouComClient initialized with API key")
         else:
-            self._client = None
             logger.warning("⚠ YouComClient: No API key - using fallback responses (Get key: https://you.com/platform)")
     
     async def search_nostalgia(
         self,
         birth_year: Optional[int] = None,
-        trigger_reason: str = "general"
+        trigger_reason: str = "general",
+        refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Search for era-specific nostalgic content from patient's golden years
         
         Golden years = ages 15-25 (formative years with strongest memories)
+        Content comes from the local era knowledge base first; live You.com
+        results are merged in when they arrive within `live_deadline`.
+        Live results are shared across patients through the era cache;
+        fallback content is never cached.
         
         Args:
             birth_year: Patient's birth year (e.g., 1951)
             trigger_reason: Why nostalgia was triggered (e.g., "feeling lonely", "reminiscing")
+            refresh: Bypass the cache and re-fetch live content only (nightly warm job)
         
         Returns:
             Dict with nostalgic content:
@@ -78,7 +136,8 @@ class YouComClient:
                 "music": ["Song 1", "Song 2", ...],
                 "events": ["Historical event 1", ...],
                 "culture": "Cultural summary",
-                "era": "1966-1976"
+                "era": "1966-1976",
+                "sources": ["era_kb", "youcom"]
             }
         """
         # Calculate golden years (ages 15-25)
@@ -89,20 +148,42 @@ class YouComClient:
             # Default to 1960s if no birth year
             year_start, year_end = 1965, 1975
         
+        live = self.cache.get_or_fetch(
+            era_key(year_start, year_end),
+            lambda: self._fetch_era_content(year_start, year_end),
+            cacheable=lambda content: "_note" not in content,
+            refresh=refresh,
+        )
+        local = None if refresh else self.knowledge_base.lookup(year_start, year_end)
+        if local is None:
+            return await live
+        if not self._client:
+            live.close()
+            return local
+        return merge_era_content(local, await self._within_deadline(live))
+    
+    async def _within_deadline(self, live) -> Optional[Dict[str, Any]]:
+        """Live content if it arrives within the deadline; otherwise let it finish in the background"""
+        task = asyncio.ensure_future(live)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.live_deadline)
+        except asyncio.TimeoutError:
+            logger.info(f"[NOSTALGIA] Live results missed the {self.live_deadline * 1000:.0f}ms deadline; answering from the knowledge base")
+            _late_fetches.add(task)
+            task.add_done_callback(_late_fetches.discard)
+            return None
+    
+    async def _fetch_era_content(self, year_start: int, year_end: int) -> Dict[str, Any]:
+        """Live era content from You.com, or local fallback content"""
         if not self._client:
             return self._fallback_nostalgia_content(year_start, year_end)
         
         try:
-            # Search for era-specific music
-            music_results = await self._search_era_content(
-                f"popular music hits {year_start}-{year_end}",
-                count=5
-            )
-            
-            # Search for era events
-            events_results = await self._search_era_content(
-                f"major events news {year_start}-{year_end}",
-                count=5
+            # Era music and events searches run concurrently; either failing
+            # (or the You.com breaker being open) falls back to local content
+            music_results, events_results = await asyncio.gather(
+                self._search_era_content(f"popular music hits {year_start}-{year_end}", count=5),
+                self._search_era_content(f"major events news {year_start}-{year_end}", count=5),
             )
             
             # Combine results
@@ -123,46 +204,55 @@ class YouComClient:
             logger.error(f"Unexpected error in You.com search: {e}")
             return self._fallback_nostalgia_content(year_start, year_end)
     
+    async def _search(self, query: str) -> httpx.Response:
+        """GET /v1/search through the You.com breaker (hedged: it's a read)"""
+        async def attempt() -> httpx.Response:
+            response = await self._client.get(
+                "/v1/search",
+                params={"query": query},
+                headers=self._headers,
+            )
+            if response.status_code >= 500:
+                response.raise_for_status()
+            return response
+        
+        return await guarded("youcom", attempt, timeout=15.0, idempotent=True)
+    
     async def _search_era_content(self, query: str, count: int = 5) -> List[Dict[str, Any]]:
         """
         Internal helper for era-specific searches
         
         Uses You.com Search API v1: GET /v1/search
+        Errors propagate so search_nostalgia can fall back as a whole.
         """
-        try:
-            response = await self._client.get(
-                "/v1/search",
-                params={"query": query}
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await self._search(query)
+        response.raise_for_status()
+        data = response.json()
 
-            # /v1/search returns {results: {web: [{url, title, description, snippets}]}}
-            # Handle both the nested dict shape and any legacy flat-list shape.
-            raw = data.get("results", {})
-            web_list = raw.get("web", []) if isinstance(raw, dict) else raw
+        # /v1/search returns {results: {web: [{url, title, description, snippets}]}}
+        # Handle both the nested dict shape and any legacy flat-list shape.
+        raw = data.get("results", {})
+        web_list = raw.get("web", []) if isinstance(raw, dict) else raw
 
-            results = []
-            for result in web_list[:count]:
-                results.append({
-                    "title": result.get("title", ""),
-                    "snippet": result.get("description", "") or (
-                        result.get("snippets", [""])[0] if result.get("snippets") else ""
-                    ),
-                    "url": result.get("url", "")
-                })
+        results = []
+        for result in web_list[:count]:
+            results.append({
+                "title": result.get("title", ""),
+                "snippet": result.get("description", "") or (
+                    result.get("snippets", [""])[0] if result.get("snippets") else ""
+                ),
+                "url": result.get("url", "")
+            })
 
-            return results
-            
-        except Exception as e:
-            logger.warning(f"Era search failed: {e}")
-            return []
+        return results
     
     async def search_realtime(self, query: str) -> Dict[str, Any]:
         """
         Search for real-time information using You.com Search API
         
         Perfect for answering patient questions with up-to-date, citation-backed info.
+        Answers are shared across calls through the query cache (per-category
+        TTLs, one upstream request per distinct in-flight question).
         
         Examples:
             - "What's the weather today?"
@@ -180,15 +270,20 @@ class YouComClient:
                 "citations": ["url1", "url2", ...]
             }
         """
+        return await self.query_cache.get_or_fetch(
+            query,
+            lambda: self._fetch_realtime(query),
+            cacheable=lambda result: "_note" not in result,
+        )
+    
+    async def _fetch_realtime(self, query: str) -> Dict[str, Any]:
+        """Live answer from You.com, or the fallback answer"""
         if not self._client:
             return self._fallback_realtime(query)
         
         try:
             # Official You.com Search API endpoint
-            response = await self._client.get(
-                "/v1/search",
-                params={"query": query}
-            )
+            response = await self._search(query)
             
             if response.status_code == 403:
                 logger.error(
@@ -292,8 +387,10 @@ class YouComClient:
             "_note": "Fallback - Get You.com API key at https://you.com/platform ($100 free credits)"
         }
     
+    @property
+    def _client(self) -> Optional[httpx.AsyncClient]:
+        """Shared pooled client, or None when no API key is configured"""
+        return get_http_client("youcom") if self.api_key else None
+    
     async def close(self):
-        """Close HTTP client"""
-        if self._client:
-            await self._client.aclose()
-            logger.info("Closed YouComClient HTTP client")
+        """No-op: the pooled client is owned and closed by the app lifespan"""
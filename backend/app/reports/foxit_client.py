@@ -14,6 +14,9 @@ import asyncio
 from typing import Optional, Dict, Any
 import httpx
 
+from app.http_clients import get_http_client
+from app.resilience import guarded
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,20 +43,18 @@ class FoxitPDFServicesClient:
         self.client_secret = client_secret or os.getenv("FOXIT_PDF_SERVICES_CLIENT_SECRET")
         self.base_url = (base_url or os.getenv("FOXIT_BASE_URL", "https://na1.fusion.foxit.com")).rstrip("/")
 
+        self._headers = {"client_id": self.client_id, "client_secret": self.client_secret}
+
         if self.client_id and self.client_secret:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                headers={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                },
-                timeout=60.0,
-            )
             logger.info("✓ FoxitPDFServicesClient initialized with credentials")
         else:
-            self._client = None
             logger.warning("⚠ FoxitPDFServicesClient: no credentials — HTML→PDF disabled")
 
+    @property
+    def _client(self) -> Optional[httpx.AsyncClient]:
+        """Shared pooled client, or None when no credentials are configured"""
+        return get_http_client("foxit") if self.client_id and self.client_secret else None
+
     # ── public ──────────────────────────────────────────────
 
     async def html_to_pdf(self, html_content: str, filename: str = "report.html") -> Optional[bytes]:
@@ -70,7 +71,7 @@ class FoxitPDFServicesClient:
             logger.warning("PDF Services client not configured — skipping")
             return None
 
-        try:
+        async def convert() -> Optional[bytes]:
             # Step 1 — Upload
             document_id = await self._upload(html_content.encode("utf-8"), filename)
             if not document_id:
@@ -87,9 +88,11 @@ class FoxitPDFServicesClient:
                 return None
 
             # Step 4 — Download
-            pdf_bytes = await self._download(result_doc_id)
-            return pdf_bytes
+            return await self._download(result_doc_id)
 
+        try:
+            # Whole upload → poll → download flow shares the Foxit breaker and budget
+            return await guarded("foxit", convert, timeout=90.0)
         except Exception as e:
             logger.error(f"HTML→PDF conversion failed: {e}", exc_info=True)
             return None
@@ -100,8 +103,9 @@ class FoxitPDFServicesClient:
         """Upload source file, return documentId."""
         files = {"file": (filename, io.BytesIO(file_bytes), "text/html")}
         resp = await self._client.post(
-            "/pdf-services/api/documents/upload",
+            f"{self.base_url}/pdf-services/api/documents/upload",
             files=files,
+            headers=self._headers,
         )
         if resp.status_code == 200:
             doc_id = resp.json().get("documentId")
@@ -113,9 +117,9 @@ class FoxitPDFServicesClient:
     async def _create_pdf(self, document_id: str) -> Optional[str]:
         """Kick off HTML→PDF conversion, return taskId."""
         resp = await self._client.post(
-            "/pdf-services/api/documents/create/pdf-from-html",
+            f"{self.base_url}/pdf-services/api/documents/create/pdf-from-html",
             json={"documentId": document_id},
-            headers={"Content-Type": "application/json"},
+            headers={**self._headers, "Content-Type": "application/json"},
         )
         if resp.status_code in (200, 202):
             data = resp.json()
@@ -128,7 +132,9 @@ class FoxitPDFServicesClient:
     async def _poll_task(self, task_id: str, max_wait: int = 30) -> Optional[str]:
         """Poll task status until COMPLETED (or timeout)."""
         for _ in range(max_wait):
-            resp = await self._client.get(f"/pdf-services/api/tasks/{task_id}")
+            resp = await self._client.get(
+                f"{self.base_url}/pdf-services/api/tasks/{task_id}", headers=self._headers
+            )
             if resp.status_code == 200:
                 data = resp.json()
                 status = data.get("status", "")
@@ -150,7 +156,8 @@ class FoxitPDFServicesClient:
     async def _download(self, document_id: str) -> Optional[bytes]:
         """Download the result PDF bytes."""
         resp = await self._client.get(
-            f"/pdf-services/api/documents/{document_id}/download",
+            f"{self.base_url}/pdf-services/api/documents/{document_id}/download",
+            headers=self._headers,
         )
         if resp.status_code == 200:
             logger.info(f"  ✓ Downloaded PDF ({len(resp.content)} bytes)")
@@ -159,8 +166,7 @@ class FoxitPDFServicesClient:
         return None
 
     async def close(self):
-        if self._client:
-            await self._client.aclose()
+        """No-op: the pooled client is owned and closed by the app lifespan"""
 
 
 # ─────────────────────────────────────────────────────────────
@@ -191,21 +197,16 @@ class FoxitClient:
         """
         self.client_id = client_id or os.getenv("FOXIT_DOCUMENT_GENERATION_CLIENT_ID")
         self.client_secret = client_secret or os.getenv("FOXIT_DOCUMENT_GENERATION_API_SECRET")
-        self.base_url = base_url or os.getenv("FOXIT_BASE_URL", "https://na1.fusion.foxit.com")
+        self.base_url = (base_url or os.getenv("FOXIT_BASE_URL", "https://na1.fusion.foxit.com")).rstrip("/")
+        self._headers = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "Content-Type": "application/json"
+        }
 
         if self.client_id and self.client_secret:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                headers={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "Content-Type": "application/json"
-                },
-                timeout=30.0
-            )
             logger.info("✓ FoxitClient initialized with Document Generation API credentials")
         else:
-            self._client = None
             logger.warning("⚠ FoxitClient initialized without credentials - will use mock PDFs")
 
     async def generate_cognitive_report_pdf(
@@ -268,10 +269,18 @@ class FoxitClient:
 
             logger.info(f"Generating PDF for patient: {document_values['patient_name']}")
 
-            response = await self._client.post(
-                "/document-generation/api/GenerateDocumentBase64",
-                json=payload
-            )
+            async def attempt() -> httpx.Response:
+                resp = await self._client.post(
+                    f"{self.base_url}/document-generation/api/GenerateDocumentBase64",
+                    json=payload,
+                    headers=self._headers
+                )
+                if resp.status_code >= 500:
+                    resp.raise_for_status()
+                return resp
+
+            # Breaker open / budget spent / 5xx → mock PDF via the handlers below
+            response = await guarded("foxit", attempt, timeout=30.0)
 
             if response.status_code == 200:
                 result = response.json()
@@ -422,8 +431,10 @@ startxref
 """
         return pdf_content.encode('latin-1')
 
+    @property
+    def _client(self) -> Optional[httpx.AsyncClient]:
+        """Shared pooled client, or None when no credentials are configured"""
+        return get_http_client("foxit") if self.client_id and self.client_secret else None
+
     async def close(self):
-        """Close HTTP client"""
-        if self._client:
-            await self._client.aclose()
-            logger.info("Closed FoxitClient HTTP client")
+        """No-op: the pooled client is owned and closed by the app lifespan"""
@@ -8,9 +8,11 @@ Falls back to Foxit Document Generation API or mock PDF
 
 import logging
 import os
-from datetime import datetime, UTC, date
+from datetime import datetime, UTC, date, timedelta
 from typing import Dict, Any, List, Optional
 
+from app.storage.timeseries import to_utc_iso
+
 try:
     import google.generativeai as genai
     _GEMINI_AVAILABLE = True
@@ -66,12 +68,20 @@ class ReportGenerator:
         # 3. Fetch baseline
         baseline = await self.data_store.get_cognitive_baseline(patient_id)
 
-        # 4. Fetch recent alerts
-        alerts = await self.data_store.get_alerts(patient_id, limit=10)
+        # 4. Fetch recent alerts (newest first), limited to the report period
+        #    so the list agrees with the period totals below
+        cutoff = to_utc_iso(datetime.now(UTC) - timedelta(days=days))
+        alerts = [
+            a for a in await self.data_store.get_alerts(patient_id, limit=10)
+            if a.get("timestamp") and to_utc_iso(a["timestamp"]) >= cutoff
+        ]
 
         # 5. Fetch recent conversations
         conversations = await self.data_store.get_conversations(patient_id, limit=10)
 
+        # 5b. Period statistics (aggregated by the data store)
+        stats = await self.data_store.get_analytics_summary(patient_id, days)
+
         # 6. Calculate summary statistics
         cognitive_score = self._calculate_overall_score(trends, baseline)
         trend_direction = self._calculate_trend_direction(trends)
@@ -91,13 +101,13 @@ class ReportGenerator:
             "baseline_established": baseline.get("established", False) if baseline else False,
 
             # Current averages
-            "avg_vocabulary": self._average_metric(trends, "vocabulary_diversity"),
-            "avg_coherence": self._average_metric(trends, "topic_coherence"),
-            "avg_repetition": self._average_metric(trends, "repetition_rate"),
+            "avg_vocabulary": stats["avg_vocabulary"],
+            "avg_coherence": stats["avg_coherence"],
+            "avg_repetition": stats["avg_repetition"],
 
             # Alert summary
-            "total_alerts": len(alerts),
-            "high_severity_alerts": len([a for a in alerts if a.get("severity") == "high"]),
+            "total_alerts": stats["alerts"]["total"],
+            "high_severity_alerts": stats["alerts"]["by_severity"]["high"],
             "alerts": alerts,
 
             # Conversation summary
@@ -112,11 +122,11 @@ class ReportGenerator:
                 "patient_name": patient.get("name", "Unknown"),
                 "cognitive_score": cognitive_score,
                 "trend": trend_direction,
-                "total_alerts": len(alerts),
+                "total_alerts": stats["alerts"]["total"],
                 "total_conversations": len(conversations),
-                "avg_vocabulary": self._average_metric(trends, "vocabulary_diversity"),
-                "avg_coherence": self._average_metric(trends, "topic_coherence"),
-                "avg_repetition": self._average_metric(trends, "repetition_rate"),
+                "avg_vocabulary": stats["avg_vocabulary"],
+                "avg_coherence": stats["avg_coherence"],
+                "avg_repetition": stats["avg_repetition"],
                 "conversations": conversations[:5],
                 "report_period_days": days,
             }),
@@ -0,0 +1,283 @@
+"""
+Resilience Layer
+Circuit breakers, latency budgets and hedged reads for external services
+(Deepgram, Gemini, You.com, Foxit, Sanity).
+
+- Circuit breaker per upstream: after `failure_threshold` consecutive
+  failures the breaker opens and calls go straight to the caller's local
+  fallback for `reset_timeout` seconds; one probe call is then let
+  through (half-open) to decide whether to close again.
+- Deadlines: `with deadline(seconds):` sets an overall budget in a
+  contextvar (inherited by tasks spawned inside it). Each guarded call
+  is capped at min(its own timeout, time left), so a slow upstream
+  can't run past the caller's budget.
+- Hedging: idempotent reads may start a second identical request if the
+  first hasn't answered within the upstream's `hedge_after`; the first
+  successful response wins and the other is cancelled.
+
+Usage:
+    result = await guarded(
+        "youcom", lambda: fetch(query),
+        timeout=15.0, fallback=lambda: local_answer(query), idempotent=True,
+    )
+
+Breaker state is reported by /dev/status.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+BREAKERS = {
+    "deepgram": {"failure_threshold": 3, "reset_timeout": 30.0, "hedge_after": None},
+    "gemini": {"failure_threshold": 3, "reset_timeout": 60.0, "hedge_after": None},
+    "youcom": {"failure_threshold": 3, "reset_timeout": 30.0, "hedge_after": 2.0},
+    "foxit": {"failure_threshold": 3, "reset_timeout": 60.0, "hedge_after": None},
+    "sanity": {"failure_threshold": 5, "reset_timeout": 15.0, "hedge_after": 1.0},
+}
+
+DEFAULT_BREAKER = {"failure_threshold": 5, "reset_timeout": 30.0, "hedge_after": None}
+
+
+class BreakerOpenError(RuntimeError):
+    """Raised when a call is short-circuited and the caller gave no fallback."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the surrounding budget is already spent before a call starts."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker: closed → open → half-open → closed."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 hedge_after: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hedge_after = hedge_after
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.stats = {
+            "calls": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "short_circuits": 0,
+            "hedges": 0,
+            "fallbacks": 0,
+        }
+
+    def allow(self) -> bool:
+        """Whether a call may go to the upstream right now."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+            logger.info(f"[BREAKER] {self.name}: half-open, probing")
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe without a verdict (skipped or cancelled call)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"[BREAKER] {self.name}: closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.stats["failures"] += 1
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"[BREAKER] {self.name}: open after {self.consecutive_failures} failure(s), "
+                    f"retry in {self.reset_timeout:.0f}s"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        retry_in = 0.0
+        if self.state == self.OPEN:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_sec": round(retry_in, 1),
+            **self.stats,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """The process-wide breaker for an upstream (created on first use)."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(name, **{**DEFAULT_BREAKER, **BREAKERS.get(name, {})})
+        _breakers[name] = breaker
+    return breaker
+
+
+def breaker_states() -> dict:
+    """Snapshot of every configured (or used) breaker, for /dev/status."""
+    for name in BREAKERS:
+        get_breaker(name)
+    return {name: breaker.snapshot() for name, breaker in sorted(_breakers.items())}
+
+
+def reset_breakers() -> None:
+    """Forget all breaker state (tests)."""
+    _breakers.clear()
+
+
+# ─── Deadlines ───────────────────────────────────────────────────────────────
+
+_deadline: ContextVar[Optional[float]] = ContextVar("resilience_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float):
+    """Run the block under a budget of `seconds` (nested budgets only shrink)."""
+    candidate = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(candidate if current is None else min(current, candidate))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None when no deadline is set."""
+    current = _deadline.get()
+    return None if current is None else current - time.monotonic()
+
+
+def _budget(timeout: Optional[float]) -> Optional[float]:
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+# ─── Guarded calls ───────────────────────────────────────────────────────────
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    """Client errors (4xx) are the caller's problem and don't trip the breaker."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return True
+
+
+async def _hedged(factory: Callable[[], Awaitable[Any]], hedge_after: float, breaker: CircuitBreaker) -> Any:
+    tasks = [asyncio.ensure_future(factory())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            breaker.stats["hedges"] += 1
+            tasks.append(asyncio.ensure_future(factory()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def guarded(
+    upstream: str,
+    factory: Callable[[], Awaitable[Any]],
+    *,
+    timeout: Optional[float] = None,
+    fallback: Optional[Callable[[], Any]] = None,
+    idempotent: bool = False,
+) -> Any:
+    """
+    Call an upstream through its breaker, within the current deadline.
+
+    Args:
+        upstream: breaker name (see BREAKERS)
+        factory: zero-arg callable returning a fresh awaitable for one attempt
+        timeout: per-call cap in seconds (further capped by the deadline)
+        fallback: zero-arg callable producing the local result when the
+                  breaker is open, the budget is spent or the call fails;
+                  without one the error is raised
+        idempotent: allow a hedged second request (reads only)
+
+    Raises:
+        BreakerOpenError / DeadlineExceeded / the upstream error, when no fallback is given
+    """
+    breaker = get_breaker(upstream)
+
+    def _fallback(reason: str, exc: BaseException):
+        if fallback is None:
+            raise exc
+        breaker.stats["fallbacks"] += 1
+        logger.info(f"[BREAKER] {upstream}: using fallback ({reason})")
+        return fallback()
+
+    if not breaker.allow():
+        breaker.stats["short_circuits"] += 1
+        return _fallback("circuit open", BreakerOpenError(f"{upstream} circuit is open"))
+
+    budget = _budget(timeout)
+    if budget is not None and budget <= 0:
+        breaker.release_probe()
+        return _fallback("budget spent", DeadlineExceeded(f"no time left for {upstream}"))
+
+    breaker.stats["calls"] += 1
+    hedge_after = breaker.hedge_after if idempotent else None
+    try:
+        attempt = _hedged(factory, hedge_after, breaker) if hedge_after else factory()
+        result = await asyncio.wait_for(attempt, budget)
+    except asyncio.TimeoutError as exc:
+        breaker.stats["timeouts"] += 1
+        breaker.record_failure()
+        # With no budget the timeout came from the upstream call itself
+        reason = f"timed out after {budget:.1f}s" if budget is not None else "upstream timed out"
+        return _fallback(reason, exc)
+    except Exception as exc:
+        if not _is_upstream_failure(exc):
+            breaker.record_success()
+            raise
+        breaker.record_failure()
+        return _fallback(f"{type(exc).__name__}: {exc}", exc)
+    except BaseException:
+        # Cancelled (hangup, shutdown, an outer wait_for): no verdict on the
+        # upstream, but the probe slot must not stay taken
+        breaker.release_probe()
+        raise
+    breaker.record_success()
+    return result
@@ -8,6 +8,7 @@ from .conversations import router as conversations_router
 from .wellness import router as wellness_router
 from .alerts import router as alerts_router
 from .live_status import router as live_status_router
+from .events import router as events_router
 
 # Data insight and report routes
 try:
@@ -19,6 +20,7 @@ try:
         "wellness_router",
         "alerts_router",
         "live_status_router",
+        "events_router",
         "insights_router",
         "reports_router"
     ]
@@ -28,5 +30,6 @@ except ImportError:
         "conversations_router",
         "wellness_router",
         "alerts_router",
-        "live_status_router"
+        "live_status_router",
+        "events_router"
     ]
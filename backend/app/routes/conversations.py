@@ -3,198 +3,17 @@ Conversation API Routes
 Endpoints for conversation history and details
 """
 
-import re
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, Depends
 
 from app.dependencies import get_data_store, get_cognitive_pipeline
+from app.storage.normalization import normalize_conversation
+from app.storage.pagination import CONVERSATION_ORDER, InvalidCursorError, next_cursor
 from .models import CreateConversationRequest
 
 router = APIRouter(prefix="/api/conversations", tags=["conversations"])
 
 
-# ---------------------------------------------------------------------------
-# Summary normalizer — strips raw AI preamble from stored summaries
-# ---------------------------------------------------------------------------
-
-_SUMMARY_NOISE = [
-    # "A wellness check-in phone call between Clara... "
-    re.compile(r"A wellness check-in phone call between Clara[^.]+\.\s*", re.I),
-    # "between Clara (an AI companion)..."
-    re.compile(r"between Clara \(an AI companion\)[^,.]*, ?", re.I),
-    # "Summarizing the call, Clara..." or just "Summarizing the call,"
-    re.compile(r"Summarizing the call,?\s*Clara[^.]+\.\s*", re.I),
-    re.compile(r"Summarizing the call,?\s*", re.I),
-    # "discussed topics such as mood, stress..."
-    re.compile(r"discussed topics such as [^.]+\.\s*", re.I),
-    # "(an AI companion)"
-    re.compile(r"\(an AI companion\)", re.I),
-    # "Clara asks" sentence starts
-    re.compile(r"^Clara asks[^.]+\.\s*", re.I | re.M),
-    # "A customer named Clara talks to <name> about..." style preamble
-    re.compile(r"A customer named Clara[^.]+\.\s*", re.I),
-    # --- Deepgram generic-label structural preambles ---
-    # "A caller and a host discuss a wellness phone call with an elderly adult."
-    re.compile(r"A (?:caller|customer) and (?:a |the )?host discuss(?:es)?.*?\.\s*", re.I),
-    # "They discuss the importance of..." / "They also talk about..."
-    re.compile(r"(?:They|The host and (?:the )?caller) (?:also )?(?:discuss(?:es)?|talk(?:s)? about).*?\.\s*", re.I),
-    # "They discuss" mid-sentence (leftover)
-    re.compile(r"They discuss .*?\.\s*", re.I),
-    # "Patient discussed:" fallback prefix
-    re.compile(r"^Patient discussed:\s*", re.I),
-    # "Topic: " prefix
-    re.compile(r"^Topic:\s*", re.I),
-]
-
-# Inline Clara references → "the companion"
-_CLARA_REF = re.compile(r"\bClara\b")
-
-# Replace "the patient" with she/her based on position — subject vs object
-_THE_PATIENT_SUBJECT = re.compile(r"\bThe patient\b")   # sentence-start (capitalised)
-_THE_PATIENT_OBJECT  = re.compile(r"\bthe patient\b")   # mid-sentence (lowercase)
-
-# Fix "their" when clearly referring to the patient
-_THEIR_POSSESSIVE = re.compile(r"\btheir\b", re.I)
-
-
-
-
-def _clean_summary(raw: str) -> str:
-    """
-    Strip AI-system preamble and persona references from a stored summary.
-    Returns a clean, family-friendly third-person description.
-    """
-    if not raw:
-        return raw
-
-    text = raw.strip()
-    
-    # Transform Deepgram structural preambles into personalized summaries
-    # Step 1: Remove generic openers entirely
-    text = re.sub(
-        r"A (?:caller|customer) and (?:a |the )?host discuss(?:es)? a wellness phone call "
-        r"with an elderly (?:adult|patient|woman|man)\.\s*",
-        "", text, flags=re.I
-    )
-    # "A caller named Summarizes a wellness phone call ..." — Deepgram treats verb as name
-    # Also handles: "A caller named <Name> summarizes..."
-    text = re.sub(
-        r"A (?:caller|customer) named \w+\s+(?:a |the )?(?:wellness )?(?:phone )?(?:call|check-in)[^.]+\.\s*",
-        "", text, flags=re.I
-    )
-    text = re.sub(
-        r"A (?:caller|customer) named \w+ (?:summarizes|describes|discusses|talks about)[^.]+\.\s*",
-        "", text, flags=re.I
-    )
-    # "A customer named Clara talks to <name> about..." — already in _SUMMARY_NOISE but reinforce
-    text = re.sub(r"A customer named Clara[^.]+\.\s*", "", text, flags=re.I)
-
-    # Step 2: Transform "They discuss the importance of X" → "She talked about X"
-    text = re.sub(
-        r"They discuss(?:es)? the importance of ",
-        "She talked about ", text, flags=re.I
-    )
-    # Step 3: Transform "They also talk about the importance of X" → "She also mentioned X"
-    text = re.sub(
-        r"They also (?:talk|talked) about the importance of ",
-        "She also mentioned ", text, flags=re.I
-    )
-    # Step 4: Transform remaining "They also talk/discuss/mention X" → "She also talked about X"
-    text = re.sub(
-        r"They also (?:talk|talked|discuss(?:es)?|mention(?:ed)?) (?:about )?",
-        "She also talked about ", text, flags=re.I
-    )
-    # Step 5: Transform "They discuss X" → "She talked about X"
-    text = re.sub(
-        r"They discuss(?:es)? ",
-        "She talked about ", text, flags=re.I
-    )
-
-    # Step 6: Replace impersonal role labels
-    # "the representative" / "the host" → "Clara" (more natural than 'the companion')
-    text = re.sub(r"\bthe representative\b", "Clara", text, flags=re.I)
-    # NOTE: do NOT replace "Clara" with "the companion" — it garbles natural summaries
-    # e.g. "Clara and Emily discussed lunch" should stay as-is
-
-    # Step 7: Replace Deepgram generic patient labels → pronouns
-    text = re.sub(r"\bthe elderly (?:adult|patient|woman|man)\b", "she", text, flags=re.I)
-    text = re.sub(r"\bthe (?:caller|customer)\b", "she", text, flags=re.I)
-    text = _THE_PATIENT_SUBJECT.sub("She", text)
-    text = _THE_PATIENT_OBJECT.sub("her", text)
-    text = _THEIR_POSSESSIVE.sub("her", text)
-
-    # Step 8: Strip filler closing sentences
-    text = re.sub(
-        r"The call (?:ends|ended) with (?:her|she) (?:thanking|saying)[^.]+\.\s*",
-        "", text, flags=re.I
-    )
-
-    # Step 9: Strip noise pattern list (iterative)
-    changed = True
-    while changed:
-        changed = False
-        for pattern in _SUMMARY_NOISE:
-            new = pattern.sub("", text).strip()
-            if new != text:
-                text = new
-                changed = True
-
-
-    # Clean up spacing artefacts
-    text = re.sub(r"\s{2,}", " ", text).strip()
-
-    # Capitalise first letter of each sentence  
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    sentences = [s[0].upper() + s[1:] if s else s for s in sentences]
-    text = " ".join(sentences)
-
-    # Ensure ends with a period
-    if text and text[-1] not in (".", "!", "?"):
-        text += "."
-
-    return text
-
-
-async def _normalize_conversation(conv: dict, store) -> dict:
-    """Normalize a conversation record before serving it to the frontend.
-    Fast-paths: skips regex cleaning if summary has no legacy noise patterns.
-    """
-    if not conv:
-        return conv
-
-    summary = conv.get("summary", "")
-
-    # Fast path: only run expensive regex if summary has legacy noise
-    needs_cleaning = summary and any(p.search(summary) for p in _SUMMARY_NOISE)
-
-    if needs_cleaning:
-        clean = _clean_summary(summary)
-    elif not summary:
-        clean = ""
-    else:
-        clean = summary  # already clean, skip regex
-
-    # Fallback: if summary is missing or empty after cleaning
-    if not clean:
-        try:
-            digest = await store.get_latest_wellness_digest(conv.get("patient_id"))
-            if digest and digest.get("conversation_id") == conv.get("id"):
-                highlights = digest.get("highlights", [])
-                if highlights:
-                    from app.routes.wellness import _clean_highlight
-                    clean_lines = [_clean_highlight(h) for h in highlights]
-                    clean_lines = [line for line in clean_lines if len(line) > 10]
-                    clean = " ".join(clean_lines)
-        except Exception:
-            pass
-
-    # If we generated a fallback or cleaned an existing one, update the dict
-    if clean != summary or not conv.get("summary"):
-        conv = dict(conv)
-        conv["summary"] = clean
-
-    return conv
-
-
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -204,6 +23,7 @@ async def list_conversations(
     patient_id: str = Query(..., description="Patient ID"),
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
     store=Depends(get_data_store),
 ):
     """
@@ -212,19 +32,26 @@ async def list_conversations(
     Query params:
         - patient_id: Patient identifier
         - limit: Max results (1-100, default 10)
-        - offset: Pagination offset (default 0)
+        - offset: Pagination offset (default 0, ignored when cursor is set)
+        - cursor: Keyset cursor — pass back next_cursor to fetch the next page
     """
-    conversations = await store.get_conversations(patient_id, limit=limit, offset=offset)
+    try:
+        conversations = await store.get_conversations(
+            patient_id, limit=limit, offset=offset, cursor=cursor
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     normalized_convs = []
     for c in conversations:
-        normalized_convs.append(await _normalize_conversation(c, store))
+        normalized_convs.append(await normalize_conversation(c, store))
 
     return {
         "patient_id": patient_id,
         "conversations": normalized_convs,
         "count": len(conversations),
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor(conversations, limit, CONVERSATION_ORDER)
     }
 
 
@@ -246,7 +73,7 @@ async def get_conversation(
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    return await _normalize_conversation(conversation, store)
+    return await normalize_conversation(conversation, store)
 
 
 @router.post("")
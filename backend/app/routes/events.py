@@ -0,0 +1,58 @@
+"""
+Dashboard Events API Route
+Server-Sent Events stream of call and alert events (replaces polling)
+"""
+
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.dependencies import get_data_store
+from app.events import event_hub, format_sse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+KEEPALIVE_SEC = 15.0
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    patient_id: List[str] = Query(..., description="Patient ID; repeat for a family account watching several patients"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    data_store=Depends(get_data_store),
+):
+    """
+    Stream call_started, call_ended, pipeline_complete and alert_created
+    events for the given patients as text/event-stream.
+
+    A comment line is sent every KEEPALIVE_SEC so proxies keep the
+    connection open. Browsers reconnect with Last-Event-ID automatically
+    and receive the events they missed (from the recent-event buffer).
+    """
+    for pid in patient_id:
+        if not await data_store.get_patient(pid):
+            raise HTTPException(status_code=404, detail=f"Patient {pid} not found")
+
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    subscription = event_hub.subscribe(patient_id, last_event_id=resume_from)
+    logger.info(f"[EVENTS] Subscribed to {', '.join(patient_id)} (resume_from={resume_from})")
+
+    async def frames():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=KEEPALIVE_SEC)
+                yield format_sse(event) if event else ": keepalive\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
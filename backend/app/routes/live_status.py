@@ -4,6 +4,9 @@ Provides real-time call status for the dashboard
 """
 
 import logging
+from datetime import datetime, UTC
+from typing import Optional
+
 from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
 
@@ -12,6 +15,12 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/live-status", tags=["live-status"])
 
 
+def _duration_sec(started_at: Optional[str]) -> int:
+    if not started_at:
+        return 0
+    return int((datetime.now(UTC) - datetime.fromisoformat(started_at)).total_seconds())
+
+
 @router.get("")
 async def get_live_status(patient_id: str = Query(..., description="Patient ID to check")):
     """
@@ -25,33 +34,20 @@ async def get_live_status(patient_id: str = Query(..., description="Patient ID t
             "started_at": str (optional)
         }
     """
-    from app.main import app
-    
-    # Access the twilio_bridge from the app state
+    # The call may be on any worker/replica, so look it up in the shared registry
     try:
-        from app.voice import twilio_bridge
-        
-        active_calls = twilio_bridge.active_calls
+        from app.voice.call_registry import call_registry
         
-        # Find active call for this patient
-        for call_sid, session in active_calls.items():
-            if session.patient_id == patient_id and session.is_active:
-                # Calculate duration
-                duration_sec = 0
-                started_at = None
-                
-                if session.call_start_time:
-                    from datetime import datetime, UTC
-                    duration_sec = int((datetime.now(UTC) - session.call_start_time).total_seconds())
-                    started_at = session.call_start_time.isoformat()
-                
-                return {
-                    "is_active": True,
-                    "call_sid": call_sid,
-                    "patient_id": patient_id,
-                    "duration_sec": duration_sec,
-                    "started_at": started_at
-                }
+        record = await call_registry.find_by_patient(patient_id)
+        if record:
+            return {
+                "is_active": True,
+                "call_sid": record["call_sid"],
+                "patient_id": patient_id,
+                "duration_sec": _duration_sec(record.get("started_at")),
+                "started_at": record.get("started_at"),
+                "node_id": record["node_id"]
+            }
         
         # No active call found
         return {
@@ -88,26 +84,18 @@ async def get_all_active_calls():
             ]
         }
     """
-    from app.voice import twilio_bridge
-    from datetime import datetime, UTC
-    
-    active_calls = []
+    from app.voice.call_registry import call_registry
     
-    for call_sid, session in twilio_bridge.active_calls.items():
-        if session.is_active:
-            duration_sec = 0
-            started_at = None
-            
-            if session.call_start_time:
-                duration_sec = int((datetime.now(UTC) - session.call_start_time).total_seconds())
-                started_at = session.call_start_time.isoformat()
-            
-            active_calls.append({
-                "call_sid": call_sid,
-                "patient_id": session.patient_id,
-                "duration_sec": duration_sec,
-                "started_at": started_at
-            })
+    active_calls = [
+        {
+            "call_sid": record["call_sid"],
+            "patient_id": record["patient_id"],
+            "duration_sec": _duration_sec(record.get("started_at")),
+            "started_at": record.get("started_at"),
+            "node_id": record["node_id"]
+        }
+        for record in await call_registry.list_calls()
+    ]
     
     return {
         "active_count": len(active_calls),
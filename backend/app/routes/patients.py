@@ -3,13 +3,35 @@ Patient API Routes
 Endpoints for patient profile management
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import logging
+from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional
 
 from app.dependencies import get_data_store
+from app.storage.normalization import normalize_alert, normalize_conversation, normalize_digest
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/patients", tags=["patients"])
 
+DASHBOARD_FIELDS = (
+    "patient", "baseline", "latest_digest", "recent_conversations",
+    "active_alerts", "trends", "insights",
+)
+
+
+def _conversation_summary(c: dict) -> dict:
+    """Compact conversation row for dashboard lists"""
+    summary = c.get("summary", "")
+    return {
+        "id": c["id"],
+        "timestamp": c["timestamp"],
+        "duration": c["duration"],
+        "mood": c.get("detected_mood"),
+        "summary": summary[:100] + "..." if len(summary) > 100 else summary
+    }
+
 
 @router.get("/{patient_id}")
 async def get_patient(patient_id: str, store=Depends(get_data_store)):
@@ -22,37 +44,98 @@ async def get_patient(patient_id: str, store=Depends(get_data_store)):
         - Latest wellness digest
         - Recent conversations summary
     """
-    # Get patient
-    patient = await store.get_patient(patient_id)
+    # Independent reads run concurrently; recent conversations are the last 5
+    patient, baseline, latest_digest, recent_conversations = await asyncio.gather(
+        store.get_patient(patient_id),
+        store.get_cognitive_baseline(patient_id),
+        store.get_latest_wellness_digest(patient_id),
+        store.get_conversations(patient_id, limit=5),
+    )
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
     
-    # Get baseline
-    baseline = await store.get_cognitive_baseline(patient_id)
-    
-    # Get latest digest
-    latest_digest = await store.get_latest_wellness_digest(patient_id)
-    
-    # Get recent conversations (last 5)
-    recent_conversations = await store.get_conversations(patient_id, limit=5)
-    
     return {
         "patient": patient,
         "baseline": baseline,
         "latest_digest": latest_digest,
-        "recent_conversations": [
-            {
-                "id": c["id"],
-                "timestamp": c["timestamp"],
-                "duration": c["duration"],
-                "mood": c.get("detected_mood"),
-                "summary": c.get("summary", "")[:100] + "..." if len(c.get("summary", "")) > 100 else c.get("summary", "")
-            }
-            for c in recent_conversations
-        ]
+        "recent_conversations": [_conversation_summary(c) for c in recent_conversations]
     }
 
 
+@router.get("/{patient_id}/dashboard")
+async def get_patient_dashboard(
+    patient_id: str,
+    fields: Optional[str] = Query(
+        None, description=f"Comma-separated sections to include (default all): {', '.join(DASHBOARD_FIELDS)}"
+    ),
+    days: int = Query(30, ge=1, le=365, description="Days of cognitive trends"),
+    conversations: int = Query(5, ge=1, le=50, description="Number of recent conversations"),
+    store=Depends(get_data_store),
+):
+    """
+    Everything the family dashboard loads, in one response
+    
+    All sections are read concurrently, so the response takes as long as
+    the slowest read rather than the sum. A section whose read fails is
+    returned as null and listed in "unavailable" instead of failing the
+    whole dashboard.
+    """
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(DASHBOARD_FIELDS)
+    unknown = [f for f in selected if f not in DASHBOARD_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Must be: {', '.join(DASHBOARD_FIELDS)}"
+        )
+    
+    async def active_alerts():
+        alerts = await store.get_alerts(patient_id, limit=20)
+        return [normalize_alert(a) for a in alerts if not a.get("acknowledged")]
+    
+    async def latest_digest():
+        return normalize_digest(await store.get_latest_wellness_digest(patient_id))
+    
+    async def recent_conversations():
+        rows = await store.get_conversations(patient_id, limit=conversations)
+        normalized = await asyncio.gather(*(normalize_conversation(c, store) for c in rows))
+        return [_conversation_summary(c) for c in normalized]
+    
+    readers = {
+        "baseline": lambda: store.get_cognitive_baseline(patient_id),
+        "latest_digest": latest_digest,
+        "recent_conversations": recent_conversations,
+        "active_alerts": active_alerts,
+        "trends": lambda: store.get_cognitive_trends(patient_id, days=days),
+        "insights": lambda: store.get_patient_insights(patient_id),
+    }
+    sections = [f for f in dict.fromkeys(selected) if f != "patient"]
+    
+    # The patient read doubles as the existence check, so it always runs
+    patient, *results = await asyncio.gather(
+        store.get_patient(patient_id),
+        *(readers[f]() for f in sections),
+        return_exceptions=True,
+    )
+    if isinstance(patient, Exception):
+        raise patient
+    if not patient:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    
+    payload = {"patient_id": patient_id}
+    if "patient" in selected:
+        payload["patient"] = patient
+    unavailable = []
+    for field, result in zip(sections, results):
+        if isinstance(result, Exception):
+            logger.error(f"[DASHBOARD] {field} failed for {patient_id}: {result}")
+            unavailable.append(field)
+            result = None
+        payload[field] = result
+    if unavailable:
+        payload["unavailable"] = unavailable
+    return payload
+
+
 @router.patch("/{patient_id}")
 async def update_patient(patient_id: str, updates: dict, store=Depends(get_data_store)):
     """
@@ -7,9 +7,14 @@ Supports both in-memory (testing) and Sanity CMS (production)
 from .base import DataStore
 from .memory import InMemoryDataStore
 from .sanity import SanityDataStore
+from .unit_of_work import UnitOfWork, RevisionConflictError
+from .pagination import InvalidCursorError
 
 __all__ = [
     "DataStore",
     "InMemoryDataStore",
-    "SanityDataStore"
+    "SanityDataStore",
+    "UnitOfWork",
+    "RevisionConflictError",
+    "InvalidCursorError"
 ]
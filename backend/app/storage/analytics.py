@@ -0,0 +1,89 @@
+"""
+Analytics Summary
+Period-bounded cognitive and alert statistics for reports and dashboards.
+
+`summarize` is the reference Python implementation used by
+InMemoryDataStore. SanityDataStore computes the same numbers server-side
+in a single GROQ query (count(), math::avg, per-mood sub-queries) so only
+the aggregated values cross the network; both must return the same shape.
+"""
+
+from typing import Optional
+
+from .timeseries import to_utc_iso
+
+SEVERITIES = ("low", "medium", "high")
+
+
+def _avg(values: list) -> float:
+    """Mean of non-null values, rounded; 0.0 when there are none (GROQ: null)."""
+    vals = [v for v in values if v is not None]
+    return round(sum(vals) / len(vals), 3) if vals else 0.0
+
+
+def empty_summary(days: int) -> dict:
+    return {
+        "period_days": days,
+        "conversation_count": 0,
+        "avg_vocabulary": 0.0,
+        "avg_coherence": 0.0,
+        "avg_repetition": 0.0,
+        "avg_word_finding_pauses": 0.0,
+        "by_mood": {},
+        "alerts": {
+            "total": 0,
+            "by_severity": {s: 0 for s in SEVERITIES},
+            "acknowledged": 0,
+        },
+    }
+
+
+def summarize(conversations: list[dict], alerts: list[dict], since, days: int) -> dict:
+    """
+    Summarize conversations (with cognitive metrics) and alerts at or after `since`.
+
+    Args:
+        conversations: conversation dicts (DataStore shape)
+        alerts: alert dicts (DataStore shape)
+        since: datetime or ISO string lower bound (inclusive)
+        days: period length, echoed back as period_days
+    """
+    cutoff = to_utc_iso(since)
+
+    def in_period(record: dict) -> bool:
+        ts: Optional[str] = record.get("timestamp")
+        return bool(ts) and to_utc_iso(ts) >= cutoff
+
+    convs = [c for c in conversations if c.get("cognitive_metrics") and in_period(c)]
+    period_alerts = [a for a in alerts if in_period(a)]
+
+    def metric(rows: list[dict], key: str) -> list:
+        return [r["cognitive_metrics"].get(key) for r in rows]
+
+    moods: dict[str, list[dict]] = {}
+    for conv in convs:
+        moods.setdefault(conv.get("detected_mood") or "unknown", []).append(conv)
+
+    summary = empty_summary(days)
+    summary.update({
+        "conversation_count": len(convs),
+        "avg_vocabulary": _avg(metric(convs, "vocabulary_diversity")),
+        "avg_coherence": _avg(metric(convs, "topic_coherence")),
+        "avg_repetition": _avg(metric(convs, "repetition_rate")),
+        "avg_word_finding_pauses": _avg(metric(convs, "word_finding_pauses")),
+        "by_mood": {
+            mood: {
+                "count": len(rows),
+                "avg_vocabulary": _avg(metric(rows, "vocabulary_diversity")),
+                "avg_coherence": _avg(metric(rows, "topic_coherence")),
+            }
+            for mood, rows in moods.items()
+        },
+    })
+    summary["alerts"]["total"] = len(period_alerts)
+    for alert in period_alerts:
+        severity = alert.get("severity")
+        if severity in summary["alerts"]["by_severity"]:
+            summary["alerts"]["by_severity"][severity] += 1
+    summary["alerts"]["acknowledged"] = sum(1 for a in period_alerts if a.get("acknowledged"))
+    return summary
@@ -5,6 +5,8 @@ Abstract interface for data storage - allows swapping between in-memory, Sanity,
 
 from typing import Protocol, Optional
 
+from .unit_of_work import UnitOfWork
+
 
 class DataStore(Protocol):
     """
@@ -12,6 +14,15 @@ class DataStore(Protocol):
     Implementations: InMemoryDataStore, SanityDataStore
     """
     
+    def batch(self) -> UnitOfWork:
+        """
+        Start a unit of work: writes made inside `async with store.batch():`
+        are queued and committed together (atomically) when the block exits.
+        Raises RevisionConflictError on commit if a baseline or deviation
+        tracker read inside the block was changed concurrently.
+        """
+        ...
+    
     async def get_patient(self, patient_id: str) -> Optional[dict]:
         """
         Retrieve patient profile
@@ -21,6 +32,25 @@ class DataStore(Protocol):
         """
         ...
     
+    async def get_patient_birth_years(self) -> list[int]:
+        """
+        Distinct birth years across all patients (for warming era content)
+        
+        Returns:
+            Sorted list of years
+        """
+        ...
+    
+    async def get_call_schedules(self) -> list[dict]:
+        """
+        Daily check-in schedule of every patient that has one and a phone number
+        
+        Returns:
+            List of dicts with patient_id, name, phone_number, preferred_time
+            ("10:00 AM") and timezone (IANA name, may be None)
+        """
+        ...
+    
     async def update_patient(self, patient_id: str, updates: dict) -> bool:
         """
         Update patient profile (e.g., preferences, thresholds)
@@ -34,11 +64,18 @@ class DataStore(Protocol):
         self, 
         patient_id: str, 
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> list[dict]:
         """
         Get paginated list of conversations for a patient
         
+        Pass `cursor` (from pagination.next_cursor) for keyset paging;
+        offset is ignored when a cursor is given.
+        
+        Transcripts are not included; records carry transcript_ref and
+        transcript_size instead (see get_conversation / get_transcripts).
+        
         Returns:
             List of conversation dicts, ordered by timestamp desc
         """
@@ -53,6 +90,15 @@ class DataStore(Protocol):
         """
         ...
     
+    async def get_transcripts(self, conversation_ids: list[str]) -> dict[str, str]:
+        """
+        Load transcripts for several conversations in one round trip
+        
+        Returns:
+            Dict of conversation_id -> transcript (ids without one are omitted)
+        """
+        ...
+    
     async def save_conversation(self, conversation: dict) -> str:
         """
         Save a conversation with transcript, summary, and cognitive metrics
@@ -81,13 +127,16 @@ class DataStore(Protocol):
         self,
         patient_id: str,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> list[dict]:
         """
         Get paginated wellness digests for a patient
         
+        Pass `cursor` for keyset paging; offset is ignored when given.
+        
         Returns:
-            List of digest dicts, ordered by date desc
+            List of digest dicts, ordered by created_at desc
         """
         ...
     
@@ -114,13 +163,16 @@ class DataStore(Protocol):
         patient_id: str,
         severity: Optional[str] = None,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> list[dict]:
         """
         Get alerts for a patient, optionally filtered by severity
         
+        Pass `cursor` for keyset paging; offset is ignored when given.
+        
         Returns:
-            List of alert dicts, ordered by timestamp desc
+            List of alert dicts, unacknowledged first, then timestamp desc
         """
         ...
     
@@ -187,6 +239,18 @@ class DataStore(Protocol):
         """
         ...
 
+    async def get_analytics_summary(self, patient_id: str, days: int = 30) -> dict:
+        """
+        Period-bounded statistics for reports and dashboards
+        
+        Returns:
+            Dict with conversation_count, avg_vocabulary, avg_coherence,
+            avg_repetition, avg_word_finding_pauses,
+            by_mood: {mood: {count, avg_vocabulary, avg_coherence}},
+            alerts: {total, by_severity, acknowledged}
+        """
+        ...
+    
     async def get_patient_insights(self, patient_id: str) -> dict:
         """
         Get structured content insights for a patient.
@@ -196,8 +260,49 @@ class DataStore(Protocol):
         
         Returns:
             Dict with:
-            - cognitive_by_mood: {mood: {avg_vocabulary, avg_coherence, conversation_count}}
+            - cognitive_by_mood: {mood: {avg_vocabulary, avg_coherence,
+              std_vocabulary, std_coherence, conversation_count}}
             - nostalgia_effectiveness: {with_nostalgia, without_nostalgia, improvement_pct}
             - alert_summary: {total, by_severity, most_common_type, acknowledged_count}
+        
+        Served from running aggregates updated on conversation/alert writes.
+        """
+        ...
+    
+    async def list_unnormalized(
+        self,
+        kind: str,
+        after_id: Optional[str] = None,
+        limit: int = 100
+    ) -> list[dict]:
+        """
+        Records not yet stamped with the current normalization_version
+        
+        Args:
+            kind: "conversation", "alert" or "digest"
+            after_id: Only records whose id sorts after this (resume point)
+        
+        Returns:
+            Records ordered by id asc (conversations without transcripts)
+        """
+        ...
+    
+    async def save_normalized(self, kind: str, record_id: str, fields: dict) -> bool:
+        """
+        Overwrite a record's normalized text fields (see NORMALIZED_FIELDS)
+        and its normalization_version; nothing else is touched
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        ...
+    
+    async def recompute_patient_insights(self, patient_id: str) -> dict:
+        """
+        Rebuild a patient's insight aggregates from all conversations and
+        alerts (repairs drift in the running totals)
+        
+        Returns:
+            The refreshed insights dict (same shape as get_patient_insights)
         """
         ...
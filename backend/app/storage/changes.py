@@ -0,0 +1,45 @@
+"""
+Change Notifications
+Lets caches outside the storage layer hear about writes that make their
+derived data stale, without the stores knowing who is listening.
+
+Usage:
+    on_patient_changed(prompt_cache.invalidate)
+
+Stores call patient_changed(store, patient_id) from update_patient and
+save_conversation. Inside a batch the notification is deferred until the
+batch commits (and dropped if it is discarded), so a cache refilled in
+between can't pick up pre-commit data and keep it.
+"""
+
+import logging
+from typing import Callable
+
+from .unit_of_work import current_unit_of_work
+
+logger = logging.getLogger(__name__)
+
+_patient_listeners: list[Callable[[str], None]] = []
+
+
+def on_patient_changed(listener: Callable[[str], None]) -> None:
+    """Register a listener called with the patient_id after a patient-scoped write."""
+    if listener not in _patient_listeners:
+        _patient_listeners.append(listener)
+
+
+def _notify(patient_id: str) -> None:
+    for listener in list(_patient_listeners):
+        try:
+            listener(patient_id)
+        except Exception as e:
+            logger.error(f"[CHANGES] Listener failed for patient {patient_id}: {e}")
+
+
+def patient_changed(store, patient_id: str) -> None:
+    """Notify listeners now, or when the active batch on `store` commits."""
+    uow = current_unit_of_work(store)
+    if uow is not None:
+        uow.after_commit(lambda: _notify(patient_id))
+    else:
+        _notify(patient_id)
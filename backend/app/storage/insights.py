@@ -0,0 +1,240 @@
+"""
+Insight Aggregates
+Running per-patient aggregates behind get_patient_insights.
+
+Instead of scanning every conversation and alert on each request, stores
+keep one aggregate state per patient, updated on every conversation and
+alert write:
+- per mood bucket and per nostalgia flag: count, plus n / sum / sum of
+  squares for vocabulary diversity and topic coherence
+- alert counters by severity and type, plus acknowledged count
+
+A write is expressed as increments (`conversation_changes` /
+`alert_changes`): the new version's contribution minus the previous
+version's, which the store reads from the record being replaced. Re-saving
+a conversation or acknowledging an alert therefore adjusts the totals
+instead of double counting, the state stays a fixed size however many
+records a patient has, and increments commute, so concurrent writers never
+need to lock the aggregates (Sanity applies them as `inc` patches).
+Floating-point drift or missed writes are repaired by rebuilding from
+source records — see `recompute_insights.py`.
+
+The state is a plain JSON-able dict so it can be persisted as-is.
+"""
+
+import math
+import re
+from collections import defaultdict
+from typing import Optional
+
+
+def _metric() -> dict:
+    return {"n": 0, "sum": 0.0, "sumsq": 0.0}
+
+
+def _bucket() -> dict:
+    return {"count": 0, "vocabulary": _metric(), "coherence": _metric()}
+
+
+def empty_state() -> dict:
+    return {
+        "moods": {},
+        "nostalgia": {"with": _bucket(), "without": _bucket()},
+        "alerts": {
+            "total": 0,
+            "by_severity": {"low": 0, "medium": 0, "high": 0},
+            "by_type": {},
+            "acknowledged": 0,
+        },
+    }
+
+
+def state_key(value: Optional[str], default: str) -> str:
+    """A mood or alert type usable as one segment of a dotted state path."""
+    return re.sub(r"[^A-Za-z0-9_]", "_", value) if value else default
+
+
+def _mean(m: dict) -> float:
+    return m["sum"] / m["n"] if m["n"] else 0.0
+
+
+def _stddev(m: dict) -> float:
+    if m["n"] < 2:
+        return 0.0
+    mean = m["sum"] / m["n"]
+    return math.sqrt(max(0.0, m["sumsq"] / m["n"] - mean * mean))
+
+
+def conversation_contribution(conversation: Optional[dict]) -> Optional[list]:
+    """[mood, nostalgia_triggered, vocabulary, coherence] or None if no metrics."""
+    metrics = (conversation or {}).get("cognitive_metrics")
+    if not metrics:
+        return None
+    ne = conversation.get("nostalgia_engagement")
+    return [
+        state_key(conversation.get("detected_mood"), "unknown"),
+        bool(ne and ne.get("triggered")),
+        metrics.get("vocabulary_diversity"),
+        metrics.get("topic_coherence"),
+    ]
+
+
+def alert_contribution(alert: Optional[dict]) -> Optional[list]:
+    """[severity, alert_type, acknowledged] or None for no alert."""
+    if not alert:
+        return None
+    return [
+        state_key(alert.get("severity"), "low"),
+        state_key(alert.get("alert_type"), "unknown"),
+        bool(alert.get("acknowledged")),
+    ]
+
+
+def _add_conversation(increments: dict, contribution: Optional[list], sign: int) -> None:
+    if not contribution:
+        return
+    mood, nostalgia, vocab, coherence = contribution
+    for prefix in (f"moods.{mood}", f"nostalgia.{'with' if nostalgia else 'without'}"):
+        increments[f"{prefix}.count"] += sign
+        for name, value in (("vocabulary", vocab), ("coherence", coherence)):
+            if value is None:
+                continue
+            increments[f"{prefix}.{name}.n"] += sign
+            increments[f"{prefix}.{name}.sum"] += sign * value
+            increments[f"{prefix}.{name}.sumsq"] += sign * value * value
+
+
+def _add_alert(increments: dict, contribution: Optional[list], sign: int) -> None:
+    if not contribution:
+        return
+    severity, alert_type, acknowledged = contribution
+    increments["alerts.total"] += sign
+    increments[f"alerts.by_severity.{severity}"] += sign
+    increments[f"alerts.by_type.{alert_type}"] += sign
+    if acknowledged:
+        increments["alerts.acknowledged"] += sign
+
+
+def _nonzero(increments: dict) -> dict:
+    return {path: delta for path, delta in increments.items() if delta}
+
+
+def conversation_changes(old: Optional[dict], new: Optional[dict]) -> dict:
+    """Increments (dotted state path -> delta) replacing `old`'s contribution with `new`'s."""
+    increments: dict = defaultdict(int)
+    _add_conversation(increments, conversation_contribution(old), -1)
+    _add_conversation(increments, conversation_contribution(new), +1)
+    return _nonzero(increments)
+
+
+def alert_changes(old: Optional[dict], new: Optional[dict]) -> dict:
+    """Increments (dotted state path -> delta) replacing `old`'s contribution with `new`'s."""
+    increments: dict = defaultdict(int)
+    _add_alert(increments, alert_contribution(old), -1)
+    _add_alert(increments, alert_contribution(new), +1)
+    return _nonzero(increments)
+
+
+def missing_containers(increments: dict) -> dict:
+    """Per-key entries (mood buckets, alert type/severity counters) an increment may need created first."""
+    containers = {}
+    for path in increments:
+        parts = path.split(".")
+        if parts[0] == "moods":
+            containers[f"moods.{parts[1]}"] = _bucket()
+        elif parts[0] == "alerts" and parts[1] in ("by_severity", "by_type"):
+            containers[path] = 0
+    return containers
+
+
+class InsightAggregates:
+    """Mutable aggregate state for one patient."""
+
+    def __init__(self, state: Optional[dict] = None):
+        self.state = state if state is not None else empty_state()
+
+    def apply(self, increments: dict) -> None:
+        """Add increments from conversation_changes / alert_changes to the state."""
+        for path, default in missing_containers(increments).items():
+            *parents, leaf = path.split(".")
+            node = self.state
+            for part in parents:
+                node = node[part]
+            node.setdefault(leaf, default)
+        for path, delta in increments.items():
+            *parents, leaf = path.split(".")
+            node = self.state
+            for part in parents:
+                node = node[part]
+            node[leaf] += delta
+
+    def add_conversation(self, conversation: dict, previous: Optional[dict] = None) -> None:
+        """Fold a saved conversation into the aggregates, replacing `previous` (the version it overwrote)."""
+        self.apply(conversation_changes(previous, conversation))
+
+    def add_alert(self, alert: dict, previous: Optional[dict] = None) -> None:
+        """Fold a saved alert into the aggregates, replacing `previous` (the version it overwrote)."""
+        self.apply(alert_changes(previous, alert))
+
+    # -- read side -----------------------------------------------------------
+
+    def summary(self) -> dict:
+        """The get_patient_insights payload, computed from the aggregates in O(1)."""
+        cognitive_by_mood = {
+            mood: {
+                "avg_vocabulary": round(_mean(b["vocabulary"]), 3),
+                "avg_coherence": round(_mean(b["coherence"]), 3),
+                "std_vocabulary": round(_stddev(b["vocabulary"]), 3),
+                "std_coherence": round(_stddev(b["coherence"]), 3),
+                "conversation_count": b["count"],
+            }
+            for mood, b in self.state["moods"].items()
+            if b["count"] > 0
+        }
+
+        with_n = self.state["nostalgia"]["with"]
+        without_n = self.state["nostalgia"]["without"]
+        wv, wov = _mean(with_n["vocabulary"]), _mean(without_n["vocabulary"])
+        wc, woc = _mean(with_n["coherence"]), _mean(without_n["coherence"])
+        vocab_imp = ((wv - wov) / wov * 100) if wov > 0 else 0
+        coh_imp = ((wc - woc) / woc * 100) if woc > 0 else 0
+
+        alerts = self.state["alerts"]
+        by_type = {t: n for t, n in alerts["by_type"].items() if n > 0}
+        most_common = max(by_type.items(), key=lambda x: x[1])[0] if by_type else "none"
+
+        return {
+            "cognitive_by_mood": cognitive_by_mood,
+            "nostalgia_effectiveness": {
+                "with_nostalgia": {
+                    "avg_vocabulary": round(wv, 3),
+                    "avg_coherence": round(wc, 3),
+                    "count": with_n["count"],
+                },
+                "without_nostalgia": {
+                    "avg_vocabulary": round(wov, 3),
+                    "avg_coherence": round(woc, 3),
+                    "count": without_n["count"],
+                },
+                "improvement_pct": {
+                    "vocabulary": round(vocab_imp, 1),
+                    "coherence": round(coh_imp, 1),
+                },
+            },
+            "alert_summary": {
+                "total": alerts["total"],
+                "by_severity": dict(alerts["by_severity"]),
+                "most_common_type": most_common,
+                "acknowledged_count": alerts["acknowledged"],
+            },
+        }
+
+    @classmethod
+    def rebuild(cls, conversations: list[dict], alerts: list[dict]) -> "InsightAggregates":
+        """Recompute from source records (used for backfill and drift repair)."""
+        aggregates = cls()
+        for conv in conversations:
+            aggregates.add_conversation(conv)
+        for alert in alerts:
+            aggregates.add_alert(alert)
+        return aggregates
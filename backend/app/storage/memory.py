@@ -11,6 +11,19 @@ from typing import Optional
 from collections import defaultdict
 
 from app.cognitive.utils import calculate_cognitive_score
+from .pagination import ALERT_ORDER, CONVERSATION_ORDER, DIGEST_ORDER, keyset_page
+from .timeseries import CognitiveTimeSeries
+from .insights import InsightAggregates
+from .analytics import summarize
+from .transcripts import compress_transcript, decompress_transcript, split_transcript
+from .changes import patient_changed
+from .normalization import NORMALIZATION_VERSION, NORMALIZED_FIELDS, normalize_on_write
+from .unit_of_work import (
+    UnitOfWork,
+    RevisionConflictError,
+    current_unit_of_work,
+    merge_pending_conversations,
+)
 
 
 class InMemoryDataStore:
@@ -28,9 +41,27 @@ class InMemoryDataStore:
         self.alerts = {}
         self.family_contacts = {}
         self.consecutive_deviations = defaultdict(dict)
+        # Revision counters for optimistically-locked docs (baseline, deviation tracker)
+        self._revisions: dict[str, int] = {}
+        
+        # Compressed transcript blobs, keyed by transcript_ref
+        self.transcript_blobs: dict[str, str] = {}
         
         # Seed test data
         self._seed_data()
+        for conv_id, conv in list(self.conversations.items()):
+            self.conversations[conv_id] = self._store_transcript(conv)
+
+        # Per-patient cognitive series, kept in step by save_conversation
+        self.series: dict[str, CognitiveTimeSeries] = defaultdict(CognitiveTimeSeries)
+        for conv in self.conversations.values():
+            self.series[conv["patient_id"]].add_conversation(conv)
+
+        # Per-patient insight aggregates, kept in step by conversation/alert writes
+        self.insights: dict[str, InsightAggregates] = defaultdict(InsightAggregates)
+        seeded = {r["patient_id"] for r in [*self.conversations.values(), *self.alerts.values()]}
+        for patient_id in seeded:
+            self.insights[patient_id] = self._rebuild_insights(patient_id)
     
     def _seed_data(self):
         """Populate with Dorothy test data"""
@@ -301,14 +332,83 @@ class InMemoryDataStore:
         """Calculate composite cognitive score (0-100) - delegates to shared utility"""
         return calculate_cognitive_score(metrics)
     
+    # =========================================================================
+    # Unit of work (batched writes)
+    # =========================================================================
+
+    def batch(self) -> UnitOfWork:
+        """
+        Collect writes made inside `async with store.batch():` and apply them
+        together on exit. Baseline and deviation-tracker writes are checked
+        against the revision seen when they were read, mirroring Sanity's
+        ifRevisionID semantics.
+        """
+        return UnitOfWork(self, self._commit_batch)
+
+    async def _commit_batch(self, uow: UnitOfWork) -> None:
+        # Verify every guard first, then apply — no awaits, so this is atomic
+        for guard_key, expected, _ in uow.operations:
+            if guard_key is not None and self._revision(guard_key) != expected:
+                raise RevisionConflictError(
+                    f"{guard_key} changed since it was read "
+                    f"(expected revision {expected}, found {self._revision(guard_key)})"
+                )
+        for _, _, apply in uow.operations:
+            apply()
+
+    def _revision(self, key: str) -> Optional[int]:
+        """Current revision of a locked doc, or None if it does not exist."""
+        if key.startswith("baseline-"):
+            exists = key[len("baseline-"):] in self.baselines
+        else:
+            exists = key[len("deviation-tracker-"):] in self.consecutive_deviations
+        return self._revisions.get(key, 0) if exists else None
+
+    def _write(self, apply, guard_key: Optional[str] = None) -> None:
+        """Apply a write now, or queue it if a batch is active."""
+        uow = current_unit_of_work(self)
+        if uow is None:
+            apply()
+            if guard_key is not None:
+                self._revisions[guard_key] = self._revisions.get(guard_key, 0) + 1
+            return
+
+        expected = uow.expected_revisions.get(guard_key) if guard_key else None
+        has_guard = guard_key is not None and guard_key in uow.expected_revisions
+
+        def apply_and_bump():
+            apply()
+            if guard_key is not None:
+                self._revisions[guard_key] = self._revisions.get(guard_key, 0) + 1
+
+        uow.add((guard_key if has_guard else None, expected, apply_and_bump))
+
     # DataStore protocol implementation
     
     async def get_patient(self, patient_id: str) -> Optional[dict]:
         return self.patients.get(patient_id)
     
+    async def get_patient_birth_years(self) -> list[int]:
+        return sorted({p["birth_year"] for p in self.patients.values() if p.get("birth_year")})
+    
+    async def get_call_schedules(self) -> list[dict]:
+        schedules = []
+        for p in self.patients.values():
+            sched = p.get("call_schedule") or {}
+            if sched.get("preferred_time") and p.get("phone_number"):
+                schedules.append({
+                    "patient_id": p["id"],
+                    "name": p.get("preferred_name") or p.get("name"),
+                    "phone_number": p["phone_number"],
+                    "preferred_time": sched["preferred_time"],
+                    "timezone": sched.get("timezone") or (p.get("location") or {}).get("timezone"),
+                })
+        return schedules
+    
     async def update_patient(self, patient_id: str, updates: dict) -> bool:
         if patient_id in self.patients:
-            self.patients[patient_id].update(updates)
+            self._write(lambda: self.patients[patient_id].update(updates))
+            patient_changed(self, patient_id)
             return True
         return False
     
@@ -316,42 +416,88 @@ class InMemoryDataStore:
         self,
         patient_id: str,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> list[dict]:
         convs = [
             c for c in self.conversations.values()
             if c["patient_id"] == patient_id
         ]
-        convs.sort(key=lambda x: x["timestamp"], reverse=True)
-        return convs[offset:offset+limit]
+        if cursor:
+            return keyset_page(convs, CONVERSATION_ORDER, limit, cursor)
+        page = keyset_page(convs, CONVERSATION_ORDER, offset + limit)[offset:]
+        return merge_pending_conversations(
+            current_unit_of_work(self), patient_id, page, limit, offset
+        )
     
     async def get_conversation(self, conversation_id: str) -> Optional[dict]:
-        return self.conversations.get(conversation_id)
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            return None
+        # Lazy load: the transcript is only decompressed for detail reads
+        blob = self.transcript_blobs.get(conversation.get("transcript_ref"))
+        return {**conversation, "transcript": decompress_transcript(blob)}
+    
+    async def get_transcripts(self, conversation_ids: list[str]) -> dict[str, str]:
+        transcripts = {}
+        for conv_id in conversation_ids:
+            ref = (self.conversations.get(conv_id) or {}).get("transcript_ref")
+            if ref in self.transcript_blobs:
+                transcripts[conv_id] = decompress_transcript(self.transcript_blobs[ref])
+        return transcripts
+    
+    def _store_transcript(self, conversation: dict) -> dict:
+        """Move a conversation's transcript into a blob; returns the metadata record."""
+        metadata, transcript = split_transcript(conversation)
+        if transcript:
+            self.transcript_blobs[metadata["transcript_ref"]] = compress_transcript(transcript)
+        return metadata
     
     async def save_conversation(self, conversation: dict) -> str:
         conv_id = conversation.get("id") or f"conversation-{uuid.uuid4().hex[:8]}"
         conversation["id"] = conv_id
-        self.conversations[conv_id] = conversation
+        normalize_on_write("conversation", conversation)
+        metadata, _ = split_transcript(conversation)
+        uow = current_unit_of_work(self)
+        if uow is not None:
+            uow.pending_conversations[conv_id] = metadata
+        def apply():
+            previous = self.conversations.get(conv_id)
+            self.conversations[conv_id] = self._store_transcript(conversation)
+            self.series[conversation["patient_id"]].add_conversation(metadata)
+            self.insights[conversation["patient_id"]].add_conversation(metadata, previous)
+
+        self._write(apply)
+        patient_changed(self, conversation["patient_id"])
         return conv_id
     
     async def get_cognitive_baseline(self, patient_id: str) -> Optional[dict]:
+        uow = current_unit_of_work(self)
+        if uow is not None:
+            key = f"baseline-{patient_id}"
+            uow.expect_revision(key, self._revision(key))
         return self.baselines.get(patient_id)
     
     async def save_cognitive_baseline(self, patient_id: str, baseline: dict) -> None:
-        self.baselines[patient_id] = baseline
+        self._write(
+            lambda: self.baselines.__setitem__(patient_id, baseline),
+            guard_key=f"baseline-{patient_id}",
+        )
     
     async def get_wellness_digests(
         self,
         patient_id: str,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> list[dict]:
         digests = [
             d for d in self.digests.values()
             if d["patient_id"] == patient_id
         ]
-        digests.sort(key=lambda x: x["date"], reverse=True)
-        return digests[offset:offset+limit]
+        if cursor:
+            return keyset_page(digests, DIGEST_ORDER, limit, cursor)
+        return keyset_page(digests, DIGEST_ORDER, offset + limit)[offset:]
     
     async def get_latest_wellness_digest(self, patient_id: str) -> Optional[dict]:
         digests = await self.get_wellness_digests(patient_id, limit=1)
@@ -360,7 +506,8 @@ class InMemoryDataStore:
     async def save_wellness_digest(self, digest: dict) -> str:
         digest_id = digest.get("id") or f"digest-{uuid.uuid4().hex[:8]}"
         digest["id"] = digest_id
-        self.digests[digest_id] = digest
+        normalize_on_write("digest", digest)
+        self._write(lambda: self.digests.__setitem__(digest_id, digest))
         return digest_id
     
     async def get_alerts(
@@ -368,7 +515,8 @@ class InMemoryDataStore:
         patient_id: str,
         severity: Optional[str] = None,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> list[dict]:
         alerts = [
             a for a in self.alerts.values()
@@ -376,18 +524,31 @@ class InMemoryDataStore:
         ]
         if severity:
             alerts = [a for a in alerts if a["severity"] == severity]
-        alerts.sort(key=lambda x: x["timestamp"], reverse=True)
-        return alerts[offset:offset+limit]
+        if cursor:
+            return keyset_page(alerts, ALERT_ORDER, limit, cursor)
+        return keyset_page(alerts, ALERT_ORDER, offset + limit)[offset:]
     
     async def save_alert(self, alert: dict) -> str:
         alert_id = alert.get("id") or f"alert-{uuid.uuid4().hex[:8]}"
         alert["id"] = alert_id
-        self.alerts[alert_id] = alert
+        normalize_on_write("alert", alert)
+        def apply():
+            previous = self.alerts.get(alert_id)
+            self.alerts[alert_id] = alert
+            self.insights[alert["patient_id"]].add_alert(alert, previous)
+
+        self._write(apply)
         return alert_id
     
     async def update_alert(self, alert_id: str, updates: dict) -> bool:
         if alert_id in self.alerts:
-            self.alerts[alert_id].update(updates)
+            def apply():
+                alert = self.alerts[alert_id]
+                previous = dict(alert)
+                alert.update(updates)
+                self.insights[alert["patient_id"]].add_alert(alert, previous)
+
+            self._write(apply)
             return True
         return False
     
@@ -398,149 +559,84 @@ class InMemoryDataStore:
         ]
     
     async def get_consecutive_deviations(self, patient_id: str) -> dict:
-        return self.consecutive_deviations.get(patient_id, {})
+        uow = current_unit_of_work(self)
+        if uow is not None:
+            key = f"deviation-tracker-{patient_id}"
+            uow.expect_revision(key, self._revision(key))
+        # Copy so callers mutating the counters don't bypass update_consecutive_deviations
+        return dict(self.consecutive_deviations.get(patient_id, {}))
     
     async def update_consecutive_deviations(
         self,
         patient_id: str,
         deviations: dict
     ) -> None:
-        self.consecutive_deviations[patient_id] = deviations
+        self._write(
+            lambda: self.consecutive_deviations.__setitem__(patient_id, deviations),
+            guard_key=f"deviation-tracker-{patient_id}",
+        )
     
     async def get_cognitive_trends(
         self,
         patient_id: str,
         days: int = 30
     ) -> list[dict]:
-        """Get time-series cognitive metrics"""
-        cutoff = datetime.now(UTC) - timedelta(days=days)
-        
-        convs = [
-            c for c in self.conversations.values()
-            if c["patient_id"] == patient_id 
-            and datetime.fromisoformat(c["timestamp"]) >= cutoff
-        ]
-        convs.sort(key=lambda x: x["timestamp"])
-        
-        trends = []
-        for conv in convs:
-            metrics = conv.get("cognitive_metrics", {})
-            if metrics:
-                trends.append({
-                    "date": datetime.fromisoformat(conv["timestamp"]).date().isoformat(),
-                    "vocabulary_diversity": metrics.get("vocabulary_diversity"),
-                    "topic_coherence": metrics.get("topic_coherence"),
-                    "repetition_rate": metrics.get("repetition_rate"),
-                    "word_finding_pauses": metrics.get("word_finding_pauses"),
-                    "cognitive_score": self._calculate_cognitive_score(metrics)
-                })
-        
-        return trends
+        """Get time-series cognitive metrics (binary search into the patient's series)"""
+        series = self.series.get(patient_id)
+        if series is None:
+            return []
+        return series.window(datetime.now(UTC) - timedelta(days=days))
+
+    async def get_analytics_summary(self, patient_id: str, days: int = 30) -> dict:
+        """Period-bounded cognitive/alert statistics"""
+        return summarize(
+            [c for c in self.conversations.values() if c["patient_id"] == patient_id],
+            [a for a in self.alerts.values() if a["patient_id"] == patient_id],
+            datetime.now(UTC) - timedelta(days=days),
+            days,
+        )
 
     async def get_patient_insights(self, patient_id: str) -> dict:
         """
         Get structured content insights for a patient.
-        Showcase for Sanity challenge: features impossible with flat files.
+        Served from running aggregates maintained on every write.
         """
-        # Get all conversations for the patient
-        all_convs = [
-            c for c in self.conversations.values()
-            if c["patient_id"] == patient_id
-        ]
+        aggregates = self.insights.get(patient_id) or InsightAggregates()
+        return aggregates.summary()
 
-        # --- Cognitive by Mood ---
-        mood_stats: dict = {}
-        for conv in all_convs:
-            mood = conv.get("detected_mood", "unknown")
-            metrics = conv.get("cognitive_metrics")
-            if not metrics:
-                continue
-            if mood not in mood_stats:
-                mood_stats[mood] = {"vocabs": [], "coherences": [], "count": 0}
-            vocab = metrics.get("vocabulary_diversity")
-            coherence = metrics.get("topic_coherence")
-            if vocab is not None:
-                mood_stats[mood]["vocabs"].append(vocab)
-            if coherence is not None:
-                mood_stats[mood]["coherences"].append(coherence)
-            mood_stats[mood]["count"] += 1
+    async def recompute_patient_insights(self, patient_id: str) -> dict:
+        """Rebuild a patient's insight aggregates from source records."""
+        self.insights[patient_id] = self._rebuild_insights(patient_id)
+        return self.insights[patient_id].summary()
 
-        cognitive_by_mood = {}
-        for mood, stats in mood_stats.items():
-            avg_v = sum(stats["vocabs"]) / len(stats["vocabs"]) if stats["vocabs"] else 0
-            avg_c = sum(stats["coherences"]) / len(stats["coherences"]) if stats["coherences"] else 0
-            cognitive_by_mood[mood] = {
-                "avg_vocabulary": round(avg_v, 3),
-                "avg_coherence": round(avg_c, 3),
-                "conversation_count": stats["count"]
-            }
-
-        # --- Nostalgia Effectiveness ---
-        with_nostalgia = []
-        without_nostalgia = []
-        for conv in all_convs:
-            metrics = conv.get("cognitive_metrics")
-            if not metrics:
-                continue
-            ne = conv.get("nostalgia_engagement")
-            if ne and ne.get("triggered"):
-                with_nostalgia.append(metrics)
-            else:
-                without_nostalgia.append(metrics)
-
-        def _avg(lst: list, key: str) -> float:
-            vals = [m[key] for m in lst if m.get(key) is not None]
-            return sum(vals) / len(vals) if vals else 0.0
+    def _rebuild_insights(self, patient_id: str) -> InsightAggregates:
+        return InsightAggregates.rebuild(
+            [c for c in self.conversations.values() if c["patient_id"] == patient_id],
+            [a for a in self.alerts.values() if a["patient_id"] == patient_id],
+        )
 
-        wv = _avg(with_nostalgia, "vocabulary_diversity")
-        wov = _avg(without_nostalgia, "vocabulary_diversity")
-        wc = _avg(with_nostalgia, "topic_coherence")
-        woc = _avg(without_nostalgia, "topic_coherence")
+    def _records(self, kind: str) -> dict:
+        return {"conversation": self.conversations, "alert": self.alerts, "digest": self.digests}[kind]
 
-        vocab_imp = ((wv - wov) / wov * 100) if wov > 0 else 0
-        coh_imp = ((wc - woc) / woc * 100) if woc > 0 else 0
-
-        nostalgia_effectiveness = {
-            "with_nostalgia": {
-                "avg_vocabulary": round(wv, 3),
-                "avg_coherence": round(wc, 3),
-                "count": len(with_nostalgia)
-            },
-            "without_nostalgia": {
-                "avg_vocabulary": round(wov, 3),
-                "avg_coherence": round(woc, 3),
-                "count": len(without_nostalgia)
-            },
-            "improvement_pct": {
-                "vocabulary": round(vocab_imp, 1),
-                "coherence": round(coh_imp, 1)
-            }
-        }
-
-        # --- Alert Summary ---
-        patient_alerts = [
-            a for a in self.alerts.values()
-            if a["patient_id"] == patient_id
-        ]
-        severity_counts = {"low": 0, "medium": 0, "high": 0}
-        type_counts: dict = {}
-        for alert in patient_alerts:
-            sev = alert.get("severity", "low")
-            severity_counts[sev] = severity_counts.get(sev, 0) + 1
-            at = alert.get("alert_type", "unknown")
-            type_counts[at] = type_counts.get(at, 0) + 1
-
-        most_common = max(type_counts.items(), key=lambda x: x[1])[0] if type_counts else "none"
-
-        alert_summary = {
-            "total": len(patient_alerts),
-            "by_severity": severity_counts,
-            "most_common_type": most_common,
-            "acknowledged_count": sum(1 for a in patient_alerts if a.get("acknowledged"))
-        }
+    async def list_unnormalized(
+        self,
+        kind: str,
+        after_id: Optional[str] = None,
+        limit: int = 100
+    ) -> list[dict]:
+        pending = sorted(
+            (r for r in self._records(kind).values()
+             if (r.get("normalization_version") or 0) < NORMALIZATION_VERSION
+             and r["id"] > (after_id or "")),
+            key=lambda r: r["id"],
+        )
+        return [dict(r) for r in pending[:limit]]
 
-        return {
-            "cognitive_by_mood": cognitive_by_mood,
-            "nostalgia_effectiveness": nostalgia_effectiveness,
-            "alert_summary": alert_summary
-        }
+    async def save_normalized(self, kind: str, record_id: str, fields: dict) -> bool:
+        record = self._records(kind).get(record_id)
+        if record is None:
+            return False
+        updates = {k: fields[k] for k in NORMALIZED_FIELDS[kind] if k in fields}
+        updates["normalization_version"] = fields.get("normalization_version", NORMALIZATION_VERSION)
+        self._write(lambda: record.update(updates))
+        return True
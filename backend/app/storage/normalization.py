@@ -0,0 +1,612 @@
+"""
+Record Normalization
+Plain-English rewrites for conversation summaries, alert text and wellness
+digest highlights.
+
+These regex rules used to run on every read. Stores now apply them once,
+when a record is written, and stamp it with normalization_version; read
+handlers return stamped records untouched. Records written before that
+are normalized on read as before until backfill_normalization.py has
+rewritten and stamped them.
+
+Bump NORMALIZATION_VERSION when the rules change so the backfill picks
+up records normalized under the old rules.
+"""
+
+import re
+from typing import Optional
+
+NORMALIZATION_VERSION = 1
+
+# Fields each record kind carries after normalization
+NORMALIZED_FIELDS = {
+    "conversation": ("summary",),
+    "alert": ("description", "suggested_action"),
+    "digest": ("highlights", "recommendations"),
+}
+
+
+def is_normalized(record: Optional[dict]) -> bool:
+    """True if the record was normalized under the current rules"""
+    return bool(record) and (record.get("normalization_version") or 0) >= NORMALIZATION_VERSION
+
+
+# ---------------------------------------------------------------------------
+# Summary normalizer — strips raw AI preamble from stored summaries
+# ---------------------------------------------------------------------------
+
+_SUMMARY_NOISE = [
+    # "A wellness check-in phone call between Clara... "
+    re.compile(r"A wellness check-in phone call between Clara[^.]+\.\s*", re.I),
+    # "between Clara (an AI companion)..."
+    re.compile(r"between Clara \(an AI companion\)[^,.]*, ?", re.I),
+    # "Summarizing the call, Clara..." or just "Summarizing the call,"
+    re.compile(r"Summarizing the call,?\s*Clara[^.]+\.\s*", re.I),
+    re.compile(r"Summarizing the call,?\s*", re.I),
+    # "discussed topics such as mood, stress..."
+    re.compile(r"discussed topics such as [^.]+\.\s*", re.I),
+    # "(an AI companion)"
+    re.compile(r"\(an AI companion\)", re.I),
+    # "Clara asks" sentence starts
+    re.compile(r"^Clara asks[^.]+\.\s*", re.I | re.M),
+    # "A customer named Clara talks to <name> about..." style preamble
+    re.compile(r"A customer named Clara[^.]+\.\s*", re.I),
+    # --- Deepgram generic-label structural preambles ---
+    # "A caller and a host discuss a wellness phone call with an elderly adult."
+    re.compile(r"A (?:caller|customer) and (?:a |the )?host discuss(?:es)?.*?\.\s*", re.I),
+    # "They discuss the importance of..." / "They also talk about..."
+    re.compile(r"(?:They|The host and (?:the )?caller) (?:also )?(?:discuss(?:es)?|talk(?:s)? about).*?\.\s*", re.I),
+    # "They discuss" mid-sentence (leftover)
+    re.compile(r"They discuss .*?\.\s*", re.I),
+    # "Patient discussed:" fallback prefix
+    re.compile(r"^Patient discussed:\s*", re.I),
+    # "Topic: " prefix
+    re.compile(r"^Topic:\s*", re.I),
+]
+
+# Inline Clara references → "the companion"
+_CLARA_REF = re.compile(r"\bClara\b")
+
+# Replace "the patient" with she/her based on position — subject vs object
+_THE_PATIENT_SUBJECT = re.compile(r"\bThe patient\b")   # sentence-start (capitalised)
+_THE_PATIENT_OBJECT  = re.compile(r"\bthe patient\b")   # mid-sentence (lowercase)
+
+# Fix "their" when clearly referring to the patient
+_THEIR_POSSESSIVE = re.compile(r"\btheir\b", re.I)
+
+
+def clean_summary(raw: str) -> str:
+    """
+    Strip AI-system preamble and persona references from a stored summary.
+    Returns a clean, family-friendly third-person description.
+    """
+    if not raw:
+        return raw
+
+    text = raw.strip()
+    
+    # Transform Deepgram structural preambles into personalized summaries
+    # Step 1: Remove generic openers entirely
+    text = re.sub(
+        r"A (?:caller|customer) and (?:a |the )?host discuss(?:es)? a wellness phone call "
+        r"with an elderly (?:adult|patient|woman|man)\.\s*",
+        "", text, flags=re.I
+    )
+    # "A caller named Summarizes a wellness phone call ..." — Deepgram treats verb as name
+    # Also handles: "A caller named <Name> summarizes..."
+    text = re.sub(
+        r"A (?:caller|customer) named \w+\s+(?:a |the )?(?:wellness )?(?:phone )?(?:call|check-in)[^.]+\.\s*",
+        "", text, flags=re.I
+    )
+    text = re.sub(
+        r"A (?:caller|customer) named \w+ (?:summarizes|describes|discusses|talks about)[^.]+\.\s*",
+        "", text, flags=re.I
+    )
+    # "A customer named Clara talks to <name> about..." — already in _SUMMARY_NOISE but reinforce
+    text = re.sub(r"A customer named Clara[^.]+\.\s*", "", text, flags=re.I)
+
+    # Step 2: Transform "They discuss the importance of X" → "She talked about X"
+    text = re.sub(
+        r"They discuss(?:es)? the importance of ",
+        "She talked about ", text, flags=re.I
+    )
+    # Step 3: Transform "They also talk about the importance of X" → "She also mentioned X"
+    text = re.sub(
+        r"They also (?:talk|talked) about the importance of ",
+        "She also mentioned ", text, flags=re.I
+    )
+    # Step 4: Transform remaining "They also talk/discuss/mention X" → "She also talked about X"
+    text = re.sub(
+        r"They also (?:talk|talked|discuss(?:es)?|mention(?:ed)?) (?:about )?",
+        "She also talked about ", text, flags=re.I
+    )
+    # Step 5: Transform "They discuss X" → "She talked about X"
+    text = re.sub(
+        r"They discuss(?:es)? ",
+        "She talked about ", text, flags=re.I
+    )
+
+    # Step 6: Replace impersonal role labels
+    # "the representative" / "the host" → "Clara" (more natural than 'the companion')
+    text = re.sub(r"\bthe representative\b", "Clara", text, flags=re.I)
+    # NOTE: do NOT replace "Clara" with "the companion" — it garbles natural summaries
+    # e.g. "Clara and Emily discussed lunch" should stay as-is
+
+    # Step 7: Replace Deepgram generic patient labels → pronouns
+    text = re.sub(r"\bthe elderly (?:adult|patient|woman|man)\b", "she", text, flags=re.I)
+    text = re.sub(r"\bthe (?:caller|customer)\b", "she", text, flags=re.I)
+    text = _THE_PATIENT_SUBJECT.sub("She", text)
+    text = _THE_PATIENT_OBJECT.sub("her", text)
+    text = _THEIR_POSSESSIVE.sub("her", text)
+
+    # Step 8: Strip filler closing sentences
+    text = re.sub(
+        r"The call (?:ends|ended) with (?:her|she) (?:thanking|saying)[^.]+\.\s*",
+        "", text, flags=re.I
+    )
+
+    # Step 9: Strip noise pattern list (iterative)
+    changed = True
+    while changed:
+        changed = False
+        for pattern in _SUMMARY_NOISE:
+            new = pattern.sub("", text).strip()
+            if new != text:
+                text = new
+                changed = True
+
+
+    # Clean up spacing artefacts
+    text = re.sub(r"\s{2,}", " ", text).strip()
+
+    # Capitalise first letter of each sentence  
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    sentences = [s[0].upper() + s[1:] if s else s for s in sentences]
+    text = " ".join(sentences)
+
+    # Ensure ends with a period
+    if text and text[-1] not in (".", "!", "?"):
+        text += "."
+
+    return text
+
+
+# ---------------------------------------------------------------------------
+# Legacy highlight/recommendation normalizer
+# Rewrites old technical text in wellness digest highlights and recommendations.
+# ---------------------------------------------------------------------------
+
+_NOISE_PHRASES = [
+    re.compile(r"Clara \(an AI companion\)", re.I),
+    re.compile(r"between Clara and", re.I),
+    re.compile(r"an AI companion", re.I),
+    re.compile(r"Summarizing the call,?", re.I),
+    re.compile(r"Safety concerns detected:\s*Safety keyword '[^']+': \"[^\"]*\"", re.I),
+    re.compile(r"Loneliness expressed:\s*", re.I),
+    re.compile(r"Overall sentiment:\s*\w+\s*\(score:\s*[\d.]+\)", re.I),
+    re.compile(r"Low conversation coherence \([\d.]+\)", re.I),
+    re.compile(r"Memory inconsistency detected[:\s]*", re.I),
+    re.compile(r"Action needed:\s*Confabulation detected:.*", re.I),
+    re.compile(r"Action needed:\s*Wants family connection:.*", re.I),
+    re.compile(r"Engagement level:\s*\w+\.", re.I),
+    re.compile(r"Medication discussed:", re.I),
+]
+
+_REPLACEMENT_MAP = [
+    # Safety concerns — raw keyword dump → warm advisory
+    (
+        re.compile(r"Safety concerns detected:.*", re.I | re.DOTALL),
+        "⚠️ She said something during this call that is a cause for concern. "
+        "Please review the alert and consider reaching out to her soon."
+    ),
+    # Loneliness
+    (
+        re.compile(r"Loneliness expressed:\s*.+", re.I),
+        "She expressed feelings of loneliness or missing people she loves."
+    ),
+    # Raw sentiment score
+    (
+        re.compile(r"Overall sentiment:\s*(\w+)\s*\(score:\s*[\d.+-]+\)", re.I),
+        lambda m: {
+            "positive": "Her overall tone during the call felt upbeat and positive.",
+            "negative": "Her overall tone during the call felt low or subdued.",
+        }.get(m.group(1).lower(), "Her overall tone during the call felt calm and neutral.")
+    ),
+    # Engagement level — raw enum
+    (
+        re.compile(r"Engagement level:\s*(\w+)\.", re.I),
+        lambda m: {
+            "high": "She was chatty and engaged throughout the call — a great sign.",
+            "medium": "She had a comfortable, relaxed conversation today.",
+            "low": "She was quieter than usual. A follow-up check-in might be helpful.",
+        }.get(m.group(1).lower(), "")
+    ),
+    # Low coherence with raw number
+    (
+        re.compile(r"⚠️?\s*Low conversation coherence \([\d.]+\)[^.]*\.", re.I),
+        "⚠️ Today's conversation was harder to follow than usual — she jumped between topics "
+        "and had difficulty staying on one thread. This may be worth a gentle check-in."
+    ),
+    # Old memory inconsistency one-liner
+    (
+        re.compile(r"⚠️?\s*Memory inconsistency detected during conversation\.", re.I),
+        "⚠️ She gave some conflicting answers during the conversation. "
+        "This can sometimes be an early sign of short-term memory changes and is worth watching."
+    ),
+    # Action needed: confabulation / raw transcript
+    (
+        re.compile(r"Action needed:\s*Confabulation detected:.*", re.I),
+        "⚠️ She gave some conflicting answers during the conversation — worth watching over time."
+    ),
+    (
+        re.compile(r"Action needed:\s*Wants family connection:.*", re.I),
+        "She expressed a desire to connect with family soon — a short call or visit would mean a lot."
+    ),
+    (
+        re.compile(r"Action needed:\s*Expressed feelings of loneliness", re.I),
+        "She mentioned feeling lonely. Reaching out with a call or visit soon would be meaningful."
+    ),
+    # Patient engagement — old phrasing
+    (
+        re.compile(r"Patient was highly engaged and talkative\.", re.I),
+        "She was chatty and engaged throughout the call — a great sign."
+    ),
+    (
+        re.compile(r"Patient had moderate engagement during the call\.", re.I),
+        "She had a comfortable, relaxed conversation today."
+    ),
+    (
+        re.compile(r"Patient was quieter than usual during the call\.", re.I),
+        "She was quieter than usual. A follow-up check-in might be helpful."
+    ),
+    # Medication phrasing
+    (
+        re.compile(r"Medication discussed:", re.I),
+        "Medication update:"
+    ),
+    (
+        re.compile(r"Medication was discussed during the call\.", re.I),
+        "Medication was briefly mentioned during the call."
+    ),
+    # Old recommendation phrasing — rewrite to concrete family actions
+    (
+        re.compile(r"Conversation coherence was low\..*", re.I),
+        "Consider giving her a call yourself today — a familiar voice can help when she's having a harder time expressing herself."
+    ),
+    (
+        re.compile(r"Conversation coherence has declined compared to baseline\..*", re.I),
+        "This pattern has continued for a few calls — it may be worth bringing up at her next doctor's appointment."
+    ),
+    (
+        re.compile(r"Vocabulary diversity has decreased compared to baseline\..*", re.I),
+        "Her language has felt more limited lately. A call or visit where you share stories, photos, or news could give her something richer to engage with."
+    ),
+    (
+        re.compile(r"Several word-finding pauses were noted\..*", re.I),
+        "If this keeps happening over the next few days, mention it to her doctor at the next scheduled visit."
+    ),
+    (
+        re.compile(r"Some repetition was detected\..*", re.I),
+        "Try giving her a call and bringing up something new — upcoming family plans, a shared memory, or something she's looking forward to."
+    ),
+]
+_NOISE_STRIP_PATTERNS = [
+    # Full sentence: "A wellness check-in phone call between Clara (an AI companion) and an elderly patient discussed ..."
+    re.compile(
+        r"A wellness check-in phone call between Clara[^.]+\.\s*",
+        re.I
+    ),
+    # Partial: "between Clara (an AI companion) and ..."
+    re.compile(r"between Clara \(an AI companion\) and an elderly patient[,.]?\s*", re.I),
+    # "Summarizing the call, Clara ..." — remove up to the end of that clause
+    re.compile(r"Summarizing the call,?\s*Clara[^.]+\.\s*", re.I),
+    # Bare "Summarizing the call,"
+    re.compile(r"Summarizing the call,?\s*", re.I),
+    # Deepgram caller and host
+    re.compile(r"A (?:caller|customer) and (?:a |the )?host discuss(?:es)?[^.]+\.\s*", re.I),
+    re.compile(r"(?:They|The host and (?:the )?caller) (?:also )?(?:discuss(?:es)?|talk(?:s)? about)[^.]+\.\s*", re.I),
+    re.compile(r"They discuss [^.]+\.\s*", re.I),
+]
+
+
+def clean_highlight(h: str) -> str:
+    """Apply all normalisation rules to a single highlight string."""
+    if not h:
+        return h
+    # First try the full replacement map
+    for pattern, replacement in _REPLACEMENT_MAP:
+        if pattern.search(h):
+            if callable(replacement):
+                m = pattern.search(h)
+                return replacement(m)
+            return replacement
+    # Then strip noise phrases that are partial prefixes
+    for pattern in _NOISE_STRIP_PATTERNS:
+        h = pattern.sub("", h).strip()
+
+    # Apply pronoun replacements
+    h = _THE_PATIENT_SUBJECT.sub("She", h)
+    h = _THE_PATIENT_OBJECT.sub("her", h)
+    h = _THEIR_POSSESSIVE.sub("her", h)
+    h = re.sub(r"\bthe elderly (?:adult|patient|woman|man)\b", "she", h, flags=re.I)
+    h = re.sub(r"\bthe (?:caller|customer|host and (?:the )?caller)\b", "she", h, flags=re.I)
+
+    # Capitalise and fix trailing punctuation
+    if h and not h[0].isupper():
+        h = h[0].upper() + h[1:]
+    if h and not h.endswith(('.', '!', '?', '️')):
+        h += '.'
+    return h
+
+
+def normalize_digest(digest: dict) -> dict:
+    """
+    Normalize legacy highlights and recommendations in a stored digest.
+    Returns a shallow-copy dict with cleaned lists; original is not mutated.
+    """
+    if not digest or is_normalized(digest):
+        return digest
+
+    highlights = digest.get("highlights", [])
+    recommendations = digest.get("recommendations", [])
+
+    cleaned_highlights = []
+    for h in highlights:
+        c = clean_highlight(h)
+        # Drop empty or very short strings left after stripping
+        if c and len(c) > 10:
+            cleaned_highlights.append(c)
+
+    cleaned_recs = []
+    for r in recommendations:
+        c = clean_highlight(r)
+        if c and len(c) > 10:
+            cleaned_recs.append(c)
+
+    if cleaned_highlights != highlights or cleaned_recs != recommendations:
+        digest = dict(digest)
+        digest["highlights"] = cleaned_highlights
+        digest["recommendations"] = cleaned_recs
+
+    return digest
+
+
+# ---------------------------------------------------------------------------
+# Legacy description normalizer
+# Converts old technical alert descriptions to plain-English equivalents.
+# Alerts written before normalization-on-write are upgraded when served
+# to the dashboard (or rewritten by the backfill).
+# ---------------------------------------------------------------------------
+
+_LEGACY_PATTERNS = [
+    # Raw coherence score  e.g. "Low topic coherence detected (0.24)..."
+    re.compile(r"low topic coherence detected", re.I),
+    # Raw percentage change  e.g. "Topic coherence has declined by 72.2%..."
+    re.compile(r"(vocabulary diversity|topic coherence|repetition rate|"
+               r"word.finding pauses?|response latency) has (declined|increased) by \d", re.I),
+    # Raw baseline score  e.g. "Repetition rate increased to 0.10 (baseline: 0.05)"
+    re.compile(r"\bbaseline[:\s]", re.I),
+    # Raw transcript dump  e.g. "Memory inconsistency detected: Patient changed…"
+    re.compile(r"memory inconsistency detected:", re.I),
+    # Raw numeric metric  e.g. "Vocabulary diversity dropped below baseline (0.52 vs 0.63 baseline)"
+    re.compile(r"\(0\.\d+ vs 0\.\d+", re.I),
+    # Latency in seconds  e.g. "Response latency increased to 2.4s"
+    re.compile(r"response latency increased to \d+\.\d+s", re.I),
+]
+
+_PLAIN_DESCRIPTIONS = {
+    "coherence_drop": (
+        "Today's conversation was noticeably harder to follow than usual. "
+        "She jumped between topics frequently and had difficulty staying on the same thread. "
+        "This can be a sign of confusion or difficulty concentrating, "
+        "and may be worth a gentle check-in."
+    ),
+    "vocabulary_shrinkage": (
+        "She has been using a more limited range of words than usual across recent conversations. "
+        "This can sometimes happen when someone is feeling tired, stressed, or experiencing "
+        "subtle memory changes. It's worth keeping an eye on."
+    ),
+    "vocabulary_decline": (
+        "She has been using a more limited range of words than usual across recent conversations. "
+        "This can sometimes happen when someone is feeling tired, stressed, or experiencing "
+        "subtle memory changes. It's worth keeping an eye on."
+    ),
+    "repetition_increase": (
+        "She has been repeating certain stories or phrases more often than usual across recent "
+        "conversations. Repetition can sometimes be a sign of something on her mind, or it may "
+        "reflect short-term memory changes worth watching."
+    ),
+    "word_finding_difficulty": (
+        "She has been stopping more often to search for words during recent conversations. "
+        "You might notice phrases like \"um,\" \"you know,\" or sentences that trail off. "
+        "While this can be normal with age, the increase compared to her usual pattern is worth noting."
+    ),
+    "response_delay": (
+        "She has been taking longer than usual to respond in conversations. "
+        "This can be a sign of fatigue, reduced concentration, or difficulty processing what was said."
+    ),
+    "response_latency": (
+        "She has been taking longer than usual to respond in conversations. "
+        "This can be a sign of fatigue, reduced concentration, or difficulty processing what was said."
+    ),
+    "cognitive_decline": (
+        "During today's call, she gave conflicting answers to the same question — "
+        "first agreeing, then expressing doubt or saying the opposite. "
+        "This kind of inconsistency can sometimes be an early sign of short-term memory difficulty "
+        "and is worth watching over the coming conversations."
+    ),
+}
+
+_PLAIN_ACTIONS = {
+    "coherence_drop": (
+        "Call her yourself today. Keep it light and ask one thing at a time — "
+        "a familiar voice makes a real difference."
+    ),
+    "vocabulary_shrinkage": (
+        "Give her a call and chat about something she loves — "
+        "a favourite memory, a family story, or what’s been on her mind."
+    ),
+    "vocabulary_decline": (
+        "Give her a call and chat about something she loves — "
+        "a favourite memory, a family story, or what’s been on her mind."
+    ),
+    "repetition_increase": (
+        "Give her a ring and bring up something new — upcoming family plans, "
+        "a shared memory, or something she’s looking forward to."
+    ),
+    "word_finding_difficulty": (
+        "Call her and let the conversation flow at her pace. "
+        "If this keeps happening, mention it to her doctor at the next visit."
+    ),
+    "response_delay": (
+        "Check in with her — a short call to ask how she’s feeling today goes a long way."
+    ),
+    "response_latency": (
+        "Check in with her — a short call to ask how she’s feeling today goes a long way."
+    ),
+    "cognitive_decline": (
+        "Bring this up at her next doctor’s appointment — mention the dates and what you’ve noticed."
+    ),
+    "distress": (
+        "Call her right away and let her know you’re thinking of her. "
+        "If she seems very distressed, consider arranging a visit or contacting her caregiver."
+    ),
+    "mood_distress": (
+        "Call her right away and let her know you’re thinking of her. "
+        "If she seems very distressed, consider arranging a visit."
+    ),
+    "confusion_detected": (
+        "Give her a reassuring call or, if possible, pop in for a visit. "
+        "Let her doctor know if this is becoming more frequent."
+    ),
+    "social_connection": (
+        "She’s missing you. Give her a call or plan a visit — "
+        "even just 10 minutes together means a lot."
+    ),
+    "emergency": (
+        "Call her immediately. If you can’t reach her, "
+        "contact emergency services or her on-site caregiver."
+    ),
+    "fall": (
+        "Call her immediately to confirm she is safe. "
+        "If you can’t reach her, contact her caregiver or a neighbour right away."
+    ),
+}
+
+_DEFAULT_ACTION = "Give her a call to check in, and mention this to her doctor if it keeps happening."
+
+
+def _is_legacy_description(description: str) -> bool:
+    """Return True if the description contains old technical jargon."""
+    if not description:
+        return False
+    return any(p.search(description) for p in _LEGACY_PATTERNS)
+
+
+def normalize_alert(alert: dict) -> dict:
+    """
+    If an alert has a legacy technical description, replace it with plain English.
+    Always refreshes suggested_action from _PLAIN_ACTIONS so stale Sanity values
+    are overwritten with the latest family-member-appropriate advice.
+    Returns a (possibly mutated copy of the) alert dict.
+    """
+    if is_normalized(alert):
+        return alert
+
+    alert_type = alert.get("alert_type", "")
+    description = alert.get("description", "")
+
+    if not description and alert_type == "social_connection":
+        alert = dict(alert)
+        alert["description"] = "She asked to speak with you or a family member."
+    elif _is_legacy_description(description):
+        plain = _PLAIN_DESCRIPTIONS.get(alert_type)
+        if plain:
+            if not isinstance(alert, dict) or alert is locals().get('alert'):
+                alert = dict(alert)  # shallow copy
+            alert["description"] = plain
+
+    # Always re-derive suggested_action — overwrites any stale Sanity value
+    fresh_action = _PLAIN_ACTIONS.get(alert_type, _DEFAULT_ACTION)
+    if alert.get("suggested_action") != fresh_action:
+        alert = dict(alert)
+        alert["suggested_action"] = fresh_action
+
+    return alert
+
+
+# ---------------------------------------------------------------------------
+# Conversations
+# ---------------------------------------------------------------------------
+
+def normalize_summary(summary: Optional[str]) -> str:
+    """Clean a summary, skipping the regex work when it has no legacy noise"""
+    if not summary:
+        return ""
+    if any(p.search(summary) for p in _SUMMARY_NOISE):
+        return clean_summary(summary)
+    return summary
+
+
+async def normalize_conversation(conv: dict, store) -> dict:
+    """Normalize a conversation record before serving it to the frontend.
+    Records normalized at write time are returned as-is; otherwise an
+    empty summary falls back to the latest digest's highlights.
+    """
+    if not conv or is_normalized(conv):
+        return conv
+
+    summary = conv.get("summary", "")
+    clean = normalize_summary(summary)
+
+    # Fallback: if summary is missing or empty after cleaning
+    if not clean:
+        try:
+            digest = await store.get_latest_wellness_digest(conv.get("patient_id"))
+            if digest and digest.get("conversation_id") == conv.get("id"):
+                highlights = digest.get("highlights", [])
+                if highlights:
+                    clean_lines = [clean_highlight(h) for h in highlights]
+                    clean_lines = [line for line in clean_lines if len(line) > 10]
+                    clean = " ".join(clean_lines)
+        except Exception:
+            pass
+
+    # If we generated a fallback or cleaned an existing one, update the dict
+    if clean != summary or not conv.get("summary"):
+        conv = dict(conv)
+        conv["summary"] = clean
+
+    return conv
+
+
+# ---------------------------------------------------------------------------
+# Write-time normalization
+# ---------------------------------------------------------------------------
+
+def normalize_on_write(kind: str, record: dict) -> dict:
+    """
+    Normalize a record about to be stored and stamp it (in place).
+
+    A conversation whose summary is empty is left unstamped: its digest
+    is written after it, and the read path falls back to the digest's
+    highlights.
+    """
+    if is_normalized(record):
+        return record
+    if kind == "conversation":
+        record["summary"] = clean_summary(record.get("summary") or "")
+        if not record["summary"]:
+            return record
+    elif kind == "alert":
+        normalized = normalize_alert(record)
+        record["description"] = normalized.get("description")
+        record["suggested_action"] = normalized.get("suggested_action")
+    elif kind == "digest":
+        normalized = normalize_digest(record)
+        record["highlights"] = normalized.get("highlights", [])
+        record["recommendations"] = normalized.get("recommendations", [])
+    else:
+        raise ValueError(f"Unknown record kind: {kind}")
+    record["normalization_version"] = NORMALIZATION_VERSION
+    return record
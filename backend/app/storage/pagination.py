@@ -0,0 +1,122 @@
+"""
+Keyset (cursor) pagination helpers shared by the data stores and routes.
+
+A cursor is an opaque, URL-safe token encoding the sort key of the last item
+on the previous page (e.g. timestamp + id). The next page starts strictly
+after that key, so deep pages cost the same as the first one and results
+don't shift when new records land between page loads.
+
+Sort orders used in cursor mode (ties broken by id, descending):
+    conversations: timestamp desc
+    digests:       created_at desc
+    alerts:        unacknowledged first, then timestamp desc
+"""
+
+import base64
+import binascii
+import json
+from functools import cmp_to_key
+from typing import Any, Optional, Sequence
+
+
+class InvalidCursorError(ValueError):
+    """The cursor token is malformed or was issued for a different list."""
+
+
+# (field, descending) pairs per list type — must match the GROQ order() clauses
+CONVERSATION_ORDER: tuple[tuple[str, bool], ...] = (("timestamp", True), ("id", True))
+DIGEST_ORDER: tuple[tuple[str, bool], ...] = (("created_at", True), ("id", True))
+ALERT_ORDER: tuple[tuple[str, bool], ...] = (("acknowledged", False), ("timestamp", True), ("id", True))
+
+
+def _sort_value(item: dict, field: str) -> Any:
+    value = item.get(field)
+    if field == "acknowledged":
+        return bool(value)
+    return value or ""
+
+
+def encode_cursor(item: dict, order: Sequence[tuple[str, bool]]) -> str:
+    """Encode the sort key of `item` as an opaque cursor."""
+    values = [_sort_value(item, field) for field, _ in order]
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: Sequence[tuple[str, bool]]) -> list:
+    """Decode a cursor back into its sort-key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError) as exc:
+        raise InvalidCursorError(f"Malformed cursor: {cursor!r}") from exc
+    if not isinstance(values, list) or len(values) != len(order):
+        raise InvalidCursorError(f"Cursor does not match this list: {cursor!r}")
+    return values
+
+
+def next_cursor(items: list[dict], limit: int, order: Sequence[tuple[str, bool]]) -> Optional[str]:
+    """Cursor for the page after `items`, or None if this was the last page."""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(items[-1], order)
+
+
+def _compare(a: Sequence, b: Sequence, order: Sequence[tuple[str, bool]]) -> int:
+    """-1 if key `a` comes before `b` in `order`, 1 if after, 0 if equal."""
+    for av, bv, (_, descending) in zip(a, b, order):
+        if av == bv:
+            continue
+        before = av > bv if descending else av < bv
+        return -1 if before else 1
+    return 0
+
+
+def keyset_page(
+    items: list[dict],
+    order: Sequence[tuple[str, bool]],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> list[dict]:
+    """
+    In-process keyset pagination (used by InMemoryDataStore).
+    Sorts `items` by `order` and returns up to `limit` items after `cursor`.
+    """
+    after = decode_cursor(cursor, order) if cursor else None
+
+    def key(item: dict) -> list:
+        return [_sort_value(item, field) for field, _ in order]
+
+    ordered = sorted(items, key=cmp_to_key(lambda a, b: _compare(key(a), key(b), order)))
+    if after is not None:
+        ordered = [i for i in ordered if _compare(key(i), after, order) > 0]
+    return ordered[:limit]
+
+
+def groq_after(
+    cursor: str,
+    order: Sequence[tuple[str, bool]],
+    fields: dict[str, str],
+) -> tuple[str, dict]:
+    """
+    Build a GROQ filter selecting documents strictly after `cursor`.
+
+    Args:
+        fields: maps our field names to GROQ expressions, e.g.
+                {"timestamp": "timestamp", "id": "_id"}
+
+    Returns:
+        (filter_expression, params) — params are named c0, c1, ...
+    """
+    values = decode_cursor(cursor, order)
+    params = {f"c{i}": v for i, v in enumerate(values)}
+
+    # Lexicographic "after": (k0 after c0) || (k0 == c0 && ((k1 after c1) || ...))
+    expr = ""
+    for i in reversed(range(len(order))):
+        field, descending = order[i]
+        groq_field = fields[field]
+        op = "<" if descending else ">"
+        clause = f"{groq_field} {op} $c{i}"
+        expr = clause if not expr else f"({clause} || ({groq_field} == $c{i} && {expr}))"
+    return expr, params
@@ -11,10 +11,79 @@ from datetime import datetime, UTC, timedelta
 from typing import Optional
 import httpx
 
-from app.cognitive.utils import calculate_cognitive_score
+from ..http_clients import get_http_client
+from ..resilience import guarded
+from .pagination import ALERT_ORDER, CONVERSATION_ORDER, DIGEST_ORDER, groq_after
+from .timeseries import CognitiveTimeSeries, to_utc_iso
+from .insights import InsightAggregates, alert_changes, conversation_changes, empty_state, missing_containers
+from .analytics import SEVERITIES, empty_summary
+from .changes import patient_changed
+from .normalization import NORMALIZATION_VERSION, normalize_on_write
+from .transcripts import (
+    ENCODING,
+    compress_transcript,
+    decompress_transcript,
+    split_transcript,
+    transcript_blob_id,
+)
+from .unit_of_work import (
+    UnitOfWork,
+    RevisionConflictError,
+    current_unit_of_work,
+    merge_pending_conversations,
+)
 
 logger = logging.getLogger(__name__)
 
+# List orderings — kept in step with the keyset orders in pagination.py
+_CONVERSATION_SORT = "timestamp desc, _id desc"
+_DIGEST_SORT = "coalesce(generatedAt, _updatedAt) desc, _id desc"
+_ALERT_SORT = "coalesce(acknowledged, false) asc, timestamp desc, _id desc"
+# Conversation fields for list queries — everything except the (legacy) embedded transcript
+_CONVERSATION_LIST_FIELDS = (
+    "{ _id, patient, timestamp, duration, summary, mood, cognitiveMetrics, "
+    "nostalgiaEngagement, transcriptRef, transcriptSize, normalizationVersion }"
+)
+# Record kinds with normalized text: Sanity type and the field names written back
+_NORMALIZED_DOCS = {
+    "conversation": ("conversation", {"summary": "summary"}),
+    "alert": ("alert", {"description": "description", "suggested_action": "suggestedAction"}),
+    "digest": ("wellnessDigest", {"highlights": "highlights", "recommendations": "recommendations"}),
+}
+
+# Analytics pushdown: everything is aggregated server-side, only numbers come back
+_CONV_IN_PERIOD = (
+    '_type == "conversation" && patient._ref == $pid '
+    '&& timestamp >= $cutoff && defined(cognitiveMetrics)'
+)
+_ALERT_IN_PERIOD = '_type == "alert" && patient._ref == $pid && timestamp >= $cutoff'
+_MOOD = 'coalesce(mood, "unknown")'
+ANALYTICS_SUMMARY_QUERY = f"""{{
+    "conversation_count": count(*[{_CONV_IN_PERIOD}]),
+    "avg_vocabulary": math::avg(*[{_CONV_IN_PERIOD}].cognitiveMetrics.vocabularyDiversity),
+    "avg_coherence": math::avg(*[{_CONV_IN_PERIOD}].cognitiveMetrics.topicCoherence),
+    "avg_repetition": math::avg(*[{_CONV_IN_PERIOD}].cognitiveMetrics.repetitionRate),
+    "avg_word_finding_pauses": math::avg(*[{_CONV_IN_PERIOD}].cognitiveMetrics.wordFindingPauses),
+    "by_mood": array::unique(*[{_CONV_IN_PERIOD}]{{ "m": {_MOOD} }}.m)[]{{
+        "mood": @,
+        "count": count(*[{_CONV_IN_PERIOD} && {_MOOD} == ^]),
+        "avg_vocabulary": math::avg(*[{_CONV_IN_PERIOD} && {_MOOD} == ^].cognitiveMetrics.vocabularyDiversity),
+        "avg_coherence": math::avg(*[{_CONV_IN_PERIOD} && {_MOOD} == ^].cognitiveMetrics.topicCoherence)
+    }},
+    "alert_total": count(*[{_ALERT_IN_PERIOD}]),
+    "alert_low": count(*[{_ALERT_IN_PERIOD} && severity == "low"]),
+    "alert_medium": count(*[{_ALERT_IN_PERIOD} && severity == "medium"]),
+    "alert_high": count(*[{_ALERT_IN_PERIOD} && severity == "high"]),
+    "alert_acknowledged": count(*[{_ALERT_IN_PERIOD} && acknowledged == true])
+}}"""
+
+_SORT_FIELDS = {
+    "timestamp": "timestamp",
+    "created_at": "coalesce(generatedAt, _updatedAt)",
+    "acknowledged": "coalesce(acknowledged, false)",
+    "id": "_id",
+}
+
 
 class SanityDataStore:
     """
@@ -27,16 +96,16 @@ class SanityDataStore:
         self.dataset = dataset
         self.token = token
         self.base_url = f"https://{project_id}.api.sanity.io/v2024-01-01/data"
-        self._client = httpx.AsyncClient(
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=10.0,
-        )
+        self._headers = {"Authorization": f"Bearer {token}"}
         logger.info(f"Initialized SanityDataStore for project {project_id}")
 
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """Shared pooled client for the Sanity upstream"""
+        return get_http_client("sanity")
+
     async def close(self):
-        """Close HTTP client (called on shutdown)."""
-        await self._client.aclose()
-        logger.info("Closed SanityDataStore HTTP client")
+        """No-op: the pooled client is owned and closed by the app lifespan"""
 
     # =========================================================================
     # Internal helpers
@@ -44,43 +113,117 @@ class SanityDataStore:
 
     async def _query(self, query: str, params: dict | None = None) -> dict:
         """Execute a GROQ query."""
-        try:
+        async def attempt() -> dict:
             resp = await self._client.get(
                 f"{self.base_url}/query/{self.dataset}",
                 params={"query": query, **({"$" + k: v for k, v in (params or {}).items()} if params else {})},
+                headers=self._headers,
             )
             resp.raise_for_status()
             return resp.json()
-        except httpx.HTTPError as exc:
+
+        try:
+            return await guarded("sanity", attempt, timeout=10.0, idempotent=True)
+        except Exception as exc:
             logger.error(f"Sanity query failed: {exc}")
             raise
 
     async def _query_groq(self, query: str, params: dict | None = None) -> dict:
         """Execute a GROQ query via POST (supports complex params)."""
-        try:
+        async def attempt() -> dict:
             resp = await self._client.post(
                 f"{self.base_url}/query/{self.dataset}",
                 json={"query": query, "params": params or {}},
+                headers=self._headers,
             )
             resp.raise_for_status()
             return resp.json()
-        except httpx.HTTPError as exc:
+
+        try:
+            # Queries are reads, so a slow one may be hedged
+            return await guarded("sanity", attempt, timeout=10.0, idempotent=True)
+        except Exception as exc:
             logger.error(f"Sanity query failed: {exc}")
             raise
 
     async def _mutate(self, mutations: list) -> dict:
         """Execute mutations (create/update/delete)."""
-        try:
+        async def attempt() -> dict:
             resp = await self._client.post(
                 f"{self.base_url}/mutate/{self.dataset}",
                 json={"mutations": mutations},
+                headers=self._headers,
             )
             resp.raise_for_status()
             return resp.json()
-        except httpx.HTTPError as exc:
+
+        try:
+            return await guarded("sanity", attempt, timeout=10.0)
+        except Exception as exc:
             logger.error(f"Sanity mutation failed: {exc}")
             raise
 
+    async def _write(self, mutations: list) -> None:
+        """Send mutations now, or queue them if a batch is active."""
+        uow = current_unit_of_work(self)
+        if uow is not None:
+            uow.add(*mutations)
+            return
+        await self._mutate(mutations)
+
+    # =========================================================================
+    # Unit of work (batched writes)
+    # =========================================================================
+
+    def batch(self) -> UnitOfWork:
+        """
+        Collect writes made inside `async with store.batch():` and commit them
+        as ONE Sanity transaction (a single mutations array) on exit.
+
+        Baseline and deviation-tracker docs read inside the batch are written
+        back with `ifRevisionID`, so a concurrent update aborts the whole
+        transaction instead of being silently overwritten.
+        """
+        return UnitOfWork(self, self._commit_batch)
+
+    async def _commit_batch(self, uow: UnitOfWork) -> None:
+        try:
+            await self._mutate(uow.operations)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 409:
+                raise RevisionConflictError(
+                    f"Sanity transaction rejected: a locked document changed ({exc.response.text})"
+                ) from exc
+            raise
+
+    def _guarded_replace(self, sanity_doc: dict) -> dict:
+        """
+        Build a write for a locked doc. Inside a batch where the doc was read,
+        use a revision-checked patch (or create, if it did not exist);
+        otherwise fall back to createOrReplace.
+        """
+        uow = current_unit_of_work(self)
+        doc_id = sanity_doc["_id"]
+        if uow is None or doc_id not in uow.expected_revisions:
+            return {"createOrReplace": sanity_doc}
+        revision = uow.expected_revisions[doc_id]
+        if revision is None:
+            return {"create": sanity_doc}
+        fields = {k: v for k, v in sanity_doc.items() if k not in ("_id", "_type")}
+        return {"patch": {"id": doc_id, "ifRevisionID": revision, "set": fields}}
+
+    @staticmethod
+    def _page_filter(cursor: Optional[str], order, offset: int) -> tuple[str, dict, int]:
+        """
+        GROQ filter clause + params for a keyset page.
+        With a cursor the slice always starts at 0; offset is ignored.
+        Raises InvalidCursorError for a malformed cursor.
+        """
+        if not cursor:
+            return "", {}, offset
+        expr, params = groq_after(cursor, order, _SORT_FIELDS)
+        return f" && {expr}", params, 0
+
     # =========================================================================
     # Field-mapping helpers  (Sanity camelCase → Python snake_case)
     #
@@ -160,12 +303,11 @@ class SanityDataStore:
         patient_id = self._ref_id(doc.get("patient"))
         cm = doc.get("cognitiveMetrics") or {}
         ne = doc.get("nostalgiaEngagement")
-        return {
+        conversation = {
             "id": doc["_id"],
             "patient_id": patient_id,
             "timestamp": doc.get("timestamp"),
             "duration": doc.get("duration"),
-            "transcript": doc.get("transcript"),
             "summary": doc.get("summary"),
             "detected_mood": doc.get("mood"),
             "cognitive_metrics": {
@@ -175,6 +317,7 @@ class SanityDataStore:
                 "repetition_rate": cm.get("repetitionRate"),
                 "word_finding_pauses": cm.get("wordFindingPauses"),
                 "response_latency": cm.get("responseLatency"),
+                "pause_duration": cm.get("pauseDuration"),
             } if cm else None,
             "nostalgia_engagement": {
                 "triggered": ne.get("triggered"),
@@ -182,7 +325,20 @@ class SanityDataStore:
                 "content_used": ne.get("contentUsed"),
                 "engagement_score": ne.get("engagementScore"),
             } if ne else None,
+            "normalization_version": doc.get("normalizationVersion"),
         }
+        if doc.get("transcriptRef"):
+            conversation["transcript_ref"] = self._ref_id(doc["transcriptRef"])
+            conversation["transcript_size"] = doc.get("transcriptSize")
+        return conversation
+
+    @staticmethod
+    def _resolve_transcript(doc: dict) -> Optional[str]:
+        """Transcript from a joined blob, falling back to a legacy embedded transcript."""
+        blob = doc.get("transcriptBlob")
+        if blob and blob.get("data"):
+            return decompress_transcript(blob["data"], blob.get("encoding") or ENCODING)
+        return doc.get("transcript")
 
     def _map_alert(self, doc: dict | None) -> dict | None:
         if not doc:
@@ -204,6 +360,7 @@ class SanityDataStore:
             "acknowledged_at": doc.get("acknowledgedAt"),
             "acknowledged_by": acked_by,
             "conversation_id": self._ref_id(doc.get("conversation")),
+            "normalization_version": doc.get("normalizationVersion"),
         }
 
     def _map_digest(self, doc: dict | None) -> dict | None:
@@ -219,7 +376,8 @@ class SanityDataStore:
             "cognitive_trend": doc.get("trend"),
             "recommendations": doc.get("recommendations", []),
             "conversation_id": self._ref_id(doc.get("conversation")),
-            "created_at": doc.get("generatedAt"),
+            "created_at": doc.get("generatedAt") or doc.get("_updatedAt"),
+            "normalization_version": doc.get("normalizationVersion"),
         }
 
     def _map_baseline(self, doc: dict | None) -> dict | None:
@@ -282,6 +440,28 @@ class SanityDataStore:
             logger.error(f"get_patient failed for {patient_id}: {exc}")
             return None
 
+    async def get_patient_birth_years(self) -> list[int]:
+        try:
+            result = await self._query_groq(
+                'array::unique(*[_type == "patient" && defined(birthYear)].birthYear)'
+            )
+            return sorted(int(y) for y in (result.get("result") or []) if y)
+        except Exception as exc:
+            logger.error(f"get_patient_birth_years failed: {exc}")
+            return []
+
+    async def get_call_schedules(self) -> list[dict]:
+        try:
+            result = await self._query_groq(
+                '*[_type == "patient" && defined(callSchedule.preferredTime) && defined(phoneNumber)]'
+                '{"patient_id": _id, "name": coalesce(preferredName, name), "phone_number": phoneNumber,'
+                ' "preferred_time": callSchedule.preferredTime, "timezone": location.timezone}'
+            )
+            return result.get("result") or []
+        except Exception as exc:
+            logger.error(f"get_call_schedules failed: {exc}")
+            return []
+
     async def update_patient(self, patient_id: str, updates: dict) -> bool:
         try:
             sanity_set: dict = {}
@@ -336,7 +516,8 @@ class SanityDataStore:
                 if py_key in updates:
                     sanity_set[san_key] = updates[py_key]
 
-            await self._mutate([{"patch": {"id": patient_id, "set": sanity_set}}])
+            await self._write([{"patch": {"id": patient_id, "set": sanity_set}}])
+            patient_changed(self, patient_id)
             return True
         except Exception as exc:
             logger.error(f"update_patient failed for {patient_id}: {exc}")
@@ -347,15 +528,21 @@ class SanityDataStore:
     # =========================================================================
 
     async def get_conversations(
-        self, patient_id: str, limit: int = 10, offset: int = 0
+        self, patient_id: str, limit: int = 10, offset: int = 0, cursor: Optional[str] = None
     ) -> list[dict]:
+        filters, params, offset = self._page_filter(cursor, CONVERSATION_ORDER, offset)
         end = offset + limit
         try:
             result = await self._query_groq(
-                f'*[_type == "conversation" && patient._ref == $pid] | order(timestamp desc) [{offset}...{end}]',
-                {"pid": patient_id},
+                f'*[_type == "conversation" && patient._ref == $pid{filters}] | order({_CONVERSATION_SORT}) [{offset}...{end}] {_CONVERSATION_LIST_FIELDS}',
+                {"pid": patient_id, **params},
+            )
+            conversations = [self._map_conversation(c) for c in (result.get("result") or []) if c]
+            if cursor:
+                return conversations
+            return merge_pending_conversations(
+                current_unit_of_work(self), patient_id, conversations, limit, offset
             )
-            return [self._map_conversation(c) for c in (result.get("result") or []) if c]
         except Exception as exc:
             logger.error(f"get_conversations failed: {exc}")
             return []
@@ -363,17 +550,42 @@ class SanityDataStore:
     async def get_conversation(self, conversation_id: str) -> Optional[dict]:
         try:
             result = await self._query_groq(
-                '*[_type == "conversation" && _id == $cid][0]',
+                '*[_type == "conversation" && _id == $cid][0]'
+                '{ ..., "transcriptBlob": *[_id == ^.transcriptRef._ref][0]{ data, encoding } }',
                 {"cid": conversation_id},
             )
-            return self._map_conversation(result.get("result"))
+            doc = result.get("result")
+            conversation = self._map_conversation(doc)
+            if conversation is not None:
+                conversation["transcript"] = self._resolve_transcript(doc)
+            return conversation
         except Exception as exc:
             logger.error(f"get_conversation failed: {exc}")
             return None
 
+    async def get_transcripts(self, conversation_ids: list[str]) -> dict[str, str]:
+        if not conversation_ids:
+            return {}
+        try:
+            result = await self._query_groq(
+                '*[_type == "conversation" && _id in $ids]'
+                '{ _id, transcript, "transcriptBlob": *[_id == ^.transcriptRef._ref][0]{ data, encoding } }',
+                {"ids": list(conversation_ids)},
+            )
+            transcripts = {}
+            for doc in result.get("result") or []:
+                transcript = self._resolve_transcript(doc)
+                if transcript:
+                    transcripts[doc["_id"]] = transcript
+            return transcripts
+        except Exception as exc:
+            logger.error(f"get_transcripts failed: {exc}")
+            return {}
+
     async def save_conversation(self, conversation: dict) -> str:
         conv_id = conversation.get("id", f"conversation-{datetime.now(UTC).strftime('%Y%m%d%H%M%S')}")
         try:
+            normalize_on_write("conversation", conversation)
             metrics = conversation.get("cognitive_metrics") or {}
             ne = conversation.get("nostalgia_engagement")
             sanity_doc: dict = {
@@ -382,10 +594,23 @@ class SanityDataStore:
                 "patient": {"_ref": conversation["patient_id"], "_type": "reference"},
                 "timestamp": conversation.get("timestamp"),
                 "duration": conversation.get("duration"),
-                "transcript": conversation.get("transcript"),
                 "summary": conversation.get("summary"),
                 "mood": conversation.get("detected_mood"),
+                "normalizationVersion": conversation.get("normalization_version"),
             }
+            transcript = conversation.get("transcript")
+            blob_doc = None
+            if transcript:
+                blob_id = transcript_blob_id(conv_id)
+                blob_doc = {
+                    "_type": "conversationTranscript",
+                    "_id": blob_id,
+                    "conversation": {"_ref": conv_id, "_type": "reference", "_weak": True},
+                    "encoding": ENCODING,
+                    "data": compress_transcript(transcript),
+                }
+                sanity_doc["transcriptRef"] = {"_ref": blob_id, "_type": "reference", "_weak": True}
+                sanity_doc["transcriptSize"] = len(transcript.encode("utf-8"))
             if metrics:
                 sanity_doc["cognitiveMetrics"] = {
                     "vocabularyDiversity": metrics.get("vocabulary_diversity"),
@@ -394,6 +619,7 @@ class SanityDataStore:
                     "repetitionRate": metrics.get("repetition_rate"),
                     "wordFindingPauses": metrics.get("word_finding_pauses"),
                     "responseLatency": metrics.get("response_latency"),
+                    "pauseDuration": metrics.get("pause_duration"),
                 }
             if ne:
                 sanity_doc["nostalgiaEngagement"] = {
@@ -402,7 +628,20 @@ class SanityDataStore:
                     "contentUsed": ne.get("content_used"),
                     "engagementScore": ne.get("engagement_score"),
                 }
-            await self._mutate([{"createOrReplace": sanity_doc}])
+            previous = await self._previous_conversation(conv_id)
+            uow = current_unit_of_work(self)
+            if uow is not None:
+                uow.pending_conversations[conv_id] = split_transcript({**conversation, "id": conv_id})[0]
+            saved = {**conversation, "id": conv_id}
+            mutations = [{"createOrReplace": sanity_doc}]
+            if blob_doc:
+                mutations.insert(0, {"createOrReplace": blob_doc})
+            mutations.extend(self._series_append_mutations(saved))
+            mutations.extend(self._insights_mutations(
+                conversation["patient_id"], conversation_changes(previous, saved)
+            ))
+            await self._write(mutations)
+            patient_changed(self, conversation["patient_id"])
             return conv_id
         except Exception as exc:
             logger.error(f"save_conversation failed: {exc}")
@@ -418,7 +657,14 @@ class SanityDataStore:
                 '*[_type == "cognitiveBaseline" && patient._ref == $pid][0]',
                 {"pid": patient_id},
             )
-            return self._map_baseline(result.get("result"))
+            doc = result.get("result")
+            uow = current_unit_of_work(self)
+            if uow is not None:
+                uow.expect_revision(
+                    (doc or {}).get("_id", f"baseline-{patient_id}"),
+                    (doc or {}).get("_rev"),
+                )
+            return self._map_baseline(doc)
         except Exception as exc:
             logger.error(f"get_cognitive_baseline failed: {exc}")
             return None
@@ -446,7 +692,7 @@ class SanityDataStore:
                 "conversationCount": baseline.get("conversation_count", 0),
                 "lastUpdated": baseline.get("last_updated"),
             }
-            await self._mutate([{"createOrReplace": sanity_doc}])
+            await self._write([self._guarded_replace(sanity_doc)])
         except Exception as exc:
             logger.error(f"save_cognitive_baseline failed: {exc}")
 
@@ -455,13 +701,14 @@ class SanityDataStore:
     # =========================================================================
 
     async def get_wellness_digests(
-        self, patient_id: str, limit: int = 10, offset: int = 0
+        self, patient_id: str, limit: int = 10, offset: int = 0, cursor: Optional[str] = None
     ) -> list[dict]:
+        filters, params, offset = self._page_filter(cursor, DIGEST_ORDER, offset)
         end = offset + limit
         try:
             result = await self._query_groq(
-                f'*[_type == "wellnessDigest" && patient._ref == $pid] | order(_updatedAt desc) [{offset}...{end}]',
-                {"pid": patient_id},
+                f'*[_type == "wellnessDigest" && patient._ref == $pid{filters}] | order({_DIGEST_SORT}) [{offset}...{end}]',
+                {"pid": patient_id, **params},
             )
             return [self._map_digest(d) for d in (result.get("result") or []) if d]
         except Exception as exc:
@@ -471,7 +718,7 @@ class SanityDataStore:
     async def get_latest_wellness_digest(self, patient_id: str) -> Optional[dict]:
         try:
             result = await self._query_groq(
-                '*[_type == "wellnessDigest" && patient._ref == $pid] | order(_updatedAt desc)[0]',
+                f'*[_type == "wellnessDigest" && patient._ref == $pid] | order({_DIGEST_SORT})[0]',
                 {"pid": patient_id},
             )
             return self._map_digest(result.get("result"))
@@ -482,6 +729,7 @@ class SanityDataStore:
     async def save_wellness_digest(self, digest: dict) -> str:
         digest_id = digest.get("id", f"digest-{datetime.now(UTC).strftime('%Y%m%d%H%M%S')}")
         try:
+            normalize_on_write("digest", digest)
             sanity_doc: dict = {
                 "_type": "wellnessDigest",
                 "_id": digest_id,
@@ -493,11 +741,12 @@ class SanityDataStore:
                 "trend": digest.get("cognitive_trend"),
                 "recommendations": digest.get("recommendations", []),
                 "generatedAt": digest.get("created_at"),
+                "normalizationVersion": digest.get("normalization_version"),
             }
             conv_id = digest.get("conversation_id")
             if conv_id:
                 sanity_doc["conversation"] = {"_ref": conv_id, "_type": "reference"}
-            await self._mutate([{"createOrReplace": sanity_doc}])
+            await self._write([{"createOrReplace": sanity_doc}])
             return digest_id
         except Exception as exc:
             logger.error(f"save_wellness_digest failed: {exc}")
@@ -513,18 +762,20 @@ class SanityDataStore:
         severity: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> list[dict]:
+        filters, params, offset = self._page_filter(cursor, ALERT_ORDER, offset)
         end = offset + limit
         try:
             if severity:
                 result = await self._query_groq(
-                    f'*[_type == "alert" && patient._ref == $pid && severity == $sev] | order(acknowledged asc, timestamp desc) [{offset}...{end}]',
-                    {"pid": patient_id, "sev": severity},
+                    f'*[_type == "alert" && patient._ref == $pid && severity == $sev{filters}] | order({_ALERT_SORT}) [{offset}...{end}]',
+                    {"pid": patient_id, "sev": severity, **params},
                 )
             else:
                 result = await self._query_groq(
-                    f'*[_type == "alert" && patient._ref == $pid] | order(acknowledged asc, timestamp desc) [{offset}...{end}]',
-                    {"pid": patient_id},
+                    f'*[_type == "alert" && patient._ref == $pid{filters}] | order({_ALERT_SORT}) [{offset}...{end}]',
+                    {"pid": patient_id, **params},
                 )
             return [self._map_alert(a) for a in (result.get("result") or []) if a]
         except Exception as exc:
@@ -534,6 +785,7 @@ class SanityDataStore:
     async def save_alert(self, alert: dict) -> str:
         alert_id = alert.get("id", f"alert-{datetime.now(UTC).strftime('%Y%m%d%H%M%S')}")
         try:
+            normalize_on_write("alert", alert)
             sanity_doc: dict = {
                 "_type": "alert",
                 "_id": alert_id,
@@ -545,11 +797,18 @@ class SanityDataStore:
                 "relatedMetrics": alert.get("related_metrics"),
                 "timestamp": alert.get("timestamp"),
                 "acknowledged": alert.get("acknowledged", False),
+                "normalizationVersion": alert.get("normalization_version"),
             }
             conv_id = alert.get("conversation_id")
             if conv_id:
                 sanity_doc["conversation"] = {"_ref": conv_id, "_type": "reference"}
-            await self._mutate([{"createOrReplace": sanity_doc}])
+            saved = {**alert, "id": alert_id}
+            previous = await self._previous_alert(alert_id)
+            mutations = [{"createOrReplace": sanity_doc}]
+            mutations.extend(self._insights_mutations(
+                alert["patient_id"], alert_changes(previous, saved)
+            ))
+            await self._write(mutations)
             return alert_id
         except Exception as exc:
             logger.error(f"save_alert failed: {exc}")
@@ -569,7 +828,15 @@ class SanityDataStore:
                     sanity_set["acknowledgedBy"] = acked_by
             if "acknowledged_at" in updates:
                 sanity_set["acknowledgedAt"] = updates["acknowledged_at"]
-            await self._mutate([{"patch": {"id": alert_id, "set": sanity_set}}])
+            mutations = [{"patch": {"id": alert_id, "set": sanity_set}}]
+            if "acknowledged" in updates:
+                previous = await self._previous_alert(alert_id)
+                if previous:
+                    mutations.extend(self._insights_mutations(
+                        previous["patient_id"],
+                        alert_changes(previous, {**previous, "acknowledged": updates["acknowledged"]}),
+                    ))
+            await self._write(mutations)
             return True
         except Exception as exc:
             logger.error(f"update_alert failed for {alert_id}: {exc}")
@@ -606,10 +873,14 @@ class SanityDataStore:
         doc_id = f"deviation-tracker-{patient_id}"
         try:
             result = await self._query_groq(
-                '*[_type == "deviationTracker" && _id == $did][0].metrics',
+                '*[_type == "deviationTracker" && _id == $did][0]{ metrics, _rev }',
                 {"did": doc_id},
             )
-            return result.get("result") or {}
+            doc = result.get("result")
+            uow = current_unit_of_work(self)
+            if uow is not None:
+                uow.expect_revision(doc_id, (doc or {}).get("_rev"))
+            return (doc or {}).get("metrics") or {}
         except Exception as exc:
             logger.error(f"get_consecutive_deviations failed: {exc}")
             return {}
@@ -625,7 +896,7 @@ class SanityDataStore:
                 "patient": {"_ref": patient_id, "_type": "reference"},
                 "metrics": deviations,
             }
-            await self._mutate([{"createOrReplace": sanity_doc}])
+            await self._write([self._guarded_replace(sanity_doc)])
         except Exception as exc:
             logger.error(f"update_consecutive_deviations failed: {exc}")
 
@@ -633,34 +904,81 @@ class SanityDataStore:
     # COGNITIVE TRENDS
     # =========================================================================
 
+    # The series lives in one `cognitiveSeries` doc per patient: an array of
+    # points keyed by conversation id, appended in the same transaction as
+    # the conversation itself. `complete` is only set once the doc has been
+    # backfilled from conversation history.
+
+    @staticmethod
+    def _series_id(patient_id: str) -> str:
+        return f"cognitiveSeries-{patient_id}"
+
+    def _series_append_mutations(self, conversation: dict) -> list[dict]:
+        point = CognitiveTimeSeries().add_conversation(conversation)
+        if point is None:
+            return []
+        series_id = self._series_id(conversation["patient_id"])
+        conv_id = conversation["id"]
+        return [
+            {"createIfNotExists": {
+                "_id": series_id,
+                "_type": "cognitiveSeries",
+                "patient": {"_ref": conversation["patient_id"], "_type": "reference"},
+                "complete": False,
+                "points": [],
+            }},
+            {"patch": {"id": series_id, "unset": [f'points[_key == "{conv_id}"]']}},
+            {"patch": {"id": series_id, "insert": {
+                "after": "points[-1]",
+                "items": [{"_key": conv_id, "conversationId": conv_id, **point}],
+            }}},
+        ]
+
+    async def _rebuild_cognitive_series(self, patient_id: str, existing: dict | None) -> CognitiveTimeSeries:
+        """Backfill the series doc from conversation history (first read only)."""
+        result = await self._query_groq(
+            '*[_type == "conversation" && patient._ref == $pid && defined(cognitiveMetrics)] { _id, timestamp, cognitiveMetrics }',
+            {"pid": patient_id},
+        )
+        series = CognitiveTimeSeries()
+        for doc in result.get("result") or []:
+            series.add_conversation(self._map_conversation(doc))
+
+        series_id = self._series_id(patient_id)
+        if existing is None:
+            mutation = {"create": {
+                "_id": series_id,
+                "_type": "cognitiveSeries",
+                "patient": {"_ref": patient_id, "_type": "reference"},
+                "complete": True,
+                "points": series.to_points(),
+            }}
+        else:
+            mutation = {"patch": {
+                "id": series_id,
+                "ifRevisionID": existing.get("_rev"),
+                "set": {"complete": True, "points": series.to_points()},
+            }}
+        try:
+            await self._mutate([mutation])
+            logger.info(f"[COGNITIVE_SERIES] Backfilled {len(series)} points for {patient_id}")
+        except Exception as exc:
+            # A concurrent write won the race — serve what we computed, retry next read
+            logger.warning(f"[COGNITIVE_SERIES] Backfill not persisted for {patient_id}: {exc}")
+        return series
+
     async def get_cognitive_trends(self, patient_id: str, days: int = 30) -> list[dict]:
-        cutoff = (datetime.now(UTC) - timedelta(days=days)).isoformat()
+        cutoff = to_utc_iso(datetime.now(UTC) - timedelta(days=days))
         try:
             result = await self._query_groq(
-                '*[_type == "conversation" && patient._ref == $pid && timestamp > $cutoff] | order(timestamp asc) { timestamp, cognitiveMetrics }',
-                {"pid": patient_id, "cutoff": cutoff},
+                '*[_id == $sid][0]{ _rev, complete, "points": points[timestamp >= $cutoff] }',
+                {"sid": self._series_id(patient_id), "cutoff": cutoff},
             )
-            trends = []
-            for conv in result.get("result") or []:
-                cm = conv.get("cognitiveMetrics")
-                if not cm:
-                    continue
-                metrics_dict = {
-                    "vocabulary_diversity": cm.get("vocabularyDiversity"),
-                    "topic_coherence": cm.get("topicCoherence"),
-                    "repetition_rate": cm.get("repetitionRate"),
-                    "word_finding_pauses": cm.get("wordFindingPauses"),
-                }
-                trends.append({
-                    "timestamp": conv.get("timestamp", ""),
-                    "vocabulary_diversity": metrics_dict["vocabulary_diversity"],
-                    "topic_coherence": metrics_dict["topic_coherence"],
-                    "repetition_rate": metrics_dict["repetition_rate"],
-                    "word_finding_pauses": metrics_dict["word_finding_pauses"],
-                    "response_latency": cm.get("responseLatency"),
-                    "cognitive_score": calculate_cognitive_score(metrics_dict),
-                })
-            return trends
+            doc = result.get("result")
+            if doc and doc.get("complete"):
+                return CognitiveTimeSeries.from_points(doc.get("points")).window(cutoff)
+            series = await self._rebuild_cognitive_series(patient_id, doc)
+            return series.window(cutoff)
         except Exception as exc:
             logger.error(f"get_cognitive_trends failed: {exc}")
             return []
@@ -669,101 +987,185 @@ class SanityDataStore:
     # INSIGHTS  (Sanity challenge showcase)
     # =========================================================================
 
+    async def get_analytics_summary(self, patient_id: str, days: int = 30) -> dict:
+        """Period-bounded statistics, aggregated in GROQ (no raw documents downloaded)."""
+        cutoff = to_utc_iso(datetime.now(UTC) - timedelta(days=days))
+        try:
+            result = await self._query_groq(ANALYTICS_SUMMARY_QUERY, {"pid": patient_id, "cutoff": cutoff})
+            return self._map_analytics_summary(result.get("result") or {}, days)
+        except Exception as exc:
+            logger.error(f"get_analytics_summary failed: {exc}")
+            return empty_summary(days)
+
+    @staticmethod
+    def _map_analytics_summary(row: dict, days: int) -> dict:
+        """Map the GROQ aggregate row to the shared summary shape (math::avg null → 0.0)."""
+        def avg(value) -> float:
+            return round(value, 3) if value is not None else 0.0
+
+        summary = empty_summary(days)
+        summary.update({
+            "conversation_count": row.get("conversation_count") or 0,
+            "avg_vocabulary": avg(row.get("avg_vocabulary")),
+            "avg_coherence": avg(row.get("avg_coherence")),
+            "avg_repetition": avg(row.get("avg_repetition")),
+            "avg_word_finding_pauses": avg(row.get("avg_word_finding_pauses")),
+            "by_mood": {
+                m["mood"]: {
+                    "count": m.get("count") or 0,
+                    "avg_vocabulary": avg(m.get("avg_vocabulary")),
+                    "avg_coherence": avg(m.get("avg_coherence")),
+                }
+                for m in row.get("by_mood") or []
+            },
+        })
+        summary["alerts"] = {
+            "total": row.get("alert_total") or 0,
+            "by_severity": {s: row.get(f"alert_{s}") or 0 for s in SEVERITIES},
+            "acknowledged": row.get("alert_acknowledged") or 0,
+        }
+        return summary
+
+    # Running aggregates live in one `insightAggregates` doc per patient and
+    # are written alongside each conversation/alert as `inc` patches (the new
+    # record's contribution minus the one it replaced). Increments commute, so
+    # the doc is never read on write or guarded by ifRevisionID, and
+    # concurrent writers (e.g. an acknowledgement during a pipeline batch)
+    # don't conflict. recompute_patient_insights repairs drift.
+
+    @staticmethod
+    def _insights_id(patient_id: str) -> str:
+        return f"insightAggregates-{patient_id}"
+
+    async def _insights_doc(self, patient_id: str) -> dict:
+        """Stored aggregates doc, or a new empty one."""
+        doc_id = self._insights_id(patient_id)
+        result = await self._query_groq('*[_id == $did][0]{ complete, state }', {"did": doc_id})
+        stored = result.get("result")
+        return {
+            "complete": bool(stored and stored.get("complete")),
+            "state": (stored or {}).get("state") or empty_state(),
+        }
+
+    def _insights_mutations(self, patient_id: str, increments: dict) -> list[dict]:
+        """Writes adding `increments` (from conversation_changes / alert_changes) to the aggregates doc."""
+        if not increments:
+            return []
+        doc_id = self._insights_id(patient_id)
+        patch: dict = {"id": doc_id, "inc": {f"state.{path}": delta for path, delta in increments.items()}}
+        containers = missing_containers(increments)
+        if containers:
+            patch["setIfMissing"] = {f"state.{path}": value for path, value in containers.items()}
+        return [
+            {"createIfNotExists": {
+                "_id": doc_id,
+                "_type": "insightAggregates",
+                "patient": {"_ref": patient_id, "_type": "reference"},
+                "complete": False,
+                "state": empty_state(),
+            }},
+            {"patch": patch},
+        ]
+
+    async def _previous_conversation(self, conv_id: str) -> Optional[dict]:
+        """The version of a conversation a save is about to replace (pending in this batch or stored)."""
+        uow = current_unit_of_work(self)
+        if uow is not None and conv_id in uow.pending_conversations:
+            return uow.pending_conversations[conv_id]
+        result = await self._query_groq(
+            '*[_id == $cid][0]{ _id, patient, mood, cognitiveMetrics, nostalgiaEngagement }', {"cid": conv_id}
+        )
+        doc = result.get("result")
+        return self._map_conversation(doc) if isinstance(doc, dict) else None
+
+    async def _previous_alert(self, alert_id: str) -> Optional[dict]:
+        """The stored version of an alert, before a save or update replaces it."""
+        result = await self._query_groq(
+            '*[_id == $aid][0]{ _id, patient, alertType, severity, acknowledged }', {"aid": alert_id}
+        )
+        doc = result.get("result")
+        return self._map_alert(doc) if isinstance(doc, dict) else None
+
     async def get_patient_insights(self, patient_id: str) -> dict:
         """
-        Cross-document, reference-traversing, typed-field-aggregating insights.
-        Features IMPOSSIBLE with flat files.
+        Insights served from the patient's running aggregates (one doc read).
+        Falls back to a full recompute the first time, before the doc is backfilled.
         """
         try:
-            # 1) All conversations with metrics + mood + nostalgia flag
-            conv_result = await self._query_groq(
-                """*[_type == "conversation" && patient._ref == $pid && defined(cognitiveMetrics)] {
-                    mood,
-                    "vocab": cognitiveMetrics.vocabularyDiversity,
-                    "coherence": cognitiveMetrics.topicCoherence,
-                    "hasNostalgia": nostalgiaEngagement.triggered == true
-                }""",
-                {"pid": patient_id},
-            )
-            convos = conv_result.get("result") or []
-
-            # Cognitive by mood
-            mood_buckets: dict = {}
-            for c in convos:
-                mood = c.get("mood", "unknown")
-                if mood not in mood_buckets:
-                    mood_buckets[mood] = {"vocabs": [], "coherences": [], "count": 0}
-                v = c.get("vocab")
-                co = c.get("coherence")
-                if v is not None:
-                    mood_buckets[mood]["vocabs"].append(v)
-                if co is not None:
-                    mood_buckets[mood]["coherences"].append(co)
-                mood_buckets[mood]["count"] += 1
-
-            cognitive_by_mood = {}
-            for mood, b in mood_buckets.items():
-                av = sum(b["vocabs"]) / len(b["vocabs"]) if b["vocabs"] else 0
-                ac = sum(b["coherences"]) / len(b["coherences"]) if b["coherences"] else 0
-                cognitive_by_mood[mood] = {
-                    "avg_vocabulary": round(av, 3),
-                    "avg_coherence": round(ac, 3),
-                    "conversation_count": b["count"],
-                }
+            doc = await self._insights_doc(patient_id)
+            if doc["complete"]:
+                return InsightAggregates(doc["state"]).summary()
+            return await self.recompute_patient_insights(patient_id)
+        except Exception as exc:
+            logger.error(f"get_patient_insights failed: {exc}")
+            return InsightAggregates().summary()
 
-            # Nostalgia effectiveness
-            with_n = [c for c in convos if c.get("hasNostalgia")]
-            without_n = [c for c in convos if not c.get("hasNostalgia")]
+    async def recompute_patient_insights(self, patient_id: str) -> dict:
+        """Rebuild a patient's aggregates from every conversation and alert, and persist them."""
+        conv_result = await self._query_groq(
+            '*[_type == "conversation" && patient._ref == $pid && defined(cognitiveMetrics)] { _id, mood, cognitiveMetrics, nostalgiaEngagement }',
+            {"pid": patient_id},
+        )
+        alert_result = await self._query_groq(
+            '*[_type == "alert" && patient._ref == $pid] { _id, alertType, severity, acknowledged }',
+            {"pid": patient_id},
+        )
+        conversations = [self._map_conversation(c) for c in (conv_result.get("result") or []) if c]
+        alerts = [self._map_alert(a) for a in (alert_result.get("result") or []) if a]
+        aggregates = InsightAggregates.rebuild(conversations, alerts)
 
-            def _avg(lst, key):
-                vals = [x[key] for x in lst if x.get(key) is not None]
-                return sum(vals) / len(vals) if vals else 0.0
+        doc_id = self._insights_id(patient_id)
+        rev_result = await self._query_groq('*[_id == $did][0]._rev', {"did": doc_id})
+        revision = rev_result.get("result")
+        if revision:
+            mutation = {"patch": {
+                "id": doc_id,
+                "ifRevisionID": revision,
+                "set": {"complete": True, "state": aggregates.state},
+            }}
+        else:
+            mutation = {"create": {
+                "_id": doc_id,
+                "_type": "insightAggregates",
+                "patient": {"_ref": patient_id, "_type": "reference"},
+                "complete": True,
+                "state": aggregates.state,
+            }}
+        try:
+            await self._mutate([mutation])
+            logger.info(
+                f"[INSIGHTS] Recomputed aggregates for {patient_id}: "
+                f"{len(conversations)} conversations, {len(alerts)} alerts"
+            )
+        except Exception as exc:
+            # A concurrent write won the race — serve what we computed, retry next read
+            logger.warning(f"[INSIGHTS] Recompute not persisted for {patient_id}: {exc}")
+        return aggregates.summary()
 
-            wv, wov = _avg(with_n, "vocab"), _avg(without_n, "vocab")
-            wc, woc = _avg(with_n, "coherence"), _avg(without_n, "coherence")
-            vi = ((wv - wov) / wov * 100) if wov > 0 else 0
-            ci = ((wc - woc) / woc * 100) if woc > 0 else 0
+    # =========================================================================
+    # NORMALIZATION BACKFILL
+    # =========================================================================
 
-            nostalgia_effectiveness = {
-                "with_nostalgia": {"avg_vocabulary": round(wv, 3), "avg_coherence": round(wc, 3), "count": len(with_n)},
-                "without_nostalgia": {"avg_vocabulary": round(wov, 3), "avg_coherence": round(woc, 3), "count": len(without_n)},
-                "improvement_pct": {"vocabulary": round(vi, 1), "coherence": round(ci, 1)},
-            }
+    async def list_unnormalized(
+        self, kind: str, after_id: Optional[str] = None, limit: int = 100
+    ) -> list[dict]:
+        doc_type, _ = _NORMALIZED_DOCS[kind]
+        projection = _CONVERSATION_LIST_FIELDS if kind == "conversation" else ""
+        result = await self._query_groq(
+            f'*[_type == $type && !(normalizationVersion >= $version) && _id > $after]'
+            f' | order(_id asc) [0...{limit}] {projection}',
+            {"type": doc_type, "version": NORMALIZATION_VERSION, "after": after_id or ""},
+        )
+        mapper = {"conversation": self._map_conversation, "alert": self._map_alert, "digest": self._map_digest}[kind]
+        return [mapper(d) for d in (result.get("result") or []) if d]
 
-            # 2) Alerts cross-document query
-            alert_result = await self._query_groq(
-                '*[_type == "alert" && patient._ref == $pid] { alertType, severity, acknowledged }',
-                {"pid": patient_id},
-            )
-            alerts = alert_result.get("result") or []
-
-            sev_counts = {"low": 0, "medium": 0, "high": 0}
-            type_counts: dict = {}
-            ack_count = 0
-            for a in alerts:
-                sev = a.get("severity", "low")
-                sev_counts[sev] = sev_counts.get(sev, 0) + 1
-                at = a.get("alertType", "unknown")
-                type_counts[at] = type_counts.get(at, 0) + 1
-                if a.get("acknowledged"):
-                    ack_count += 1
-
-            most_common = max(type_counts.items(), key=lambda x: x[1])[0] if type_counts else "none"
-
-            return {
-                "cognitive_by_mood": cognitive_by_mood,
-                "nostalgia_effectiveness": nostalgia_effectiveness,
-                "alert_summary": {
-                    "total": len(alerts),
-                    "by_severity": sev_counts,
-                    "most_common_type": most_common,
-                    "acknowledged_count": ack_count,
-                },
-            }
+    async def save_normalized(self, kind: str, record_id: str, fields: dict) -> bool:
+        _, field_names = _NORMALIZED_DOCS[kind]
+        sanity_set = {field_names[k]: v for k, v in fields.items() if k in field_names}
+        sanity_set["normalizationVersion"] = fields.get("normalization_version", NORMALIZATION_VERSION)
+        try:
+            await self._write([{"patch": {"id": record_id, "set": sanity_set}}])
+            return True
         except Exception as exc:
-            logger.error(f"get_patient_insights failed: {exc}")
-            return {
-                "cognitive_by_mood": {},
-                "nostalgia_effectiveness": {},
-                "alert_summary": {"total": 0, "by_severity": {"low": 0, "medium": 0, "high": 0}, "most_common_type": "none", "acknowledged_count": 0},
-            }
+            logger.error(f"save_normalized failed for {record_id}: {exc}")
+            return False
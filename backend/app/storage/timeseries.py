@@ -0,0 +1,127 @@
+"""
+Cognitive Time Series
+Compact per-patient series of cognitive metrics, maintained at write time.
+
+Each conversation with cognitive metrics contributes one point, stored as
+parallel column arrays (timestamps, one list per metric, precomputed score)
+kept sorted by timestamp. A trend window is a binary search on the
+timestamp column plus a slice — no conversation scan, no re-scoring.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, UTC
+from typing import Optional
+
+from app.cognitive.utils import calculate_cognitive_score
+
+SERIES_METRICS = (
+    "vocabulary_diversity",
+    "topic_coherence",
+    "repetition_rate",
+    "word_finding_pauses",
+    "response_latency",
+)
+
+
+def to_utc_iso(timestamp) -> str:
+    """Normalize a datetime or ISO string to a UTC ISO string (sortable as text)."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return timestamp.astimezone(UTC).isoformat()
+
+
+class CognitiveTimeSeries:
+    """Column-oriented cognitive metrics for one patient, sorted by timestamp."""
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.timestamps: list[str] = []
+        self.columns: dict[str, list] = {m: [] for m in SERIES_METRICS}
+        self.scores: list[int] = []
+        self._known: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def add(self, conversation_id: str, timestamp, metrics: dict) -> dict:
+        """
+        Add (or replace) the point for a conversation.
+
+        Appends in O(1) for the usual in-order case; older timestamps are
+        inserted at their sorted position.
+
+        Returns:
+            The stored point as a dict (see `point`)
+        """
+        if conversation_id in self._known:
+            self._remove(self.ids.index(conversation_id))
+
+        ts = to_utc_iso(timestamp)
+        if not self.timestamps or ts >= self.timestamps[-1]:
+            pos = len(self.timestamps)
+        else:
+            pos = bisect_right(self.timestamps, ts)
+
+        self.ids.insert(pos, conversation_id)
+        self._known.add(conversation_id)
+        self.timestamps.insert(pos, ts)
+        for metric in SERIES_METRICS:
+            self.columns[metric].insert(pos, metrics.get(metric))
+        # Sanity returns unset metrics as None; let the scorer apply its defaults
+        present = {k: v for k, v in metrics.items() if v is not None}
+        self.scores.insert(pos, calculate_cognitive_score(present))
+        return self.point(pos)
+
+    def add_conversation(self, conversation: dict) -> Optional[dict]:
+        """Add a conversation dict's metrics; skipped if it has none."""
+        metrics = conversation.get("cognitive_metrics")
+        if not metrics or not conversation.get("timestamp"):
+            return None
+        return self.add(conversation["id"], conversation["timestamp"], metrics)
+
+    def _remove(self, index: int) -> None:
+        self._known.discard(self.ids[index])
+        del self.ids[index]
+        del self.timestamps[index]
+        for metric in SERIES_METRICS:
+            del self.columns[metric][index]
+        del self.scores[index]
+
+    def point(self, index: int) -> dict:
+        """One data point in the shape returned by get_cognitive_trends."""
+        ts = self.timestamps[index]
+        point = {"timestamp": ts, "date": ts[:10]}
+        for metric in SERIES_METRICS:
+            point[metric] = self.columns[metric][index]
+        point["cognitive_score"] = self.scores[index]
+        return point
+
+    def window(self, since) -> list[dict]:
+        """All points at or after `since` (datetime or ISO string), oldest first."""
+        start = bisect_left(self.timestamps, to_utc_iso(since))
+        return [self.point(i) for i in range(start, len(self.timestamps))]
+
+    # -- persistence (row form, for stores that keep the series as a document) --
+
+    def to_points(self) -> list[dict]:
+        """Rows keyed by conversation id, e.g. for a Sanity array field."""
+        return [
+            {"_key": cid, "conversationId": cid, **self.point(i)}
+            for i, cid in enumerate(self.ids)
+        ]
+
+    @classmethod
+    def from_points(cls, points: list[dict]) -> "CognitiveTimeSeries":
+        """Rebuild from stored rows; scores are taken as stored, not recomputed."""
+        series = cls()
+        latest = {(row.get("conversationId") or row.get("_key")): row for row in points or []}
+        for cid, row in sorted(latest.items(), key=lambda item: to_utc_iso(item[1]["timestamp"])):
+            series.ids.append(cid)
+            series._known.add(cid)
+            series.timestamps.append(to_utc_iso(row["timestamp"]))
+            for metric in SERIES_METRICS:
+                series.columns[metric].append(row.get(metric))
+            series.scores.append(row.get("cognitive_score"))
+        return series
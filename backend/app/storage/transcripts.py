@@ -0,0 +1,49 @@
+"""
+Transcript Blobs
+Transcripts are stored apart from conversation metadata as compressed
+blobs, so list queries never carry them.
+
+A conversation record holds only:
+    transcript_ref:  blob id ("transcript-<conversation_id>")
+    transcript_size: uncompressed size in bytes (UTF-8)
+
+Blobs are gzip-compressed and base64-encoded (JSON-safe for Sanity).
+"""
+
+import base64
+import gzip
+from typing import Optional
+
+ENCODING = "gzip+base64"
+
+
+def transcript_blob_id(conversation_id: str) -> str:
+    return f"transcript-{conversation_id}"
+
+
+def compress_transcript(text: str) -> str:
+    """Compress a transcript into a JSON-safe string."""
+    raw = gzip.compress(text.encode("utf-8"), compresslevel=6, mtime=0)
+    return base64.b64encode(raw).decode("ascii")
+
+
+def decompress_transcript(data: Optional[str], encoding: str = ENCODING) -> Optional[str]:
+    """Inverse of compress_transcript; None passes through."""
+    if data is None:
+        return None
+    if encoding != ENCODING:
+        raise ValueError(f"Unsupported transcript encoding: {encoding}")
+    return gzip.decompress(base64.b64decode(data)).decode("utf-8")
+
+
+def split_transcript(conversation: dict) -> tuple[dict, Optional[str]]:
+    """
+    Split a conversation dict into (metadata, transcript).
+    Metadata gets transcript_ref / transcript_size when there is a transcript.
+    """
+    metadata = {k: v for k, v in conversation.items() if k != "transcript"}
+    transcript = conversation.get("transcript")
+    if transcript:
+        metadata["transcript_ref"] = transcript_blob_id(conversation["id"])
+        metadata["transcript_size"] = len(transcript.encode("utf-8"))
+    return metadata, transcript
@@ -0,0 +1,137 @@
+"""
+Unit of Work
+Collects data store writes made during one logical operation (e.g. one
+pipeline run) and commits them together as a single atomic batch.
+
+Usage:
+    async with data_store.batch():
+        await data_store.save_conversation(conversation)
+        await data_store.save_wellness_digest(digest)
+    # both writes are committed here, or neither is
+
+The active unit of work is tracked in a ContextVar, so concurrent requests
+on the same store never see each other's pending writes.
+"""
+
+import inspect
+import logging
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RevisionConflictError(RuntimeError):
+    """A document changed between being read and being written in a batch."""
+
+
+_active: ContextVar[Optional["UnitOfWork"]] = ContextVar("claracare_unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """
+    Pending writes for one store, committed on successful exit of the block.
+
+    Stores push their own operation objects (Sanity mutation dicts, in-memory
+    callables) and decide how to commit them; this class only tracks state:
+    - operations: queued writes, in order
+    - expected_revisions: doc_id -> revision seen when the doc was read
+      (None means "did not exist"), used for optimistic concurrency checks
+    - pending_conversations: conversations saved in this batch, so reads
+      inside the block still see them (read-your-writes)
+    - after-commit callbacks: run once the writes are committed (dropped
+      with the writes on error), e.g. cache invalidation; a callback that
+      returns an awaitable (e.g. sending notifications) is awaited
+    """
+
+    def __init__(self, store, commit: Callable[["UnitOfWork"], Awaitable[None]]):
+        self.store = store
+        self.operations: list[Any] = []
+        self.expected_revisions: dict[str, Optional[str]] = {}
+        self.pending_conversations: dict[str, dict] = {}
+        self.committed = False
+        self._after_commit: list[Callable[[], Optional[Awaitable[None]]]] = []
+        self._commit = commit
+        self._token = None
+        self._outer: Optional["UnitOfWork"] = None
+
+    def add(self, *operations: Any) -> None:
+        """Queue one or more write operations."""
+        self.operations.extend(operations)
+
+    def after_commit(self, callback: Callable[[], Optional[Awaitable[None]]]) -> None:
+        """Run `callback` once this batch has committed."""
+        self._after_commit.append(callback)
+
+    def expect_revision(self, doc_id: str, revision: Optional[str]) -> None:
+        """Record the revision of a document read inside this batch (first read wins)."""
+        self.expected_revisions.setdefault(doc_id, revision)
+
+    def pending_conversations_for(self, patient_id: str) -> list[dict]:
+        """Conversations saved in this batch for a patient (not yet committed)."""
+        return [
+            c for c in self.pending_conversations.values()
+            if c.get("patient_id") == patient_id
+        ]
+
+    async def __aenter__(self) -> "UnitOfWork":
+        outer = _active.get()
+        if outer is not None and outer.store is self.store:
+            # Nested batch on the same store — join the outer unit of work
+            self._outer = outer
+            return outer
+        self._token = _active.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        if self._outer is not None:
+            return False
+        _active.reset(self._token)
+        self._token = None
+
+        if exc_type is not None:
+            if self.operations:
+                logger.warning(
+                    f"[UNIT_OF_WORK] Discarding {len(self.operations)} pending write(s) after error: {exc}"
+                )
+            self.operations.clear()
+            self._after_commit.clear()
+            return False
+
+        if self.operations:
+            await self._commit(self)
+            logger.info(f"[UNIT_OF_WORK] Committed {len(self.operations)} write(s) in one batch")
+        self.committed = True
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        return False
+
+
+def current_unit_of_work(store) -> Optional[UnitOfWork]:
+    """Return the unit of work active for `store` in this context, if any."""
+    uow = _active.get()
+    if uow is not None and uow.store is store:
+        return uow
+    return None
+
+
+def merge_pending_conversations(
+    uow: Optional[UnitOfWork],
+    patient_id: str,
+    conversations: list[dict],
+    limit: int,
+    offset: int = 0,
+) -> list[dict]:
+    """Overlay conversations saved in the active batch onto a first page of results."""
+    if uow is None or offset:
+        return conversations
+    pending = uow.pending_conversations_for(patient_id)
+    if not pending:
+        return conversations
+    pending_ids = {c["id"] for c in pending}
+    merged = pending + [c for c in conversations if c.get("id") not in pending_ids]
+    merged.sort(key=lambda c: c.get("timestamp") or "", reverse=True)
+    return merged[:limit]
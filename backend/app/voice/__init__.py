@@ -13,6 +13,8 @@ from .persona import (
 )
 from .twilio_bridge import TwilioBridge, TwilioCallSession, twilio_bridge
 from .outbound import OutboundCallManager, outbound_manager
+from .prewarm import PrewarmPool, prewarm_pool
+from .scheduler import CallScheduler, call_scheduler
 
 __all__ = [
     # Agent
@@ -36,6 +38,14 @@ __all__ = [
     
     # Outbound
     "OutboundCallManager",
-    "outbound_manager"
+    "outbound_manager",
+    
+    # Pre-warm
+    "PrewarmPool",
+    "prewarm_pool",
+    
+    # Scheduler
+    "CallScheduler",
+    "call_scheduler"
 ]
 
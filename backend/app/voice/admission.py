@@ -0,0 +1,145 @@
+"""
+Admission Control
+Caps how many calls one worker process takes on.
+
+Every call costs this process two audio relays, a Deepgram session and
+mid-call analysis, then a post-call analysis burst after hangup. Past
+some point audio degrades for every call at once, so capacity is
+explicit:
+
+- MAX_ACTIVE_CALLS: calls streaming audio (plus calls admitted by the
+  TwiML endpoint whose stream hasn't connected yet).
+- MAX_PENDING_ANALYSES: post-call analyses still running.
+
+A new call arriving while either limit is reached is turned away at
+/voice/twiml: redirected to CALL_OVERFLOW_URL (another worker's TwiML
+endpoint) when set, otherwise told Clara will call back. A stream that
+arrives without going through /voice/twiml is closed with 1013 (try
+again later). Non-urgent outbound dialing (scheduled and batch calls)
+waits for capacity instead of placing calls that would be turned away.
+
+utilization() is served at /capacity for autoscaling.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_ACTIVE_CALLS = int(os.getenv("MAX_ACTIVE_CALLS", "20"))
+MAX_PENDING_ANALYSES = int(os.getenv("MAX_PENDING_ANALYSES", "10"))
+RESERVATION_TTL_SEC = 30.0   # TwiML fetched → stream connects within seconds
+DEFER_POLL_SEC = 5.0
+
+
+class AdmissionController:
+    """Per-process call and post-call-analysis capacity"""
+
+    def __init__(self, max_active_calls: int = MAX_ACTIVE_CALLS, max_pending_analyses: int = MAX_PENDING_ANALYSES):
+        self.max_active_calls = max_active_calls
+        self.max_pending_analyses = max_pending_analyses
+        self._active: set[str] = set()
+        self._reserved: Dict[str, float] = {}  # call_sid -> expiry (monotonic)
+        self.pending_analyses = 0
+        self._released: Optional[asyncio.Event] = None
+        self.stats = {"admitted": 0, "rejected": 0, "deferred": 0}
+
+    def _expire_reservations(self) -> None:
+        now = time.monotonic()
+        for call_sid in [sid for sid, expires in self._reserved.items() if expires <= now]:
+            del self._reserved[call_sid]
+
+    @property
+    def call_load(self) -> int:
+        self._expire_reservations()
+        return len(self._active) + len(self._reserved)
+
+    @property
+    def saturated(self) -> bool:
+        return self.call_load >= self.max_active_calls or self.pending_analyses >= self.max_pending_analyses
+
+    def try_admit(self, call_sid: str) -> bool:
+        """Reserve a slot for a call about to connect its stream (TwiML time)"""
+        if call_sid in self._reserved or call_sid in self._active:
+            return True
+        if self.saturated:
+            self.stats["rejected"] += 1
+            logger.warning(
+                f"[ADMISSION] Rejecting CallSid={call_sid}: calls={self.call_load}/{self.max_active_calls} "
+                f"analyses={self.pending_analyses}/{self.max_pending_analyses}"
+            )
+            return False
+        self._reserved[call_sid] = time.monotonic() + RESERVATION_TTL_SEC
+        self.stats["admitted"] += 1
+        return True
+
+    def call_started(self, call_sid: str) -> bool:
+        """Take an active slot when the media stream starts (uses the TwiML reservation if any)"""
+        if self._reserved.pop(call_sid, None) is None and call_sid not in self._active:
+            if self.saturated:
+                self.stats["rejected"] += 1
+                logger.warning(f"[ADMISSION] Rejecting unreserved stream CallSid={call_sid}: at capacity")
+                return False
+            self.stats["admitted"] += 1
+        self._active.add(call_sid)
+        return True
+
+    def call_ended(self, call_sid: str) -> None:
+        self._active.discard(call_sid)
+        self._reserved.pop(call_sid, None)
+        self._notify()
+
+    @contextmanager
+    def analysis(self):
+        """Count a post-call analysis while it runs"""
+        self.pending_analyses += 1
+        try:
+            yield
+        finally:
+            self.pending_analyses -= 1
+            self._notify()
+
+    def _notify(self) -> None:
+        if self._released is not None:
+            self._released.set()
+
+    async def wait_for_capacity(self) -> float:
+        """Block until the process isn't saturated. Returns seconds waited."""
+        if not self.saturated:
+            return 0.0
+        self.stats["deferred"] += 1
+        started = time.monotonic()
+        if self._released is None:
+            self._released = asyncio.Event()
+        while self.saturated:
+            self._released.clear()
+            try:
+                # Reservations expire silently, so re-check periodically too
+                await asyncio.wait_for(self._released.wait(), DEFER_POLL_SEC)
+            except asyncio.TimeoutError:
+                pass
+        return time.monotonic() - started
+
+    def utilization(self) -> dict:
+        load = self.call_load
+        call_util = load / self.max_active_calls if self.max_active_calls else 1.0
+        analysis_util = self.pending_analyses / self.max_pending_analyses if self.max_pending_analyses else 1.0
+        return {
+            "max_active_calls": self.max_active_calls,
+            "active_calls": len(self._active),
+            "reserved_calls": len(self._reserved),
+            "max_pending_analyses": self.max_pending_analyses,
+            "pending_analyses": self.pending_analyses,
+            "call_utilization": round(call_util, 3),
+            "analysis_utilization": round(analysis_util, 3),
+            "utilization": round(max(call_util, analysis_util), 3),
+            "saturated": self.saturated,
+            **self.stats,
+        }
+
+
+admission = AdmissionController()
@@ -7,16 +7,25 @@ import asyncio
 import json
 import logging
 import os
+import time
 from typing import Optional, Callable, Dict, Any
 
 import websockets
 from websockets.client import WebSocketClientProtocol
 
-from .persona import get_function_definitions, get_full_prompt, get_personalized_greeting, build_patient_context_prompt
+from .persona import build_patient_context_prompt
+from .prompt_cache import prompt_cache
 from .functions import FunctionHandler
+from .function_dispatcher import FunctionCallDispatcher
 
 logger = logging.getLogger(__name__)
 
+# ~10s of 20ms agent audio kept while no output callback is attached
+EARLY_AUDIO_MAX_CHUNKS = 500
+
+# Deepgram events timestamped for per-turn response latency
+SPEECH_EVENTS = frozenset({"AgentStoppedSpeaking", "UserStartedSpeaking", "UserStoppedSpeaking"})
+
 
 class DeepgramVoiceAgent:
     """
@@ -30,6 +39,7 @@ class DeepgramVoiceAgent:
         self.deepgram_ws: Optional[WebSocketClientProtocol] = None
         self.is_connected = False
         self.function_handler = FunctionHandler(patient_id, cognitive_pipeline)
+        self.function_dispatcher = FunctionCallDispatcher(self.function_handler.execute, self._send_text)
         self.data_store = data_store
         self._listen_task: Optional[asyncio.Task] = None
 
@@ -41,6 +51,15 @@ class DeepgramVoiceAgent:
         # Task 3.5: Speaking state tracking for safe injection queue
         self.agent_is_speaking = False
         self._on_agent_silence: Optional[Callable[[], None]] = None
+        # Speaking events (type, monotonic receive time) for turn timing.
+        # Not buffered before callbacks attach: a pre-warmed greeting's
+        # timing says nothing about when the patient heard it.
+        self._on_speech_event: Optional[Callable[[str, float], None]] = None
+
+        # Output that arrives before callbacks are attached (pre-warmed
+        # sessions start greeting before the Twilio stream exists)
+        self._early_audio: list[bytes] = []
+        self._early_transcripts: list[tuple[str, str]] = []
         
     async def connect(self) -> bool:
         """
@@ -53,41 +72,23 @@ class DeepgramVoiceAgent:
             return False
             
         try:
-            # 1. Fetch patient data BEFORE connecting so we can embed it in the prompt
-            patient = None
-            recent_convos = []
-            try:
-                data_store = self.data_store
-                if not data_store and self.function_handler and self.function_handler.cognitive_pipeline:
-                    data_store = self.function_handler.cognitive_pipeline.data_store
-                
-                if data_store:
-                    patient = await data_store.get_patient(self.patient_id)
-                    if patient:
-                        recent_convos = await data_store.get_conversations(
-                            patient_id=self.patient_id, limit=3
-                        )
-                        logger.info(f"Fetched patient context for {patient.get('preferred_name', self.patient_id)} ({len(recent_convos)} recent convos)")
-                    else:
-                        logger.warning(f"Patient {self.patient_id} not found — using generic prompt")
-                else:
-                    logger.warning("No data store available — using generic prompt")
-            except Exception as e:
-                logger.error(f"Error fetching patient data: {e} — using generic prompt")
-            
-            # 2. Build personalized prompt + greeting
-            full_prompt = get_full_prompt(patient, recent_convos)
-            greeting = get_personalized_greeting(patient)
+            # 1. Rendered prompt + greeting + Settings text (cached per patient;
+            #    only a first call or one after a profile/history change reads
+            #    the data store)
+            data_store = self.data_store
+            if not data_store and self.function_handler and self.function_handler.cognitive_pipeline:
+                data_store = self.function_handler.cognitive_pipeline.data_store
+            prompt = await prompt_cache.get(self.patient_id, data_store)
             
-            # 3. Connect to Deepgram
+            # 2. Connect to Deepgram
             url = "wss://agent.deepgram.com/v1/agent/converse"
             headers = {"Authorization": f"Token {self.deepgram_api_key}"}
             
             logger.info(f"Connecting to Deepgram Voice Agent for patient {self.patient_id}")
             self.deepgram_ws = await websockets.connect(url, extra_headers=headers)
             
-            # 4. Send Settings with the personalized prompt + greeting baked in
-            await self._send_config(full_prompt, greeting)
+            # 3. Send Settings with the personalized prompt + greeting baked in
+            await self._send_config(prompt)
             
             self.is_connected = True
             logger.info("Successfully connected to Deepgram Voice Agent")
@@ -95,6 +96,9 @@ class DeepgramVoiceAgent:
             # Start listening for messages from Deepgram
             self._listen_task = asyncio.create_task(self._listen_to_deepgram())
             
+            # Patient-only tool results are fetched now, before Clara asks
+            self.function_handler.prefetch()
+            
             return True
             
         except Exception as e:
@@ -103,50 +107,10 @@ class DeepgramVoiceAgent:
                 await self.on_error(f"Connection failed: {str(e)}")
             return False
     
-    async def _send_config(self, full_prompt: str, greeting: str):
+    async def _send_config(self, prompt: dict):
         """Send V1 Settings to Deepgram with personalized prompt + greeting."""
-        config = {
-            "type": "Settings",
-            "audio": {
-                "input": {
-                    "encoding": "mulaw",
-                    "sample_rate": 8000
-                },
-                "output": {
-                    "encoding": "mulaw",
-                    "sample_rate": 8000,
-                    "container": "none"
-                }
-            },
-            "agent": {
-                "language": "en",
-                "listen": {
-                    "provider": {
-                        "type": "deepgram",
-                        "model": "nova-3"
-                    }
-                },
-                "think": {
-                    "provider": {
-                        "type": "open_ai",
-                        "model": "gpt-4o-mini",
-                        "temperature": 0.7
-                    },
-                    "prompt": full_prompt,
-                    "functions": get_function_definitions()
-                },
-                "speak": {
-                    "provider": {
-                        "type": "deepgram",
-                        "model": "aura-2-thalia-en"
-                    }
-                },
-                "greeting": greeting
-            }
-        }
-        
-        await self.deepgram_ws.send(json.dumps(config))
-        logger.info(f"Sent V1 Settings — prompt={len(full_prompt)} chars, greeting='{greeting}'")
+        await self.deepgram_ws.send(prompt["settings"])
+        logger.info(f"Sent V1 Settings — prompt={len(prompt['prompt'])} chars, greeting='{prompt['greeting']}'")
     
     async def _inject_patient_context(self):
         """
@@ -203,6 +167,8 @@ class DeepgramVoiceAgent:
                     # Audio output from Clara
                     if self.on_audio_output:
                         await self.on_audio_output(message)
+                    elif len(self._early_audio) < EARLY_AUDIO_MAX_CHUNKS:
+                        self._early_audio.append(message)
                 else:
                     # JSON message (transcript, function call, etc.)
                     await self._handle_json_message(json.loads(message))
@@ -220,6 +186,9 @@ class DeepgramVoiceAgent:
         """Handle JSON messages from Deepgram"""
         msg_type = message.get("type")
         
+        if self._on_speech_event and msg_type in SPEECH_EVENTS:
+            self._on_speech_event(msg_type, time.monotonic())
+        
         if msg_type == "UserStartedSpeaking":
             logger.debug("User started speaking")
             
@@ -270,6 +239,8 @@ class DeepgramVoiceAgent:
                 logger.info(f"ConversationText [{speaker}]: {content}")
                 if self.on_transcript:
                     await self.on_transcript(speaker, content)
+                else:
+                    self._early_transcripts.append((speaker, content))
             
         elif msg_type == "Metadata":
             # Metadata about the agent
@@ -307,6 +278,8 @@ class DeepgramVoiceAgent:
         """
         Handle V1 FunctionCallRequest from Clara.
         V1 format uses a "functions" array with id/name/arguments/client_side.
+        Calls run as supervised tasks so the listener never waits on a tool;
+        responses are sent in request order by the dispatcher.
         """
         functions = message.get("functions", [])
         
@@ -326,37 +299,10 @@ class DeepgramVoiceAgent:
                 input_data = {}
             
             logger.info(f"[FUNC_CALL] function={function_name} params={input_data}")
-            
-            try:
-                # Execute the function
-                result = await self.function_handler.execute(function_name, input_data)
-                
-                # V1 FunctionCallResponse: id, name, content (JSON string)
-                response = {
-                    "type": "FunctionCallResponse",
-                    "id": func_id,
-                    "name": function_name,
-                    "content": json.dumps(result)
-                }
-                
-                await self.deepgram_ws.send(json.dumps(response))
-                logger.info(f"[FUNC_RESULT] function={function_name} result_keys={list(result.keys()) if isinstance(result, dict) else 'non-dict'}")
-                
-            except Exception as e:
-                logger.error(f"Error executing function {function_name}: {e}")
-                
-                # Send error response in V1 format
-                error_response = {
-                    "type": "FunctionCallResponse",
-                    "id": func_id,
-                    "name": function_name,
-                    "content": json.dumps({
-                        "error": str(e),
-                        "success": False
-                    })
-                }
-                
-                await self.deepgram_ws.send(json.dumps(error_response))
+            self.function_dispatcher.submit(func_id, function_name, input_data)
+    
+    async def _send_text(self, text: str):
+        await self.deepgram_ws.send(text)
     
     async def send_audio(self, audio_data: bytes):
         """
@@ -373,6 +319,22 @@ class DeepgramVoiceAgent:
             if self.on_error:
                 await self.on_error(f"Audio send error: {str(e)}")
     
+    async def send_keepalive(self):
+        """Keep an idle (pre-warmed) connection open while no audio is flowing"""
+        if self.is_connected and self.deepgram_ws:
+            await self.deepgram_ws.send(json.dumps({"type": "KeepAlive"}))
+    
+    async def flush_early_output(self):
+        """Deliver output buffered before callbacks were attached, in order"""
+        transcripts, self._early_transcripts = self._early_transcripts, []
+        audio, self._early_audio = self._early_audio, []
+        if self.on_transcript:
+            for speaker, text in transcripts:
+                await self.on_transcript(speaker, text)
+        if self.on_audio_output:
+            for chunk in audio:
+                await self.on_audio_output(chunk)
+    
     async def close(self):
         """Close the Deepgram WebSocket connection and cancel background tasks"""
         # Cancel the listener task first
@@ -384,6 +346,9 @@ class DeepgramVoiceAgent:
                 pass
             self._listen_task = None
         
+        await self.function_dispatcher.close()
+        await self.function_handler.cancel_prefetch()
+        
         if self.deepgram_ws:
             try:
                 await self.deepgram_ws.close()
@@ -399,7 +364,8 @@ class DeepgramVoiceAgent:
         on_audio_output: Optional[Callable[[bytes], None]] = None,
         on_transcript: Optional[Callable[[str, str], None]] = None,
         on_error: Optional[Callable[[str], None]] = None,
-        on_agent_silence: Optional[Callable[[], None]] = None
+        on_agent_silence: Optional[Callable[[], None]] = None,
+        on_speech_event: Optional[Callable[[str, float], None]] = None
     ):
         """
         Set callback functions for handling agent output
@@ -409,6 +375,7 @@ class DeepgramVoiceAgent:
             on_transcript: Called when transcript is available (speaker, text)
             on_error: Called when an error occurs (error message)
             on_agent_silence: Called when Clara stops speaking (for draining injection queue)
+            on_speech_event: Called with (event type, monotonic time) for speaking events
         """
         if on_audio_output:
             self.on_audio_output = on_audio_output
@@ -418,6 +385,8 @@ class DeepgramVoiceAgent:
             self.on_error = on_error
         if on_agent_silence:
             self._on_agent_silence = on_agent_silence
+        if on_speech_event:
+            self._on_speech_event = on_speech_event
 
 
 class AgentSessionManager:
@@ -459,6 +428,11 @@ class AgentSessionManager:
         else:
             raise ConnectionError("Failed to connect to Deepgram Voice Agent")
     
+    def adopt_session(self, session_id: str, agent: DeepgramVoiceAgent):
+        """Register an already-connected (pre-warmed) agent under a call's session id"""
+        self.sessions[session_id] = agent
+        logger.info(f"Adopted pre-warmed agent session {session_id} for patient {agent.patient_id}")
+    
     def get_session(self, session_id: str) -> Optional[DeepgramVoiceAgent]:
         """Get an existing agent session"""
         return self.sessions.get(session_id)
@@ -0,0 +1,126 @@
+"""Bounded, decoupled audio relay — one per direction of a call."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+
+
+class AudioRelay:
+    """
+    Moves audio chunks from a producer to a slow consumer without coupling them.
+
+    The producer calls put() (never blocks); a dedicated task sends queued
+    chunks in order. When the queue is full:
+    - drop_oldest: the oldest chunk is discarded (live microphone audio —
+      stale frames are worthless)
+    - coalesce: the chunk is appended to the newest queued chunk, so no
+      audio is lost but sends get larger (agent speech); once that chunk
+      reaches max_coalesce_bytes the oldest chunk is dropped instead
+    A failing or hanging send only stalls this relay, never the producer.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        send: Callable[[bytes], Awaitable[None]],
+        maxsize: int = 50,
+        policy: str = DROP_OLDEST,
+        max_coalesce_bytes: int = 16_000,
+    ):
+        if policy not in (DROP_OLDEST, COALESCE):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.name = name
+        self.policy = policy
+        self.maxsize = maxsize
+        self.max_coalesce_bytes = max_coalesce_bytes
+        self._send = send
+        self._queue: deque[tuple[float, bytes]] = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._latencies: deque[float] = deque(maxlen=500)
+        self.stats = {
+            "enqueued": 0,
+            "sent": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "send_errors": 0,
+            "max_depth": 0,
+        }
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def put(self, chunk: bytes) -> None:
+        """Queue a chunk, applying the overflow policy when full."""
+        if not chunk:
+            return
+        self.stats["enqueued"] += 1
+        if len(self._queue) >= self.maxsize:
+            if (self.policy == COALESCE
+                    and len(self._queue[-1][1]) + len(chunk) <= self.max_coalesce_bytes):
+                queued_at, tail = self._queue[-1]
+                self._queue[-1] = (queued_at, tail + chunk)
+                self.stats["coalesced"] += 1
+                return
+            self._queue.popleft()
+            self.stats["dropped"] += 1
+        self._queue.append((time.monotonic(), chunk))
+        self.stats["max_depth"] = max(self.stats["max_depth"], len(self._queue))
+        self._ready.set()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            queued_at, chunk = self._queue.popleft()
+            try:
+                await self._send(chunk)
+                self.stats["sent"] += 1
+                self._latencies.append(time.monotonic() - queued_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["send_errors"] += 1
+                if self.stats["send_errors"] == 1 or self.stats["send_errors"] % 100 == 0:
+                    logger.warning(f"[RELAY] {self.name} send failed ({self.stats['send_errors']}x): {e}")
+
+    async def close(self, drain_timeout: float = 0.5) -> None:
+        """Give queued audio a moment to flush, then stop the sender task."""
+        if self._task is None:
+            return
+        deadline = time.monotonic() + drain_timeout
+        while self._queue and not self._task.done() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def metrics(self) -> dict:
+        latencies = sorted(self._latencies)
+        if latencies:
+            latency = {
+                "avg_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+                "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+                "max_ms": round(latencies[-1] * 1000, 2),
+            }
+        else:
+            latency = {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "policy": self.policy,
+            "depth": len(self._queue),
+            **self.stats,
+            "latency": latency,
+        }
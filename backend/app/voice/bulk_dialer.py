@@ -0,0 +1,143 @@
+"""
+Bulk Dialer
+Dials many patients concurrently for batch check-ins.
+
+call_multiple_patients used to await each Twilio Calls.json POST in turn,
+so a 500-resident facility took minutes. Here a fixed pool of workers
+(BULK_DIAL_CONCURRENCY) pulls patients off one iterator and dials through
+OutboundCallManager.call_patient, which uses the pooled Twilio client and
+the shared CPS token bucket. Results stream back as each call is placed.
+
+Batch endpoints don't hold the request open: start() returns a
+BulkDialJob whose progress is polled at GET /voice/call/jobs/{job_id}.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime, UTC
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BULK_DIAL_CONCURRENCY = int(os.getenv("BULK_DIAL_CONCURRENCY", "10"))
+KEEP_JOBS = 50
+
+
+class BulkDialJob:
+    """Progress of one batch of calls"""
+
+    def __init__(self, patients: List[Dict[str, str]]):
+        self.id = uuid.uuid4().hex[:12]
+        self.patients = patients
+        self.calls: List[dict] = []
+        self.successful = 0
+        self.failed = 0
+        self.status = "running"
+        self.started_at = datetime.now(UTC).isoformat()
+        self.finished_at: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def record(self, entry: dict) -> None:
+        self.calls.append(entry)
+        if entry["result"].get("success"):
+            self.successful += 1
+        else:
+            self.failed += 1
+
+    def progress(self, since: int = 0) -> dict:
+        """Counts plus per-patient results from index `since` (for incremental polling)"""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": len(self.patients),
+            "completed": len(self.calls),
+            "successful": self.successful,
+            "failed": self.failed,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "next": len(self.calls),
+            "calls": self.calls[since:],
+        }
+
+
+class BulkDialer:
+    """Bounded-concurrency dialing with streamed results and pollable jobs"""
+
+    def __init__(
+        self,
+        call_patient: Callable[[str, str, str], Awaitable[Dict[str, Any]]],
+        concurrency: int = BULK_DIAL_CONCURRENCY,
+    ):
+        self._call_patient = call_patient
+        self.concurrency = max(1, concurrency)
+        self._jobs: "OrderedDict[str, BulkDialJob]" = OrderedDict()
+
+    async def _dial(self, patient: Dict[str, str]) -> dict:
+        patient_id = patient.get("patient_id")
+        phone = patient.get("phone")
+        name = patient.get("name", "Patient")
+        try:
+            result = await self._call_patient(patient_id, phone, name)
+        except Exception as e:
+            logger.error(f"[BULK_DIAL] {patient_id} failed: {e}")
+            result = {"success": False, "error": str(e)}
+        return {"patient_id": patient_id, "name": name, "phone": phone, "result": result}
+
+    async def stream(self, patients: List[Dict[str, str]]) -> AsyncIterator[dict]:
+        """Yield each patient's dial result as soon as it is placed (completion order)"""
+        pending = iter(patients)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def worker() -> None:
+            for patient in pending:
+                await results.put(await self._dial(patient))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(patients)))]
+        try:
+            for _ in range(len(patients)):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def start(self, patients: List[Dict[str, str]]) -> BulkDialJob:
+        """Dial in the background; poll the returned job for progress"""
+        job = BulkDialJob(patients)
+        job.task = asyncio.create_task(self._run(job))
+        self._jobs[job.id] = job
+        while len(self._jobs) > KEEP_JOBS:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.status == "running":
+                break
+            del self._jobs[oldest_id]
+        logger.info(f"[BULK_DIAL] job={job.id} dialing {len(patients)} patient(s), concurrency={self.concurrency}")
+        return job
+
+    async def _run(self, job: BulkDialJob) -> None:
+        try:
+            async for entry in self.stream(job.patients):
+                job.record(entry)
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        finally:
+            job.finished_at = datetime.now(UTC).isoformat()
+            logger.info(
+                f"[BULK_DIAL] job={job.id} {job.status}: {job.successful} successful, "
+                f"{job.failed} failed out of {len(job.patients)}"
+            )
+
+    def get(self, job_id: str) -> Optional[BulkDialJob]:
+        return self._jobs.get(job_id)
+
+    async def close(self) -> None:
+        """Cancel running jobs (app shutdown)"""
+        running = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,313 @@
+"""
+Call Registry
+Which node owns which live call, visible to every worker and replica.
+
+TwilioBridge.active_calls only holds the calls on this process, so with
+more than one uvicorn worker (or pod) live-status, /voice/calls and
+end-call would only see whichever worker served the request. Each node
+now records its calls here:
+
+- register / unregister as media streams start and stop, stamped with
+  this node's NODE_ID
+- a heartbeat loop refreshes the node's calls every HEARTBEAT_SEC;
+  records not refreshed within REGISTRY_TTL_SEC (a crashed worker) are
+  treated as gone
+- commands for a call on another node (end-call) are queued for the
+  owner, which polls its queue every COMMAND_POLL_SEC
+
+Backends (CALL_REGISTRY):
+    memory  in-process only (default; one worker, as before)
+    sqlite  shared by all workers on one host through a SQLite file
+            (CALL_REGISTRY_PATH); also the local stand-in for redis
+    redis   shared across hosts/replicas (REDIS_URL, needs `redis`)
+
+Registry failures are logged and never break a call.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+try:
+    import redis.asyncio as aioredis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+logger = logging.getLogger(__name__)
+
+NODE_ID = os.getenv("NODE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+HEARTBEAT_SEC = 10.0
+REGISTRY_TTL_SEC = 30.0
+COMMAND_POLL_SEC = 1.0
+DEFAULT_SQLITE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "call_registry.sqlite"
+
+
+class CallRegistry:
+    """
+    In-process registry; also the base for shared backends, which only
+    override the storage primitives (_put, _touch, _delete, _records,
+    _push_command, _pop_commands).
+    """
+
+    backend = "memory"
+
+    def __init__(self, node_id: str = NODE_ID, ttl: float = REGISTRY_TTL_SEC):
+        self.node_id = node_id
+        self.ttl = ttl
+        self._calls: Dict[str, dict] = {}
+        self._commands: Dict[str, List[dict]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # ---- storage primitives --------------------------------------------
+
+    async def _put(self, record: dict) -> None:
+        self._calls[record["call_sid"]] = record
+
+    async def _touch(self, call_sids: List[str], now: float) -> None:
+        for call_sid in call_sids:
+            if call_sid in self._calls:
+                self._calls[call_sid]["heartbeat_at"] = now
+
+    async def _delete(self, call_sid: str) -> None:
+        self._calls.pop(call_sid, None)
+
+    async def _records(self) -> List[dict]:
+        return list(self._calls.values())
+
+    async def _push_command(self, node_id: str, command: dict) -> None:
+        self._commands.setdefault(node_id, []).append(command)
+
+    async def _pop_commands(self, node_id: str) -> List[dict]:
+        return self._commands.pop(node_id, [])
+
+    # ---- public API ----------------------------------------------------
+
+    async def register(self, call_sid: str, patient_id: str, started_at: Optional[str] = None) -> None:
+        now = time.time()
+        record = {
+            "call_sid": call_sid,
+            "patient_id": patient_id,
+            "node_id": self.node_id,
+            "started_at": started_at,
+            "heartbeat_at": now,
+        }
+        await self._safe("register", self._put(record))
+
+    async def unregister(self, call_sid: str) -> None:
+        await self._safe("unregister", self._delete(call_sid))
+
+    async def heartbeat(self, call_sids: Iterable[str]) -> None:
+        call_sids = list(call_sids)
+        if call_sids:
+            await self._safe("heartbeat", self._touch(call_sids, time.time()))
+
+    async def list_calls(self) -> List[dict]:
+        """Live calls on every node (expired records are skipped)"""
+        records = await self._safe("list", self._records()) or []
+        cutoff = time.time() - self.ttl
+        return sorted(
+            (r for r in records if r["heartbeat_at"] >= cutoff),
+            key=lambda r: r.get("started_at") or "",
+        )
+
+    async def get(self, call_sid: str) -> Optional[dict]:
+        return next((r for r in await self.list_calls() if r["call_sid"] == call_sid), None)
+
+    async def find_by_patient(self, patient_id: str) -> Optional[dict]:
+        return next((r for r in await self.list_calls() if r["patient_id"] == patient_id), None)
+
+    async def send_command(self, node_id: str, command: dict) -> None:
+        await self._safe("send_command", self._push_command(node_id, command))
+
+    async def _safe(self, op: str, awaitable: Awaitable):
+        try:
+            return await awaitable
+        except Exception as e:
+            logger.error(f"[CALL_REGISTRY] {self.backend} {op} failed: {e}")
+            return None
+
+    # ---- node loop -----------------------------------------------------
+
+    def start(
+        self,
+        owned: Callable[[], Iterable[str]],
+        handle_command: Callable[[dict], Awaitable[None]],
+    ) -> None:
+        """Heartbeat this node's calls and run commands routed to it"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(owned, handle_command))
+            logger.info(f"[CALL_REGISTRY] backend={self.backend} node={self.node_id}")
+
+    async def _run(self, owned, handle_command) -> None:
+        next_heartbeat = 0.0
+        while True:
+            if time.monotonic() >= next_heartbeat:
+                await self.heartbeat(owned())
+                next_heartbeat = time.monotonic() + HEARTBEAT_SEC
+            for command in await self._safe("poll", self._pop_commands(self.node_id)) or []:
+                try:
+                    await handle_command(command)
+                except Exception as e:
+                    logger.error(f"[CALL_REGISTRY] Command {command} failed: {e}")
+            await asyncio.sleep(COMMAND_POLL_SEC)
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def metrics(self) -> dict:
+        calls = await self.list_calls()
+        nodes: Dict[str, int] = {}
+        for record in calls:
+            nodes[record["node_id"]] = nodes.get(record["node_id"], 0) + 1
+        return {"backend": self.backend, "node_id": self.node_id, "calls": len(calls), "nodes": nodes}
+
+
+class SqliteCallRegistry(CallRegistry):
+    """Shared by every worker on one host (and the local stand-in for the redis backend)"""
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path = DEFAULT_SQLITE_PATH, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS calls (call_sid TEXT PRIMARY KEY, patient_id TEXT,"
+                " node_id TEXT, started_at TEXT, heartbeat_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS commands (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " node_id TEXT, payload TEXT)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    async def _exec(self, fn: Callable[[sqlite3.Connection], object]):
+        def run():
+            conn = self._connect()
+            try:
+                with conn:
+                    return fn(conn)
+            finally:
+                conn.close()
+        return await asyncio.to_thread(run)
+
+    async def _put(self, record: dict) -> None:
+        await self._exec(lambda c: c.execute(
+            "INSERT OR REPLACE INTO calls VALUES (?, ?, ?, ?, ?)",
+            (record["call_sid"], record["patient_id"], record["node_id"], record["started_at"], record["heartbeat_at"]),
+        ))
+
+    async def _touch(self, call_sids: List[str], now: float) -> None:
+        def touch(c):
+            c.executemany(
+                "UPDATE calls SET heartbeat_at = ? WHERE call_sid = ? AND node_id = ?",
+                [(now, sid, self.node_id) for sid in call_sids],
+            )
+            c.execute("DELETE FROM calls WHERE heartbeat_at < ?", (now - self.ttl,))
+        await self._exec(touch)
+
+    async def _delete(self, call_sid: str) -> None:
+        await self._exec(lambda c: c.execute("DELETE FROM calls WHERE call_sid = ?", (call_sid,)))
+
+    async def _records(self) -> List[dict]:
+        rows = await self._exec(lambda c: c.execute(
+            "SELECT call_sid, patient_id, node_id, started_at, heartbeat_at FROM calls"
+        ).fetchall())
+        keys = ("call_sid", "patient_id", "node_id", "started_at", "heartbeat_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    async def _push_command(self, node_id: str, command: dict) -> None:
+        await self._exec(lambda c: c.execute(
+            "INSERT INTO commands (node_id, payload) VALUES (?, ?)", (node_id, json.dumps(command))
+        ))
+
+    async def _pop_commands(self, node_id: str) -> List[dict]:
+        def pop(c):
+            rows = c.execute("SELECT id, payload FROM commands WHERE node_id = ? ORDER BY id", (node_id,)).fetchall()
+            if rows:
+                c.execute("DELETE FROM commands WHERE node_id = ? AND id <= ?", (node_id, rows[-1][0]))
+            return [json.loads(payload) for _, payload in rows]
+        return await self._exec(pop)
+
+
+class RedisCallRegistry(CallRegistry):
+    """Shared across hosts and replicas: one key per call with a TTL, one list per node for commands"""
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "claracare:", **kwargs):
+        if not HAS_REDIS:
+            raise RuntimeError("CALL_REGISTRY=redis needs the `redis` package")
+        super().__init__(**kwargs)
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self._prefix = prefix
+
+    def _key(self, call_sid: str) -> str:
+        return f"{self._prefix}call:{call_sid}"
+
+    async def _put(self, record: dict) -> None:
+        await self._redis.set(self._key(record["call_sid"]), json.dumps(record), ex=int(self.ttl))
+
+    async def _touch(self, call_sids: List[str], now: float) -> None:
+        # Refresh the TTL and the stamp; a record that already expired stays gone
+        values = await self._redis.mget([self._key(sid) for sid in call_sids])
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for sid, raw in zip(call_sids, values):
+                if raw:
+                    record = {**json.loads(raw), "heartbeat_at": now}
+                    pipe.set(self._key(sid), json.dumps(record), ex=int(self.ttl))
+            await pipe.execute()
+
+    async def _delete(self, call_sid: str) -> None:
+        await self._redis.delete(self._key(call_sid))
+
+    async def _records(self) -> List[dict]:
+        keys = [key async for key in self._redis.scan_iter(match=self._key("*"), count=500)]
+        if not keys:
+            return []
+        return [json.loads(raw) for raw in await self._redis.mget(keys) if raw]
+
+    async def _push_command(self, node_id: str, command: dict) -> None:
+        await self._redis.rpush(f"{self._prefix}commands:{node_id}", json.dumps(command))
+
+    async def _pop_commands(self, node_id: str) -> List[dict]:
+        key = f"{self._prefix}commands:{node_id}"
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lrange(key, 0, -1)
+            pipe.delete(key)
+            raw, _ = await pipe.execute()
+        return [json.loads(item) for item in raw]
+
+    async def close(self) -> None:
+        await super().close()
+        await self._redis.aclose()
+
+
+def create_call_registry() -> CallRegistry:
+    """Registry backend from CALL_REGISTRY (memory | sqlite | redis)"""
+    backend = os.getenv("CALL_REGISTRY", "memory").lower()
+    if backend == "sqlite":
+        return SqliteCallRegistry(Path(os.getenv("CALL_REGISTRY_PATH", str(DEFAULT_SQLITE_PATH))))
+    if backend == "redis":
+        return RedisCallRegistry(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    return CallRegistry()
+
+
+call_registry = create_call_registry()
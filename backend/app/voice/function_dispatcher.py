@@ -0,0 +1,198 @@
+"""
+Function Call Dispatcher
+Runs Clara's function calls off the Deepgram listener loop.
+
+The listener used to await each function inline, so while a You.com
+search ran (up to 15s) no Deepgram message — including Clara's audio —
+was processed. Now each call runs as a supervised task:
+
+- Per-function timeouts (FUNCTION_TIMEOUTS); on timeout or crash Clara
+  gets a fallback response she can talk around instead of silence.
+- Functions with side effects (alerts, medication logs, saves) are not
+  cancelled on timeout: the fallback is sent and the call finishes in
+  the background.
+- FunctionCallResponses are sent in request order, even when a later
+  call finishes first.
+- Per-function latency, timeouts and errors are recorded (see metrics()).
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FUNCTION_TIMEOUTS = {
+    "get_patient_context": 5.0,
+    "search_nostalgia": 8.0,
+    "search_realtime": 8.0,
+    "log_medication_check": 5.0,
+    "trigger_alert": 10.0,
+    "save_conversation": 60.0,
+}
+DEFAULT_TIMEOUT = 10.0
+
+# Finish these in the background after a timeout rather than cancelling them
+SIDE_EFFECT_FUNCTIONS = frozenset({"log_medication_check", "trigger_alert", "save_conversation"})
+
+FALLBACKS = {
+    "get_patient_context": {
+        "success": False,
+        "message": "Patient details aren't available right now. Keep chatting warmly and ask about their day.",
+    },
+    "search_nostalgia": {
+        "success": False,
+        "message": "Couldn't look that up right now. Ask them what they remember about it instead.",
+    },
+    "search_realtime": {
+        "success": False,
+        "message": "Couldn't get current information right now. Say you'll check later and move on.",
+    },
+}
+DEFAULT_FALLBACK = {
+    "success": False,
+    "message": "That's taking a little longer than expected; it will finish in the background.",
+}
+
+# Side-effect work still running after its session gave up waiting (process-wide,
+# so it outlives the agent that started it)
+_background: set[asyncio.Future] = set()
+
+
+class _PendingCall:
+    __slots__ = ("func_id", "name", "started", "result", "done")
+
+    def __init__(self, func_id: str, name: str):
+        self.func_id = func_id
+        self.name = name
+        self.started = time.monotonic()
+        self.result: Optional[dict] = None
+        self.done = False
+
+
+class FunctionCallDispatcher:
+    """Supervised, ordered execution of FunctionCallRequests for one agent session"""
+
+    def __init__(
+        self,
+        execute: Callable[[str, Dict[str, Any]], Awaitable[dict]],
+        send: Callable[[str], Awaitable[None]],
+        timeouts: Optional[Dict[str, float]] = None,
+    ):
+        self._execute = execute
+        self._send = send
+        self.timeouts = {**FUNCTION_TIMEOUTS, **(timeouts or {})}
+        self._order: deque[_PendingCall] = deque()
+        self._runs: set[asyncio.Task] = set()
+        self._send_lock = asyncio.Lock()
+        self._stats: Dict[str, dict] = {}
+
+    def submit(self, func_id: str, name: str, arguments: Dict[str, Any]) -> None:
+        """Start a function call; its response is sent when it (and all earlier calls) finish."""
+        call = _PendingCall(func_id, name)
+        self._order.append(call)
+        task = asyncio.create_task(self._run(call, arguments))
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+
+    async def _run(self, call: _PendingCall, arguments: Dict[str, Any]) -> None:
+        timeout = self.timeouts.get(call.name, DEFAULT_TIMEOUT)
+        outcome = "ok"
+        work = asyncio.ensure_future(self._execute(call.name, arguments))
+        try:
+            if call.name in SIDE_EFFECT_FUNCTIONS:
+                result = await asyncio.wait_for(asyncio.shield(work), timeout)
+            else:
+                result = await asyncio.wait_for(work, timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.warning(f"[FUNC_TIMEOUT] function={call.name} after {timeout:.0f}s — sending fallback")
+            result = FALLBACKS.get(call.name, DEFAULT_FALLBACK)
+            if call.name in SIDE_EFFECT_FUNCTIONS:
+                self._detach(work)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # This run was cancelled (close()), not the function itself
+                if call.name in SIDE_EFFECT_FUNCTIONS:
+                    self._detach(work)
+                else:
+                    work.cancel()
+                raise
+            # The function's own work was cancelled: answer with the fallback so
+            # later responses queued behind this one are not held up
+            outcome = "error"
+            logger.error(f"Function {call.name} was cancelled — sending fallback")
+            result = FALLBACKS.get(call.name, DEFAULT_FALLBACK)
+        except Exception as e:
+            outcome = "error"
+            logger.error(f"Error executing function {call.name}: {e}")
+            result = {"error": str(e), "success": False}
+
+        self._record(call, outcome)
+        call.result = result
+        call.done = True
+        await self._flush()
+
+    async def _flush(self) -> None:
+        """Send completed responses from the head of the queue, in request order."""
+        async with self._send_lock:
+            while self._order and self._order[0].done:
+                call = self._order.popleft()
+                response = {
+                    "type": "FunctionCallResponse",
+                    "id": call.func_id,
+                    "name": call.name,
+                    "content": json.dumps(call.result),
+                }
+                try:
+                    await self._send(json.dumps(response))
+                except Exception as e:
+                    logger.error(f"Failed to send FunctionCallResponse for {call.name}: {e}")
+                    continue
+                result = call.result
+                logger.info(
+                    f"[FUNC_RESULT] function={call.name} "
+                    f"result_keys={list(result.keys()) if isinstance(result, dict) else 'non-dict'}"
+                )
+
+    def _detach(self, work: asyncio.Future) -> None:
+        """Keep a reference to side-effect work finishing in the background"""
+        _background.add(work)
+        work.add_done_callback(_background.discard)
+
+    def _record(self, call: _PendingCall, outcome: str) -> None:
+        elapsed_ms = (time.monotonic() - call.started) * 1000
+        stats = self._stats.setdefault(
+            call.name, {"calls": 0, "timeouts": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if outcome == "timeout":
+            stats["timeouts"] += 1
+        elif outcome == "error":
+            stats["errors"] += 1
+        logger.info(f"[FUNC_LATENCY] function={call.name} {elapsed_ms:.0f}ms outcome={outcome}")
+
+    async def close(self) -> None:
+        """Stop waiting on in-flight calls; side-effect functions still finish in the background"""
+        runs = list(self._runs)
+        for task in runs:
+            task.cancel()
+        await asyncio.gather(*runs, return_exceptions=True)
+        self._order.clear()
+
+    def metrics(self) -> dict:
+        return {
+            name: {
+                "calls": s["calls"],
+                "timeouts": s["timeouts"],
+                "errors": s["errors"],
+                "avg_ms": round(s["total_ms"] / s["calls"], 1) if s["calls"] else 0.0,
+                "max_ms": round(s["max_ms"], 1),
+            }
+            for name, s in sorted(self._stats.items())
+        }
@@ -3,11 +3,13 @@ Function Call Handlers for Clara
 Implements the 6 core functions that Clara can call during conversations
 """
 
+import asyncio
 import logging
 import os
+import time
 from datetime import datetime, UTC
 from typing import Dict, Any, Optional
-import httpx
+from app.http_clients import get_http_client
 
 # Nostalgia engine for era-specific content
 from app.nostalgia import YouComClient, calculate_golden_years
@@ -27,6 +29,11 @@ class FunctionHandler:
         self.cognitive_pipeline = cognitive_pipeline
         self.youcom_client = YouComClient(api_key=self.you_api_key)
         
+        # Speculative prefetch: results for calls whose inputs are known at
+        # session start, memoized for this session (see prefetch())
+        self._prefetched: Dict[str, asyncio.Task] = {}
+        self._prefetch_stats: Dict[str, Dict[str, float]] = {}
+        
     async def execute(self, function_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute a function call and return the result
@@ -50,6 +57,14 @@ class FunctionHandler:
             "save_conversation": self.save_conversation
         }
         
+        if (function_name in self._prefetched
+                and parameters.get("patient_id", self.patient_id) == self.patient_id):
+            result = await self._from_prefetch(function_name)
+            if result is not None:
+                if function_name == "search_nostalgia":
+                    result = {**result, "trigger_reason": parameters.get("trigger_reason", "")}
+                return result
+        
         handler = handlers.get(function_name)
         if not handler:
             logger.error(f"Unknown function: {function_name}")
@@ -68,6 +83,80 @@ class FunctionHandler:
                 "error": str(e)
             }
     
+    # Calls that depend only on the patient, so they can run before Clara asks
+    PREFETCHABLE = ("get_patient_context", "search_nostalgia")
+    
+    def prefetch(self):
+        """
+        Start the patient-only calls in the background at session start.
+        When Clara later asks for one, execute() answers from this memo
+        instead of going to the data store / You.com mid-conversation.
+        """
+        handlers = {
+            "get_patient_context": self.get_patient_context,
+            "search_nostalgia": self.search_nostalgia,
+        }
+        for name in self.PREFETCHABLE:
+            if name not in self._prefetched:
+                self._prefetched[name] = asyncio.create_task(
+                    self._timed(handlers[name], {"patient_id": self.patient_id})
+                )
+                self._prefetch_stats[name] = {
+                    "lookups": 0, "hits": 0, "partial_hits": 0, "misses": 0, "saved_ms": 0.0
+                }
+        logger.info(f"[PREFETCH] Started {', '.join(self.PREFETCHABLE)} for patient {self.patient_id}")
+    
+    @staticmethod
+    async def _timed(handler, params: Dict[str, Any]) -> tuple[Dict[str, Any], float]:
+        started = time.monotonic()
+        result = await handler(params)
+        return result, (time.monotonic() - started) * 1000
+    
+    async def _from_prefetch(self, function_name: str) -> Optional[Dict[str, Any]]:
+        """Prefetched result (waiting for it if still in flight), or None to run live"""
+        task = self._prefetched[function_name]
+        stats = self._prefetch_stats[function_name]
+        stats["lookups"] += 1
+        in_flight = not task.done()
+        started = time.monotonic()
+        try:
+            # Shielded: a caller timing out must not cancel the shared prefetch
+            result, fetch_ms = await asyncio.shield(task)
+        except Exception as e:
+            logger.warning(f"[PREFETCH] {function_name} prefetch failed ({e}) — running live")
+            stats["misses"] += 1
+            return None
+        if not isinstance(result, dict) or not result.get("success"):
+            stats["misses"] += 1
+            return None
+        waited_ms = (time.monotonic() - started) * 1000
+        stats["partial_hits" if in_flight else "hits"] += 1
+        stats["saved_ms"] += max(0.0, fetch_ms - waited_ms)
+        logger.info(
+            f"[PREFETCH] {function_name} served from memo "
+            f"(saved {max(0.0, fetch_ms - waited_ms):.0f}ms{', waited for in-flight fetch' if in_flight else ''})"
+        )
+        return result
+    
+    def prefetch_metrics(self) -> Dict[str, Any]:
+        """Per-function prefetch hit rate and mid-call latency saved"""
+        metrics = {}
+        for name, stats in self._prefetch_stats.items():
+            served = stats["hits"] + stats["partial_hits"]
+            metrics[name] = {
+                **stats,
+                "saved_ms": round(stats["saved_ms"], 1),
+                "hit_rate": round(served / stats["lookups"], 3) if stats["lookups"] else 0.0,
+            }
+        return metrics
+    
+    async def cancel_prefetch(self):
+        """Stop prefetches that are still running (session ended)"""
+        for task in self._prefetched.values():
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*self._prefetched.values(), return_exceptions=True)
+    
     async def get_patient_context(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Retrieve patient profile, preferences, medical notes, and recent conversations
@@ -119,25 +208,25 @@ class FunctionHandler:
         
         # Fallback to Sanity API
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.sanity_api_url}/patients/{patient_id}",
-                    timeout=10.0
-                )
+            client = get_http_client("internal")
+            response = await client.get(
+                f"{self.sanity_api_url}/patients/{patient_id}",
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                return {
+                    "success": True,
+                    "patient": data.get("patient", {}),
+                    "recent_conversations": data.get("recent_conversations", []),
+                    "medications": data.get("medications", []),
+                    "preferences": data.get("preferences", {})
+                }
+            else:
+                logger.warning(f"Failed to get patient context: {response.status_code}")
+                return self._default_patient_context()
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "patient": data.get("patient", {}),
-                        "recent_conversations": data.get("recent_conversations", []),
-                        "medications": data.get("medications", []),
-                        "preferences": data.get("preferences", {})
-                    }
-                else:
-                    logger.warning(f"Failed to get patient context: {response.status_code}")
-                    return self._default_patient_context()
-                    
         except Exception as e:
             logger.error(f"Error getting patient context: {e}")
             # Return default context if Sanity is not available yet
@@ -288,27 +377,27 @@ class FunctionHandler:
         notes = params.get("notes", "")
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.sanity_api_url}/medications/log",
-                    json={
-                        "patient_id": patient_id,
-                        "medication_name": medication_name,
-                        "taken": taken,
-                        "timestamp": datetime.now(UTC).isoformat(),
-                        "notes": notes
-                    },
-                    timeout=10.0
-                )
+            client = get_http_client("internal")
+            response = await client.post(
+                f"{self.sanity_api_url}/medications/log",
+                json={
+                    "patient_id": patient_id,
+                    "medication_name": medication_name,
+                    "taken": taken,
+                    "timestamp": datetime.now(UTC).isoformat(),
+                    "notes": notes
+                },
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                return {
+                    "success": True,
+                    "message": f"Logged medication check for {medication_name}"
+                }
+            else:
+                raise Exception(f"API status {response.status_code}")
                 
-                if response.status_code == 200:
-                    return {
-                        "success": True,
-                        "message": f"Logged medication check for {medication_name}"
-                    }
-                else:
-                    raise Exception(f"API status {response.status_code}")
-                    
         except Exception as e:
             logger.error(f"Error logging medication: {e}")
             # Log locally if Sanity is not available
@@ -376,6 +465,7 @@ class FunctionHandler:
         summary = params.get("summary", "")
         detected_mood = params.get("detected_mood", "neutral")
         response_times = params.get("response_times")  # Optional timing data for analysis
+        pause_durations = params.get("pause_durations")  # Optional mid-turn silences (seconds)
         analysis = params.get("analysis")  # Post-call analysis data for richer digests
 
         # Skip non-conversations (too short to analyze meaningfully)
@@ -407,6 +497,7 @@ class FunctionHandler:
                     summary=summary,
                     detected_mood=detected_mood,
                     response_times=response_times,
+                    pause_durations=pause_durations,
                     analysis=analysis
                 )
                 
@@ -434,36 +525,36 @@ class FunctionHandler:
         
         # Legacy save (if no pipeline or pipeline failed)
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.sanity_api_url}/conversations",
-                    json={
-                        "patient_id": patient_id,
-                        "transcript": transcript,
-                        "duration": duration,
-                        "summary": summary,
-                        "detected_mood": detected_mood,
-                        "timestamp": datetime.now(UTC).isoformat()
-                    },
-                    timeout=10.0
-                )
+            client = get_http_client("internal")
+            response = await client.post(
+                f"{self.sanity_api_url}/conversations",
+                json={
+                    "patient_id": patient_id,
+                    "transcript": transcript,
+                    "duration": duration,
+                    "summary": summary,
+                    "detected_mood": detected_mood,
+                    "timestamp": datetime.now(UTC).isoformat()
+                },
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                return {
+                    "success": True,
+                    "message": "Conversation saved",
+                    "conversation_id": response.json().get("conversation_id", "")
+                }
+            else:
+                # API not available - use local fallback
+                logger.warning(f"Failed to save conversation: {response.status_code}")
+                logger.info(f"Conversation saved (local): Duration={duration}s, Mood={detected_mood}, Summary={summary[:100]}")
+                return {
+                    "success": True,
+                    "message": "Conversation saved",
+                    "note": "Saved locally - Sanity not connected yet"
+                }
                 
-                if response.status_code == 200:
-                    return {
-                        "success": True,
-                        "message": "Conversation saved",
-                        "conversation_id": response.json().get("conversation_id", "")
-                    }
-                else:
-                    # API not available - use local fallback
-                    logger.warning(f"Failed to save conversation: {response.status_code}")
-                    logger.info(f"Conversation saved (local): Duration={duration}s, Mood={detected_mood}, Summary={summary[:100]}")
-                    return {
-                        "success": True,
-                        "message": "Conversation saved",
-                        "note": "Saved locally - Sanity not connected yet"
-                    }
-                    
         except Exception as e:
             logger.error(f"Error saving conversation: {e}")
             # Log locally if Sanity is not available
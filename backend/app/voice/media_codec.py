@@ -0,0 +1,69 @@
+"""
+Twilio Media Stream fast path.
+
+Media frames arrive every 20ms per call in each direction, so the hot
+path avoids building dicts:
+
+- Inbound: the raw text frame is checked for the `{"event":"media"`
+  prefix and the base64 `payload` is sliced out directly (base64 never
+  contains a quote), skipping JSON parsing entirely. Anything else
+  (start / mark / stop, or an unexpected layout) goes through the full
+  parser.
+- Outbound: the message around the payload is serialized once per
+  stream; each chunk is spliced in between a fixed prefix and suffix.
+
+orjson is used for full parses when installed, with stdlib json as the
+fallback.
+"""
+
+import binascii
+import json
+from typing import Optional
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+MEDIA_PREFIX = '{"event":"media"'
+_PAYLOAD_KEY = '"payload":"'
+
+
+def extract_media_payload(raw: str) -> Optional[bytes]:
+    """
+    Decoded audio from a Twilio media frame, without parsing the JSON.
+
+    Returns None when the frame is not a media frame in Twilio's compact
+    layout; the caller should then fall back to parse_message.
+    """
+    if not raw.startswith(MEDIA_PREFIX):
+        return None
+    start = raw.find(_PAYLOAD_KEY, len(MEDIA_PREFIX))
+    if start < 0:
+        return None
+    start += len(_PAYLOAD_KEY)
+    end = raw.find('"', start)
+    if end < 0:
+        return None
+    return binascii.a2b_base64(raw[start:end])
+
+
+def parse_message(raw: str) -> dict:
+    """Full parse of a Twilio frame (non-media events)."""
+    return _loads(raw)
+
+
+class OutboundMediaTemplate:
+    """Pre-serialized outbound media message for one stream."""
+
+    def __init__(self, stream_sid: str):
+        self.stream_sid = stream_sid
+        self._prefix = (
+            '{"event":"media","streamSid":' + json.dumps(stream_sid) + ',"media":{"payload":"'
+        )
+        self._suffix = '"}}'
+
+    def render(self, audio_data: bytes) -> str:
+        """Twilio media message text carrying `audio_data` (raw mulaw)."""
+        return self._prefix + binascii.b2a_base64(audio_data, newline=False).decode("ascii") + self._suffix
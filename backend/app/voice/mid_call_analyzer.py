@@ -6,7 +6,8 @@ import os
 from collections import deque
 from typing import Optional
 
-import httpx
+from app.http_clients import get_http_client
+from app.resilience import guarded
 
 logger = logging.getLogger(__name__)
 
@@ -22,13 +23,11 @@ class MidCallAnalyzer:
         self.sentiment_history: deque[str] = deque(maxlen=max_history)
         self.check_interval: int = 5  # Check every N patient turns
         self._task: Optional[asyncio.Task] = None
-        self._http_client: httpx.AsyncClient = httpx.AsyncClient(timeout=10.0)
 
     async def close(self):
-        """Close the HTTP client."""
+        """Cancel any in-flight check (the pooled HTTP client is shared)."""
         if self._task and not self._task.done():
             self._task.cancel()
-        await self._http_client.aclose()
 
     def should_check(self, patient_turn_count: int) -> bool:
         """Whether it's time for a sentiment check."""
@@ -47,10 +46,14 @@ class MidCallAnalyzer:
             if not dg_key:
                 return prev, self.last_sentiment
 
-            resp = await self._http_client.post(
-                "https://api.deepgram.com/v1/read?sentiment=true&language=en",
-                headers={"Authorization": f"Token {dg_key}", "Content-Type": "application/json"},
-                json={"text": text},
+            resp = await guarded(
+                "deepgram",
+                lambda: get_http_client("deepgram").post(
+                    "https://api.deepgram.com/v1/read?sentiment=true&language=en",
+                    headers={"Authorization": f"Token {dg_key}", "Content-Type": "application/json"},
+                    json={"text": text},
+                ),
+                timeout=10.0,
             )
             if resp.status_code == 200:
                 data = resp.json()
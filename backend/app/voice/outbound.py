@@ -8,10 +8,18 @@ import os
 from typing import Optional, Dict, Any
 from datetime import datetime, UTC
 
-import httpx
+from app.http_clients import get_http_client
+from .admission import admission
+from .bulk_dialer import BulkDialer
+from .prewarm import prewarm_pool
+from .rate_limit import TokenBucket
+from .scheduler import call_scheduler
 
 logger = logging.getLogger(__name__)
 
+# Twilio calls-per-second limit for the account (1 unless raised by Twilio)
+TWILIO_CPS = float(os.getenv("TWILIO_CPS", "1"))
+
 
 class OutboundCallManager:
     """
@@ -28,6 +36,10 @@ class OutboundCallManager:
         # Your server's public URL (from ngrok or production domain)
         self.server_url = os.getenv("SERVER_PUBLIC_URL", "http://localhost:8000")
         
+        # Shared by every dial (scheduled, batch, manual) to stay under Twilio's CPS
+        self.dial_limiter = TokenBucket(rate=TWILIO_CPS, burst=TWILIO_CPS)
+        self.bulk_dialer = BulkDialer(self.call_patient_when_idle)
+        
         logger.info(
             f"[OUTBOUND_INIT] twilio_sid={'configured' if self.account_sid else 'MISSING'} "
             f"twilio_phone={'configured' if self.from_number else 'MISSING'} "
@@ -65,31 +77,40 @@ class OutboundCallManager:
                 "error": "Twilio phone number not configured"
             }
         
+        waited = await self.dial_limiter.acquire()
+        if waited:
+            logger.info(f"[OUTBOUND_RATE] patient={patient_id} waited {waited:.2f}s for a Twilio dial slot")
+        
+        # Start fetching context and connecting Deepgram while the phone rings
+        prewarm_pool.prewarm(patient_id)
+        
         try:
             # TwiML that will connect the call to our WebSocket
             twiml_url = f"{self.server_url}/voice/twiml?patient_id={patient_id}"
             
             # Make the call using Twilio API
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/Calls.json",
-                    auth=(self.account_sid, self.auth_token),
-                    data={
-                        "To": patient_phone,
-                        "From": self.from_number,
-                        "Url": twiml_url,
-                        "Method": "GET",
-                        "StatusCallback": f"{self.server_url}/voice/status",
-                        "StatusCallbackEvent": "initiated ringing answered completed",
-                        "StatusCallbackMethod": "POST"
-                    },
-                    timeout=30.0
-                )
-            
+            client = get_http_client("twilio")
+            response = await client.post(
+                f"{self.base_url}/Calls.json",
+                auth=(self.account_sid, self.auth_token),
+                data={
+                    "To": patient_phone,
+                    "From": self.from_number,
+                    "Url": twiml_url,
+                    "Method": "GET",
+                    "StatusCallback": f"{self.server_url}/voice/status",
+                    "StatusCallbackEvent": "initiated ringing answered completed",
+                    "StatusCallbackMethod": "POST"
+                },
+                timeout=30.0
+            )
+        
             if response.status_code in [200, 201]:
                 data = response.json()
                 call_sid = data.get("sid")
                 status = data.get("status")
+                if call_sid:
+                    prewarm_pool.bind(patient_id, call_sid)
                 
                 logger.info(
                     f"[OUTBOUND_CALL_OK] patient={patient_name} phone={patient_phone} "
@@ -107,6 +128,7 @@ class OutboundCallManager:
             else:
                 error_message = response.text
                 logger.error(f"Failed to initiate call: {response.status_code} - {error_message}")
+                await prewarm_pool.cancel(patient_id)
                 return {
                     "success": False,
                     "error": f"Twilio API error: {response.status_code}",
@@ -115,43 +137,66 @@ class OutboundCallManager:
                 
         except Exception as e:
             logger.error(f"Error initiating outbound call: {e}", exc_info=True)
+            await prewarm_pool.cancel(patient_id)
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    async def call_patient_when_idle(
+        self,
+        patient_id: str,
+        patient_phone: str,
+        patient_name: str = "there"
+    ) -> Dict[str, Any]:
+        """
+        call_patient for non-urgent calls (scheduled and batch check-ins):
+        waits while this worker is at call/analysis capacity rather than
+        placing a call that /voice/twiml would turn away
+        """
+        waited = await admission.wait_for_capacity()
+        if waited:
+            logger.info(f"[OUTBOUND_DEFERRED] patient={patient_id} waited {waited:.1f}s for capacity")
+        return await self.call_patient(patient_id, patient_phone, patient_name)
+    
     async def schedule_daily_checkin(
         self,
         patient_id: str,
         patient_phone: str,
         patient_name: str,
-        checkin_time: str = "09:00"
+        checkin_time: str = "09:00",
+        timezone: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Schedule a daily check-in call (placeholder for scheduler integration)
+        Schedule a daily check-in call with the call scheduler
         
         Args:
             patient_id: Patient identifier
             patient_phone: Patient's phone number
             patient_name: Patient's name
-            checkin_time: Time to call (HH:MM format, 24-hour)
+            checkin_time: Time to call ("09:00" or "9:00 AM"), patient's local time
+            timezone: IANA timezone of the patient (default: UTC)
             
         Returns:
-            Scheduling confirmation
+            Scheduling confirmation with the next call time
         """
+        try:
+            job = call_scheduler.schedule(patient_id, patient_phone, patient_name, checkin_time, timezone)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        
+        next_call_at = datetime.fromtimestamp(job["fire_at"], UTC).isoformat()
         logger.info(
             f"Daily check-in scheduled for {patient_name} ({patient_id}) "
-            f"at {checkin_time} to {patient_phone}"
+            f"at {checkin_time} {timezone or 'UTC'} to {patient_phone}; next call {next_call_at}"
         )
         
-        # TODO: Integrate with scheduler (APScheduler, Celery, or cloud scheduler)
-        # For now, this is a placeholder
-        
         return {
             "success": True,
             "message": f"Daily check-in scheduled for {patient_name} at {checkin_time}",
             "patient_id": patient_id,
-            "checkin_time": checkin_time
+            "checkin_time": checkin_time,
+            "next_call_at": next_call_at
         }
     
     async def call_multiple_patients(
@@ -159,7 +204,7 @@ class OutboundCallManager:
         patients: list[Dict[str, str]]
     ) -> Dict[str, Any]:
         """
-        Initiate calls to multiple patients
+        Initiate calls to multiple patients (concurrently, see BulkDialer)
         
         Args:
             patients: List of dicts with patient_id, phone, and name
@@ -174,24 +219,12 @@ class OutboundCallManager:
             "calls": []
         }
         
-        for patient in patients:
-            patient_id = patient.get("patient_id")
-            phone = patient.get("phone")
-            name = patient.get("name", "Patient")
-            
-            result = await self.call_patient(patient_id, phone, name)
-            
-            if result.get("success"):
+        async for entry in self.bulk_dialer.stream(patients):
+            if entry["result"].get("success"):
                 results["successful"] += 1
             else:
                 results["failed"] += 1
-            
-            results["calls"].append({
-                "patient_id": patient_id,
-                "name": name,
-                "phone": phone,
-                "result": result
-            })
+            results["calls"].append(entry)
         
         logger.info(
             f"Batch call completed: {results['successful']} successful, "
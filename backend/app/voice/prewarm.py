@@ -0,0 +1,197 @@
+"""
+Deepgram Agent Pre-warm Pool
+
+Opening a call used to wait for Twilio's `start` event before fetching
+the patient, rendering the prompt and connecting to Deepgram — the
+patient heard silence for all of it. The pool starts that work as soon
+as a call is known to be coming (outbound dial, or /voice/twiml being
+requested) and hands the connected agent to the stream when it arrives.
+
+- Entries are keyed by patient and, once known, by CallSid; the stream
+  claims by CallSid first, then by patient.
+- While unclaimed the agent's WebSocket is kept open with KeepAlive
+  messages; the greeting Deepgram speaks meanwhile is buffered by the
+  agent and flushed into the call on claim.
+- Unanswered calls expire after WARM_TTL_SEC and the agent is closed.
+
+Time-to-greeting (stream start → first audio to Twilio) is recorded for
+warm and cold starts so the two can be compared on /dev/status.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Optional, Dict
+
+from .agent import DeepgramVoiceAgent
+
+logger = logging.getLogger(__name__)
+
+WARM_TTL_SEC = 60.0          # Ring timeout + answer; unclaimed agents are closed after this
+KEEPALIVE_INTERVAL_SEC = 5.0
+CLAIM_WAIT_SEC = 10.0        # Max wait for a still-connecting warm agent before going cold
+
+
+class _WarmEntry:
+    def __init__(self, patient_id: str, call_sid: Optional[str]):
+        self.patient_id = patient_id
+        self.call_sid = call_sid
+        self.agent: Optional[DeepgramVoiceAgent] = None
+        self.ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.claimed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.created_at = time.monotonic()
+
+
+class PrewarmPool:
+    """Connected-but-unclaimed Deepgram agents, waiting for their Twilio stream"""
+
+    def __init__(self, ttl: float = WARM_TTL_SEC, keepalive_interval: float = KEEPALIVE_INTERVAL_SEC):
+        self.ttl = ttl
+        self.keepalive_interval = keepalive_interval
+        self.cognitive_pipeline = None  # Set by main.py during startup
+        self._by_patient: Dict[str, _WarmEntry] = {}
+        self._by_call: Dict[str, _WarmEntry] = {}
+        self._greeting_ms = {"warm": deque(maxlen=200), "cold": deque(maxlen=200)}
+        self.stats = {"prewarmed": 0, "claimed": 0, "expired": 0, "cancelled": 0, "failed": 0}
+
+    def set_cognitive_pipeline(self, pipeline):
+        """Set the cognitive pipeline (called during app startup)"""
+        self.cognitive_pipeline = pipeline
+
+    def _create_agent(self, patient_id: str) -> DeepgramVoiceAgent:
+        data_store = getattr(self.cognitive_pipeline, "data_store", None)
+        return DeepgramVoiceAgent(patient_id, self.cognitive_pipeline, data_store)
+
+    def prewarm(self, patient_id: str, call_sid: Optional[str] = None) -> bool:
+        """
+        Start connecting an agent for an expected call (returns immediately).
+
+        Returns False when pre-warming is unavailable (no Deepgram key).
+        A second request for a patient already warming only binds the CallSid.
+        """
+        if not os.getenv("DEEPGRAM_API_KEY"):
+            return False
+        entry = self._by_patient.get(patient_id)
+        if entry is not None:
+            if call_sid:
+                self.bind(patient_id, call_sid)
+            return True
+
+        entry = _WarmEntry(patient_id, call_sid)
+        self._by_patient[patient_id] = entry
+        if call_sid:
+            self._by_call[call_sid] = entry
+        entry.task = asyncio.create_task(self._run(entry))
+        self.stats["prewarmed"] += 1
+        logger.info(f"[PREWARM] Warming agent for patient {patient_id} (CallSid={call_sid})")
+        return True
+
+    def bind(self, patient_id: str, call_sid: str) -> None:
+        """Attach the CallSid (known once Twilio accepts the dial) to a warming entry"""
+        entry = self._by_patient.get(patient_id)
+        if entry is not None and entry.call_sid != call_sid:
+            entry.call_sid = call_sid
+            self._by_call[call_sid] = entry
+
+    async def _run(self, entry: _WarmEntry) -> None:
+        agent = self._create_agent(entry.patient_id)
+        try:
+            if not await agent.connect():
+                raise ConnectionError("Failed to connect to Deepgram Voice Agent")
+            entry.agent = agent
+            entry.ready.set_result(agent)
+            await self._keep_warm(entry, agent)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning(f"[PREWARM] Agent for patient {entry.patient_id} failed: {e}")
+        finally:
+            if not entry.ready.done():
+                entry.ready.set_result(None)
+            if not entry.claimed.is_set():
+                self._forget(entry)
+                await agent.close()
+
+    async def _keep_warm(self, entry: _WarmEntry, agent: DeepgramVoiceAgent) -> None:
+        """KeepAlive the idle connection until claimed or expired"""
+        expires_at = entry.created_at + self.ttl
+        while not entry.claimed.is_set():
+            left = expires_at - time.monotonic()
+            if left <= 0:
+                self.stats["expired"] += 1
+                logger.info(f"[PREWARM] Unclaimed agent for patient {entry.patient_id} expired")
+                return
+            try:
+                await asyncio.wait_for(entry.claimed.wait(), min(self.keepalive_interval, left))
+            except asyncio.TimeoutError:
+                await agent.send_keepalive()
+
+    def _forget(self, entry: _WarmEntry) -> None:
+        if self._by_patient.get(entry.patient_id) is entry:
+            del self._by_patient[entry.patient_id]
+        if entry.call_sid and self._by_call.get(entry.call_sid) is entry:
+            del self._by_call[entry.call_sid]
+
+    async def claim(self, call_sid: str, patient_id: str) -> Optional[DeepgramVoiceAgent]:
+        """
+        Take the warm agent for an arriving stream, waiting briefly if it is
+        still connecting. Returns None when there is none (start cold).
+        """
+        entry = self._by_call.get(call_sid) or self._by_patient.get(patient_id)
+        if entry is None or entry.claimed.is_set():
+            return None
+        self._forget(entry)
+        try:
+            agent = await asyncio.wait_for(asyncio.shield(entry.ready), CLAIM_WAIT_SEC)
+        except asyncio.TimeoutError:
+            logger.warning(f"[PREWARM] Agent for patient {patient_id} still connecting, starting cold")
+            entry.task.cancel()
+            return None
+        if agent is None or not agent.is_connected:
+            return None
+        entry.claimed.set()
+        self.stats["claimed"] += 1
+        waited_ms = (time.monotonic() - entry.created_at) * 1000
+        logger.info(f"[PREWARM] CallSid={call_sid} claimed warm agent ({waited_ms:.0f}ms after pre-warm)")
+        return agent
+
+    async def cancel(self, patient_id: str) -> None:
+        """Drop a pending pre-warm (e.g. the dial failed)"""
+        entry = self._by_patient.get(patient_id)
+        if entry is None:
+            return
+        self._forget(entry)
+        self.stats["cancelled"] += 1
+        entry.task.cancel()
+        try:
+            await entry.task
+        except asyncio.CancelledError:
+            pass
+
+    async def close_all(self) -> None:
+        """Close every unclaimed agent (app shutdown)"""
+        for patient_id in list(self._by_patient):
+            await self.cancel(patient_id)
+
+    def record_greeting(self, elapsed_ms: float, warm: bool) -> None:
+        """Time from stream start to Clara's first audio reaching Twilio"""
+        self._greeting_ms["warm" if warm else "cold"].append(elapsed_ms)
+
+    def metrics(self) -> dict:
+        greeting = {}
+        for kind, samples in self._greeting_ms.items():
+            ordered = sorted(samples)
+            greeting[kind] = {
+                "count": len(ordered),
+                "avg_ms": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+                "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 1) if ordered else 0.0,
+            }
+        return {"warming": len(self._by_patient), **self.stats, "time_to_greeting": greeting}
+
+
+# Global pre-warm pool
+prewarm_pool = PrewarmPool()
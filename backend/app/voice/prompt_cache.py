@@ -0,0 +1,178 @@
+"""
+Prompt Cache
+Rendered per-patient prompts and the serialized Deepgram Settings message.
+
+Call setup used to read the patient and recent conversations, render the
+full prompt and greeting, and JSON-serialize the whole Settings payload
+(including the unchanging function definitions) on every call. Now:
+
+- The static part of Settings is serialized once (SettingsTemplate); only
+  the JSON-encoded prompt and greeting are spliced in.
+- Each patient's rendered prompt, greeting and Settings text are cached,
+  keyed by (patient version, latest conversation id) as seen at render
+  time. Entries are dropped when update_patient or save_conversation
+  commits for that patient (see app.storage.changes), so a repeat call
+  is served without touching the data store.
+- A render that was started before an invalidation is not cached, so a
+  slow fill can't resurrect stale context.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Optional, Dict
+
+from .persona import get_function_definitions, get_full_prompt, get_personalized_greeting
+from ..storage.changes import on_patient_changed
+
+logger = logging.getLogger(__name__)
+
+_PROMPT_SLOT = "__CLARA_PROMPT__"
+_GREETING_SLOT = "__CLARA_GREETING__"
+
+
+def build_settings(full_prompt: str, greeting: str) -> dict:
+    """Deepgram V1 Settings with the personalized prompt + greeting."""
+    return {
+        "type": "Settings",
+        "audio": {
+            "input": {
+                "encoding": "mulaw",
+                "sample_rate": 8000
+            },
+            "output": {
+                "encoding": "mulaw",
+                "sample_rate": 8000,
+                "container": "none"
+            }
+        },
+        "agent": {
+            "language": "en",
+            "listen": {
+                "provider": {
+                    "type": "deepgram",
+                    "model": "nova-3"
+                }
+            },
+            "think": {
+                "provider": {
+                    "type": "open_ai",
+                    "model": "gpt-4o-mini",
+                    "temperature": 0.7
+                },
+                "prompt": full_prompt,
+                "functions": get_function_definitions()
+            },
+            "speak": {
+                "provider": {
+                    "type": "deepgram",
+                    "model": "aura-2-thalia-en"
+                }
+            },
+            "greeting": greeting
+        }
+    }
+
+
+class SettingsTemplate:
+    """Settings message serialized once, with slots for the prompt and greeting."""
+
+    def __init__(self):
+        text = json.dumps(build_settings(_PROMPT_SLOT, _GREETING_SLOT))
+        head, rest = text.split(json.dumps(_PROMPT_SLOT))
+        middle, tail = rest.split(json.dumps(_GREETING_SLOT))
+        self._parts = (head, middle, tail)
+
+    def render(self, full_prompt: str, greeting: str) -> str:
+        head, middle, tail = self._parts
+        return head + json.dumps(full_prompt) + middle + json.dumps(greeting) + tail
+
+
+settings_template = SettingsTemplate()
+
+
+def patient_version(patient: dict) -> str:
+    """Revision of the patient record (Sanity _rev when present, else a content hash)."""
+    if patient.get("_rev"):
+        return patient["_rev"]
+    canonical = json.dumps(patient, sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class PromptCache:
+    """Per-patient rendered prompt, greeting and Settings text"""
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+        self._generations: Dict[str, int] = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def invalidate(self, patient_id: str) -> None:
+        """Drop a patient's entry (their profile or conversation history changed)"""
+        self._generations[patient_id] = self._generations.get(patient_id, 0) + 1
+        if self._entries.pop(patient_id, None) is not None:
+            self.stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        for patient_id in list(self._entries):
+            self.invalidate(patient_id)
+
+    async def get(self, patient_id: str, data_store=None) -> dict:
+        """
+        Prompt entry for a patient: {"key", "prompt", "greeting", "settings"}.
+
+        Served from cache when present; otherwise reads the patient and
+        their 3 most recent conversations and renders. Falls back to the
+        generic prompt (not cached) when there is no store, no patient or
+        the read fails.
+        """
+        entry = self._entries.get(patient_id)
+        if entry is not None:
+            self.stats["hits"] += 1
+            return entry
+        self.stats["misses"] += 1
+
+        generation = self._generations.get(patient_id, 0)
+        patient = None
+        recent_convos: list = []
+        try:
+            if data_store:
+                patient = await data_store.get_patient(patient_id)
+                if patient:
+                    recent_convos = await data_store.get_conversations(patient_id=patient_id, limit=3)
+                    logger.info(f"Fetched patient context for {patient.get('preferred_name', patient_id)} ({len(recent_convos)} recent convos)")
+                else:
+                    logger.warning(f"Patient {patient_id} not found — using generic prompt")
+            else:
+                logger.warning("No data store available — using generic prompt")
+        except Exception as e:
+            logger.error(f"Error fetching patient data: {e} — using generic prompt")
+            patient = None
+
+        full_prompt = get_full_prompt(patient, recent_convos)
+        greeting = get_personalized_greeting(patient)
+        entry = {
+            "key": (
+                patient_version(patient) if patient else None,
+                recent_convos[0].get("id") if recent_convos else None,
+            ),
+            "prompt": full_prompt,
+            "greeting": greeting,
+            "settings": settings_template.render(full_prompt, greeting),
+        }
+        if patient and self._generations.get(patient_id, 0) == generation:
+            self._entries[patient_id] = entry
+        return entry
+
+    def metrics(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            **self.stats,
+            "hit_ratio": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Global prompt cache (invalidated by patient-scoped writes)
+prompt_cache = PromptCache()
+on_patient_changed(prompt_cache.invalidate)
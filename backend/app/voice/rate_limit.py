@@ -0,0 +1,50 @@
+"""
+Token bucket for outbound dialing.
+
+Twilio caps how many calls an account may create per second (CPS, 1 by
+default). Every dial goes through one process-wide bucket so scheduled,
+bulk and manual calls together stay under it instead of getting 429s.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """`rate` tokens per second, up to `burst` saved; acquire() waits its turn (FIFO)"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.stats = {"acquired": 0, "waited": 0, "wait_sec": 0.0}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        async with self._lock:
+            self._refill()
+            waited = 0.0
+            if self._tokens < 1:
+                waited = (1 - self._tokens) / self.rate
+                await asyncio.sleep(waited)
+                self._refill()
+                self.stats["waited"] += 1
+                self.stats["wait_sec"] += waited
+            self._tokens -= 1
+            self.stats["acquired"] += 1
+            return waited
+
+    def metrics(self) -> dict:
+        return {
+            "rate_per_sec": self.rate,
+            "burst": self.burst,
+            **self.stats,
+            "wait_sec": round(self.stats["wait_sec"], 3),
+        }
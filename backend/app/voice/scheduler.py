@@ -0,0 +1,395 @@
+"""
+Outbound Call Scheduler
+Places each patient's daily check-in call at their preferred local time.
+
+- Schedule: call_schedule.preferred_time ("10:00 AM") in the patient's
+  location.timezone, loaded from the data store at start, refreshed for
+  a patient when it is written (on_patient_changed) and fully resynced
+  every SYNC_INTERVAL_SEC.
+- A min-heap of (fire_at, seq, patient_id, kind) drives one loop that
+  sleeps until the earliest entry, so thousands of patients cost one
+  timer. Rescheduling pushes a new entry; stale entries are skipped
+  when popped (their fire_at no longer matches the job).
+- Jitter: each call fires up to CALL_JITTER_SEC after the preferred
+  time, stable per patient and day, so 9:00 AM is not one burst.
+- Dials go through OutboundCallManager.call_patient, whose token bucket
+  keeps every outbound path under the Twilio calls-per-second limit.
+- A failed dial, or a no-answer / busy / failed status from Twilio, is
+  retried after CALL_RETRY_DELAY_SEC, up to CALL_MAX_RETRIES times.
+- Pending jobs and retries are written to a JSON file, so a restart
+  neither re-places nor skips today's calls; calls missed by less than
+  MISSED_GRACE_SEC while the server was down fire right away.
+
+Off unless CALL_SCHEDULER_ENABLED=true.
+
+Configuration:
+    CALL_SCHEDULER_ENABLED   start the scheduler with the app (default: false)
+    CALL_SCHEDULE_PATH       JSON state file (default: backend/.cache/call_schedule.json)
+    CALL_JITTER_SEC          max delay after the preferred time (default: 120)
+    CALL_RETRY_DELAY_SEC     wait before retrying an unanswered call (default: 600)
+    CALL_MAX_RETRIES         retries per daily call (default: 2)
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import time
+from datetime import date, datetime, timedelta, UTC
+from datetime import time as dt_time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ..storage.changes import on_patient_changed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "call_schedule.json"
+JITTER_SEC = float(os.getenv("CALL_JITTER_SEC", "120"))
+RETRY_DELAY_SEC = float(os.getenv("CALL_RETRY_DELAY_SEC", "600"))
+MAX_RETRIES = int(os.getenv("CALL_MAX_RETRIES", "2"))
+MISSED_GRACE_SEC = 30 * 60
+SYNC_INTERVAL_SEC = 15 * 60
+
+RETRY_STATUSES = frozenset({"no-answer", "busy", "failed"})
+FINAL_STATUSES = frozenset({"completed", "canceled"}) | RETRY_STATUSES
+
+_TIME_RE = re.compile(r"^\s*(\d{1,2})(?::(\d{2}))?\s*([ap])?\.?\s*m?\.?\s*$", re.IGNORECASE)
+
+
+def parse_preferred_time(value: str) -> dt_time:
+    """'10:00 AM', '10am', '9:30 pm' or '14:00' → time. Raises ValueError otherwise."""
+    match = _TIME_RE.match(value or "")
+    if not match:
+        raise ValueError(f"Unrecognized call time: {value!r}")
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), (match.group(3) or "").lower()
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ValueError(f"Unrecognized call time: {value!r}")
+        hour = hour % 12 + (12 if meridiem == "p" else 0)
+    return dt_time(hour, minute)
+
+
+def _zone(timezone: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(timezone or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"[SCHEDULER] Unknown timezone {timezone!r}, using UTC")
+        return ZoneInfo("UTC")
+
+
+def _jitter(patient_id: str, day: date, jitter_sec: float) -> float:
+    """Stable per patient and day, so restarts don't move the call"""
+    return random.Random(f"{patient_id}:{day.isoformat()}").uniform(0, jitter_sec) if jitter_sec else 0.0
+
+
+def next_fire_at(
+    preferred_time: str,
+    timezone: Optional[str],
+    after: datetime,
+    patient_id: str = "",
+    jitter_sec: float = JITTER_SEC,
+) -> datetime:
+    """Next (UTC) moment after `after` for a daily call at `preferred_time` local time, jitter included"""
+    tz = _zone(timezone)
+    at = parse_preferred_time(preferred_time)
+    day = after.astimezone(tz).date()
+    while True:
+        local = datetime.combine(day, at, tzinfo=tz)
+        fire_at = local.astimezone(UTC) + timedelta(seconds=_jitter(patient_id, day, jitter_sec))
+        if fire_at > after:
+            return fire_at
+        day += timedelta(days=1)
+
+
+class CallScheduler:
+    """Heap-driven daily check-in calls with retries and a persisted schedule"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        jitter_sec: float = JITTER_SEC,
+        retry_delay: float = RETRY_DELAY_SEC,
+        max_retries: int = MAX_RETRIES,
+        sync_interval: float = SYNC_INTERVAL_SEC,
+    ):
+        self.path = Path(path) if path else None
+        self.jitter_sec = jitter_sec
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self.sync_interval = sync_interval
+
+        self._jobs: Dict[str, dict] = {}        # patient_id -> daily job
+        self._retries: Dict[str, dict] = {}     # patient_id -> {"fire_at", "attempt"}
+        self._calls: Dict[str, Tuple[str, int]] = {}  # call_sid -> (patient_id, attempt)
+        self._heap: List[Tuple[float, int, str, str]] = []
+        self._seq = itertools.count()
+
+        self._data_store = None
+        self._dial: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._dials: set[asyncio.Task] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._stale: set[str] = set()
+        self._dirty = False
+        self._loaded = False
+        self.stats = {"fired": 0, "dial_failures": 0, "retries": 0, "gave_up": 0, "answered": 0}
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def _push(self, fire_at: float, patient_id: str, kind: str) -> None:
+        heapq.heappush(self._heap, (fire_at, next(self._seq), patient_id, kind))
+        self._dirty = True
+        if self._wake is not None:
+            self._wake.set()
+
+    def schedule(
+        self,
+        patient_id: str,
+        phone: str,
+        name: str,
+        preferred_time: str,
+        timezone: Optional[str] = None,
+    ) -> dict:
+        """Add or update a patient's daily call. Unchanged schedules keep their next fire time."""
+        job = self._jobs.get(patient_id)
+        if job and (job["phone"], job["preferred_time"], job["timezone"]) == (phone, preferred_time, timezone):
+            job["name"] = name
+            return job
+        fire_at = next_fire_at(preferred_time, timezone, datetime.now(UTC), patient_id, self.jitter_sec)
+        job = {
+            "patient_id": patient_id,
+            "phone": phone,
+            "name": name,
+            "preferred_time": preferred_time,
+            "timezone": timezone,
+            "fire_at": fire_at.timestamp(),
+        }
+        self._jobs[patient_id] = job
+        self._push(job["fire_at"], patient_id, "daily")
+        if self._task is None:
+            self._save()  # the loop saves in batches; persist direct calls now
+        logger.info(f"[SCHEDULER] {patient_id} daily call at {preferred_time} {timezone or 'UTC'}; next {fire_at.isoformat()}")
+        return job
+
+    def unschedule(self, patient_id: str) -> None:
+        job = self._jobs.pop(patient_id, None)
+        retry = self._retries.pop(patient_id, None)
+        if job is not None or retry is not None:
+            self._dirty = True
+
+    def _schedule_entry(self, entry: dict) -> None:
+        try:
+            self.schedule(
+                entry["patient_id"],
+                entry["phone_number"],
+                entry.get("name") or "there",
+                entry["preferred_time"],
+                entry.get("timezone"),
+            )
+        except (KeyError, ValueError) as e:
+            logger.warning(f"[SCHEDULER] Skipping {entry.get('patient_id')}: {e}")
+            self.unschedule(entry.get("patient_id", ""))
+
+    async def sync(self) -> None:
+        """Reconcile jobs with the data store's call schedules"""
+        entries = await self._data_store.get_call_schedules()
+        current = {e["patient_id"] for e in entries}
+        for patient_id in list(self._jobs):
+            if patient_id not in current:
+                self.unschedule(patient_id)
+        for entry in entries:
+            self._schedule_entry(entry)
+
+    async def _refresh(self, patient_id: str) -> None:
+        patient = await self._data_store.get_patient(patient_id)
+        sched = (patient or {}).get("call_schedule") or {}
+        if not patient or not sched.get("preferred_time") or not patient.get("phone_number"):
+            self.unschedule(patient_id)
+            return
+        self._schedule_entry({
+            "patient_id": patient_id,
+            "name": patient.get("preferred_name") or patient.get("name"),
+            "phone_number": patient["phone_number"],
+            "preferred_time": sched["preferred_time"],
+            "timezone": sched.get("timezone") or (patient.get("location") or {}).get("timezone"),
+        })
+
+    def _patient_changed(self, patient_id: str) -> None:
+        if self._task is not None:
+            self._stale.add(patient_id)
+            self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    def start(self, data_store, dial: Callable[..., Awaitable[Dict[str, Any]]]) -> None:
+        """Begin placing calls. `dial(patient_id, phone, name)` is OutboundCallManager.call_patient."""
+        if self._task is not None and not self._task.done():
+            return
+        self._data_store = data_store
+        self._dial = dial
+        self._wake = asyncio.Event()
+        on_patient_changed(self._patient_changed)
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        next_sync = 0.0
+        while True:
+            self._wake.clear()
+            try:
+                if time.monotonic() >= next_sync:
+                    await self.sync()
+                    next_sync = time.monotonic() + self.sync_interval
+                while self._stale:
+                    await self._refresh(self._stale.pop())
+                self._fire_due(time.time())
+            except Exception as e:
+                logger.error(f"[SCHEDULER] Loop error: {e}", exc_info=True)
+            if self._dirty:
+                self._save()
+            delay = next_sync - time.monotonic()
+            if self._heap:
+                delay = min(delay, self._heap[0][0] - time.time())
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(delay, 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire_due(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, patient_id, kind = heapq.heappop(self._heap)
+            job = self._jobs.get(patient_id)
+            if job is None:
+                continue
+            if kind == "daily":
+                if job["fire_at"] != fire_at:
+                    continue  # superseded
+                attempt = 0
+                after = datetime.fromtimestamp(max(now, fire_at), UTC)
+                job["fire_at"] = next_fire_at(
+                    job["preferred_time"], job["timezone"], after, patient_id, self.jitter_sec
+                ).timestamp()
+                self._push(job["fire_at"], patient_id, "daily")
+            else:
+                retry = self._retries.get(patient_id)
+                if retry is None or retry["fire_at"] != fire_at:
+                    continue
+                attempt = self._retries.pop(patient_id)["attempt"]
+                self._dirty = True
+            self.stats["fired"] += 1
+            task = asyncio.create_task(self._place(job, attempt))
+            self._dials.add(task)
+            task.add_done_callback(self._dials.discard)
+
+    async def _place(self, job: dict, attempt: int) -> None:
+        logger.info(f"[SCHEDULER] Calling {job['patient_id']} (attempt {attempt + 1})")
+        try:
+            result = await self._dial(job["patient_id"], job["phone"], job["name"])
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        call_sid = result.get("call_sid")
+        if result.get("success") and call_sid:
+            self._calls[call_sid] = (job["patient_id"], attempt)
+        else:
+            self.stats["dial_failures"] += 1
+            self._retry(job["patient_id"], attempt, result.get("error", "dial failed"))
+
+    def _retry(self, patient_id: str, attempt: int, reason: str) -> None:
+        if patient_id not in self._jobs:
+            return
+        if attempt >= self.max_retries:
+            self.stats["gave_up"] += 1
+            logger.warning(f"[SCHEDULER] {patient_id} not reached after {attempt + 1} attempt(s) ({reason})")
+            return
+        fire_at = time.time() + self.retry_delay
+        self._retries[patient_id] = {"fire_at": fire_at, "attempt": attempt + 1}
+        self.stats["retries"] += 1
+        self._push(fire_at, patient_id, "retry")
+        logger.info(f"[SCHEDULER] {patient_id} {reason}; retrying in {self.retry_delay:.0f}s")
+
+    def on_call_status(self, call_sid: str, status: str) -> None:
+        """Twilio status callback: retry unanswered scheduled calls"""
+        if status not in FINAL_STATUSES or call_sid not in self._calls:
+            return
+        patient_id, attempt = self._calls.pop(call_sid)
+        if status in RETRY_STATUSES:
+            self._retry(patient_id, attempt, status)
+        elif status == "completed":
+            self.stats["answered"] += 1
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._dirty:
+            self._save()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> None:
+        """Restore the persisted schedule (once; called from app startup, not at import)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not self.path.exists():
+            return
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"[SCHEDULER] Ignoring unreadable schedule {self.path}: {e}")
+            return
+        now = time.time()
+        for patient_id, job in state.get("jobs", {}).items():
+            if job["fire_at"] < now - MISSED_GRACE_SEC:
+                job["fire_at"] = next_fire_at(
+                    job["preferred_time"], job["timezone"], datetime.now(UTC), patient_id, self.jitter_sec
+                ).timestamp()
+            self._jobs[patient_id] = job
+            self._push(job["fire_at"], patient_id, "daily")
+        for patient_id, retry in state.get("retries", {}).items():
+            if patient_id in self._jobs:
+                self._retries[patient_id] = retry
+                self._push(retry["fire_at"], patient_id, "retry")
+        self._dirty = False
+        logger.info(f"[SCHEDULER] Restored {len(self._jobs)} job(s), {len(self._retries)} retry(ies) from {self.path}")
+
+    def _save(self) -> None:
+        self._dirty = False
+        if not self.path:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"jobs": self._jobs, "retries": self._retries}))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"[SCHEDULER] Could not write {self.path}: {e}")
+
+    def metrics(self) -> dict:
+        upcoming = min((j["fire_at"] for j in self._jobs.values()), default=None)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "patients": len(self._jobs),
+            "pending_retries": len(self._retries),
+            "awaiting_status": len(self._calls),
+            "next_call_at": datetime.fromtimestamp(upcoming, UTC).isoformat() if upcoming else None,
+            **self.stats,
+        }
+
+
+call_scheduler = CallScheduler(Path(os.getenv("CALL_SCHEDULE_PATH", str(DEFAULT_STATE_PATH))))
@@ -0,0 +1,94 @@
+"""
+Per-call turn timing from Deepgram speaking events.
+
+Deepgram already tells us when Clara stops talking and when the patient
+starts and stops, so response latency costs nothing extra to measure.
+Events are kept in a compact timeline (one byte of event code plus one
+double timestamp each, ~9 bytes per event) and reduced at call end:
+
+- response latency: AgentStoppedSpeaking → next UserStartedSpeaking
+  (how long the patient takes to start answering). Barge-ins (the
+  patient starts before Clara stops) and gaps over MAX_RESPONSE_SEC
+  (line noise, patient walked away) are ignored.
+- pause duration: UserStoppedSpeaking → UserStartedSpeaking with no
+  agent turn in between, i.e. a silence inside the patient's own turn
+  that was long enough for end-of-speech detection but not long enough
+  for Clara to take over.
+"""
+
+import time
+from array import array
+from typing import Optional
+
+AGENT_STOPPED = 0
+USER_STARTED = 1
+USER_STOPPED = 2
+
+EVENT_CODES = {
+    "AgentStoppedSpeaking": AGENT_STOPPED,
+    "UserStartedSpeaking": USER_STARTED,
+    "UserStoppedSpeaking": USER_STOPPED,
+}
+
+MAX_RESPONSE_SEC = 30.0
+MAX_PAUSE_SEC = 30.0
+
+
+class TurnTimeline:
+    """Compact (event code, monotonic timestamp) array for one call"""
+
+    def __init__(self):
+        self._codes = bytearray()
+        self._times = array("d")
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def record(self, event: str, at: Optional[float] = None) -> None:
+        """Record a Deepgram speaking event by message type (others are ignored)"""
+        code = EVENT_CODES.get(event)
+        if code is None:
+            return
+        self._codes.append(code)
+        self._times.append(time.monotonic() if at is None else at)
+
+    def response_latencies(self) -> list[float]:
+        """Seconds from Clara finishing to the patient starting to speak, per turn"""
+        latencies = []
+        agent_stopped_at: Optional[float] = None
+        for code, at in zip(self._codes, self._times):
+            if code == AGENT_STOPPED:
+                agent_stopped_at = at
+            elif code == USER_STARTED and agent_stopped_at is not None:
+                gap = at - agent_stopped_at
+                if 0 <= gap <= MAX_RESPONSE_SEC:
+                    latencies.append(round(gap, 3))
+                agent_stopped_at = None
+        return latencies
+
+    def pause_durations(self) -> list[float]:
+        """Seconds of silence inside the patient's turns"""
+        pauses = []
+        user_stopped_at: Optional[float] = None
+        for code, at in zip(self._codes, self._times):
+            if code == USER_STOPPED:
+                user_stopped_at = at
+            elif code == AGENT_STOPPED:
+                user_stopped_at = None
+            elif code == USER_STARTED and user_stopped_at is not None:
+                gap = at - user_stopped_at
+                if 0 <= gap <= MAX_PAUSE_SEC:
+                    pauses.append(round(gap, 3))
+                user_stopped_at = None
+        return pauses
+
+    def summary(self) -> dict:
+        latencies = self.response_latencies()
+        pauses = self.pause_durations()
+        return {
+            "events": len(self),
+            "responses": len(latencies),
+            "avg_response_sec": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            "pauses": len(pauses),
+            "avg_pause_sec": round(sum(pauses) / len(pauses), 2) if pauses else None,
+        }
@@ -8,6 +8,7 @@ import base64
 import json
 import logging
 import os
+import time
 from datetime import datetime, UTC
 from typing import Optional, Dict
 
@@ -18,6 +19,13 @@ from .agent import session_manager, DeepgramVoiceAgent
 from .topic_tracker import TopicTracker
 from .injection_queue import InjectionQueue
 from .mid_call_analyzer import MidCallAnalyzer
+from .media_codec import OutboundMediaTemplate, extract_media_payload, parse_message
+from .audio_relay import AudioRelay, COALESCE, DROP_OLDEST
+from .admission import admission
+from .call_registry import call_registry
+from ..events import event_hub
+from .prewarm import prewarm_pool
+from .turn_timing import TurnTimeline
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +40,7 @@ class TwilioAudioStream:
         self.websocket = websocket
         self.stream_sid: Optional[str] = None
         self.call_sid: Optional[str] = None
+        self._media_template: Optional[OutboundMediaTemplate] = None
         
     async def send_audio(self, audio_data: bytes):
         """
@@ -43,19 +52,14 @@ class TwilioAudioStream:
         if not self.stream_sid:
             logger.warning("Cannot send audio - stream not initialized")
             return
-            
-        # Encode audio to base64 for Twilio
-        payload = base64.b64encode(audio_data).decode('utf-8')
         
-        message = {
-            "event": "media",
-            "streamSid": self.stream_sid,
-            "media": {
-                "payload": payload
-            }
-        }
+        # Message framing is pre-serialized per stream; only the base64
+        # payload is spliced in per chunk
+        template = self._media_template
+        if template is None or template.stream_sid != self.stream_sid:
+            template = self._media_template = OutboundMediaTemplate(self.stream_sid)
         
-        await self.websocket.send_json(message)
+        await self.websocket.send_text(template.render(audio_data))
     
     async def send_mark(self, mark_name: str):
         """Send a mark event to Twilio"""
@@ -106,11 +110,18 @@ class TwilioCallSession:
         self.twilio_stream = TwilioAudioStream(twilio_ws)
         self.deepgram_agent: Optional[DeepgramVoiceAgent] = None
 
-        self.is_active = False
+        self.is_active = False  # media is streaming
+        self._started = False
+        self._ended = False
         self.conversation_transcript: list = []
         self.conversation_saved = False  # Track if AI already saved via function call
         self.call_start_time: Optional[datetime] = None
 
+        # Time-to-greeting: stream start → Clara's first audio sent to Twilio
+        self._started_at: Optional[float] = None
+        self._warm_start = False
+        self.time_to_greeting_ms: Optional[float] = None
+
         # In-call context memory
         self._patient_turn_count = 0
         self._context_inject_interval = 10  # Inject every N patient turns
@@ -119,6 +130,18 @@ class TwilioCallSession:
         self._topic_tracker = TopicTracker()
         self._injection_queue = InjectionQueue()
         self._midcall_analyzer = MidCallAnalyzer()
+        self._turn_timeline = TurnTimeline()
+
+        # Each audio direction runs on its own task over a bounded queue, so a
+        # slow Deepgram send never stalls reading from Twilio (and vice versa).
+        # Caller audio drops the oldest frames when backed up (~1s at 20ms);
+        # Clara's speech is coalesced so it is delayed rather than cut.
+        self._inbound_relay = AudioRelay(
+            "twilio→deepgram", self._send_to_deepgram, maxsize=50, policy=DROP_OLDEST
+        )
+        self._outbound_relay = AudioRelay(
+            "deepgram→twilio", self._send_to_twilio, maxsize=100, policy=COALESCE
+        )
         
     async def start(self) -> bool:
         """
@@ -127,26 +150,41 @@ class TwilioCallSession:
         """
         try:
             self.call_start_time = datetime.now(UTC)
+            self._started_at = time.monotonic()
             
-            # Create Deepgram agent session with cognitive pipeline
-            self.deepgram_agent = await session_manager.create_session(
-                session_id=self.call_sid,
-                patient_id=self.patient_id,
-                cognitive_pipeline=self.cognitive_pipeline
-            )
+            # Use the agent pre-warmed at dial / TwiML time when there is one,
+            # otherwise connect now (cold start)
+            warm_agent = await prewarm_pool.claim(self.call_sid, self.patient_id)
+            if warm_agent:
+                session_manager.adopt_session(self.call_sid, warm_agent)
+                self.deepgram_agent = warm_agent
+                self._warm_start = True
+            else:
+                self.deepgram_agent = await session_manager.create_session(
+                    session_id=self.call_sid,
+                    patient_id=self.patient_id,
+                    cognitive_pipeline=self.cognitive_pipeline
+                )
             
             # Set up callbacks for Deepgram output
             self.deepgram_agent.set_callbacks(
                 on_audio_output=self._on_deepgram_audio,
                 on_transcript=self._on_transcript,
                 on_error=self._on_error,
-                on_agent_silence=self._drain_injection_queue
+                on_agent_silence=self._drain_injection_queue,
+                on_speech_event=self._turn_timeline.record
             )
             
             self.is_active = True
+            self._started = True
+            self._inbound_relay.start()
+            self._outbound_relay.start()
+            # A warm agent has usually already greeted; play it now
+            await self.deepgram_agent.flush_early_output()
             logger.info(
                 f"[CALL_START] CallSid={self.call_sid} patient={self.patient_id} "
-                f"pipeline={'enabled' if self.cognitive_pipeline else 'disabled'}"
+                f"pipeline={'enabled' if self.cognitive_pipeline else 'disabled'} "
+                f"agent={'warm' if self._warm_start else 'cold'}"
             )
             return True
             
@@ -154,6 +192,20 @@ class TwilioCallSession:
             logger.error(f"[CALL_START_FAILED] CallSid={self.call_sid} error={e}", exc_info=True)
             return False
     
+    async def handle_twilio_frame(self, raw: str):
+        """
+        Process a raw Twilio WebSocket text frame
+        
+        Media frames take the fast path (payload sliced out, no JSON
+        parse); other events are parsed and dispatched normally.
+        """
+        audio_data = extract_media_payload(raw)
+        if audio_data is None:
+            await self.handle_twilio_message(parse_message(raw))
+            return
+        if self.is_active:
+            self._inbound_relay.put(audio_data)
+    
     async def handle_twilio_message(self, message: Dict):
         """
         Process incoming messages from Twilio
@@ -198,11 +250,8 @@ class TwilioCallSession:
         payload = media.get("payload", "")
         
         if payload:
-            # Decode base64 audio from Twilio
-            audio_data = base64.b64decode(payload)
-            
-            # Send to Deepgram
-            await self.deepgram_agent.send_audio(audio_data)
+            # Decode base64 audio from Twilio and hand it to the inbound relay
+            self._inbound_relay.put(base64.b64decode(payload))
     
     async def _handle_mark(self, message: Dict):
         """Handle Twilio mark event"""
@@ -210,16 +259,42 @@ class TwilioCallSession:
         logger.debug(f"Twilio mark received: {mark.get('name')}")
     
     async def _handle_stop(self, message: Dict):
-        """Handle Twilio stream stop event"""
+        """
+        Handle Twilio stream stop event (the caller hung up)
+        Only stops the audio; the receive loop exits and TwilioBridge runs end()
+        """
         logger.info(f"Twilio stream stopped: {self.twilio_stream.stream_sid}")
-        await self.end()
+        await self.stop_stream()
     
     async def _on_deepgram_audio(self, audio_data: bytes):
         """
         Callback: Deepgram sent audio (Clara speaking)
-        Forward to Twilio
+        Queue for Twilio (sent by the outbound relay task)
         """
+        self._outbound_relay.put(audio_data)
+    
+    async def _send_to_deepgram(self, audio_data: bytes):
+        """Inbound relay sink: forward caller audio to Deepgram"""
+        if self.deepgram_agent:
+            await self.deepgram_agent.send_audio(audio_data)
+    
+    async def _send_to_twilio(self, audio_data: bytes):
+        """Outbound relay sink: forward Clara's audio to Twilio"""
         await self.twilio_stream.send_audio(audio_data)
+        if self.time_to_greeting_ms is None and self._started_at is not None:
+            self.time_to_greeting_ms = (time.monotonic() - self._started_at) * 1000
+            prewarm_pool.record_greeting(self.time_to_greeting_ms, self._warm_start)
+            logger.info(
+                f"[GREETING] CallSid={self.call_sid} time_to_greeting={self.time_to_greeting_ms:.0f}ms "
+                f"agent={'warm' if self._warm_start else 'cold'}"
+            )
+    
+    def relay_metrics(self) -> dict:
+        """Per-direction queue depth, drops and relay latency for this call"""
+        return {
+            "inbound": self._inbound_relay.metrics(),
+            "outbound": self._outbound_relay.metrics(),
+        }
     
     async def _on_transcript(self, speaker: str, text: str):
         """
@@ -375,27 +450,65 @@ class TwilioCallSession:
             return False, f"insufficient_transcript (lines={len(self.conversation_transcript)} < {MIN_TRANSCRIPT_LINES})"
         return True, ""
 
-    async def end(self):
+    async def stop_stream(self):
         """
-        End the call session.
-        Runs LLM post-call analysis, safety detection, cognitive pipeline, and cleanup.
+        Stop relaying audio and mid-call work once the media stream is over.
+        Safe to call more than once; end() calls it too.
         """
         if not self.is_active:
             return
 
         self.is_active = False
 
+        # Stop audio relays (let Clara's last words flush briefly)
+        await self._inbound_relay.close(drain_timeout=0)
+        await self._outbound_relay.close(drain_timeout=0.5)
+        relay = self.relay_metrics()
+        logger.info(
+            f"[RELAY_STATS] CallSid={self.call_sid} "
+            f"in: sent={relay['inbound']['sent']} dropped={relay['inbound']['dropped']} "
+            f"max_depth={relay['inbound']['max_depth']} p95={relay['inbound']['latency']['p95_ms']}ms | "
+            f"out: sent={relay['outbound']['sent']} coalesced={relay['outbound']['coalesced']} "
+            f"dropped={relay['outbound']['dropped']} p95={relay['outbound']['latency']['p95_ms']}ms"
+        )
+
         # Cancel any running mid-call analysis
         await self._midcall_analyzer.close()
 
         # Clear injection queue
         self._injection_queue.clear()
 
+    async def end(self):
+        """
+        End the call session.
+        Runs LLM post-call analysis, safety detection, cognitive pipeline, and cleanup.
+        """
+        if not self._started or self._ended:
+            return
+
+        self._ended = True
+        await self.stop_stream()
+
         # Calculate call duration
         call_duration_sec = 0
         if self.call_start_time:
             call_duration_sec = int((datetime.now(UTC) - self.call_start_time).total_seconds())
         
+        response_times = self._turn_timeline.response_latencies()
+        pause_durations = self._turn_timeline.pause_durations()
+        timing = self._turn_timeline.summary()
+        logger.info(
+            f"[TURN_TIMING] CallSid={self.call_sid} responses={timing['responses']} "
+            f"avg_response={timing['avg_response_sec']}s pauses={timing['pauses']} "
+            f"avg_pause={timing['avg_pause_sec']}s"
+        )
+        if self.deepgram_agent:
+            for name, stats in self.deepgram_agent.function_handler.prefetch_metrics().items():
+                logger.info(
+                    f"[PREFETCH_STATS] CallSid={self.call_sid} function={name} "
+                    f"lookups={stats['lookups']} hit_rate={stats['hit_rate']} saved={stats['saved_ms']}ms"
+                )
+        
         total_turns = len(self.conversation_transcript)
         patient_turns = sum(1 for t in self.conversation_transcript if t.get('speaker', '').lower() != 'clara')
         agent_turns = total_turns - patient_turns
@@ -532,6 +645,8 @@ class TwilioCallSession:
                         "duration": call_duration_sec or len(self.conversation_transcript) * 5,
                         "summary": summary,
                         "detected_mood": detected_mood,
+                        "response_times": response_times,
+                        "pause_durations": pause_durations,
                         "analysis": analysis
                     }
                 )
@@ -547,6 +662,12 @@ class TwilioCallSession:
                         f"cognitive_score={pipeline_result.get('cognitive_score')} "
                         f"alerts={pipeline_result.get('alerts_generated', 0)}"
                     )
+                    event_hub.publish("pipeline_complete", self.patient_id, {
+                        "call_sid": self.call_sid,
+                        "conversation_id": pipeline_result.get("conversation_id"),
+                        "cognitive_score": pipeline_result.get("cognitive_score"),
+                        "alerts_generated": pipeline_result.get("alerts_generated", 0),
+                    })
                 else:
                     logger.warning(
                         f"[PIPELINE_INCOMPLETE] CallSid={self.call_sid} "
@@ -690,6 +811,10 @@ class TwilioBridge:
                     patient_id = custom_params["patient_id"]
                     logger.info(f"Got patient_id from Twilio customParameters: {patient_id}")
                 
+                if not admission.call_started(call_sid):
+                    await websocket.close(code=1013)  # try again later
+                    return
+                
                 # Create call session with cognitive pipeline
                 call_session = TwilioCallSession(
                     twilio_ws=websocket,
@@ -699,8 +824,15 @@ class TwilioBridge:
                 )
                 
                 self.active_calls[call_sid] = call_session
+                started_at = datetime.now(UTC).isoformat()
+                await call_registry.register(call_sid, patient_id, started_at)
+                event_hub.publish("call_started", patient_id, {"call_sid": call_sid, "started_at": started_at})
+                
+                # Process the start message first so the streamSid is known
+                # before a warm agent's buffered greeting is flushed
+                await call_session.handle_twilio_message(initial_message)
                 
-                # Start the session (connect to Deepgram)
+                # Start the session (claim the warm agent or connect to Deepgram)
                 success = await call_session.start()
                 
                 if not success:
@@ -708,14 +840,11 @@ class TwilioBridge:
                     await websocket.close()
                     return
                 
-                # Process the start message
-                await call_session.handle_twilio_message(initial_message)
-                
                 # Handle incoming messages
                 while call_session.is_active:
                     try:
-                        message = await websocket.receive_json()
-                        await call_session.handle_twilio_message(message)
+                        raw = await websocket.receive_text()
+                        await call_session.handle_twilio_frame(raw)
                         
                     except WebSocketDisconnect:
                         logger.info(f"Twilio WebSocket disconnected for call {call_sid}")
@@ -732,21 +861,46 @@ class TwilioBridge:
             logger.error(f"Error handling Twilio call: {e}", exc_info=True)
             
         finally:
-            # Clean up
+            # Clean up: the call stops being live (audio slot, registry, local
+            # list) as soon as the stream stops; post-call analysis is counted separately
             if call_session:
-                await call_session.end()
-                if call_session.call_sid in self.active_calls:
-                    del self.active_calls[call_session.call_sid]
+                await call_session.stop_stream()
+                admission.call_ended(call_session.call_sid)
+                self.active_calls.pop(call_session.call_sid, None)
+                try:
+                    await call_registry.unregister(call_session.call_sid)
+                    event_hub.publish("call_ended", call_session.patient_id, {"call_sid": call_session.call_sid})
+                finally:
+                    with admission.analysis():
+                        await call_session.end()
     
     def get_active_call_count(self) -> int:
         """Get number of active calls"""
         return len(self.active_calls)
     
-    async def end_call(self, call_sid: str):
-        """Manually end a call"""
+    async def end_call(self, call_sid: str) -> str:
+        """
+        Manually end a call, wherever it is running
+        
+        Returns:
+            "ended" (on this node), "routed" (sent to the owning node) or "not_found"
+        """
         if call_sid in self.active_calls:
             await self.active_calls[call_sid].end()
-            del self.active_calls[call_sid]
+            self.active_calls.pop(call_sid, None)
+            return "ended"
+        
+        record = await call_registry.get(call_sid)
+        if record and record["node_id"] != call_registry.node_id:
+            await call_registry.send_command(record["node_id"], {"action": "end", "call_sid": call_sid})
+            logger.info(f"[CALL_REGISTRY] Routed end of {call_sid} to node {record['node_id']}")
+            return "routed"
+        return "not_found"
+    
+    async def handle_registry_command(self, command: Dict):
+        """Run a command another node routed to this one"""
+        if command.get("action") == "end":
+            await self.end_call(command["call_sid"])
 
 
 # Global bridge instance
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Backfill Record Normalization
+Rewrites conversations, alerts and wellness digests stored before
+normalization-on-write with the text the API would serve, and stamps them
+with the current normalization_version so reads skip the regex work.
+
+Progress is checkpointed per record kind in .cache/normalization_backfill.json;
+an interrupted run picks up after the last record it finished. Records
+already stamped are never rewritten, so re-running is safe.
+
+Usage:
+    python backfill_normalization.py                   # every kind
+    python backfill_normalization.py alert digest      # specific kinds
+    python backfill_normalization.py --dry-run         # count, don't write
+    python backfill_normalization.py --restart         # ignore the checkpoint
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from app.storage import SanityDataStore
+from app.storage.normalization import (
+    NORMALIZATION_VERSION,
+    NORMALIZED_FIELDS,
+    normalize_alert,
+    normalize_conversation,
+    normalize_digest,
+)
+
+CHECKPOINT_PATH = Path(__file__).parent / ".cache" / "normalization_backfill.json"
+BATCH_SIZE = 100
+
+
+def load_checkpoint(restart: bool) -> dict:
+    if not restart and CHECKPOINT_PATH.exists():
+        checkpoint = json.loads(CHECKPOINT_PATH.read_text())
+        if checkpoint.get("version") == NORMALIZATION_VERSION:
+            return checkpoint
+    return {"version": NORMALIZATION_VERSION, "after": {}}
+
+
+def save_checkpoint(checkpoint: dict) -> None:
+    CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CHECKPOINT_PATH.write_text(json.dumps(checkpoint, indent=2))
+
+
+async def normalized_fields(store, kind: str, record: dict) -> dict | None:
+    """The fields to write back, or None to leave the record unstamped"""
+    if kind == "conversation":
+        normalized = await normalize_conversation(record, store)
+        if not normalized.get("summary"):
+            return None  # nothing to fall back on yet; reads keep trying the digest
+    elif kind == "alert":
+        normalized = normalize_alert(record)
+    else:
+        normalized = normalize_digest(record)
+    fields = {k: normalized.get(k) for k in NORMALIZED_FIELDS[kind]}
+    fields["normalization_version"] = NORMALIZATION_VERSION
+    return fields
+
+
+async def backfill_kind(store, kind: str, checkpoint: dict, dry_run: bool) -> dict:
+    counts = {"rewritten": 0, "skipped": 0, "failed": 0}
+    after = checkpoint["after"].get(kind)
+    while True:
+        records = await store.list_unnormalized(kind, after_id=after, limit=BATCH_SIZE)
+        if not records:
+            break
+        for record in records:
+            fields = await normalized_fields(store, kind, record)
+            if fields is None:
+                counts["skipped"] += 1
+            elif dry_run or await store.save_normalized(kind, record["id"], fields):
+                counts["rewritten"] += 1
+            else:
+                counts["failed"] += 1
+        after = records[-1]["id"]
+        if not dry_run:
+            checkpoint["after"][kind] = after
+            save_checkpoint(checkpoint)
+    return counts
+
+
+async def backfill(kinds: list[str], restart: bool, dry_run: bool) -> int:
+    project_id = os.getenv("SANITY_PROJECT_ID")
+    dataset = os.getenv("SANITY_DATASET")
+    token = os.getenv("SANITY_TOKEN")
+    if not (project_id and dataset and token):
+        print("❌ SANITY_PROJECT_ID, SANITY_DATASET and SANITY_TOKEN must be set")
+        return 1
+
+    store = SanityDataStore(project_id=project_id, dataset=dataset, token=token)
+    checkpoint = load_checkpoint(restart)
+    failed = 0
+    try:
+        for kind in kinds:
+            counts = await backfill_kind(store, kind, checkpoint, dry_run)
+            failed += counts["failed"]
+            verb = "would rewrite" if dry_run else "rewritten"
+            print(f"  ✓ {kind}: {counts['rewritten']} {verb}, {counts['skipped']} skipped, {counts['failed']} failed")
+    finally:
+        await store.close()
+
+    print(f"\nNormalization v{NORMALIZATION_VERSION} backfill {'checked' if dry_run else 'complete'}")
+    return 1 if failed else 0
+
+
+def main():
+    env_file = Path(__file__).parent / ".env"
+    if env_file.exists():
+        load_dotenv(env_file)
+    parser = argparse.ArgumentParser(description="Normalize and stamp legacy records")
+    parser.add_argument("kinds", nargs="*", help=f"record kinds ({', '.join(NORMALIZED_FIELDS)}; default all)")
+    parser.add_argument("--dry-run", action="store_true", help="count records without writing")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    args = parser.parse_args()
+    unknown = [k for k in args.kinds if k not in NORMALIZED_FIELDS]
+    if unknown:
+        parser.error(f"unknown kind(s): {', '.join(unknown)}")
+    sys.exit(asyncio.run(backfill(args.kinds or list(NORMALIZED_FIELDS), args.restart, args.dry_run)))
+
+
+if __name__ == "__main__":
+    main()
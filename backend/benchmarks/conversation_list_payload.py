@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Conversation List Payload Benchmark
+Compares get_conversations payload size and latency with transcripts
+embedded in every record (previous layout) against metadata-only records
+with separately stored, compressed transcript blobs.
+
+Usage:
+    PYTHONPATH=. python benchmarks/conversation_list_payload.py [conversations] [page_size]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+
+from app.storage.memory import InMemoryDataStore
+
+PATIENT = "patient-bench-001"
+LINES = [
+    "Clara: Good morning! How did you sleep last night?",
+    "Patient: Oh, not too bad. The birds woke me up early again.",
+    "Clara: They must love your garden. What are you planting this spring?",
+    "Patient: Tomatoes, like my mother used to grow back in Ohio.",
+]
+
+
+def _transcript(turns: int) -> str:
+    return "\n".join(random.choice(LINES) for _ in range(turns))
+
+
+async def _time_list(store: InMemoryDataStore, page_size: int, embedded: dict, rounds: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        page = await store.get_conversations(PATIENT, limit=page_size)
+        if embedded:
+            page = [{**c, "transcript": embedded[c["id"]]} for c in page]
+        body = json.dumps(page, default=str)
+    return (time.perf_counter() - start) / rounds * 1000, len(body.encode("utf-8"))
+
+
+async def main(count: int, page_size: int, rounds: int = 200) -> None:
+    random.seed(7)
+    store = InMemoryDataStore()
+    transcripts = {}
+    for i in range(count):
+        conv_id = f"bench-{i:05d}"
+        transcripts[conv_id] = _transcript(random.randint(40, 120))
+        await store.save_conversation({
+            "id": conv_id,
+            "patient_id": PATIENT,
+            "timestamp": f"2025-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+            "duration": 600,
+            "summary": "Talked about the garden",
+            "detected_mood": "happy",
+            "transcript": transcripts[conv_id],
+        })
+
+    raw = sum(len(t.encode("utf-8")) for t in transcripts.values())
+    stored = sum(len(b) for b in store.transcript_blobs.values() if b)
+
+    before_ms, before_bytes = await _time_list(store, page_size, transcripts, rounds)
+    after_ms, after_bytes = await _time_list(store, page_size, {}, rounds)
+
+    print(f"{count} conversations, page size {page_size}, {rounds} rounds")
+    print(f"  transcript storage: {raw / 1024:.1f} KiB raw -> {stored / 1024:.1f} KiB stored")
+    print(f"  list payload:  embedded {before_bytes / 1024:.1f} KiB   metadata-only {after_bytes / 1024:.1f} KiB")
+    print(f"  list latency:  embedded {before_ms:.3f} ms   metadata-only {after_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(main(*(args or [500, 20])))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Twilio Media Path Benchmark
+Measures per-frame CPU cost of the Twilio media path, comparing the
+previous dict-based path with the fast path in app.voice.media_codec:
+
+  inbound   receive_json + dict dispatch + b64decode
+            vs. raw text + payload slice + a2b_base64
+  outbound  dict build + json.dumps (send_json)
+            vs. pre-serialized template + payload splice
+
+Reports frames/second on one core and an upper bound on concurrent calls
+per pod. Each call carries 50 frames/s in each direction (20ms mulaw
+frames). WebSocket I/O and Deepgram are excluded, so the call estimate
+is the ceiling imposed by media handling alone.
+
+Usage:
+    PYTHONPATH=. python benchmarks/twilio_media_path.py [frames] [pod_cores]
+"""
+
+import base64
+import json
+import os
+import sys
+import time
+
+from app.voice.media_codec import OutboundMediaTemplate, extract_media_payload
+
+FRAME_BYTES = 160          # 20ms of 8kHz mulaw
+FRAMES_PER_SEC_PER_DIRECTION = 50
+STREAM_SID = "MZ18ad3ab5a668481ce02b83e7395059f0"
+
+
+def _inbound_frame(seq: int, audio: bytes) -> str:
+    # Same layout Twilio sends (compact JSON, event first)
+    return json.dumps({
+        "event": "media",
+        "sequenceNumber": str(seq),
+        "media": {"track": "inbound", "chunk": str(seq), "timestamp": str(seq * 20),
+                  "payload": base64.b64encode(audio).decode()},
+        "streamSid": STREAM_SID,
+    }, separators=(",", ":"))
+
+
+def _old_inbound(raw: str) -> bytes:
+    message = json.loads(raw)
+    if message.get("event") == "media":
+        payload = message.get("media", {}).get("payload", "")
+        return base64.b64decode(payload)
+    return b""
+
+
+def _old_outbound(audio: bytes) -> str:
+    message = {"event": "media", "streamSid": STREAM_SID,
+               "media": {"payload": base64.b64encode(audio).decode("utf-8")}}
+    return json.dumps(message, separators=(",", ":"))
+
+
+def _rate(fn, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main(frames: int, pod_cores: int) -> None:
+    audio = [os.urandom(FRAME_BYTES) for _ in range(256)]
+    inbound = [_inbound_frame(i, audio[i % 256]) for i in range(frames)]
+    outbound = [audio[i % 256] for i in range(frames)]
+    template = OutboundMediaTemplate(STREAM_SID)
+
+    assert extract_media_payload(inbound[0]) == _old_inbound(inbound[0])
+    assert json.loads(template.render(audio[0])) == json.loads(_old_outbound(audio[0]))
+
+    results = {
+        "old": (_rate(_old_inbound, inbound), _rate(_old_outbound, outbound)),
+        "fast": (_rate(extract_media_payload, inbound), _rate(template.render, outbound)),
+    }
+
+    print(f"{frames} frames of {FRAME_BYTES} bytes, pod of {pod_cores} core(s)")
+    for name, (in_fps, out_fps) in results.items():
+        # Harmonic combination: one core handling both directions of each call
+        per_call = FRAMES_PER_SEC_PER_DIRECTION * (1 / in_fps + 1 / out_fps)
+        calls_per_core = 1 / per_call
+        print(
+            f"  {name:<4} inbound {in_fps:>10,.0f} fps/core   outbound {out_fps:>10,.0f} fps/core   "
+            f"max calls ≈ {calls_per_core:,.0f}/core, {calls_per_core * pod_cores:,.0f}/pod"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(args[0] if args else 200_000, args[1] if len(args) > 1 else (os.cpu_count() or 1))
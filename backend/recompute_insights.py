@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Recompute Insight Aggregates
+Rebuilds each patient's running insight aggregates from their full
+conversation and alert history in Sanity, repairing any drift.
+
+Usage:
+    python recompute_insights.py                 # every patient
+    python recompute_insights.py patient-001 ... # specific patients
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from app.storage import SanityDataStore
+
+
+async def recompute(patient_ids: list[str]) -> int:
+    project_id = os.getenv("SANITY_PROJECT_ID")
+    dataset = os.getenv("SANITY_DATASET")
+    token = os.getenv("SANITY_TOKEN")
+    if not (project_id and dataset and token):
+        print("❌ SANITY_PROJECT_ID, SANITY_DATASET and SANITY_TOKEN must be set")
+        return 1
+
+    store = SanityDataStore(project_id=project_id, dataset=dataset, token=token)
+    try:
+        if not patient_ids:
+            result = await store._query_groq('*[_type == "patient"]._id')
+            patient_ids = result.get("result") or []
+
+        for patient_id in patient_ids:
+            insights = await store.recompute_patient_insights(patient_id)
+            summary = insights["alert_summary"]
+            conversations = sum(b["conversation_count"] for b in insights["cognitive_by_mood"].values())
+            print(f"  ✓ {patient_id}: {conversations} conversations, {summary['total']} alerts")
+    finally:
+        await store.close()
+
+    print(f"\nRecomputed insights for {len(patient_ids)} patient(s)")
+    return 0
+
+
+def main():
+    env_file = Path(__file__).parent / ".env"
+    if env_file.exists():
+        load_dotenv(env_file)
+    sys.exit(asyncio.run(recompute(sys.argv[1:])))
+
+
+if __name__ == "__main__":
+    main()
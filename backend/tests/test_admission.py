@@ -0,0 +1,149 @@
+"""
+Tests for per-worker admission control (call/analysis capacity, rejection, deferral).
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from app.events import event_hub
+from app.main import app
+from app.voice.admission import AdmissionController, admission
+from app.voice.call_registry import call_registry
+from app.voice.twilio_bridge import TwilioBridge, TwilioCallSession
+
+
+def test_calls_beyond_capacity_are_rejected():
+    ctl = AdmissionController(max_active_calls=2, max_pending_analyses=1)
+    assert ctl.try_admit("CA1") and ctl.try_admit("CA2")
+    assert not ctl.try_admit("CA3")
+
+    assert ctl.call_started("CA1")  # uses its reservation
+    assert not ctl.call_started("CA-unreserved")
+    ctl.call_ended("CA1")
+    assert ctl.try_admit("CA3")
+
+    util = ctl.utilization()
+    assert util["active_calls"] == 0 and util["reserved_calls"] == 2
+    assert util["call_utilization"] == 1.0 and util["saturated"]
+    assert util["rejected"] == 2
+
+
+def test_pending_analyses_count_toward_saturation():
+    ctl = AdmissionController(max_active_calls=5, max_pending_analyses=1)
+    with ctl.analysis():
+        assert ctl.saturated
+        assert not ctl.try_admit("CA1")
+    assert not ctl.saturated
+
+
+@pytest.mark.asyncio
+async def test_non_urgent_dial_waits_for_capacity():
+    ctl = AdmissionController(max_active_calls=1, max_pending_analyses=1)
+    ctl.call_started("CA1")
+
+    waiter = asyncio.create_task(ctl.wait_for_capacity())
+    await asyncio.sleep(0.02)
+    assert not waiter.done()
+
+    ctl.call_ended("CA1")
+    assert await asyncio.wait_for(waiter, 1.0) > 0
+    assert ctl.utilization()["deferred"] == 1
+
+
+def test_twiml_turns_calls_away_when_full(monkeypatch):
+    monkeypatch.setattr(admission, "max_active_calls", 0)
+    monkeypatch.delenv("CALL_OVERFLOW_URL", raising=False)
+    with TestClient(app) as client:
+        response = client.get("/voice/twiml", params={"patient_id": "p1", "CallSid": "CA-full"})
+        assert "<Hangup/>" in response.text and "<Stream" not in response.text
+
+        monkeypatch.setenv("CALL_OVERFLOW_URL", "https://worker-2.example/voice/twiml")
+        response = client.get("/voice/twiml", params={"patient_id": "p1", "CallSid": "CA-full-2"})
+        assert "<Redirect" in response.text and "worker-2.example" in response.text
+
+        capacity = client.get("/capacity")
+        assert capacity.status_code == 503
+        assert capacity.json()["saturated"]
+
+
+def test_twiml_without_call_sid_reserves_no_slot():
+    with TestClient(app) as client:
+        before = admission.utilization()["reserved_calls"]
+        response = client.get("/voice/twiml", params={"patient_id": "p1"})
+        assert "<Stream" in response.text
+        assert admission.utilization()["reserved_calls"] == before
+
+
+class _HangupWebSocket:
+    """Twilio stream that starts, sends one media frame, then stops"""
+
+    def __init__(self, call_sid):
+        self._json = [
+            {"event": "connected"},
+            {"event": "start", "start": {"streamSid": "MZ1", "callSid": call_sid}},
+        ]
+        self._text = [
+            json.dumps({"event": "media", "media": {"payload": ""}}),
+            json.dumps({"event": "stop"}),
+        ]
+
+    async def accept(self):
+        pass
+
+    async def receive_json(self):
+        return self._json.pop(0)
+
+    async def receive_text(self):
+        if not self._text:
+            raise WebSocketDisconnect()
+        return self._text.pop(0)
+
+    async def send_text(self, text):
+        pass
+
+    async def close(self, code=1000):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_post_call_analysis_runs_after_hangup_and_is_counted(monkeypatch):
+    async def start(session):
+        session.is_active = session._started = True
+        return True
+
+    bridge = TwilioBridge()
+    during_end = []
+
+    async def end(session):
+        if session._started and not session._ended:
+            session._ended = True
+            during_end.append({
+                "pending_analyses": admission.pending_analyses,
+                "active": session.call_sid in admission._active,
+                "streaming": session.is_active,
+                "listed": session.call_sid in bridge.active_calls,
+                "registered": await call_registry.get(session.call_sid) is not None,
+            })
+            event_hub.publish("pipeline_complete", session.patient_id, {"call_sid": session.call_sid})
+
+    monkeypatch.setattr(TwilioCallSession, "start", start)
+    monkeypatch.setattr(TwilioCallSession, "end", end)
+
+    subscription = event_hub.subscribe(["patient-hangup"])
+    try:
+        await bridge.handle_call(_HangupWebSocket("CA-hangup"), "patient-hangup")
+        events = []
+        while (event := await subscription.get(timeout=0.01)) is not None:
+            events.append(event["type"])
+    finally:
+        event_hub.unsubscribe(subscription)
+
+    assert during_end == [{
+        "pending_analyses": 1, "active": False, "streaming": False, "listed": False, "registered": False,
+    }]
+    assert admission.pending_analyses == 0
+    assert events == ["call_started", "call_ended", "pipeline_complete"]
@@ -252,3 +252,22 @@ async def test_multiple_deviations_multiple_alerts(alert_engine):
     alert_types = [a["alert_type"] for a in alerts]
     assert "vocabulary_shrinkage" in alert_types
     assert "coherence_drop" in alert_types
+
+
+@pytest.mark.asyncio
+async def test_notifications_wait_for_batch_commit(data_store, alert_engine, notification_service, monkeypatch):
+    """Test families are only notified about alerts whose batch committed"""
+    monkeypatch.setattr(alert_engine, "_get_suggested_action", lambda alert_type: "Check in")
+    patient_id = "patient-dorothy-001"
+
+    with pytest.raises(RuntimeError):
+        async with data_store.batch():
+            await alert_engine.create_realtime_alert(patient_id, "fall", "high", "Patient reported a fall")
+            assert notification_service.sent_alerts == []
+            raise RuntimeError("commit failed")
+    assert notification_service.sent_alerts == []
+
+    async with data_store.batch():
+        alert = await alert_engine.create_realtime_alert(patient_id, "fall", "high", "Patient reported a fall")
+        assert notification_service.sent_alerts == []
+    assert [a["id"] for _, a in notification_service.sent_alerts] == [alert["id"]]
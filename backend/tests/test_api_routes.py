@@ -74,6 +74,60 @@ def test_update_patient_not_found(client):
     assert response.status_code == 404
 
 
+def test_get_patient_dashboard(client):
+    """Test GET /api/patients/{id}/dashboard returns every section"""
+    response = client.get("/api/patients/patient-dorothy-001/dashboard")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["patient"]["id"] == "patient-dorothy-001"
+    for field in ("baseline", "latest_digest", "recent_conversations", "active_alerts", "trends", "insights"):
+        assert field in data
+    assert len(data["recent_conversations"]) <= 5
+    assert all(not a.get("acknowledged") for a in data["active_alerts"])
+    assert "unavailable" not in data
+
+
+def test_get_patient_dashboard_normalizes_legacy_conversations(client):
+    """Test GET /api/patients/{id}/dashboard cleans summaries of records saved before normalization"""
+    client.app.state.data_store.conversations["conv-legacy-dashboard"] = {
+        "id": "conv-legacy-dashboard",
+        "patient_id": "patient-dorothy-001",
+        "timestamp": "2099-01-01T10:00:00+00:00",
+        "duration": 300,
+        "summary": "Summarizing the call, The patient talked about her roses.",
+    }
+    response = client.get("/api/patients/patient-dorothy-001/dashboard", params={"fields": "recent_conversations"})
+
+    assert response.status_code == 200
+    latest = response.json()["recent_conversations"][0]
+    assert latest["id"] == "conv-legacy-dashboard"
+    assert latest["summary"] == "She talked about her roses."
+
+
+def test_get_patient_dashboard_field_selection(client):
+    """Test GET /api/patients/{id}/dashboard?fields= returns only the requested sections"""
+    response = client.get(
+        "/api/patients/patient-dorothy-001/dashboard",
+        params={"fields": "active_alerts,trends", "days": 7}
+    )
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"patient_id", "active_alerts", "trends"}
+
+
+def test_get_patient_dashboard_invalid_field(client):
+    """Test GET /api/patients/{id}/dashboard with an unknown field"""
+    response = client.get("/api/patients/patient-dorothy-001/dashboard", params={"fields": "secrets"})
+    assert response.status_code == 400
+
+
+def test_get_patient_dashboard_not_found(client):
+    """Test GET /api/patients/{id}/dashboard for nonexistent patient"""
+    response = client.get("/api/patients/patient-nonexistent-999/dashboard")
+    assert response.status_code == 404
+
+
 # ---- Conversation routes ----
 
 
@@ -110,6 +164,30 @@ def test_list_conversations_pagination(client):
         assert ids1.isdisjoint(ids2), "Paginated results should not overlap"
 
 
+def test_list_conversations_cursor_walk(client):
+    """Following next_cursor visits every conversation exactly once, newest first"""
+    seen, cursor = [], None
+    while True:
+        url = "/api/conversations?patient_id=patient-dorothy-001&limit=4"
+        if cursor:
+            url += f"&cursor={cursor}"
+        data = client.get(url).json()
+        seen.extend(data["conversations"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    offset_page = client.get("/api/conversations?patient_id=patient-dorothy-001&limit=100").json()
+    assert [c["id"] for c in seen] == [c["id"] for c in offset_page["conversations"]]
+    timestamps = [c["timestamp"] for c in seen]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+
+def test_list_conversations_invalid_cursor(client):
+    response = client.get("/api/conversations?patient_id=patient-dorothy-001&cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
 def test_get_conversation_details(client):
     """Test GET /api/conversations/{id}"""
     # First get a conversation ID from Dorothy's conversations
@@ -242,6 +320,20 @@ def test_get_alerts_filter_by_severity(client):
         assert alert["severity"] == "high"
 
 
+def test_get_alerts_cursor_pagination(client):
+    """Cursor pages don't overlap and match the offset ordering"""
+    first = client.get("/api/alerts?patient_id=patient-dorothy-001&limit=1").json()
+    assert first["next_cursor"]
+
+    second = client.get(
+        f"/api/alerts?patient_id=patient-dorothy-001&limit=1&cursor={first['next_cursor']}"
+    ).json()
+    by_offset = client.get("/api/alerts?patient_id=patient-dorothy-001&limit=1&offset=1").json()
+
+    assert second["alerts"][0]["id"] != first["alerts"][0]["id"]
+    assert second["alerts"][0]["id"] == by_offset["alerts"][0]["id"]
+
+
 def test_get_alerts_invalid_severity(client):
     """Test GET /api/alerts with invalid severity filter"""
     response = client.get("/api/alerts?patient_id=patient-dorothy-001&severity=critical")
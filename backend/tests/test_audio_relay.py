@@ -0,0 +1,106 @@
+"""
+Tests for the bounded audio relay (overflow policies, isolation, metrics).
+"""
+
+import asyncio
+
+import pytest
+
+from app.voice.audio_relay import AudioRelay, COALESCE, DROP_OLDEST
+from app.voice.twilio_bridge import TwilioCallSession
+
+
+class _Sink:
+    def __init__(self, block: bool = False, fail: bool = False):
+        self.received = []
+        self.gate = asyncio.Event()
+        if not block:
+            self.gate.set()
+        self.fail = fail
+
+    async def send(self, chunk):
+        await self.gate.wait()
+        if self.fail:
+            raise ConnectionError("upstream gone")
+        self.received.append(chunk)
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_newest_frames():
+    sink = _Sink(block=True)
+    relay = AudioRelay("in", sink.send, maxsize=3, policy=DROP_OLDEST)
+    for i in range(6):
+        relay.put(bytes([i]))
+    relay.start()
+    sink.gate.set()
+    await relay.close(drain_timeout=1)
+
+    assert sink.received == [bytes([3]), bytes([4]), bytes([5])]
+    metrics = relay.metrics()
+    assert metrics["dropped"] == 3
+    assert metrics["max_depth"] == 3
+    assert metrics["sent"] == 3
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_overflow_into_tail():
+    sink = _Sink()
+    relay = AudioRelay("out", sink.send, maxsize=2, policy=COALESCE, max_coalesce_bytes=3)
+    for chunk in (b"a", b"b", b"c", b"d", b"e"):
+        relay.put(chunk)
+    relay.start()
+    await relay.close(drain_timeout=1)
+
+    # "c" and "d" fold into "b"; "e" would exceed 3 bytes so the oldest is dropped
+    assert sink.received == [b"bcd", b"e"]
+    assert relay.stats["coalesced"] == 2
+    assert relay.stats["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failing_sink_is_counted_and_relay_keeps_running():
+    sink = _Sink(fail=True)
+    relay = AudioRelay("in", sink.send)
+    relay.start()
+    relay.put(b"x")
+    relay.put(b"y")
+    await relay.close(drain_timeout=1)
+    assert relay.stats["send_errors"] == 2
+    assert relay.metrics()["latency"]["max_ms"] == 0.0
+
+
+class _HangingAgent:
+    async def send_audio(self, data):
+        await asyncio.Event().wait()  # Deepgram never acknowledges
+
+
+class _RecordingStream:
+    def __init__(self):
+        self.sent = []
+
+    async def send_audio(self, data):
+        self.sent.append(data)
+
+
+@pytest.mark.asyncio
+async def test_hung_deepgram_does_not_block_either_direction():
+    session = TwilioCallSession(None, "patient-1", "CA1")
+    session.deepgram_agent = _HangingAgent()
+    session.twilio_stream = _RecordingStream()
+    session.is_active = True
+    session._inbound_relay.start()
+    session._outbound_relay.start()
+
+    frame = '{"event":"media","media":{"payload":"AAAA"},"streamSid":"MZ1"}'
+    for _ in range(200):
+        await asyncio.wait_for(session.handle_twilio_frame(frame), timeout=0.1)
+    await asyncio.wait_for(session._on_deepgram_audio(b"clara"), timeout=0.1)
+    await asyncio.sleep(0.01)
+
+    assert session.twilio_stream.sent == [b"clara"]
+    metrics = session.relay_metrics()
+    assert metrics["inbound"]["depth"] <= 50
+    assert metrics["inbound"]["dropped"] > 0
+
+    await session._inbound_relay.close(drain_timeout=0)
+    await session._outbound_relay.close(drain_timeout=0)
@@ -0,0 +1,70 @@
+"""
+Tests for concurrent batch dialing and pollable call jobs.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.voice.bulk_dialer import BulkDialer
+
+
+def _patients(n):
+    return [{"patient_id": f"p{i}", "phone": f"+1555000{i:04d}", "name": f"P{i}"} for i in range(n)]
+
+
+class _Twilio:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def call_patient(self, patient_id, phone, name):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        if patient_id == "p3":
+            raise RuntimeError("bad number")
+        return {"success": True, "call_sid": f"CA-{patient_id}"}
+
+
+@pytest.mark.asyncio
+async def test_stream_dials_concurrently_up_to_the_limit():
+    twilio = _Twilio()
+    dialer = BulkDialer(twilio.call_patient, concurrency=4)
+
+    start = time.monotonic()
+    results = [entry async for entry in dialer.stream(_patients(12))]
+    elapsed = time.monotonic() - start
+
+    assert len(results) == 12
+    assert twilio.peak == 4
+    assert elapsed < 12 * twilio.delay / 2
+    failed = [r for r in results if not r["result"]["success"]]
+    assert [r["patient_id"] for r in failed] == ["p3"]
+
+
+@pytest.mark.asyncio
+async def test_job_progress_is_pollable():
+    dialer = BulkDialer(_Twilio(delay=0.01).call_patient, concurrency=2)
+    job = dialer.start(_patients(6))
+
+    first = job.progress()
+    assert first["status"] == "running" and first["total"] == 6
+
+    await job.task
+    done = dialer.get(job.id).progress(since=4)
+    assert done["status"] == "completed"
+    assert done["completed"] == 6 and done["successful"] == 5 and done["failed"] == 1
+    assert len(done["calls"]) == 2 and done["next"] == 6
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_running_jobs():
+    dialer = BulkDialer(_Twilio(delay=1.0).call_patient, concurrency=2)
+    job = dialer.start(_patients(4))
+    await asyncio.sleep(0.01)
+    await dialer.close()
+    assert job.status == "cancelled"
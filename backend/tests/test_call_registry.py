@@ -0,0 +1,81 @@
+"""
+Tests for the call registry (node ownership, heartbeats/expiry, end-call routing).
+"""
+
+import asyncio
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.voice import call_registry as registry_module
+from app.voice.call_registry import CallRegistry, SqliteCallRegistry
+
+bridge_module = importlib.import_module("app.voice.twilio_bridge")
+
+
+@pytest.mark.asyncio
+async def test_records_expire_without_heartbeat():
+    registry = CallRegistry(node_id="node-a", ttl=30)
+    await registry.register("CA1", "patient-1", "2026-01-01T10:00:00+00:00")
+    await registry.register("CA2", "patient-2", "2026-01-01T10:05:00+00:00")
+    assert (await registry.find_by_patient("patient-2"))["call_sid"] == "CA2"
+
+    registry._calls["CA1"]["heartbeat_at"] -= 60
+    assert [r["call_sid"] for r in await registry.list_calls()] == ["CA2"]
+
+    await registry.heartbeat(["CA1"])
+    assert len(await registry.list_calls()) == 2
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    path = tmp_path / "registry.sqlite"
+    worker_a = SqliteCallRegistry(path, node_id="node-a")
+    worker_b = SqliteCallRegistry(path, node_id="node-b")
+
+    await worker_a.register("CA1", "patient-1")
+    seen = await worker_b.get("CA1")
+    assert seen["node_id"] == "node-a"
+    assert (await worker_b.metrics())["nodes"] == {"node-a": 1}
+
+    await worker_a.unregister("CA1")
+    assert await worker_b.list_calls() == []
+
+
+@pytest.mark.asyncio
+async def test_end_call_is_routed_to_the_owning_node(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_module, "COMMAND_POLL_SEC", 0.01)
+    path = tmp_path / "registry.sqlite"
+    owner = SqliteCallRegistry(path, node_id="node-a")
+    other = SqliteCallRegistry(path, node_id="node-b")
+    await owner.register("CA1", "patient-1")
+
+    ended = []
+
+    async def handle(command):
+        ended.append(command)
+
+    owner.start(lambda: ["CA1"], handle)
+
+    monkeypatch.setattr(bridge_module, "call_registry", other)
+    outcome = await bridge_module.TwilioBridge().end_call("CA1")
+    assert outcome == "routed"
+    assert await bridge_module.TwilioBridge().end_call("CA-missing") == "not_found"
+
+    await asyncio.sleep(0.1)
+    await owner.close()
+    assert ended == [{"action": "end", "call_sid": "CA1"}]
+
+
+def test_dev_status_lists_calls_on_other_nodes(monkeypatch):
+    registry = CallRegistry(node_id="node-a")
+    monkeypatch.setattr(importlib.import_module("app.main"), "call_registry", registry)
+    with TestClient(app) as client:
+        asyncio.run(registry.register("CA-remote", "patient-1", "2026-01-01T10:00:00+00:00"))
+        calls = client.get("/dev/status").json()["calls"]
+
+    assert calls["active_count"] == 1 and calls["local_count"] == 0
+    assert calls["active_calls"][0]["call_sid"] == "CA-remote"
+    assert calls["active_calls"][0]["local"] is False
@@ -0,0 +1,102 @@
+"""
+Tests for the outbound call scheduler and the dial token bucket.
+"""
+
+import asyncio
+import time
+from datetime import datetime, UTC
+
+import pytest
+
+from app.storage import InMemoryDataStore
+from app.voice.rate_limit import TokenBucket
+from app.voice.scheduler import CallScheduler, next_fire_at, parse_preferred_time
+
+
+def test_parse_preferred_time_formats():
+    assert parse_preferred_time("10:00 AM").hour == 10
+    assert parse_preferred_time("12:15 am").hour == 0
+    assert parse_preferred_time("9:30pm").hour == 21
+    assert parse_preferred_time("14:00").hour == 14
+    with pytest.raises(ValueError):
+        parse_preferred_time("after lunch")
+
+
+def test_next_fire_at_uses_local_time_and_dst():
+    winter = datetime(2026, 1, 15, 12, 0, tzinfo=UTC)
+    summer = datetime(2026, 7, 15, 12, 0, tzinfo=UTC)
+    # 10:00 AM in Los Angeles is 18:00 UTC in winter (PST) and 17:00 UTC in summer (PDT)
+    assert next_fire_at("10:00 AM", "America/Los_Angeles", winter, jitter_sec=0).hour == 18
+    assert next_fire_at("10:00 AM", "America/Los_Angeles", summer, jitter_sec=0).hour == 17
+    # Already past today -> tomorrow
+    late = datetime(2026, 1, 15, 19, 0, tzinfo=UTC)
+    assert next_fire_at("10:00 AM", "America/Los_Angeles", late, jitter_sec=0).day == 16
+
+
+def test_jitter_is_bounded_and_stable_per_patient():
+    after = datetime(2026, 1, 15, 0, 0, tzinfo=UTC)
+    base = next_fire_at("9:00 AM", "UTC", after, jitter_sec=0)
+    fires = {pid: next_fire_at("9:00 AM", "UTC", after, pid, jitter_sec=120) for pid in ("a", "b", "c", "d")}
+    assert all(0 <= (f - base).total_seconds() < 120 for f in fires.values())
+    assert len(set(fires.values())) > 1
+    assert next_fire_at("9:00 AM", "UTC", after, "a", jitter_sec=120) == fires["a"]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_dials():
+    bucket = TokenBucket(rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+    assert bucket.metrics()["waited"] == 2
+
+
+class _Dialer:
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    async def __call__(self, patient_id, phone, name):
+        self.calls.append(patient_id)
+        return self.results.pop(0) if self.results else {"success": True, "call_sid": f"CA{len(self.calls)}"}
+
+
+@pytest.mark.asyncio
+async def test_due_call_is_placed_and_no_answer_retried(tmp_path):
+    scheduler = CallScheduler(tmp_path / "schedule.json", jitter_sec=0, retry_delay=0.02, max_retries=1)
+    dialer = _Dialer([{"success": True, "call_sid": "CA1"}])
+    scheduler.start(InMemoryDataStore(), dialer)
+    await asyncio.sleep(0.02)  # initial sync schedules Dorothy for tomorrow-or-later
+
+    job = scheduler._jobs["patient-dorothy-001"]
+    assert job["fire_at"] > time.time()
+    job["fire_at"] = time.time()
+    scheduler._push(job["fire_at"], "patient-dorothy-001", "daily")
+    await asyncio.sleep(0.02)
+    assert dialer.calls == ["patient-dorothy-001"]
+    assert scheduler._jobs["patient-dorothy-001"]["fire_at"] > time.time()  # rolled to the next day
+
+    scheduler.on_call_status("CA1", "no-answer")
+    await asyncio.sleep(0.06)
+    assert dialer.calls == ["patient-dorothy-001"] * 2
+
+    scheduler.on_call_status("CA2", "no-answer")  # out of retries
+    assert scheduler.metrics()["gave_up"] == 1
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_schedule_survives_restart(tmp_path):
+    path = tmp_path / "schedule.json"
+    first = CallScheduler(path, jitter_sec=0)
+    job = first.schedule("p1", "+15550001111", "Ann", "8:30 AM", "America/New_York")
+    first._retries["p1"] = {"fire_at": time.time() + 60, "attempt": 1}
+    first._save()
+
+    second = CallScheduler(path, jitter_sec=0)
+    assert second.metrics()["patients"] == 0  # nothing read until startup loads it
+    second.load()
+    assert second._jobs["p1"]["fire_at"] == job["fire_at"]
+    assert second._retries["p1"]["attempt"] == 1
+    assert second.metrics()["patients"] == 1
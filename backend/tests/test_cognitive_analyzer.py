@@ -243,6 +243,13 @@ async def test_compute_response_latency_none(analyzer):
     assert latency is None
 
 
+@pytest.mark.asyncio
+async def test_compute_pause_duration(analyzer):
+    """Test mid-turn pause averaging from measured turn timing"""
+    assert analyzer.compute_pause_duration([0.9, 2.1, 3.0]) == 2.0
+    assert analyzer.compute_pause_duration([]) is None
+
+
 @pytest.mark.asyncio
 async def test_analyze_conversation_full(analyzer):
     """Test full conversation analysis"""
@@ -0,0 +1,122 @@
+"""
+Tests for the shared nostalgia era-content cache and its warm job.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.nostalgia import YouComClient
+from app.nostalgia.era_cache import EraContentCache, era_key, warm_era_cache
+from app.storage import InMemoryDataStore
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = EraContentCache(tmp_path / "era.json", ttl=60)
+    cache.put("1966-1976", {"music": ["Motown"]})
+    assert cache.get("1966-1976") == {"music": ["Motown"]}
+
+    cache._entries["1966-1976"]["fetched_at"] = time.time() - 61
+    assert cache.get("1966-1976") is None
+    assert cache.expires_in("1966-1976") < 0
+
+
+def test_cache_survives_restart(tmp_path):
+    path = tmp_path / "era.json"
+    EraContentCache(path).put(era_key(1966, 1976), {"music": ["Motown"]})
+
+    reloaded = EraContentCache(path)
+    assert reloaded.get("1966-1976") == {"music": ["Motown"]}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch(tmp_path):
+    cache = EraContentCache(tmp_path / "era.json")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return {"era": "1960s-1970s"}
+
+    results = await asyncio.gather(*[cache.get_or_fetch("1966-1976", fetch) for _ in range(5)])
+    assert calls == 1
+    assert all(r == {"era": "1960s-1970s"} for r in results)
+
+    await cache.get_or_fetch("1966-1976", fetch)
+    metrics = cache.metrics()
+    assert calls == 1
+    assert metrics["fills"] == 1 and metrics["shared_fills"] == 4 and metrics["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_fetch(tmp_path):
+    cache = EraContentCache(tmp_path / "era.json")
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return {"era": "1960s-1970s"}
+
+    leader = asyncio.create_task(cache.get_or_fetch("1966-1976", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get_or_fetch("1966-1976", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == {"era": "1960s-1970s"}
+    assert leader.cancelled()
+    assert cache.get("1966-1976") == {"era": "1960s-1970s"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_fills_cache_after_every_caller_leaves(tmp_path):
+    cache = EraContentCache(tmp_path / "era.json")
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return {"era": "1960s-1970s"}
+
+    caller = asyncio.create_task(cache.get_or_fetch("1966-1976", fetch))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.sleep(0.03)
+    assert cache.get("1966-1976") == {"era": "1960s-1970s"}
+
+
+@pytest.mark.asyncio
+async def test_fallback_content_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.delenv("YOUCOM_API_KEY", raising=False)
+    cache = EraContentCache(tmp_path / "era.json")
+    client = YouComClient(cache=cache)
+
+    result = await client.search_nostalgia(birth_year=1951, refresh=True)
+    assert "_note" in result
+    assert cache.metrics()["eras"] == 0
+    assert not (tmp_path / "era.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_warm_refreshes_each_roster_era_once(tmp_path):
+    cache = EraContentCache(tmp_path / "era.json")
+    store = InMemoryDataStore()
+    years = await store.get_patient_birth_years()
+    assert years
+
+    class _Client:
+        def __init__(self):
+            self.birth_years = []
+
+        async def search_nostalgia(self, birth_year=None, refresh=False):
+            self.birth_years.append(birth_year)
+            cache.put(era_key(birth_year + 15, birth_year + 25), {"era": str(birth_year)})
+            return {}
+
+    client = _Client()
+    summary = await warm_era_cache(store, client, cache)
+    assert summary["refreshed"] == summary["eras"] == len(client.birth_years)
+
+    # Everything is fresh now, so a second run is a no-op
+    again = await warm_era_cache(store, client, cache)
+    assert again["refreshed"] == 0
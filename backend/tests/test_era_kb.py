@@ -0,0 +1,75 @@
+"""
+Tests for the offline era knowledge base and live-result merging.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.nostalgia import YouComClient
+from app.nostalgia.era_cache import EraContentCache
+from app.nostalgia.era_kb import KB_SOURCE, EraKnowledgeBase, build_era_kb
+
+
+def test_shipped_database_matches_source_version():
+    kb = EraKnowledgeBase()
+    assert kb.lookup(1966, 1976) is not None
+    assert kb.version == json.loads(KB_SOURCE.read_text(encoding="utf-8"))["version"]
+
+
+def test_lookup_spreads_across_the_era():
+    kb = EraKnowledgeBase()
+    content = kb.lookup(1966, 1976)
+    assert len(content["music"]) == 5
+    assert content["events"][0].endswith("(1966)") and content["events"][-1].endswith("(1976)")
+    assert "counterculture" in content["culture"]
+    assert content["sources"] == ["era_kb"]
+    assert kb.lookup(1500, 1510) is None
+
+
+def test_stale_database_is_rebuilt_in_memory(tmp_path):
+    source = tmp_path / "kb.json"
+    data = json.loads(KB_SOURCE.read_text(encoding="utf-8"))
+    source.write_text(json.dumps(data))
+    build_era_kb(source, tmp_path / "kb.sqlite")
+
+    data["version"] += 1
+    data["years"]["1966"]["music"] = ["New Song"]
+    source.write_text(json.dumps(data))
+    kb = EraKnowledgeBase(tmp_path / "kb.sqlite", source)
+    assert kb.lookup(1966, 1966)["music"] == ["New Song"]
+    assert kb.version == data["version"]
+
+
+class _LiveClient(YouComClient):
+    def __init__(self, delay, **kwargs):
+        super().__init__(api_key="test-key", **kwargs)
+        self.delay = delay
+
+    async def _fetch_era_content(self, year_start, year_end):
+        await asyncio.sleep(self.delay)
+        return {"music": ["Live Song", "The Beatles - Hey Jude"], "events": [], "era": f"{year_start}-{year_end}"}
+
+
+@pytest.mark.asyncio
+async def test_live_results_merged_within_deadline(tmp_path):
+    client = _LiveClient(0.0, cache=EraContentCache(tmp_path / "era.json"), live_deadline=0.2)
+    result = await client.search_nostalgia(birth_year=1951)
+    assert result["sources"] == ["era_kb", "youcom"]
+    assert result["music"].count("The Beatles - Hey Jude") == 1
+    assert "Live Song" in result["music"]
+
+
+@pytest.mark.asyncio
+async def test_slow_live_results_fill_cache_in_background(tmp_path):
+    cache = EraContentCache(tmp_path / "era.json")
+    client = _LiveClient(0.05, cache=cache, live_deadline=0.01)
+
+    first = await client.search_nostalgia(birth_year=1951)
+    assert first["sources"] == ["era_kb"]
+
+    await asyncio.sleep(0.1)
+    second = await client.search_nostalgia(birth_year=1951)
+    assert "Live Song" in second["music"]
+    assert cache.metrics()["fills"] == 1
@@ -0,0 +1,107 @@
+"""
+Tests for the dashboard event hub and /api/events stream.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cognitive.alerts import AlertEngine
+from app.events import EventHub, Subscription, event_hub, format_sse
+from app.main import app
+from app.storage.memory import InMemoryDataStore
+
+
+@pytest.mark.asyncio
+async def test_subscribers_only_receive_their_patients():
+    hub = EventHub()
+    family = hub.subscribe(["patient-1", "patient-2"])
+    other = hub.subscribe(["patient-3"])
+
+    hub.publish("call_started", "patient-2", {"call_sid": "CA1"})
+    hub.publish("call_started", "patient-9", {"call_sid": "CA2"})
+
+    event = await family.get(timeout=0.1)
+    assert event["type"] == "call_started"
+    assert event["data"]["call_sid"] == "CA1"
+    assert await family.get(timeout=0.01) is None
+    assert await other.get(timeout=0.01) is None
+    assert hub.metrics()["delivered"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_events():
+    subscription = Subscription({"patient-1"}, maxsize=2)
+    for i in range(3):
+        subscription.offer({"id": i, "patient_id": "patient-1"})
+
+    assert subscription.dropped == 1
+    assert [(await subscription.get(timeout=0.1))["id"] for _ in range(2)] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_events_after_last_event_id():
+    hub = EventHub(replay_size=10)
+    first = hub.publish("call_started", "patient-1")
+    hub.publish("call_ended", "patient-1")
+    hub.publish("call_started", "patient-2")
+
+    subscription = hub.subscribe(["patient-1"], last_event_id=first["id"])
+    replayed = await subscription.get(timeout=0.1)
+    assert replayed["type"] == "call_ended"
+    assert await subscription.get(timeout=0.01) is None
+
+
+def test_sse_frame_format():
+    frame = format_sse({
+        "id": 7, "type": "alert_created", "patient_id": "patient-1",
+        "timestamp": "2026-01-01T00:00:00+00:00", "data": {"severity": "high"},
+    })
+    lines = frame.split("\n")
+    assert lines[0] == "id: 7"
+    assert lines[1] == "event: alert_created"
+    assert json.loads(lines[2][len("data: "):])["data"] == {"severity": "high"}
+    assert frame.endswith("\n\n")
+
+
+@pytest.mark.asyncio
+async def test_realtime_alert_is_published(monkeypatch):
+    subscription = event_hub.subscribe(["patient-dorothy-001"])
+    try:
+        engine = AlertEngine(InMemoryDataStore())
+        monkeypatch.setattr(engine, "_get_suggested_action", lambda alert_type: "Check in")
+        alert = await engine.create_realtime_alert("patient-dorothy-001", "fall", "high", "Patient reported a fall")
+        event = await subscription.get(timeout=0.1)
+        assert event["type"] == "alert_created"
+        assert event["data"]["id"] == alert["id"]
+    finally:
+        event_hub.unsubscribe(subscription)
+
+
+@pytest.mark.asyncio
+async def test_alert_in_rolled_back_batch_is_not_published(monkeypatch):
+    subscription = event_hub.subscribe(["patient-dorothy-001"])
+    try:
+        store = InMemoryDataStore()
+        engine = AlertEngine(store)
+        monkeypatch.setattr(engine, "_get_suggested_action", lambda alert_type: "Check in")
+        with pytest.raises(RuntimeError):
+            async with store.batch():
+                await engine.create_realtime_alert("patient-dorothy-001", "fall", "high", "Patient reported a fall")
+                assert await subscription.get(timeout=0.01) is None
+                raise RuntimeError("pipeline failed")
+        assert await subscription.get(timeout=0.01) is None
+
+        async with store.batch():
+            alert = await engine.create_realtime_alert("patient-dorothy-001", "fall", "high", "Patient reported a fall")
+        event = await subscription.get(timeout=0.1)
+        assert event["data"]["id"] == alert["id"]
+    finally:
+        event_hub.unsubscribe(subscription)
+
+
+def test_events_route_rejects_unknown_patient():
+    with TestClient(app) as client:
+        response = client.get("/api/events", params={"patient_id": "patient-missing"})
+    assert response.status_code == 404
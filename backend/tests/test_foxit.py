@@ -118,3 +118,24 @@ async def test_report_generate_recommendations(report_gen):
     recs = report_gen._generate_recommendations(trends, alerts, baseline)
     assert isinstance(recs, str)
     assert len(recs) > 0
+
+
+@pytest.mark.asyncio
+async def test_report_alert_list_matches_report_period(data_store, report_gen):
+    """Alerts older than the period are left out of the list, like the period totals."""
+    from datetime import datetime, UTC, timedelta
+
+    now = datetime.now(UTC)
+    await data_store.save_alert({"id": "alert-recent", "patient_id": "patient-dorothy-001",
+                                 "severity": "high", "timestamp": (now - timedelta(days=2)).isoformat()})
+    await data_store.save_alert({"id": "alert-old", "patient_id": "patient-dorothy-001",
+                                 "severity": "high", "timestamp": (now - timedelta(days=20)).isoformat()})
+
+    with patch.object(report_gen.foxit_client, "generate_cognitive_report_pdf",
+                      AsyncMock(return_value=b"%PDF-")) as generate:
+        await report_gen.generate_cognitive_report("patient-dorothy-001", days=7)
+
+    data = generate.call_args.kwargs["patient_data"]
+    ids = [a["id"] for a in data["alerts"]]
+    assert "alert-recent" in ids and "alert-old" not in ids
+    assert data["total_alerts"] == len(ids)
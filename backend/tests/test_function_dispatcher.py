@@ -0,0 +1,97 @@
+"""
+Tests for non-blocking function-call dispatch (ordering, timeouts, fallbacks, latency).
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.voice.function_dispatcher import FALLBACKS, FunctionCallDispatcher
+
+
+class _Recorder:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, text):
+        self.sent.append(json.loads(text))
+
+
+def _executor(delays: dict, finished: list):
+    async def execute(name, params):
+        await asyncio.sleep(delays.get(name, 0))
+        if name == "explode":
+            raise RuntimeError("boom")
+        finished.append(name)
+        return {"success": True, "function": name}
+    return execute
+
+
+@pytest.mark.asyncio
+async def test_responses_sent_in_request_order():
+    finished, out = [], _Recorder()
+    dispatcher = FunctionCallDispatcher(
+        _executor({"search_nostalgia": 0.05, "get_patient_context": 0.0}, finished), out.send
+    )
+    dispatcher.submit("1", "search_nostalgia", {})
+    dispatcher.submit("2", "get_patient_context", {})
+    await asyncio.sleep(0.1)
+
+    assert finished == ["get_patient_context", "search_nostalgia"]
+    assert [r["id"] for r in out.sent] == ["1", "2"]
+    assert json.loads(out.sent[0]["content"])["function"] == "search_nostalgia"
+    assert dispatcher.metrics()["search_nostalgia"]["calls"] == 1
+    assert dispatcher.metrics()["search_nostalgia"]["avg_ms"] >= 40
+
+
+@pytest.mark.asyncio
+async def test_submit_does_not_block_and_timeout_sends_fallback():
+    finished, out = [], _Recorder()
+    dispatcher = FunctionCallDispatcher(
+        _executor({"search_realtime": 1.0}, finished), out.send, timeouts={"search_realtime": 0.02}
+    )
+    dispatcher.submit("1", "search_realtime", {})
+    assert out.sent == []  # returned before the search ran
+    await asyncio.sleep(0.05)
+
+    assert json.loads(out.sent[0]["content"]) == FALLBACKS["search_realtime"]
+    assert dispatcher.metrics()["search_realtime"]["timeouts"] == 1
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_side_effect_call_finishes_after_timeout_and_errors_reported():
+    finished, out = [], _Recorder()
+    dispatcher = FunctionCallDispatcher(
+        _executor({"trigger_alert": 0.05}, finished), out.send, timeouts={"trigger_alert": 0.01}
+    )
+    dispatcher.submit("1", "trigger_alert", {})
+    dispatcher.submit("2", "explode", {})
+    await asyncio.sleep(0.02)
+    await dispatcher.close()
+    await asyncio.sleep(0.05)
+
+    assert finished == ["trigger_alert"]
+    assert [r["id"] for r in out.sent] == ["1", "2"]
+    assert json.loads(out.sent[1]["content"]) == {"error": "boom", "success": False}
+    assert dispatcher.metrics()["explode"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_function_cancelled_from_inside_sends_fallback_and_unblocks_queue():
+    out = _Recorder()
+
+    async def execute(name, params):
+        if name == "search_nostalgia":
+            raise asyncio.CancelledError()  # e.g. an upstream client cancelled its own request
+        return {"success": True, "function": name}
+
+    dispatcher = FunctionCallDispatcher(execute, out.send)
+    dispatcher.submit("1", "search_nostalgia", {})
+    dispatcher.submit("2", "get_patient_context", {})
+    await asyncio.sleep(0.02)
+
+    assert [r["id"] for r in out.sent] == ["1", "2"]
+    assert json.loads(out.sent[0]["content"]) == FALLBACKS["search_nostalgia"]
+    assert dispatcher.metrics()["search_nostalgia"]["errors"] == 1
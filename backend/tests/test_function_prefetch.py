@@ -0,0 +1,77 @@
+"""
+Tests for speculative prefetch of patient-only function calls.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.storage import InMemoryDataStore
+from app.voice.functions import FunctionHandler
+
+PATIENT_ID = "patient-dorothy-001"
+
+
+class _CountingStore(InMemoryDataStore):
+    def __init__(self):
+        super().__init__()
+        self.patient_reads = 0
+
+    async def get_patient(self, patient_id):
+        self.patient_reads += 1
+        await asyncio.sleep(0.03)
+        return await super().get_patient(patient_id)
+
+
+def _handler(monkeypatch):
+    monkeypatch.delenv("YOUCOM_API_KEY", raising=False)
+    store = _CountingStore()
+    return FunctionHandler(PATIENT_ID, SimpleNamespace(data_store=store)), store
+
+
+@pytest.mark.asyncio
+async def test_prefetched_calls_return_from_memo(monkeypatch):
+    handler, store = _handler(monkeypatch)
+    handler.prefetch()
+    await asyncio.sleep(0.1)
+    reads_after_prefetch = store.patient_reads
+
+    context = await handler.execute("get_patient_context", {"patient_id": PATIENT_ID})
+    nostalgia = await handler.execute("search_nostalgia", {"trigger_reason": "mentioned dancing"})
+
+    assert context["success"] and context["patient"]["preferred_name"]
+    assert nostalgia["trigger_reason"] == "mentioned dancing"
+    assert store.patient_reads == reads_after_prefetch
+    metrics = handler.prefetch_metrics()
+    assert metrics["get_patient_context"]["hits"] == 1
+    assert metrics["get_patient_context"]["hit_rate"] == 1.0
+    assert metrics["get_patient_context"]["saved_ms"] >= 20
+
+
+@pytest.mark.asyncio
+async def test_in_flight_prefetch_is_awaited_and_other_patients_run_live(monkeypatch):
+    handler, store = _handler(monkeypatch)
+    handler.prefetch()
+
+    await handler.execute("get_patient_context", {})
+    assert handler.prefetch_metrics()["get_patient_context"]["partial_hits"] == 1
+
+    before = store.patient_reads
+    await handler.execute("get_patient_context", {"patient_id": "someone-else"})
+    assert store.patient_reads == before + 1
+    await handler.cancel_prefetch()
+
+
+@pytest.mark.asyncio
+async def test_failed_prefetch_falls_back_to_live_call(monkeypatch):
+    handler, _ = _handler(monkeypatch)
+
+    async def broken(params):
+        raise RuntimeError("store down")
+
+    handler.get_patient_context = broken
+    handler.prefetch()
+    result = await handler.execute("get_patient_context", {})
+    assert result == {"success": False, "error": "store down"}
+    assert handler.prefetch_metrics()["get_patient_context"]["misses"] == 1
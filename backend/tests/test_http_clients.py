@@ -0,0 +1,125 @@
+"""
+Tests for the shared HTTP client registry (pooling, config, lifecycle, reuse metrics).
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app import http_clients
+from app.http_clients import HTTPClientRegistry
+
+
+async def _keepalive_server():
+    """Minimal HTTP/1.1 server that keeps connections open between requests."""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_same_client_per_upstream_and_config_applied():
+    registry = HTTPClientRegistry({"deepgram": {"max_connections": 3, "timeout": 2.0}})
+    try:
+        client = registry.get("deepgram")
+        assert registry.get("deepgram") is client
+        assert registry.get("youcom") is not client
+        assert str(client.base_url) == "https://api.deepgram.com"
+        assert client.timeout.read == 2.0
+        assert client.timeout.connect == 5.0
+    finally:
+        await registry.aclose()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_reuse_metrics_count_new_connections():
+    server, port = await _keepalive_server()
+    registry = HTTPClientRegistry({"local": {"base_url": f"http://127.0.0.1:{port}"}})
+    try:
+        client = registry.get("local")
+        for _ in range(3):
+            response = await client.get("/ping")
+            assert response.text == "ok"
+        metrics = registry.metrics()["local"]
+        assert metrics["requests"] == 3
+        assert metrics["connections_opened"] == 1
+        assert metrics["tls_handshakes"] == 0
+        assert metrics["reused_requests"] == 2
+        assert metrics["reuse_ratio"] == pytest.approx(0.667)
+    finally:
+        await registry.aclose()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_closed_client_is_recreated_and_errors_counted():
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+    registry = HTTPClientRegistry({"internal": {"transport": transport}})
+    first = registry.get("internal")
+    await first.get("http://internal/x")
+    await registry.aclose()
+
+    second = registry.get("internal")
+    assert second is not first and not second.is_closed
+    assert registry.metrics()["internal"]["errors"] == 1
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_process_registry_lifecycle():
+    registry = http_clients.init_http_clients()
+    assert http_clients.get_http_registry() is registry
+    client = http_clients.get_http_client("twilio")
+    await http_clients.close_http_clients()
+    assert client.is_closed
+    assert http_clients.get_http_registry() is not registry
+    await http_clients.close_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_sanity_and_foxit_use_pooled_clients():
+    from app.reports.foxit_client import FoxitPDFServicesClient
+    from app.storage.sanity import SanityDataStore
+
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"result": [], "documentId": "doc-1"})
+
+    transport = httpx.MockTransport(handler)
+    registry = http_clients.init_http_clients(
+        {"sanity": {"transport": transport}, "foxit": {"transport": transport}}
+    )
+    try:
+        store = SanityDataStore(project_id="proj", dataset="production", token="tok")
+        await store._query("*[_type == 'patient']")
+        await store.close()  # leaves the shared client open
+        pdf = FoxitPDFServicesClient(client_id="id", client_secret="secret", base_url="https://foxit.test")
+        assert await pdf._upload(b"<html></html>", "r.html") == "doc-1"
+
+        assert str(seen[0].url).startswith("https://proj.api.sanity.io/")
+        assert seen[0].headers["authorization"] == "Bearer tok"
+        assert str(seen[1].url) == "https://foxit.test/pdf-services/api/documents/upload"
+        assert seen[1].headers["client_id"] == "id"
+        metrics = registry.metrics()
+        assert metrics["sanity"]["requests"] == 1 and metrics["sanity"]["open"]
+        assert metrics["foxit"]["requests"] == 1
+    finally:
+        await http_clients.close_http_clients()
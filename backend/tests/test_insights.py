@@ -1,13 +1,22 @@
 """
-Tests for Insights API Route and InMemoryDataStore.get_patient_insights
-Validates the Sanity challenge showcase endpoint.
+Tests for the Insights API route and the incrementally maintained insight
+aggregates behind get_patient_insights.
 
-TestClient is synchronous -- do NOT use @pytest.mark.asyncio here.
+Route tests use the synchronous TestClient -- do NOT use @pytest.mark.asyncio there.
 """
 
+import statistics
+
 import pytest
 from fastapi.testclient import TestClient
+
 from app.main import app
+from app.storage.insights import InsightAggregates
+from app.storage.memory import InMemoryDataStore
+from app.storage.sanity import SanityDataStore
+
+
+PATIENT = "patient-dorothy-001"
 
 
 @pytest.fixture
@@ -18,7 +27,7 @@ def client():
 
 
 # ---------------------------------------------------------------------------
-# get_patient_insights via InMemoryDataStore
+# /api/patients/{id}/insights (InMemoryDataStore)
 # ---------------------------------------------------------------------------
 
 
@@ -98,3 +107,174 @@ def test_insights_patient_not_found(client):
     """Insights for nonexistent patient returns 404."""
     resp = client.get("/api/patients/patient-nonexistent-999/insights")
     assert resp.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# Running aggregates
+# ---------------------------------------------------------------------------
+
+
+def _scan_insights(store: InMemoryDataStore, patient_id: str) -> dict:
+    """Reference: the original full-scan computation of mood and alert stats."""
+    convs = [c for c in store.conversations.values()
+             if c["patient_id"] == patient_id and c.get("cognitive_metrics")]
+    moods: dict = {}
+    for c in convs:
+        moods.setdefault(c.get("detected_mood", "unknown"), []).append(c["cognitive_metrics"])
+    by_mood = {
+        mood: {
+            "avg_vocabulary": round(statistics.mean(m["vocabulary_diversity"] for m in ms), 3),
+            "avg_coherence": round(statistics.mean(m["topic_coherence"] for m in ms), 3),
+            "conversation_count": len(ms),
+        }
+        for mood, ms in moods.items()
+    }
+    alerts = [a for a in store.alerts.values() if a["patient_id"] == patient_id]
+    return {
+        "by_mood": by_mood,
+        "alert_total": len(alerts),
+        "acknowledged": sum(1 for a in alerts if a.get("acknowledged")),
+    }
+
+
+def _strip_std(by_mood: dict) -> dict:
+    return {
+        mood: {k: v for k, v in stats.items() if not k.startswith("std_")}
+        for mood, stats in by_mood.items()
+    }
+
+
+@pytest.mark.asyncio
+async def test_memory_insights_match_full_scan():
+    store = InMemoryDataStore()
+    insights = await store.get_patient_insights(PATIENT)
+    expected = _scan_insights(store, PATIENT)
+
+    assert _strip_std(insights["cognitive_by_mood"]) == expected["by_mood"]
+    assert insights["alert_summary"]["total"] == expected["alert_total"]
+    assert insights["alert_summary"]["acknowledged_count"] == expected["acknowledged"]
+
+
+@pytest.mark.asyncio
+async def test_memory_insights_follow_writes_without_double_counting():
+    store = InMemoryDataStore()
+    conv = {
+        "id": "conv-new", "patient_id": PATIENT, "timestamp": "2099-01-01T00:00:00+00:00",
+        "detected_mood": "anxious",
+        "cognitive_metrics": {"vocabulary_diversity": 0.5, "topic_coherence": 0.6},
+    }
+    await store.save_conversation(conv)
+    await store.save_conversation({**conv, "detected_mood": "calm"})  # re-save replaces
+
+    alert_id = await store.save_alert({"patient_id": PATIENT, "severity": "high",
+                                       "alert_type": "fall", "timestamp": "2099-01-01"})
+    await store.update_alert(alert_id, {"acknowledged": True})
+
+    insights = await store.get_patient_insights(PATIENT)
+    assert "anxious" not in insights["cognitive_by_mood"]
+    assert insights["cognitive_by_mood"]["calm"]["conversation_count"] == 1
+    assert _strip_std(insights["cognitive_by_mood"]) == _scan_insights(store, PATIENT)["by_mood"]
+    assert insights["alert_summary"]["acknowledged_count"] == _scan_insights(store, PATIENT)["acknowledged"]
+
+
+@pytest.mark.asyncio
+async def test_memory_recompute_repairs_drift():
+    store = InMemoryDataStore()
+    expected = await store.get_patient_insights(PATIENT)
+    store.insights[PATIENT].state["alerts"]["total"] += 5  # simulate drift
+
+    repaired = await store.recompute_patient_insights(PATIENT)
+    assert repaired == expected
+
+
+def test_aggregates_stddev_from_sum_of_squares():
+    agg = InsightAggregates()
+    for i, vocab in enumerate([0.4, 0.6, 0.8]):
+        agg.add_conversation({"id": f"c-{i}", "detected_mood": "happy",
+                              "cognitive_metrics": {"vocabulary_diversity": vocab}})
+    stats = agg.summary()["cognitive_by_mood"]["happy"]
+    assert stats["avg_vocabulary"] == 0.6
+    assert stats["std_vocabulary"] == round(statistics.pstdev([0.4, 0.6, 0.8]), 3)
+
+
+@pytest.fixture
+def sanity_store():
+    store = SanityDataStore(project_id="test", dataset="test", token="fake")
+    store.mutations, store.queries = [], []
+    store.stored_doc = None
+
+    async def fake_mutate(mutations):
+        store.mutations.append(list(mutations))
+        return {}
+
+    async def fake_query(query, params=None):
+        store.queries.append(query)
+        if "insightAggregates" in str(params):
+            return {"result": store.stored_doc}
+        return {"result": []}
+
+    store._mutate = fake_mutate
+    store._query_groq = fake_query
+    return store
+
+
+@pytest.mark.asyncio
+async def test_sanity_insights_read_one_doc_when_complete(sanity_store):
+    agg = InsightAggregates()
+    agg.add_alert({"id": "a-1", "severity": "high", "alert_type": "fall"})
+    sanity_store.stored_doc = {"_rev": "r1", "complete": True, "state": agg.state}
+
+    insights = await sanity_store.get_patient_insights("p-1")
+
+    assert insights["alert_summary"]["by_severity"]["high"] == 1
+    assert len(sanity_store.queries) == 1
+    assert sanity_store.mutations == []
+
+
+@pytest.mark.asyncio
+async def test_sanity_aggregates_written_as_unguarded_increments(sanity_store):
+    async with sanity_store.batch():
+        await sanity_store.save_alert({"id": "a-1", "patient_id": "p-1", "severity": "low"})
+        await sanity_store.save_alert({"id": "a-2", "patient_id": "p-1", "severity": "high"})
+
+    ops = sanity_store.mutations[0]
+    patches = [op["patch"] for op in ops if op.get("patch", {}).get("id") == "insightAggregates-p-1"]
+    assert sum(p["inc"]["state.alerts.total"] for p in patches) == 2
+    assert all("ifRevisionID" not in p for p in patches)
+    assert not any("insightAggregates" in q for q in sanity_store.queries)  # never read on write
+
+
+@pytest.mark.asyncio
+async def test_sanity_acknowledgement_only_increments_acknowledged(sanity_store):
+    stored_alert = {"_id": "a-1", "patient": {"_ref": "p-1"}, "alertType": "fall",
+                    "severity": "high", "acknowledged": False}
+
+    async def fake_query(query, params=None):
+        return {"result": stored_alert if (params or {}).get("aid") == "a-1" else None}
+
+    sanity_store._query_groq = fake_query
+    assert await sanity_store.update_alert("a-1", {"acknowledged": True})
+
+    patch = sanity_store.mutations[0][-1]["patch"]
+    assert patch["inc"] == {"state.alerts.acknowledged": 1}
+    assert "ifRevisionID" not in patch
+
+
+def _paths(node: dict, prefix: str = "") -> set:
+    return {
+        path
+        for key, value in node.items()
+        for path in (_paths(value, f"{prefix}{key}.") if isinstance(value, dict) else {f"{prefix}{key}"})
+    }
+
+
+def test_aggregate_state_does_not_grow_with_records():
+    agg = InsightAggregates()
+    for i in range(200):
+        agg.add_conversation({"id": f"c-{i}", "detected_mood": "happy",
+                              "cognitive_metrics": {"vocabulary_diversity": 0.5, "topic_coherence": 0.7}})
+        agg.add_alert({"id": f"a-{i}", "severity": "low", "alert_type": "fall"})
+        if i == 0:
+            shape = _paths(agg.state)
+    assert _paths(agg.state) == shape
+    assert agg.summary()["alert_summary"]["total"] == 200
@@ -0,0 +1,85 @@
+"""
+Tests for write-time normalization, stamped-record read fast paths and the backfill.
+"""
+
+import pytest
+
+import backfill_normalization
+from app.storage.memory import InMemoryDataStore
+from app.storage.normalization import (
+    NORMALIZATION_VERSION,
+    normalize_alert,
+    normalize_conversation,
+    normalize_digest,
+)
+
+LEGACY_ALERT = {
+    "patient_id": "patient-dorothy-001",
+    "alert_type": "coherence_drop",
+    "severity": "medium",
+    "description": "Low topic coherence detected (0.24) in today's call",
+    "suggested_action": "Monitor",
+    "timestamp": "2026-01-01T10:00:00+00:00",
+    "acknowledged": False,
+}
+
+
+@pytest.mark.asyncio
+async def test_alert_is_normalized_and_stamped_on_write():
+    store = InMemoryDataStore()
+    alert_id = await store.save_alert(dict(LEGACY_ALERT))
+
+    stored = store.alerts[alert_id]
+    assert "0.24" not in stored["description"]
+    assert stored["suggested_action"] != "Monitor"
+    assert stored["normalization_version"] == NORMALIZATION_VERSION
+
+
+def test_stamped_records_skip_read_normalization():
+    alert = {**LEGACY_ALERT, "normalization_version": NORMALIZATION_VERSION}
+    digest = {"highlights": ["Overall sentiment: positive (score: 0.8)"], "normalization_version": NORMALIZATION_VERSION}
+
+    assert normalize_alert(alert) is alert
+    assert normalize_digest(digest) is digest
+    assert normalize_alert(LEGACY_ALERT) is not LEGACY_ALERT
+
+
+@pytest.mark.asyncio
+async def test_conversation_summary_cleaned_on_write_unless_empty():
+    store = InMemoryDataStore()
+    noisy = {
+        "patient_id": "patient-dorothy-001",
+        "timestamp": "2026-01-01T10:00:00+00:00",
+        "duration": 300,
+        "summary": "Summarizing the call, The patient talked about her roses.",
+    }
+    conv_id = await store.save_conversation(noisy)
+    stored = store.conversations[conv_id]
+    assert stored["summary"] == "She talked about her roses."
+    assert await normalize_conversation(stored, store) is stored
+
+    empty_id = await store.save_conversation({
+        "id": "conv-empty", "patient_id": "patient-dorothy-001",
+        "timestamp": "2026-01-02T10:00:00+00:00", "duration": 60, "summary": "",
+    })
+    assert "normalization_version" not in store.conversations[empty_id]
+
+
+@pytest.mark.asyncio
+async def test_backfill_stamps_legacy_records_and_resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(backfill_normalization, "CHECKPOINT_PATH", tmp_path / "checkpoint.json")
+    monkeypatch.setattr(backfill_normalization, "BATCH_SIZE", 1)
+    store = InMemoryDataStore()
+    store.alerts["alert-zzz"] = {**LEGACY_ALERT, "id": "alert-zzz"}
+    legacy = await store.list_unnormalized("alert")
+    assert len(legacy) >= 2
+
+    # Resume from a checkpoint: only records after it are rewritten
+    checkpoint = backfill_normalization.load_checkpoint(restart=False)
+    checkpoint["after"]["alert"] = legacy[0]["id"]
+    counts = await backfill_normalization.backfill_kind(store, "alert", checkpoint, dry_run=False)
+
+    assert counts["rewritten"] == len(legacy) - 1
+    assert [a["id"] for a in await store.list_unnormalized("alert")] == [legacy[0]["id"]]
+    assert "0.24" not in store.alerts["alert-zzz"]["description"]
+    assert backfill_normalization.load_checkpoint(restart=False)["after"]["alert"] == "alert-zzz"
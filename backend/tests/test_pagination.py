@@ -0,0 +1,95 @@
+"""
+Tests for keyset (cursor) pagination helpers and the Sanity cursor queries.
+"""
+
+import pytest
+
+from app.storage.pagination import (
+    ALERT_ORDER,
+    CONVERSATION_ORDER,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    groq_after,
+    keyset_page,
+    next_cursor,
+)
+from app.storage.sanity import SanityDataStore
+
+
+def _items():
+    return [
+        {"id": "c-1", "timestamp": "2025-01-01T10:00:00"},
+        {"id": "c-2", "timestamp": "2025-01-02T10:00:00"},
+        {"id": "c-3", "timestamp": "2025-01-02T10:00:00"},  # tie with c-2
+        {"id": "c-4", "timestamp": "2025-01-03T10:00:00"},
+    ]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor({"id": "c-3", "timestamp": "2025-01-02T10:00:00"}, CONVERSATION_ORDER)
+    assert decode_cursor(cursor, CONVERSATION_ORDER) == ["2025-01-02T10:00:00", "c-3"]
+
+
+def test_decode_rejects_garbage_and_wrong_list():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("%%%", CONVERSATION_ORDER)
+    conv_cursor = encode_cursor(_items()[0], CONVERSATION_ORDER)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(conv_cursor, ALERT_ORDER)
+
+
+def test_keyset_walk_breaks_timestamp_ties_by_id():
+    items, seen, cursor = _items(), [], None
+    while True:
+        page = keyset_page(items, CONVERSATION_ORDER, 1, cursor)
+        seen.extend(i["id"] for i in page)
+        cursor = next_cursor(page, 1, CONVERSATION_ORDER)
+        if not cursor:
+            break
+    assert seen == ["c-4", "c-3", "c-2", "c-1"]
+
+
+def test_alert_order_puts_unacknowledged_first():
+    alerts = [
+        {"id": "a-1", "timestamp": "2025-01-03", "acknowledged": True},
+        {"id": "a-2", "timestamp": "2025-01-01", "acknowledged": False},
+        {"id": "a-3", "timestamp": "2025-01-02"},
+    ]
+    page = keyset_page(alerts, ALERT_ORDER, 2)
+    assert [a["id"] for a in page] == ["a-3", "a-2"]
+    rest = keyset_page(alerts, ALERT_ORDER, 2, next_cursor(page, 2, ALERT_ORDER))
+    assert [a["id"] for a in rest] == ["a-1"]
+
+
+def test_groq_after_builds_lexicographic_filter():
+    cursor = encode_cursor({"id": "c-3", "timestamp": "2025-01-02"}, CONVERSATION_ORDER)
+    expr, params = groq_after(cursor, CONVERSATION_ORDER, {"timestamp": "timestamp", "id": "_id"})
+    assert expr == "(timestamp < $c0 || (timestamp == $c0 && _id < $c1))"
+    assert params == {"c0": "2025-01-02", "c1": "c-3"}
+
+
+@pytest.mark.asyncio
+async def test_sanity_cursor_query_starts_at_zero():
+    store = SanityDataStore(project_id="test", dataset="test", token="fake")
+    calls = []
+
+    async def fake_query(query, params=None):
+        calls.append((query, params))
+        return {"result": []}
+
+    store._query_groq = fake_query
+    cursor = encode_cursor({"id": "c-3", "timestamp": "2025-01-02"}, CONVERSATION_ORDER)
+    await store.get_conversations("patient-1", limit=5, offset=40, cursor=cursor)
+
+    query, params = calls[0]
+    assert "_id < $c1" in query
+    assert "[0...5] {" in query
+    assert params["c1"] == "c-3"
+
+
+@pytest.mark.asyncio
+async def test_sanity_invalid_cursor_raises():
+    store = SanityDataStore(project_id="test", dataset="test", token="fake")
+    with pytest.raises(InvalidCursorError):
+        await store.get_alerts("patient-1", cursor="bogus")
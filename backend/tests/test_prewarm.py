@@ -0,0 +1,137 @@
+"""
+Tests for the Deepgram agent pre-warm pool (claim by CallSid/patient, expiry, cancel, warm start).
+"""
+
+import asyncio
+import importlib
+import json
+
+import pytest
+
+from app.voice.agent import DeepgramVoiceAgent, session_manager
+from app.voice.prewarm import PrewarmPool
+from app.voice.twilio_bridge import TwilioCallSession
+
+# The package re-exports the bridge *instance* under the module's name
+bridge_module = importlib.import_module("app.voice.twilio_bridge")
+
+
+class _FakeAgent:
+    """Connects after a delay and 'greets' before any callbacks are attached."""
+
+    def __init__(self, patient_id, connect_delay=0.0, connect_ok=True):
+        self.patient_id = patient_id
+        self.connect_delay = connect_delay
+        self.connect_ok = connect_ok
+        self.is_connected = False
+        self.keepalives = 0
+        self.closed = False
+        self.on_audio_output = None
+        self.on_transcript = None
+        self._early_audio = []
+        self._early_transcripts = []
+
+    async def connect(self):
+        await asyncio.sleep(self.connect_delay)
+        self.is_connected = self.connect_ok
+        if self.connect_ok:
+            self._early_transcripts.append(("Clara", "Good morning!"))
+            self._early_audio.append(b"\x01" * 160)
+        return self.connect_ok
+
+    async def send_keepalive(self):
+        self.keepalives += 1
+
+    async def close(self):
+        self.closed = True
+        self.is_connected = False
+
+    set_callbacks = DeepgramVoiceAgent.set_callbacks
+    flush_early_output = DeepgramVoiceAgent.flush_early_output
+
+
+def _pool(monkeypatch, ttl=60.0, keepalive=5.0, **agent_kwargs):
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "test-key")
+    pool = PrewarmPool(ttl=ttl, keepalive_interval=keepalive)
+    pool._create_agent = lambda patient_id: _FakeAgent(patient_id, **agent_kwargs)
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_claim_by_call_sid_waits_for_connect(monkeypatch):
+    pool = _pool(monkeypatch, connect_delay=0.05)
+    assert pool.prewarm("patient-1")
+    pool.bind("patient-1", "CA1")
+
+    agent = await pool.claim("CA1", "other-patient")
+    assert agent is not None and agent.is_connected
+    assert pool.metrics()["claimed"] == 1
+    assert pool.metrics()["warming"] == 0
+    assert await pool.claim("CA1", "patient-1") is None
+    await asyncio.sleep(0.01)
+    assert not agent.closed
+
+
+@pytest.mark.asyncio
+async def test_unclaimed_agent_keeps_alive_then_expires(monkeypatch):
+    pool = _pool(monkeypatch, ttl=0.2, keepalive=0.05)
+    pool.prewarm("patient-1", "CA1")
+    await asyncio.sleep(0.01)
+    agent = pool._by_call["CA1"].agent
+
+    await asyncio.sleep(0.3)
+    assert agent.keepalives >= 2
+    assert agent.closed
+    assert pool.metrics()["expired"] == 1
+    assert await pool.claim("CA1", "patient-1") is None
+
+
+@pytest.mark.asyncio
+async def test_cancel_and_failed_connect_fall_back_to_cold(monkeypatch):
+    pool = _pool(monkeypatch, connect_delay=1.0)
+    pool.prewarm("patient-1")
+    await pool.cancel("patient-1")
+    assert pool.metrics()["cancelled"] == 1
+    assert await pool.claim("CA1", "patient-1") is None
+
+    failing = _pool(monkeypatch, connect_ok=False)
+    failing.prewarm("patient-2")
+    assert await failing.claim("CA2", "patient-2") is None
+    assert failing.metrics()["failed"] == 1
+
+    monkeypatch.delenv("DEEPGRAM_API_KEY")
+    assert not failing.prewarm("patient-3")
+
+
+class _FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+@pytest.mark.asyncio
+async def test_warm_session_flushes_greeting_and_records_time(monkeypatch):
+    pool = _pool(monkeypatch)
+    monkeypatch.setattr(bridge_module, "prewarm_pool", pool)
+    pool.prewarm("patient-1", "CA1")
+    await asyncio.sleep(0.01)
+
+    ws = _FakeWebSocket()
+    session = TwilioCallSession(ws, "patient-1", "CA1")
+    session.twilio_stream.stream_sid = "MZ1"
+    try:
+        assert await session.start()
+        assert session_manager.get_session("CA1") is session.deepgram_agent
+        await asyncio.sleep(0.05)
+        assert not session.deepgram_agent.closed
+        assert [json.loads(t)["streamSid"] for t in ws.sent] == ["MZ1"]
+        assert session.conversation_transcript[0]["text"] == "Good morning!"
+        assert session.time_to_greeting_ms is not None
+        assert pool.metrics()["time_to_greeting"]["warm"]["count"] == 1
+    finally:
+        session.is_active = False
+        await session._outbound_relay.close(drain_timeout=0)
+        await session._inbound_relay.close(drain_timeout=0)
+        session_manager.sessions.pop("CA1", None)
@@ -0,0 +1,83 @@
+"""
+Tests for the per-patient prompt cache and the pre-serialized Settings template.
+"""
+
+import json
+
+import pytest
+
+from app.storage import InMemoryDataStore
+from app.voice.persona import get_full_prompt, get_personalized_greeting
+from app.voice.prompt_cache import PromptCache, build_settings, settings_template, prompt_cache
+
+PATIENT_ID = "patient-dorothy-001"
+
+
+class _CountingStore(InMemoryDataStore):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    async def get_patient(self, patient_id):
+        self.reads += 1
+        return await super().get_patient(patient_id)
+
+    async def get_conversations(self, *args, **kwargs):
+        self.reads += 1
+        return await super().get_conversations(*args, **kwargs)
+
+
+def test_settings_template_matches_full_serialization():
+    prompt = 'Line one\n"quoted" — ünïcode'
+    greeting = "Hi Dot, it's Clara!"
+    assert json.loads(settings_template.render(prompt, greeting)) == build_settings(prompt, greeting)
+
+
+@pytest.mark.asyncio
+async def test_repeat_call_does_no_store_reads():
+    store = _CountingStore()
+    cache = PromptCache()
+    patient = await store.get_patient(PATIENT_ID)
+    store.reads = 0
+
+    first = await cache.get(PATIENT_ID, store)
+    assert store.reads == 2
+    assert first["prompt"] == get_full_prompt(patient, await InMemoryDataStore.get_conversations(store, PATIENT_ID, limit=3))
+    assert first["greeting"] == get_personalized_greeting(patient)
+
+    store.reads = 0
+    assert await cache.get(PATIENT_ID, store) is first
+    assert store.reads == 0
+    assert cache.metrics()["hit_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_store_writes_invalidate_global_cache():
+    store = InMemoryDataStore()
+    prompt_cache.clear()
+    before = await prompt_cache.get(PATIENT_ID, store)
+
+    await store.update_patient(PATIENT_ID, {"preferred_name": "Dottie"})
+    after = await prompt_cache.get(PATIENT_ID, store)
+    assert after is not before
+    assert "Hi Dottie" in after["greeting"]
+
+    async with store.batch():
+        conv_id = await store.save_conversation({
+            "patient_id": PATIENT_ID, "timestamp": "2099-01-01T00:00:00Z",
+            "transcript": "Clara: Hi", "summary": "chat", "duration": 60,
+        })
+        # Not committed yet — the entry stays
+        assert await prompt_cache.get(PATIENT_ID, store) is after
+    latest = await prompt_cache.get(PATIENT_ID, store)
+    assert latest is not after
+    assert latest["key"][1] == conv_id
+
+
+@pytest.mark.asyncio
+async def test_missing_patient_is_not_cached():
+    cache = PromptCache()
+    entry = await cache.get("nobody", InMemoryDataStore())
+    assert entry["key"] == (None, None)
+    assert "Hi there" in entry["greeting"]
+    assert cache.metrics()["entries"] == 0
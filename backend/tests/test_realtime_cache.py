@@ -0,0 +1,88 @@
+"""
+Tests for the search_realtime query cache.
+"""
+
+import asyncio
+
+import pytest
+
+from app.nostalgia import YouComClient
+from app.nostalgia.realtime_cache import RealtimeQueryCache, classify_query, normalize_query
+
+
+def test_equivalent_phrasings_share_a_key():
+    assert normalize_query("What's the weather today?") == normalize_query("Clara, what is the weather like today")
+    assert normalize_query("Did the Cubs win?") != normalize_query("Did the Sox win?")
+
+
+def test_categories_have_their_own_ttl():
+    assert classify_query(normalize_query("did the cubs win last night"))[0] == "sports"
+    assert classify_query(normalize_query("what's the weather today"))[0] == "weather"
+    assert classify_query(normalize_query("any news this morning"))[0] == "news"
+    category, ttl = classify_query(normalize_query("how do I make banana bread"))
+    assert category == "general"
+    assert ttl > classify_query("weather")[1]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_make_one_upstream_request():
+    cache = RealtimeQueryCache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return {"answer": "Sunny and 70"}
+
+    questions = ["What's the weather today?", "what is the weather today", "Weather today, please"]
+    results = await asyncio.gather(*[cache.get_or_fetch(q, fetch) for q in questions * 3])
+    assert calls == 1
+    assert all(r["answer"] == "Sunny and 70" for r in results)
+
+    await cache.get_or_fetch("WHAT'S THE WEATHER TODAY", fetch)
+    metrics = cache.metrics()
+    assert calls == 1
+    assert metrics["upstream"] == 1 and metrics["shared"] == 8 and metrics["hits"] == 1
+    assert metrics["by_category"]["weather"]["hit_ratio"] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_hung_up_caller_does_not_cancel_the_shared_request():
+    cache = RealtimeQueryCache()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return {"answer": "Sunny and 70"}
+
+    leader = asyncio.create_task(cache.get_or_fetch("what's the weather today", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get_or_fetch("what is the weather today", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert (await follower)["answer"] == "Sunny and 70"
+    assert leader.cancelled()
+    assert cache.get(normalize_query("weather today")) == {"answer": "Sunny and 70"}
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_refetched():
+    cache = RealtimeQueryCache()
+    cache.put(normalize_query("latest news"), {"answer": "old"}, ttl=-1)
+
+    async def fetch():
+        return {"answer": "new"}
+
+    assert (await cache.get_or_fetch("latest news", fetch))["answer"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_fallback_answers_are_not_cached(monkeypatch):
+    monkeypatch.delenv("YOUCOM_API_KEY", raising=False)
+    cache = RealtimeQueryCache()
+    client = YouComClient(query_cache=cache)
+
+    result = await client.search_realtime("what's the weather today")
+    assert "_note" in result
+    assert cache.metrics()["entries"] == 0
@@ -0,0 +1,170 @@
+"""
+Tests for the resilience layer: circuit breakers, deadlines, hedged reads and fallbacks.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app import resilience
+from app.resilience import (
+    BreakerOpenError,
+    CircuitBreaker,
+    breaker_states,
+    deadline,
+    get_breaker,
+    guarded,
+    remaining,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    resilience.reset_breakers()
+    yield
+    resilience.reset_breakers()
+
+
+async def _fail():
+    raise httpx.ConnectError("down")
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_short_circuits_to_fallback():
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await _fail()
+
+    for _ in range(3):
+        assert await guarded("youcom", failing, fallback=lambda: "local") == "local"
+    assert get_breaker("youcom").state == CircuitBreaker.OPEN
+
+    assert await guarded("youcom", failing, fallback=lambda: "local") == "local"
+    assert len(calls) == 3  # fourth call never reached the upstream
+    assert get_breaker("youcom").stats["short_circuits"] == 1
+
+    with pytest.raises(BreakerOpenError):
+        await guarded("youcom", failing)
+
+
+def test_half_open_probe_closes_or_reopens(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("x", failure_threshold=1, reset_timeout=10.0)
+
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] += 10.0
+    assert breaker.allow()          # the single probe
+    assert not breaker.allow()      # others still short-circuit
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] += 10.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_probe_frees_the_probe_slot(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = get_breaker("youcom")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    now[0] += breaker.reset_timeout
+
+    started = asyncio.Event()
+
+    async def hanging():
+        started.set()
+        await asyncio.sleep(3600)
+
+    probe = asyncio.create_task(guarded("youcom", hanging, fallback=lambda: "local"))
+    await started.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    async def healthy():
+        return "live"
+
+    assert await guarded("youcom", healthy, fallback=lambda: "local") == "live"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_breaker():
+    request = httpx.Request("GET", "https://example.test")
+
+    async def not_found():
+        raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+
+    for _ in range(5):
+        with pytest.raises(httpx.HTTPStatusError):
+            await guarded("sanity", not_found)
+    assert get_breaker("sanity").state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_deadline_caps_call_timeout():
+    async def slow():
+        await asyncio.sleep(5)
+        return "late"
+
+    with deadline(0.05):
+        assert 0 < remaining() <= 0.05
+        with deadline(10):  # nested budgets never extend the outer one
+            assert remaining() <= 0.05
+        result = await guarded("gemini", slow, timeout=30.0, fallback=lambda: "fallback")
+    assert result == "fallback"
+    assert get_breaker("gemini").stats["timeouts"] == 1
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_upstream_timeout_without_budget_uses_fallback():
+    async def times_out():
+        raise asyncio.TimeoutError()
+
+    assert await guarded("gemini", times_out, fallback=lambda: "fallback") == "fallback"
+    assert get_breaker("gemini").stats["timeouts"] == 1
+    with pytest.raises(asyncio.TimeoutError):
+        await guarded("gemini", times_out)
+
+
+@pytest.mark.asyncio
+async def test_spent_budget_skips_call():
+    called = []
+
+    async def upstream():
+        called.append(1)
+        return "remote"
+
+    with deadline(0):
+        assert await guarded("deepgram", upstream, fallback=lambda: {}) == {}
+    assert called == []
+
+
+@pytest.mark.asyncio
+async def test_hedged_read_returns_first_success(monkeypatch):
+    monkeypatch.setitem(resilience.BREAKERS, "youcom", {**resilience.BREAKERS["youcom"], "hedge_after": 0.01})
+    delays = [1.0, 0.0]
+
+    async def read():
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return f"after {delay}"
+
+    assert await guarded("youcom", read, idempotent=True) == "after 0.0"
+    assert get_breaker("youcom").stats["hedges"] == 1
+
+
+def test_breaker_states_lists_configured_upstreams():
+    states = breaker_states()
+    assert set(resilience.BREAKERS) <= set(states)
+    assert states["sanity"]["state"] == "closed"
@@ -0,0 +1,83 @@
+"""
+Parity tests for Sanity GROQ aggregation pushdown.
+
+A fixture stand-in replaces the Sanity query API: it checks the store
+sends exactly the expected query and replays the expected response.
+The same documents are then run through the Python reference
+implementation, and both results must match.
+
+The responses in fixtures/sanity_analytics.json are hand-written (what
+the GROQ queries should return over its documents), not captured from a
+live dataset, so these tests pin the query text and the response
+handling but do not prove the GROQ itself evaluates as written.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.storage.analytics import summarize
+from app.storage.sanity import SanityDataStore
+
+FIXTURE = json.loads((Path(__file__).parent / "fixtures" / "sanity_analytics.json").read_text())
+
+
+def _recording(name: str) -> dict:
+    return next(r for r in FIXTURE["recordings"] if r["name"] == name)
+
+
+def _normalize(query: str) -> str:
+    return " ".join(query.split())
+
+
+class RecordedSanity:
+    """Stand-in for SanityDataStore._query_groq that replays one canned response."""
+
+    def __init__(self, recording: dict):
+        self.recording = recording
+        self.calls = 0
+
+    async def __call__(self, query: str, params: dict | None = None) -> dict:
+        self.calls += 1
+        assert _normalize(query) == _normalize(self.recording["query"]), \
+            "Query changed — update the hand-written response in tests/fixtures/sanity_analytics.json"
+        assert params["pid"] == self.recording["params"]["pid"]
+        return self.recording["response"]
+
+
+@pytest.fixture
+def store():
+    return SanityDataStore(project_id="test", dataset="test", token="fake")
+
+
+def _python_summary(store: SanityDataStore, recording: dict) -> dict:
+    docs = FIXTURE["documents"]
+    conversations = [store._map_conversation(d) for d in docs["conversations"]]
+    alerts = [store._map_alert(d) for d in docs["alerts"]]
+    return summarize(conversations, alerts, recording["cutoff"], recording["days"])
+
+
+@pytest.mark.parametrize("name", ["analytics_summary", "analytics_summary_empty_period"])
+@pytest.mark.asyncio
+async def test_analytics_summary_matches_python(store, name):
+    recording = _recording(name)
+    stand_in = RecordedSanity(recording)
+    store._query_groq = stand_in
+
+    pushed_down = await store.get_analytics_summary(recording["params"]["pid"], days=recording["days"])
+
+    assert stand_in.calls == 1, "Summary should be a single round trip"
+    assert pushed_down == _python_summary(store, recording)
+
+
+@pytest.mark.asyncio
+async def test_memory_store_uses_same_reference_implementation():
+    from app.storage.memory import InMemoryDataStore
+
+    memory = InMemoryDataStore()
+    summary = await memory.get_analytics_summary("patient-dorothy-001", days=30)
+    assert summary["conversation_count"] == len([
+        c for c in memory.conversations.values() if c.get("cognitive_metrics")
+    ])
+    assert set(summary["alerts"]["by_severity"]) == {"low", "medium", "high"}
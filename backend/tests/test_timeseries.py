@@ -0,0 +1,134 @@
+"""
+Tests for the materialized per-patient cognitive time series.
+"""
+
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from app.cognitive.utils import calculate_cognitive_score
+from app.storage.memory import InMemoryDataStore
+from app.storage.sanity import SanityDataStore
+from app.storage.timeseries import CognitiveTimeSeries
+
+
+METRICS = {"vocabulary_diversity": 0.6, "topic_coherence": 0.8, "repetition_rate": 0.05, "word_finding_pauses": 2}
+
+
+def _ago(days: float) -> str:
+    return (datetime.now(UTC) - timedelta(days=days)).isoformat()
+
+
+def test_series_keeps_points_sorted_and_replaces_by_id():
+    series = CognitiveTimeSeries()
+    series.add("c-2", "2025-01-02T00:00:00+00:00", METRICS)
+    series.add("c-3", "2025-01-03T00:00:00+00:00", METRICS)
+    series.add("c-1", "2025-01-01T00:00:00", METRICS)  # naive → UTC, inserted in order
+    series.add("c-2", "2025-01-04T00:00:00+00:00", {**METRICS, "topic_coherence": 0.4})
+
+    assert series.ids == ["c-1", "c-3", "c-2"]
+    assert series.columns["topic_coherence"] == [0.8, 0.8, 0.4]
+    assert series.scores[0] == calculate_cognitive_score(METRICS)
+
+
+def test_series_window_is_inclusive_slice():
+    series = CognitiveTimeSeries()
+    for i, day in enumerate(["2025-01-01", "2025-01-05", "2025-01-10"]):
+        series.add(f"c-{i}", f"{day}T12:00:00+00:00", METRICS)
+
+    window = series.window("2025-01-05T12:00:00+00:00")
+    assert [p["date"] for p in window] == ["2025-01-05", "2025-01-10"]
+    assert window[0]["cognitive_score"] == calculate_cognitive_score(METRICS)
+
+
+def test_series_round_trips_through_points():
+    series = CognitiveTimeSeries()
+    series.add("c-1", "2025-01-01T00:00:00+00:00", METRICS)
+    series.add("c-2", "2025-01-02T00:00:00+00:00", METRICS)
+    restored = CognitiveTimeSeries.from_points(list(reversed(series.to_points())))
+    assert restored.ids == series.ids
+    assert restored.scores == series.scores
+
+
+@pytest.mark.asyncio
+async def test_memory_trends_follow_saved_conversations():
+    store = InMemoryDataStore()
+    patient_id = "patient-dorothy-001"
+    before = await store.get_cognitive_trends(patient_id, days=30)
+
+    await store.save_conversation({
+        "id": "conv-series", "patient_id": patient_id, "timestamp": _ago(0),
+        "cognitive_metrics": METRICS,
+    })
+    after = await store.get_cognitive_trends(patient_id, days=30)
+
+    assert len(after) == len(before) + 1
+    assert after[-1]["cognitive_score"] == calculate_cognitive_score(METRICS)
+    assert await store.get_cognitive_trends("patient-nobody", days=30) == []
+
+
+@pytest.fixture
+def sanity_store():
+    store = SanityDataStore(project_id="test", dataset="test", token="fake")
+    store.mutations, store.queries = [], []
+
+    async def fake_mutate(mutations):
+        store.mutations.append(list(mutations))
+        return {}
+
+    async def fake_query(query, params=None):
+        return {"result": None}
+
+    store._mutate = fake_mutate
+    store._query_groq = fake_query
+    return store
+
+
+@pytest.mark.asyncio
+async def test_sanity_save_conversation_appends_series_point(sanity_store):
+    await sanity_store.save_conversation({
+        "id": "conv-1", "patient_id": "p-1", "timestamp": _ago(0), "cognitive_metrics": METRICS,
+    })
+    ops = sanity_store.mutations[0]
+    assert "createOrReplace" in ops[0]
+    assert ops[1]["createIfNotExists"]["_id"] == "cognitiveSeries-p-1"
+    inserted = ops[3]["patch"]["insert"]["items"][0]
+    assert inserted["_key"] == "conv-1"
+    assert inserted["cognitive_score"] == calculate_cognitive_score(METRICS)
+
+
+@pytest.mark.asyncio
+async def test_sanity_trends_read_series_doc_without_scanning_conversations(sanity_store):
+    series = CognitiveTimeSeries()
+    series.add("conv-1", _ago(1), METRICS)
+
+    async def fake_query(query, params=None):
+        sanity_store.queries.append(query)
+        return {"result": {"_rev": "r1", "complete": True, "points": series.to_points()}}
+
+    sanity_store._query_groq = fake_query
+    trends = await sanity_store.get_cognitive_trends("p-1", days=30)
+
+    assert len(trends) == 1
+    assert len(sanity_store.queries) == 1
+    assert "conversation" not in sanity_store.queries[0]
+    assert sanity_store.mutations == []
+
+
+@pytest.mark.asyncio
+async def test_sanity_trends_backfill_missing_series(sanity_store):
+    async def fake_query(query, params=None):
+        if "_type == \"conversation\"" in query:
+            return {"result": [{
+                "_id": "conv-old", "timestamp": _ago(2),
+                "cognitiveMetrics": {"vocabularyDiversity": 0.6, "topicCoherence": 0.8},
+            }]}
+        return {"result": None}
+
+    sanity_store._query_groq = fake_query
+    trends = await sanity_store.get_cognitive_trends("p-1", days=30)
+
+    assert [t["vocabulary_diversity"] for t in trends] == [0.6]
+    created = sanity_store.mutations[0][0]["create"]
+    assert created["complete"] is True
+    assert created["points"][0]["_key"] == "conv-old"
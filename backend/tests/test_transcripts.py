@@ -0,0 +1,129 @@
+"""
+Tests for transcript blob storage: compression round trip, metadata-only
+list reads and lazy transcript loading on both stores.
+"""
+
+import pytest
+
+from app.storage.memory import InMemoryDataStore
+from app.storage.sanity import SanityDataStore
+from app.storage.transcripts import (
+    ENCODING,
+    compress_transcript,
+    decompress_transcript,
+    split_transcript,
+)
+
+
+PATIENT = "patient-dorothy-001"
+TRANSCRIPT = "Clara: Good morning, Dorothy!\nDorothy: Morning! The roses are blooming. 🌹\n" * 20
+
+
+def test_compress_round_trip_and_shrinks():
+    data = compress_transcript(TRANSCRIPT)
+    assert isinstance(data, str)
+    assert len(data) < len(TRANSCRIPT.encode("utf-8"))
+    assert decompress_transcript(data) == TRANSCRIPT
+    assert decompress_transcript(None) is None
+
+
+def test_decompress_rejects_unknown_encoding():
+    with pytest.raises(ValueError):
+        decompress_transcript(compress_transcript("hi"), encoding="zstd")
+
+
+def test_split_transcript_keeps_ref_and_size():
+    metadata, transcript = split_transcript({"id": "conv-1", "transcript": "héllo"})
+    assert transcript == "héllo"
+    assert "transcript" not in metadata
+    assert metadata["transcript_ref"] == "transcript-conv-1"
+    assert metadata["transcript_size"] == 6
+
+
+# ---------------------------------------------------------------------------
+# InMemoryDataStore
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_memory_list_omits_transcript_detail_loads_it():
+    store = InMemoryDataStore()
+    await store.save_conversation({
+        "id": "conv-blob",
+        "patient_id": PATIENT,
+        "timestamp": "2099-01-01T00:00:00+00:00",
+        "transcript": TRANSCRIPT,
+    })
+
+    listed = await store.get_conversations(PATIENT, limit=50)
+    assert listed and all("transcript" not in c for c in listed)
+    assert listed[0]["transcript_size"] == len(TRANSCRIPT.encode("utf-8"))
+
+    detail = await store.get_conversation("conv-blob")
+    assert detail["transcript"] == TRANSCRIPT
+
+    transcripts = await store.get_transcripts(["conv-blob", "missing"])
+    assert transcripts == {"conv-blob": TRANSCRIPT}
+
+
+# ---------------------------------------------------------------------------
+# SanityDataStore
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def sanity_store():
+    store = SanityDataStore(project_id="test", dataset="test", token="fake")
+    store.mutations = []
+    store.queries = []
+
+    async def fake_mutate(mutations):
+        store.mutations.append(list(mutations))
+        return {"transactionId": "tx"}
+
+    async def fake_query(query, params=None):
+        store.queries.append(query)
+        return {"result": None}
+
+    store._mutate = fake_mutate
+    store._query_groq = fake_query
+    return store
+
+
+@pytest.mark.asyncio
+async def test_sanity_save_writes_blob_and_reference(sanity_store):
+    await sanity_store.save_conversation({
+        "id": "conv-1", "patient_id": PATIENT, "transcript": TRANSCRIPT,
+    })
+
+    docs = [m["createOrReplace"] for m in sanity_store.mutations[0] if "createOrReplace" in m]
+    blob = next(d for d in docs if d["_type"] == "conversationTranscript")
+    conv = next(d for d in docs if d["_type"] == "conversation")
+
+    assert "transcript" not in conv
+    assert conv["transcriptRef"]["_ref"] == blob["_id"] == "transcript-conv-1"
+    assert conv["transcriptSize"] == len(TRANSCRIPT.encode("utf-8"))
+    assert blob["encoding"] == ENCODING
+    assert decompress_transcript(blob["data"]) == TRANSCRIPT
+
+
+@pytest.mark.asyncio
+async def test_sanity_list_query_projects_out_transcript(sanity_store):
+    await sanity_store.get_conversations(PATIENT, limit=5)
+    query = sanity_store.queries[-1]
+    projection = query.rsplit("{", 1)[1]
+    assert "transcriptRef" in projection
+    assert "transcript," not in projection and "..." not in projection
+
+
+def test_sanity_resolve_transcript_prefers_blob_then_legacy(sanity_store):
+    blob = {"data": compress_transcript("from blob"), "encoding": ENCODING}
+    assert sanity_store._resolve_transcript({"transcriptBlob": blob, "transcript": "old"}) == "from blob"
+    assert sanity_store._resolve_transcript({"transcriptBlob": None, "transcript": "old"}) == "old"
+    mapped = sanity_store._map_conversation({
+        "_id": "c1", "patient": {"_ref": "p1"},
+        "transcriptRef": {"_ref": "transcript-c1"}, "transcriptSize": 9,
+    })
+    assert mapped["transcript_ref"] == "transcript-c1"
+    assert mapped["transcript_size"] == 9
+    assert "transcript" not in mapped
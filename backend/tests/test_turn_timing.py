@@ -0,0 +1,42 @@
+"""
+Tests for per-call turn timing (response latency and pause extraction).
+"""
+
+from app.voice.turn_timing import TurnTimeline
+
+
+def _timeline(*events):
+    timeline = TurnTimeline()
+    for event, at in events:
+        timeline.record(event, at)
+    return timeline
+
+
+def test_response_latency_from_agent_stop_to_user_start():
+    timeline = _timeline(
+        ("AgentStoppedSpeaking", 10.0),
+        ("UserStartedSpeaking", 11.5),
+        ("UserStoppedSpeaking", 14.0),
+        ("AgentStoppedSpeaking", 20.0),
+        ("UserStartedSpeaking", 22.25),
+    )
+    assert timeline.response_latencies() == [1.5, 2.25]
+    assert timeline.pause_durations() == []
+
+
+def test_mid_turn_pauses_and_ignored_gaps():
+    timeline = _timeline(
+        ("UserStartedSpeaking", 1.0),            # barge-in before any agent stop: no latency
+        ("UserStoppedSpeaking", 3.0),
+        ("UserStartedSpeaking", 4.2),            # pause inside the patient's turn
+        ("UserStoppedSpeaking", 6.0),
+        ("AgentStoppedSpeaking", 9.0),
+        ("UserStartedSpeaking", 60.0),           # walked away: too long to count
+        ("AgentAudioDone", 61.0),                # not a timing event
+    )
+    assert timeline.response_latencies() == []
+    assert timeline.pause_durations() == [1.2]
+    assert len(timeline) == 6
+    summary = timeline.summary()
+    assert summary["responses"] == 0 and summary["avg_response_sec"] is None
+    assert summary["avg_pause_sec"] == 1.2
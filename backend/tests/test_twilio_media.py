@@ -0,0 +1,90 @@
+"""
+Tests for the Twilio media fast path (raw-frame parsing and outbound templates).
+"""
+
+import base64
+import json
+
+import pytest
+
+from app.voice.media_codec import OutboundMediaTemplate, extract_media_payload, parse_message
+from app.voice.twilio_bridge import TwilioAudioStream, TwilioCallSession
+
+AUDIO = bytes(range(160))
+PAYLOAD = base64.b64encode(AUDIO).decode()
+
+
+def _media_frame(payload: str = PAYLOAD) -> str:
+    return json.dumps({
+        "event": "media",
+        "sequenceNumber": "4",
+        "media": {"track": "inbound", "chunk": "2", "timestamp": "40", "payload": payload},
+        "streamSid": "MZ123",
+    }, separators=(",", ":"))
+
+
+def test_extract_payload_from_compact_media_frame():
+    assert extract_media_payload(_media_frame()) == AUDIO
+    assert extract_media_payload(_media_frame("")) == b""
+
+
+def test_non_media_or_unexpected_layout_falls_back():
+    assert extract_media_payload('{"event":"stop","streamSid":"MZ123"}') is None
+    # Pretty-printed frames still parse, just not on the fast path
+    pretty = json.dumps(json.loads(_media_frame()))
+    assert extract_media_payload(pretty) is None
+    assert parse_message(pretty)["media"]["payload"] == PAYLOAD
+
+
+def test_outbound_template_matches_dict_message():
+    rendered = OutboundMediaTemplate('MZ"odd').render(AUDIO)
+    assert json.loads(rendered) == {
+        "event": "media",
+        "streamSid": 'MZ"odd',
+        "media": {"payload": PAYLOAD},
+    }
+
+
+class _FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+class _FakeAgent:
+    def __init__(self):
+        self.audio = []
+
+    async def send_audio(self, data):
+        self.audio.append(data)
+
+
+@pytest.mark.asyncio
+async def test_audio_stream_sends_template_text():
+    ws = _FakeWebSocket()
+    stream = TwilioAudioStream(ws)
+    stream.stream_sid = "MZ1"
+    await stream.send_audio(AUDIO)
+    stream.stream_sid = "MZ2"
+    await stream.send_audio(AUDIO)
+    assert [json.loads(t)["streamSid"] for t in ws.sent] == ["MZ1", "MZ2"]
+
+
+@pytest.mark.asyncio
+async def test_session_frame_fast_path_and_dispatch():
+    session = TwilioCallSession(_FakeWebSocket(), "patient-1", "CA1")
+    session.deepgram_agent = _FakeAgent()
+    session.is_active = True
+    session._inbound_relay.start()
+
+    await session.handle_twilio_frame(_media_frame())
+    await session.handle_twilio_frame(_media_frame(""))
+    await session._inbound_relay.close()
+    assert session.deepgram_agent.audio == [AUDIO]
+
+    await session.handle_twilio_frame(
+        '{"event":"start","start":{"streamSid":"MZ9","callSid":"CA1"}}'
+    )
+    assert session.twilio_stream.stream_sid == "MZ9"
@@ -0,0 +1,145 @@
+"""
+Tests for unit-of-work batching on InMemoryDataStore and SanityDataStore.
+Sanity HTTP calls are replaced with in-process fakes (no network).
+"""
+
+import pytest
+
+from app.storage.memory import InMemoryDataStore
+from app.storage.sanity import SanityDataStore
+from app.storage.unit_of_work import RevisionConflictError
+
+
+PATIENT = "patient-dorothy-001"
+
+
+def _conversation(conv_id: str, timestamp: str = "2099-01-01T00:00:00+00:00") -> dict:
+    return {
+        "id": conv_id,
+        "patient_id": PATIENT,
+        "timestamp": timestamp,
+        "duration": 60,
+        "summary": "Chat",
+        "detected_mood": "happy",
+        "transcript": "Clara: Hi\nDorothy: Hello",
+        "cognitive_metrics": {"vocabulary_diversity": 0.6, "topic_coherence": 0.8},
+    }
+
+
+# ---------------------------------------------------------------------------
+# InMemoryDataStore
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_memory_batch_defers_writes_until_exit():
+    store = InMemoryDataStore()
+    async with store.batch():
+        await store.save_conversation(_conversation("conv-batch"))
+        await store.save_alert({"id": "alert-batch", "patient_id": PATIENT, "severity": "low",
+                                "timestamp": "2099-01-01T00:00:00+00:00"})
+        assert "conv-batch" not in store.conversations
+        assert "alert-batch" not in store.alerts
+
+    assert "conv-batch" in store.conversations
+    assert "alert-batch" in store.alerts
+
+
+@pytest.mark.asyncio
+async def test_memory_batch_reads_its_own_conversations():
+    store = InMemoryDataStore()
+    async with store.batch():
+        await store.save_conversation(_conversation("conv-batch"))
+        recent = await store.get_conversations(PATIENT, limit=3)
+        assert recent[0]["id"] == "conv-batch"
+        assert len(recent) == 3
+
+
+@pytest.mark.asyncio
+async def test_memory_batch_discarded_on_error():
+    store = InMemoryDataStore()
+    with pytest.raises(ValueError):
+        async with store.batch():
+            await store.save_conversation(_conversation("conv-discard"))
+            raise ValueError("boom")
+
+    assert "conv-discard" not in store.conversations
+
+
+@pytest.mark.asyncio
+async def test_memory_batch_revision_conflict_aborts_everything():
+    store = InMemoryDataStore()
+    with pytest.raises(RevisionConflictError):
+        async with store.batch():
+            baseline = await store.get_cognitive_baseline(PATIENT)
+            await store.save_conversation(_conversation("conv-conflict"))
+            await store.save_cognitive_baseline(PATIENT, {**baseline, "conversation_count": 99})
+            # A concurrent writer (outside this batch) updates the baseline
+            store._revisions[f"baseline-{PATIENT}"] = 42
+
+    assert "conv-conflict" not in store.conversations
+    assert store.baselines[PATIENT]["conversation_count"] == 7
+
+
+# ---------------------------------------------------------------------------
+# SanityDataStore
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def sanity_store():
+    store = SanityDataStore(project_id="test", dataset="test", token="fake")
+    store.mutations = []
+
+    async def fake_mutate(mutations):
+        store.mutations.append(list(mutations))
+        return {"transactionId": "tx"}
+
+    async def fake_query(query, params=None):
+        if "cognitiveBaseline" in query:
+            return {"result": {"_id": f"baseline-{PATIENT}", "_rev": "rev-b1", "established": True}}
+        if "deviationTracker" in query:
+            return {"result": {"metrics": {"topic_coherence": 1}, "_rev": "rev-d1"}}
+        return {"result": []}
+
+    store._mutate = fake_mutate
+    store._query_groq = fake_query
+    return store
+
+
+@pytest.mark.asyncio
+async def test_sanity_batch_commits_one_transaction(sanity_store):
+    async with sanity_store.batch():
+        await sanity_store.save_conversation(_conversation("conv-1"))
+        await sanity_store.save_alert({"id": "alert-1", "patient_id": PATIENT})
+        await sanity_store.update_alert("alert-1", {"acknowledged": True})
+        await sanity_store.save_wellness_digest({"id": "digest-1", "patient_id": PATIENT})
+        assert sanity_store.mutations == []
+
+    assert len(sanity_store.mutations) == 1
+    # 4 document writes + 1 transcript blob + 3 cognitive-series append ops
+    # for the conversation + insight-aggregates createIfNotExists/inc pairs
+    # for the conversation and the alert
+    assert len(sanity_store.mutations[0]) == 12
+
+
+@pytest.mark.asyncio
+async def test_sanity_batch_uses_if_revision_id_for_locked_docs(sanity_store):
+    async with sanity_store.batch():
+        await sanity_store.get_cognitive_baseline(PATIENT)
+        counters = await sanity_store.get_consecutive_deviations(PATIENT)
+        await sanity_store.save_cognitive_baseline(PATIENT, {"established": True})
+        await sanity_store.update_consecutive_deviations(PATIENT, {**counters, "topic_coherence": 2})
+
+    baseline_mut, tracker_mut = sanity_store.mutations[0]
+    assert baseline_mut["patch"]["ifRevisionID"] == "rev-b1"
+    assert baseline_mut["patch"]["id"] == f"baseline-{PATIENT}"
+    assert tracker_mut["patch"]["ifRevisionID"] == "rev-d1"
+    assert tracker_mut["patch"]["set"]["metrics"] == {"topic_coherence": 2}
+
+
+@pytest.mark.asyncio
+async def test_sanity_writes_outside_batch_are_immediate(sanity_store):
+    await sanity_store.save_cognitive_baseline(PATIENT, {"established": True})
+    assert len(sanity_store.mutations) == 1
+    assert "createOrReplace" in sanity_store.mutations[0][0]
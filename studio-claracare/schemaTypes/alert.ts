@@ -114,5 +114,12 @@ export const alert = defineType({
         }),
       ],
     }),
+    defineField({
+      name: 'normalizationVersion',
+      title: 'Normalization Version',
+      type: 'number',
+      description: 'Text rules version applied by the backend (set automatically)',
+      readOnly: true,
+    }),
   ],
 })
@@ -100,6 +100,12 @@ export const conversation = defineType({
           title: 'Response Latency (seconds)',
           description: 'Avg time between Clara finishing and patient responding',
         }),
+        defineField({
+          name: 'pauseDuration',
+          type: 'number',
+          title: 'Pause Duration (seconds)',
+          description: 'Avg silence inside the patient\'s own turns',
+        }),
       ],
     }),
     defineField({
@@ -133,5 +139,12 @@ export const conversation = defineType({
         }),
       ],
     }),
+    defineField({
+      name: 'normalizationVersion',
+      title: 'Normalization Version',
+      type: 'number',
+      description: 'Text rules version applied by the backend (set automatically)',
+      readOnly: true,
+    }),
   ],
 })
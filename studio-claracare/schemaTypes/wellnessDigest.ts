@@ -91,5 +91,12 @@ export const wellnessDigest = defineType({
       type: 'datetime',
       description: 'When this digest was generated',
     }),
+    defineField({
+      name: 'normalizationVersion',
+      title: 'Normalization Version',
+      type: 'number',
+      description: 'Text rules version applied by the backend (set automatically)',
+      readOnly: true,
+    }),
   ],
 })